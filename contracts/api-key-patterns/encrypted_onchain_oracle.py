@@ -23,10 +23,172 @@ Security Note:
   This example uses base64 encoding for simplicity.
   In production, use proper encryption (AES-256, Fernet, etc.)
   and store decryption keys securely on leader nodes.
+
+Envelope encryption:
+  A stored key may also be an envelope (scripts/encrypt_key.py --envelope):
+    env1:<version>:<wrapped data key>:<payload>
+  The payload is the API key encrypted (Fernet) under a per-key data key, and
+  the data key is wrapped (Fernet) under the leader key named by <version>.
+  Leaders hold several versions in LEADER_KEYRING. Rotating the leader key is
+  then a re-wrap of the short header (rewrap_api_key) while the payload stays
+  as it is, and old versions keep working until they are dropped from the
+  keyring.
 """
 import json
+import os
 import base64
+import hashlib
+import time
 import genlayer.gl as gl
+from genlayer import u64
+
+# Prices are integers scaled by PRICE_SCALE: 3000.12 USD is 300012000000.
+# They are parsed from the API's decimal text and stay integers in the leader
+# result, storage and validator checks; views format them back to decimal
+# strings.
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+
+def _parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """Decimal string -> integer scaled by 10**decimals (half to even), without float."""
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def _format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed: 300012000000 -> "3000.12"."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+# Symbol -> Coingecko id, from the shared registry
+# (packages/genvm-web-fetcher/symbols.json); contracts cannot import it.
+# Coingecko wants ids ("ethereum"), not tickers ("eth"). Anything else is
+# passed through lower-cased, as a Coingecko id.
+COINGECKO_IDS = {
+    "BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin", "SOL": "solana",
+    "XRP": "ripple", "ADA": "cardano", "DOGE": "dogecoin", "TRX": "tron",
+    "AVAX": "avalanche-2", "DOT": "polkadot", "LINK": "chainlink", "LTC": "litecoin",
+    "UNI": "uniswap", "ATOM": "cosmos", "NEAR": "near", "ARB": "arbitrum",
+    "OP": "optimism", "POL": "polygon-ecosystem-token", "MATIC": "matic-network",
+    "USDC": "usd-coin", "USDT": "tether",
+}
+
+
+def _coingecko_id(symbol: str) -> str:
+    return COINGECKO_IDS.get(symbol.upper(), symbol.lower())
+
+
+# Leader-local cache of decrypted API keys: {sha256(ciphertext): (api_key, expires_at)}.
+# It lives in module memory only: it is never assigned to a contract field and
+# never part of a leader result, so it is neither persisted nor seen by
+# validators. It lasts as long as the leader's VM instance; a new one starts empty.
+DECRYPTED_KEY_TTL_SECONDS = 300.0
+DECRYPTED_KEY_CACHE_SIZE = 64
+_decrypted_keys = {}
+
+# Leader key-encryption keys by version: {"v2": "<fernet key>", ...}. Filled
+# from the leader node's environment (JSON object in LEADER_KEYRING_ENV) the
+# first time the leader opens an envelope, not at import, so a bad variable
+# fails that update instead of every call; it is only read by the leader and
+# never stored in the contract.
+LEADER_KEYRING_ENV = "GENLAYER_ORACLE_KEYRING"
+LEADER_KEYRING = None
+
+ENVELOPE_PREFIX = "env1"
+
+
+def _split_envelope(encrypted_key: str) -> tuple:
+    """(version, wrapped_data_key, payload) of an env1 envelope; ValueError if malformed."""
+    parts = encrypted_key.split(":")
+    if len(parts) != 4 or parts[0] != ENVELOPE_PREFIX or not all(parts[1:]):
+        raise ValueError("malformed envelope: expected env1:<version>:<wrapped key>:<payload>")
+    return parts[1], parts[2], parts[3]
+
+
+def _leader_keyring() -> dict:
+    """LEADER_KEYRING, parsed from the environment on first use; ValueError if malformed."""
+    global LEADER_KEYRING
+    if LEADER_KEYRING is None:
+        try:
+            keyring = json.loads(os.environ.get(LEADER_KEYRING_ENV, "") or "{}")
+        except ValueError as e:
+            raise ValueError(f"{LEADER_KEYRING_ENV} is not valid JSON: {e}")
+        if not isinstance(keyring, dict) or not all(isinstance(v, str) for v in keyring.values()):
+            raise ValueError(f"{LEADER_KEYRING_ENV} must be a JSON object of version -> key")
+        LEADER_KEYRING = keyring
+    return LEADER_KEYRING
+
+
+def _fernet_decrypt(key: str, token: str) -> bytes:
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        raise ValueError("envelope keys need the cryptography library on the leader")
+    return Fernet(key.encode()).decrypt(token.encode())
+
+
+def _decrypt_api_key(encrypted_key: str) -> str:
+    """
+    Decrypt a stored API key.
+    
+    Envelopes are opened with the leader key of their version (a dict
+    lookup) and the unwrapped data key. Anything else is the plain
+    base64 stand-in.
+    
+    WARNING: This is a simplified example using base64.
+    In production, decrypt with proper encryption (AES-256, Fernet, etc.)
+    using a decryption key stored securely on leader nodes.
+    """
+    if encrypted_key.startswith(ENVELOPE_PREFIX + ":"):
+        version, wrapped_key, payload = _split_envelope(encrypted_key)
+        leader_key = _leader_keyring().get(version)
+        if leader_key is None:
+            raise ValueError(f"no leader key for version {version}")
+        data_key = _fernet_decrypt(leader_key, wrapped_key).decode()
+        return _fernet_decrypt(data_key, payload).decode("utf-8")
+    return base64.b64decode(encrypted_key.encode()).decode("utf-8")
+
+
+def _cached_decrypt(encrypted_key: str) -> str:
+    """_decrypt_api_key with the leader-local TTL cache in front of it."""
+    digest = hashlib.sha256(encrypted_key.encode()).digest()
+    now = time.monotonic()
+    entry = _decrypted_keys.get(digest)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    api_key = _decrypt_api_key(encrypted_key)
+    if digest not in _decrypted_keys and len(_decrypted_keys) >= DECRYPTED_KEY_CACHE_SIZE:
+        for stale in [d for d, (_, expires) in _decrypted_keys.items() if expires <= now]:
+            del _decrypted_keys[stale]
+        if len(_decrypted_keys) >= DECRYPTED_KEY_CACHE_SIZE:
+            del _decrypted_keys[next(iter(_decrypted_keys))]
+    _decrypted_keys[digest] = (api_key, now + DECRYPTED_KEY_TTL_SECONDS)
+    return api_key
 
 
 class EncryptedKeyOracle(gl.Contract):
@@ -39,13 +201,13 @@ class EncryptedKeyOracle(gl.Contract):
     """
     
     # Persistent state
-    last_price: float
+    last_price: u64  # fixed-point, PRICE_SCALE
     last_source: str
     encrypted_api_key: str  # Base64-encoded encrypted key
     
     def __init__(self):
         # Initialize state
-        self.last_price = 0.0
+        self.last_price = 0
         self.last_source = ""
         # Encrypted API key (set via set_api_key method after deployment)
         self.encrypted_api_key = ""
@@ -71,17 +233,53 @@ class EncryptedKeyOracle(gl.Contract):
         if not encrypted_key or encrypted_key == "":
             raise gl.vm.UserError("encrypted key cannot be empty")
         
+        if encrypted_key.startswith(ENVELOPE_PREFIX + ":"):
+            try:
+                _split_envelope(encrypted_key)
+            except ValueError as e:
+                raise gl.vm.UserError(str(e))
+        
         # Store encrypted key
         self.encrypted_api_key = str(encrypted_key)
         _ = self.encrypted_api_key  # Force persistence
     
+    @gl.public.write
+    def rewrap_api_key(self, envelope_header: str) -> None:
+        """
+        Replace the key version and wrapped data key of the stored envelope.
+        
+        Used after rotating the leader key: `encrypt_key.py --rewrap` re-wraps
+        the data key under the new version without touching the API key, and
+        only this header ("env1:<version>:<wrapped key>") is sent. The
+        payload already on-chain is kept.
+        
+        Args:
+            envelope_header: New "env1:<version>:<wrapped key>" header
+        """
+        if not self.encrypted_api_key.startswith(ENVELOPE_PREFIX + ":"):
+            raise gl.vm.UserError("stored api key is not an envelope")
+        
+        _, _, payload = _split_envelope(self.encrypted_api_key)
+        try:
+            _split_envelope(f"{envelope_header}:{payload}")
+        except ValueError:
+            raise gl.vm.UserError("malformed envelope header: expected env1:<version>:<wrapped key>")
+        
+        self.encrypted_api_key = f"{envelope_header}:{payload}"
+        _ = self.encrypted_api_key  # Force persistence
+    
     @gl.public.view
     def get_price(self) -> dict:
         """Get current stored price."""
+        key_version = ""
+        if self.encrypted_api_key.startswith(ENVELOPE_PREFIX + ":"):
+            key_version = _split_envelope(self.encrypted_api_key)[0]
         return {
-            "price": str(self.last_price),
+            "price": _format_fixed(self.last_price),
+            "price_e8": self.last_price,
             "source": self.last_source,
-            "has_api_key": bool(self.encrypted_api_key and self.encrypted_api_key != "")
+            "has_api_key": bool(self.encrypted_api_key and self.encrypted_api_key != ""),
+            "key_version": key_version
         }
     
     @gl.public.write
@@ -101,18 +299,10 @@ class EncryptedKeyOracle(gl.Contract):
         def leader():
             """Leader decrypts key and makes API call."""
             try:
-                # Decrypt API key
-                # WARNING: This is a simplified example using base64
-                # In production, use proper encryption (AES-256, Fernet, etc.)
-                # and store decryption keys securely on leader nodes
-                
-                # Decode base64-encoded encrypted key
-                encrypted_bytes = base64.b64decode(self.encrypted_api_key.encode())
-                
-                # In production: decrypt using proper encryption library
-                # For this example: assume base64 encoding is the "encryption"
+                # Decrypt API key (cached per ciphertext, see _cached_decrypt)
+                # For this example base64 encoding is the "encryption"
                 # (NOT SECURE - this is just for demonstration)
-                api_key = encrypted_bytes.decode("utf-8")
+                api_key = _cached_decrypt(self.encrypted_api_key)
                 
             except Exception as e:
                 raise gl.vm.UserError(f"api key decrypt error: {str(e)}")
@@ -122,10 +312,11 @@ class EncryptedKeyOracle(gl.Contract):
             
             # Make API call with decrypted key
             # Example: Coingecko Pro API
+            coin_id = _coingecko_id(symbol)
             try:
                 coingecko_url = (
                     f"https://api.coingecko.com/api/v3/simple/price"
-                    f"?ids={symbol.lower()}&vs_currencies=usd"
+                    f"?ids={coin_id}&vs_currencies=usd"
                 )
                 
                 response = gl.nondet.web.get(
@@ -159,12 +350,12 @@ class EncryptedKeyOracle(gl.Contract):
             
             try:
                 body_text = response.body.decode("utf-8")
-                data = json.loads(body_text)
+                data = json.loads(body_text, parse_float=str)
             except Exception as e:
                 raise gl.vm.UserError(f"api response parse error: {str(e)}")
             
             # Extract price
-            price_data = data.get(symbol.lower())
+            price_data = data.get(coin_id) if isinstance(data, dict) else None
             if not price_data or not isinstance(price_data, dict):
                 raise gl.vm.UserError(f"price data missing for {symbol}")
             
@@ -173,14 +364,14 @@ class EncryptedKeyOracle(gl.Contract):
                 raise gl.vm.UserError(f"usd price not found for {symbol}")
             
             try:
-                price_float = float(price)
-                if price_float <= 0:
-                    raise gl.vm.UserError(f"invalid price: {price_float}")
-            except (ValueError, TypeError) as e:
+                price_fixed = _parse_fixed(str(price))
+            except ValueError as e:
                 raise gl.vm.UserError(f"price parse error: {str(e)}")
+            if price_fixed <= 0:
+                raise gl.vm.UserError(f"invalid price: {price}")
             
             return {
-                "price": str(price_float),
+                "price": price_fixed,
                 "source": "coingecko-pro",
                 "symbol": symbol.upper()
             }
@@ -192,16 +383,12 @@ class EncryptedKeyOracle(gl.Contract):
                 if not isinstance(unpacked, dict):
                     return False
                 
-                price_str = unpacked.get("price")
-                if price_str is None:
+                price = unpacked.get("price")
+                if not isinstance(price, int) or isinstance(price, bool):
                     return False
                 
-                # Validate price is positive and reasonable
-                try:
-                    price = float(price_str)
-                    return price > 0 and price < 100000
-                except (ValueError, TypeError):
-                    return False
+                # Validate price is positive and reasonable (exact integer bounds)
+                return 0 < price < 100000 * PRICE_SCALE
                 
             except Exception:
                 return False
@@ -218,18 +405,16 @@ class EncryptedKeyOracle(gl.Contract):
         if not isinstance(data, dict):
             raise gl.vm.UserError("invalid result format")
         
-        price_str = data.get("price")
+        price = data.get("price")
         source_str = data.get("source", "coingecko-pro")
         
-        if price_str is None:
+        if price is None:
             raise gl.vm.UserError("missing price in result")
         
-        try:
-            price_float = float(str(price_str))
-            self.last_price = price_float
-            _ = self.last_price  # Force persistence
-        except (ValueError, TypeError) as e:
-            raise gl.vm.UserError(f"price assignment error: {str(e)}")
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            raise gl.vm.UserError(f"price assignment error: {price}")
+        self.last_price = price
+        _ = self.last_price  # Force persistence
         
         self.last_source = str(source_str)
         _ = self.last_source  # Force persistence
@@ -7,9 +7,10 @@ Supports multiple API keys with automatic rotation.
 Contract can switch between keys without downtime.
 
 Architecture:
-  Contract (keys: [key1, key2, key3])
-    → Leader tries key1 → if fails → try key2 → etc.
-    → Update active key based on success
+  Contract (keys: [key1, key2, key3] + per-key health)
+    → Leader tries the healthiest key → if fails → the next healthiest → etc.
+    → Keys answering 401/403/429 cool down and are skipped for a while
+    → Update active key and key health based on the outcomes
 
 Benefits:
   - Zero downtime rotation: Switch keys without contract downtime
@@ -24,32 +25,346 @@ Trade-offs:
 """
 import json
 import base64
+import hashlib
+import time
 import genlayer.gl as gl
+from genlayer import Address, DynArray, TreeMap, u32, u64
+
+# Prices are integers scaled by PRICE_SCALE: 3000.12 USD is 300012000000.
+# They are parsed from the API's decimal text and stay integers in the leader
+# result, storage and validator checks; views format them back to decimal
+# strings.
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+
+def _parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """Decimal string -> integer scaled by 10**decimals (half to even), without float."""
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def _format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed: 300012000000 -> "3000.12"."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+# Symbol -> Coingecko id, from the shared registry
+# (packages/genvm-web-fetcher/symbols.json); contracts cannot import it.
+# Coingecko wants ids ("ethereum"), not tickers ("eth"). Anything else is
+# passed through lower-cased, as a Coingecko id.
+COINGECKO_IDS = {
+    "BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin", "SOL": "solana",
+    "XRP": "ripple", "ADA": "cardano", "DOGE": "dogecoin", "TRX": "tron",
+    "AVAX": "avalanche-2", "DOT": "polkadot", "LINK": "chainlink", "LTC": "litecoin",
+    "UNI": "uniswap", "ATOM": "cosmos", "NEAR": "near", "ARB": "arbitrum",
+    "OP": "optimism", "POL": "polygon-ecosystem-token", "MATIC": "matic-network",
+    "USDC": "usd-coin", "USDT": "tether",
+}
+
+
+def _coingecko_id(symbol: str) -> str:
+    return COINGECKO_IDS.get(symbol.upper(), symbol.lower())
+
+
+# Leader-local cache of decrypted API keys: {sha256(ciphertext): (api_key, expires_at)}.
+# It lives in module memory only: it is never assigned to a contract field and
+# never part of a leader result, so it is neither persisted nor seen by
+# validators. It lasts as long as the leader's VM instance; a new one starts empty.
+DECRYPTED_KEY_TTL_SECONDS = 300.0
+DECRYPTED_KEY_CACHE_SIZE = 64
+_decrypted_keys = {}
+
+
+def _decrypt_api_key(encrypted_key: str) -> str:
+    """
+    Decrypt a stored API key.
+    
+    Simplified: base64 stands in for proper encryption (use Fernet / AES
+    with a decryption key held on leader nodes in production).
+    """
+    return base64.b64decode(encrypted_key.encode()).decode("utf-8")
+
+
+def _cached_decrypt(encrypted_key: str) -> str:
+    """_decrypt_api_key with the leader-local TTL cache in front of it."""
+    digest = hashlib.sha256(encrypted_key.encode()).digest()
+    now = time.monotonic()
+    entry = _decrypted_keys.get(digest)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    api_key = _decrypt_api_key(encrypted_key)
+    if digest not in _decrypted_keys and len(_decrypted_keys) >= DECRYPTED_KEY_CACHE_SIZE:
+        for stale in [d for d, (_, expires) in _decrypted_keys.items() if expires <= now]:
+            del _decrypted_keys[stale]
+        if len(_decrypted_keys) >= DECRYPTED_KEY_CACHE_SIZE:
+            del _decrypted_keys[next(iter(_decrypted_keys))]
+    _decrypted_keys[digest] = (api_key, now + DECRYPTED_KEY_TTL_SECONDS)
+    return api_key
+
+
+# Key health. Cooldowns are counted in successful updates (`update_count`),
+# not seconds: contract state must come out the same on every validator, and
+# a leader's wall clock does not.
+KEY_AUTH_COOLDOWN_UPDATES = 50  # 401/403 or undecryptable: likely revoked
+KEY_RATE_LIMIT_COOLDOWN_UPDATES = 5  # 429
+KEY_OUTCOMES = ("ok", "error", "auth", "rate_limited")
+# Validators cannot reproduce a key's failure (they never see the keys), so a
+# dishonest leader could report working keys as failed. Its report must
+# follow the key order validators compute themselves, and at most this many
+# failures are applied per update.
+MAX_KEY_FAILURES_PER_UPDATE = 3
+
+# EncryptedKeyOracle's env1 envelopes need a leader keyring this contract
+# does not have; they are refused when added instead of failing every probe.
+ENVELOPE_PREFIX = "env1"
+
+# Removed keys leave a tombstone ("") in their slot so other slot indices stay
+# valid; the pool is compacted once tombstones outnumber live keys.
+TOMBSTONE = ""
+
+
+def _fingerprint(encrypted_key: str) -> str:
+    """Public identifier of a stored key: first 16 hex digits of SHA-256(ciphertext)."""
+    return hashlib.sha256(encrypted_key.encode()).hexdigest()[:16]
+
+
+def _key_order(active: int, api_keys: list, successes: list, failures: list, cooldown_until: list,
+               now: int) -> list:
+    """
+    Live key slots to try, healthiest first; keys cooling down are left out.
+
+    Health is the smoothed success rate (successes + 1) / (attempts + 2), so
+    new keys start at 0.5. Ties keep the circular order from `active`. If
+    every key is cooling down, all of them are returned, soonest-expiring
+    first, so a fully throttled pool can still recover. Tombstoned slots are
+    never returned.
+    """
+    n = len(api_keys)
+    circular = [(active + offset) % n for offset in range(n)]
+    circular = [i for i in circular if api_keys[i] != TOMBSTONE]
+    ready = [i for i in circular if cooldown_until[i] <= now]
+    if not ready:
+        return sorted(circular, key=lambda i: cooldown_until[i])
+    return sorted(ready, key=lambda i: -(successes[i] + 1) / (successes[i] + failures[i] + 2))
+
+
+def _fetch_price(encrypted_key: str, symbol: str) -> tuple:
+    """
+    One Coingecko request with one stored key.
+
+    Returns (outcome, value): outcome is one of KEY_OUTCOMES, value is the
+    fixed-point price for "ok" and a short error message otherwise.
+    """
+    # Decrypt key (cached per ciphertext, see _cached_decrypt)
+    try:
+        api_key = _cached_decrypt(encrypted_key)
+    except Exception as e:
+        return "auth", f"decrypt error: {str(e)}"
+    
+    if not api_key or api_key == "":
+        return "auth", "empty after decrypt"
+    
+    # Make API call
+    coin_id = _coingecko_id(symbol)
+    try:
+        response = gl.nondet.web.get(
+            f"https://api.coingecko.com/api/v3/simple/price"
+            f"?ids={coin_id}&vs_currencies=usd",
+            headers={
+                "User-Agent": "GenLayerOracle/1.0",
+                "X-CG-Pro-API-Key": api_key  # Decrypted key
+            }
+        )
+    except Exception as e:
+        return "error", f"request error: {str(e)}"
+    
+    # Check response
+    if not response or not hasattr(response, 'status'):
+        return "error", "no response"
+    
+    if response.status in (401, 403):
+        return "auth", f"status {response.status}"
+    
+    if response.status == 429:
+        return "rate_limited", "status 429"
+    
+    if response.status != 200:
+        return "error", f"status {response.status}"
+    
+    # Parse response
+    if not response.body:
+        return "error", "empty body"
+    
+    try:
+        data = json.loads(response.body.decode("utf-8"), parse_float=str)
+    except Exception as e:
+        return "error", f"parse error: {str(e)}"
+    
+    # Extract price
+    price_data = data.get(coin_id) if isinstance(data, dict) else None
+    if not price_data or not isinstance(price_data, dict):
+        return "error", "price data missing"
+    
+    price = price_data.get("usd")
+    if price is None:
+        return "error", "usd price missing"
+    
+    try:
+        price_fixed = _parse_fixed(str(price))
+    except ValueError:
+        return "error", "price parse error"
+    
+    if price_fixed <= 0:
+        return "error", f"invalid price: {price}"
+    
+    return "ok", price_fixed
+
+
+def _probe(encrypted_key: str, symbol: str) -> tuple:
+    """_fetch_price that reports unexpected exceptions as an "error" outcome."""
+    try:
+        return _fetch_price(encrypted_key, symbol)
+    except Exception as e:
+        return "error", str(e)
+
+
+def _probe_keys(keys: list, symbol: str) -> list:
+    """
+    Try (key_index, encrypted_key) pairs in order until one works.
+
+    Each try is its own gl.nondet.web request inside the leader's single
+    nondet block; the VM is single-threaded, so they run one after another.
+    Returns [(key_index, outcome, value)] for every key tried.
+    """
+    results = []
+    for key_index, encrypted_key in keys:
+        outcome, value = _probe(encrypted_key, symbol)
+        results.append((key_index, outcome, value))
+        if outcome == "ok":
+            break
+    return results
 
 
 class RotatingKeyOracle(gl.Contract):
     """
     Oracle with support for multiple API keys and rotation.
     
-    The contract maintains a list of encrypted API keys.
-    On failure, it automatically tries the next key.
-    The active key index is updated based on success.
+    The contract maintains a list of encrypted API keys with per-key
+    success/failure counters, and an index from key fingerprint to slot so
+    keys can be removed without a scan. The leader tries the healthiest keys first,
+    skips keys cooling down after a 401/403/429 without sending a request,
+    and the outcome of every key it tried is recorded once consensus is
+    reached. The active key index follows the last key that worked.
     """
     
     # Persistent state
-    last_price: float
+    last_price: u64  # fixed-point, PRICE_SCALE
     last_source: str
     api_keys: list  # List of encrypted API keys (base64 strings)
     active_key_index: int  # Index of currently active key
-    key_success_count: dict  # Track success count per key (for monitoring)
+    update_count: u64  # Successful updates; the clock for key cooldowns
+    key_successes: DynArray[u32]  # Per key, same index as api_keys
+    key_failures: DynArray[u32]
+    key_cooldown_until: DynArray[u64]  # Skip the key while update_count < this
+    key_slots: TreeMap[str, u32]  # Fingerprint -> slot in api_keys (live keys only)
+    tombstones: u32  # Removed slots not yet compacted away
+    owner: Address  # deployer; the only caller allowed to manage the key pool
     
     def __init__(self):
         # Initialize state
-        self.last_price = 0.0
+        self.last_price = 0
         self.last_source = ""
         self.api_keys = []  # Will store encrypted keys (as strings)
         self.active_key_index = 0
-        self.key_success_count = {}  # key_index (as string) -> success_count (as string)
+        self.update_count = 0
+        self.key_successes = []
+        self.key_failures = []
+        self.key_cooldown_until = []
+        self.key_slots = {}
+        self.tombstones = 0
+        self.owner = gl.message.sender_address
+    
+    def _require_owner(self) -> None:
+        if gl.message.sender_address != getattr(self, 'owner', None):
+            raise gl.vm.UserError("only the owner can manage api keys")
+    
+    def _live_key_count(self) -> int:
+        return len(self.api_keys) - self.tombstones
+    
+    def _append_keys(self, encrypted_keys: list) -> None:
+        """Validate a batch of keys, then append them all with fresh health counters."""
+        fingerprints = []
+        for encrypted_key in encrypted_keys:
+            if not isinstance(encrypted_key, str) or encrypted_key == "":
+                raise gl.vm.UserError("encrypted key cannot be empty")
+            if encrypted_key.startswith(ENVELOPE_PREFIX + ":"):
+                raise gl.vm.UserError("envelope keys are not supported here, only by EncryptedKeyOracle")
+            fingerprint = _fingerprint(encrypted_key)
+            if fingerprint in self.key_slots or fingerprint in fingerprints:
+                raise gl.vm.UserError(f"key {fingerprint} already added")
+            fingerprints.append(fingerprint)
+        
+        for encrypted_key, fingerprint in zip(encrypted_keys, fingerprints):
+            self.key_slots[fingerprint] = len(self.api_keys)
+            self.api_keys.append(encrypted_key)
+            self.key_successes.append(0)
+            self.key_failures.append(0)
+            self.key_cooldown_until.append(0)
+        
+        # Force persistence
+        _ = self.api_keys
+        _ = self.key_slots
+        _ = self.key_successes
+        _ = self.key_failures
+        _ = self.key_cooldown_until
+    
+    def _compact_keys(self) -> None:
+        """Drop tombstoned slots, renumbering live keys and their index entries."""
+        live = [i for i, key in enumerate(self.api_keys) if key != TOMBSTONE]
+        new_slot = {old: new for new, old in enumerate(live)}
+        
+        self.api_keys = [self.api_keys[i] for i in live]
+        self.key_successes = [self.key_successes[i] for i in live]
+        self.key_failures = [self.key_failures[i] for i in live]
+        self.key_cooldown_until = [self.key_cooldown_until[i] for i in live]
+        for fingerprint in list(self.key_slots):
+            self.key_slots[fingerprint] = new_slot[self.key_slots[fingerprint]]
+        self.active_key_index = new_slot.get(self.active_key_index, 0)
+        self.tombstones = 0
+        
+        # Force persistence
+        _ = self.api_keys
+        _ = self.key_slots
+        _ = self.key_successes
+        _ = self.key_failures
+        _ = self.key_cooldown_until
+        _ = self.active_key_index
+        _ = self.tombstones
     
     @gl.public.write
     def add_api_key(self, encrypted_key: str) -> None:
@@ -62,35 +377,82 @@ class RotatingKeyOracle(gl.Contract):
         Note:
           Keys should be encrypted off-chain before adding.
           See scripts/encrypt_key.py for encryption example.
+          The same ciphertext cannot be added twice.
+          Owner only, like every change to the key pool.
+        """
+        self._require_owner()
+        self._append_keys([encrypted_key])
+    
+    @gl.public.write
+    def add_api_keys(self, encrypted_keys: list) -> None:
         """
-        if not encrypted_key or encrypted_key == "":
-            raise gl.vm.UserError("encrypted key cannot be empty")
+        Add many API keys in one transaction.
         
-        # Add key to list
-        self.api_keys.append(str(encrypted_key))
+        The batch is checked first (non-empty, no duplicates within it or
+        with the pool) and either all keys are added or none. Owner only.
         
-        # Initialize success count for new key
-        key_index = len(self.api_keys) - 1
-        key_index_str = str(key_index)
-        self.key_success_count[key_index_str] = "0"
+        Args:
+            encrypted_keys: Base64-encoded encrypted API keys
+        """
+        self._require_owner()
+        if not isinstance(encrypted_keys, list) or len(encrypted_keys) == 0:
+            raise gl.vm.UserError("encrypted_keys must be a non-empty list")
+        
+        self._append_keys(encrypted_keys)
+    
+    @gl.public.write
+    def remove_api_key(self, fingerprint: str) -> None:
+        """
+        Remove a key from the rotation pool.
+        
+        The slot is tombstoned (the leader never tries it again) and the
+        pool is compacted once more than half of the slots are tombstones,
+        which renumbers the remaining keys. Owner only.
+        
+        Args:
+            fingerprint: Key fingerprint as listed by get_key_status
+                         (first 16 hex digits of SHA-256 of the ciphertext)
+        """
+        self._require_owner()
+        slot = self.key_slots.get(fingerprint)
+        if slot is None:
+            raise gl.vm.UserError(f"unknown key fingerprint: {fingerprint}")
+        
+        del self.key_slots[fingerprint]
+        self.api_keys[slot] = TOMBSTONE
+        self.key_successes[slot] = 0
+        self.key_failures[slot] = 0
+        self.key_cooldown_until[slot] = 0
+        self.tombstones += 1
         
         # Force persistence
         _ = self.api_keys
-        _ = self.key_success_count
+        _ = self.key_slots
+        _ = self.key_successes
+        _ = self.key_failures
+        _ = self.key_cooldown_until
+        _ = self.tombstones
+        
+        if self.tombstones * 2 > len(self.api_keys):
+            self._compact_keys()
     
     @gl.public.write
     def rotate_key(self) -> None:
         """
         Manually rotate to next key in the pool.
         
-        Useful for manual key rotation or testing.
+        Useful for manual key rotation or testing (owner only).
         Automatic rotation happens on failure.
         """
-        if len(self.api_keys) == 0:
+        self._require_owner()
+        if self._live_key_count() == 0:
             raise gl.vm.UserError("no keys available")
         
-        # Rotate to next key (circular)
-        self.active_key_index = (self.active_key_index + 1) % len(self.api_keys)
+        # Rotate to next live key (circular)
+        index = (self.active_key_index + 1) % len(self.api_keys)
+        while self.api_keys[index] == TOMBSTONE:
+            index = (index + 1) % len(self.api_keys)
+        self.active_key_index = index
         _ = self.active_key_index
     
     @gl.public.view
@@ -99,13 +461,21 @@ class RotatingKeyOracle(gl.Contract):
         Get status of all keys (for monitoring).
         
         Returns:
-            Dictionary with key count, active index, and success counts
+            Dictionary with key count, active index, and per live slot the
+            key fingerprint, success and failure counts, plus the slots of
+            keys cooling down
         """
+        live = [i for i, key in enumerate(self.api_keys) if key != TOMBSTONE]
         return {
-            "key_count": len(self.api_keys),
+            "key_count": len(live),
             "active_key_index": self.active_key_index,
-            "success_counts": dict(self.key_success_count),
-            "last_price": str(self.last_price),
+            "fingerprints": {str(slot): fingerprint for fingerprint, slot in self.key_slots.items()},
+            "success_counts": {str(i): str(self.key_successes[i]) for i in live},
+            "failure_counts": {str(i): str(self.key_failures[i]) for i in live},
+            "cooling_down": [i for i in live if self.key_cooldown_until[i] > self.update_count],
+            "tombstones": self.tombstones,
+            "update_count": self.update_count,
+            "last_price": _format_fixed(self.last_price),
             "last_source": self.last_source
         }
     
@@ -113,137 +483,56 @@ class RotatingKeyOracle(gl.Contract):
     def get_price(self) -> dict:
         """Get current stored price."""
         return {
-            "price": str(self.last_price),
+            "price": _format_fixed(self.last_price),
+            "price_e8": self.last_price,
             "source": self.last_source,
             "active_key_index": self.active_key_index,
-            "key_count": len(self.api_keys)
+            "key_count": self._live_key_count()
         }
     
     @gl.public.write
     def update_price(self, symbol: str = "ETH") -> None:
         """
-        Fetch price using active API key, rotate on failure.
+        Fetch price using the healthiest API keys, rotate on failure.
         
-        The contract tries keys in order:
-        1. Starts with active key
-        2. On failure, tries next key
-        3. Updates active key to successful key
+        The leader tries keys in the order given by _key_order (keys cooling
+        down and removed keys cost no request) and stops at the first
+        success. Its result lists the outcome of every key it tried, which
+        validators check against the key order they compute themselves.
+        After consensus those outcomes update the counters (at most
+        MAX_KEY_FAILURES_PER_UPDATE failures), put keys answering 401/403/429
+        into cooldown and make the successful key the active one. If every
+        key fails the transaction fails and nothing is recorded.
         
         Args:
             symbol: Cryptocurrency symbol (default: "ETH")
         """
-        if len(self.api_keys) == 0:
+        if self._live_key_count() == 0:
             raise gl.vm.UserError("no api keys configured. call add_api_key first")
         
         def leader():
-            """Leader tries keys in order, rotates on failure."""
-            keys_to_try = len(self.api_keys)
-            last_error = None
+            """Leader tries keys healthiest first, rotates on failure."""
+            order = _key_order(
+                self.active_key_index, self.api_keys, self.key_successes,
+                self.key_failures, self.key_cooldown_until, self.update_count
+            )
+            results = _probe_keys([(i, self.api_keys[i]) for i in order], symbol)
+            outcomes = [[key_index, outcome] for key_index, outcome, _ in results]
             
-            # Try active key first, then others in circular order
-            for attempt in range(keys_to_try):
-                key_index = (self.active_key_index + attempt) % len(self.api_keys)
-                encrypted_key = self.api_keys[key_index]
-                
-                try:
-                    # Decrypt key (simplified - use proper encryption in production)
-                    try:
-                        encrypted_bytes = base64.b64decode(encrypted_key.encode())
-                        api_key = encrypted_bytes.decode("utf-8")
-                    except Exception as e:
-                        last_error = f"key {key_index} decrypt error: {str(e)}"
-                        continue  # Try next key
-                    
-                    if not api_key or api_key == "":
-                        last_error = f"key {key_index} empty after decrypt"
-                        continue
-                    
-                    # Make API call
-                    try:
-                        response = gl.nondet.web.get(
-                            f"https://api.coingecko.com/api/v3/simple/price"
-                            f"?ids={symbol.lower()}&vs_currencies=usd",
-                            headers={
-                                "User-Agent": "GenLayerOracle/1.0",
-                                "X-CG-Pro-API-Key": api_key  # Decrypted key
-                            }
-                        )
-                    except Exception as e:
-                        last_error = f"key {key_index} request error: {str(e)}"
-                        continue  # Try next key
-                    
-                    # Check response
-                    if not response or not hasattr(response, 'status'):
-                        last_error = f"key {key_index} no response"
-                        continue
-                    
-                    if response.status != 200:
-                        last_error = f"key {key_index} status {response.status}"
-                        continue  # Try next key
-                    
-                    # Parse response
-                    if not response.body:
-                        last_error = f"key {key_index} empty body"
-                        continue
-                    
-                    try:
-                        body_text = response.body.decode("utf-8")
-                        data = json.loads(body_text)
-                    except Exception as e:
-                        last_error = f"key {key_index} parse error: {str(e)}"
-                        continue
-                    
-                    # Extract price
-                    price_data = data.get(symbol.lower())
-                    if not price_data or not isinstance(price_data, dict):
-                        last_error = f"key {key_index} price data missing"
-                        continue
-                    
-                    price = price_data.get("usd")
-                    if price is None:
-                        last_error = f"key {key_index} usd price missing"
-                        continue
-                    
-                    try:
-                        price_float = float(price)
-                        if price_float <= 0:
-                            last_error = f"key {key_index} invalid price: {price_float}"
-                            continue
-                    except (ValueError, TypeError):
-                        last_error = f"key {key_index} price parse error"
-                        continue
-                    
-                    # SUCCESS - this key worked
-                    # Update success count for this key
-                    key_index_str = str(key_index)
-                    current_count_str = self.key_success_count.get(key_index_str, "0")
-                    try:
-                        current_count = int(current_count_str)
-                        new_count = current_count + 1
-                    except:
-                        new_count = 1
-                    
-                    self.key_success_count[key_index_str] = str(new_count)
-                    
-                    # Switch to this key if it's not the active one
-                    if key_index != self.active_key_index:
-                        self.active_key_index = key_index
-                        _ = self.active_key_index
-                    
+            for key_index, outcome, value in results:
+                if outcome == "ok":
                     return {
-                        "price": str(price_float),
+                        "price": value,
                         "source": f"coingecko-key-{key_index}",
                         "key_index": key_index,
-                        "symbol": symbol.upper()
+                        "symbol": symbol.upper(),
+                        "key_outcomes": outcomes
                     }
-                    
-                except Exception as e:
-                    last_error = f"key {key_index} error: {str(e)}"
-                    continue  # Try next key
             
             # All keys failed
+            last_error = f"key {results[-1][0]} {results[-1][2]}"
             raise gl.vm.UserError(
-                f"all {keys_to_try} keys failed. last error: {last_error}"
+                f"all {len(order)} keys failed. last error: {last_error}"
             )
         
         def validator(result):
@@ -253,17 +542,37 @@ class RotatingKeyOracle(gl.Contract):
                 if not isinstance(unpacked, dict):
                     return False
                 
-                price_str = unpacked.get("price")
-                if price_str is None:
+                price = unpacked.get("price")
+                if not isinstance(price, int) or isinstance(price, bool):
                     return False
                 
-                # Validate price is positive and reasonable
-                try:
-                    price = float(price_str)
-                    return price > 0 and price < 100000
-                except (ValueError, TypeError):
+                # Key outcomes must walk the key order a validator computes
+                # from the same state: failures for a prefix of it, then the
+                # key that worked. The leader cannot skip ahead or name keys
+                # it would not have tried yet.
+                outcomes = unpacked.get("key_outcomes")
+                if not isinstance(outcomes, list) or not outcomes:
+                    return False
+                order = _key_order(
+                    self.active_key_index, self.api_keys, self.key_successes,
+                    self.key_failures, self.key_cooldown_until, self.update_count
+                )
+                if len(outcomes) > len(order):
+                    return False
+                for position, entry in enumerate(outcomes):
+                    if not isinstance(entry, list) or len(entry) != 2:
+                        return False
+                    key_index, outcome = entry
+                    if key_index != order[position] or outcome not in KEY_OUTCOMES:
+                        return False
+                    if (outcome == "ok") != (position == len(outcomes) - 1):
+                        return False
+                if outcomes[-1][0] != unpacked.get("key_index"):
                     return False
                 
+                # Validate price is positive and reasonable (exact integer bounds)
+                return 0 < price < 100000 * PRICE_SCALE
+                
             except Exception:
                 return False
         
@@ -279,19 +588,48 @@ class RotatingKeyOracle(gl.Contract):
         if not isinstance(data, dict):
             raise gl.vm.UserError("invalid result format")
         
-        price_str = data.get("price")
+        price = data.get("price")
         source_str = data.get("source", "unknown")
         
-        if price_str is None:
+        if price is None:
             raise gl.vm.UserError("missing price in result")
         
-        try:
-            price_float = float(str(price_str))
-            self.last_price = price_float
-            _ = self.last_price  # Force persistence
-        except (ValueError, TypeError) as e:
-            raise gl.vm.UserError(f"price assignment error: {str(e)}")
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            raise gl.vm.UserError(f"price assignment error: {price}")
+        self.last_price = price
+        _ = self.last_price  # Force persistence
         
         self.last_source = str(source_str)
         _ = self.last_source  # Force persistence
-
+        
+        # Record key health (the clock ticks first, so a cooldown of N
+        # skips the key for the next N updates). Failures beyond
+        # MAX_KEY_FAILURES_PER_UPDATE are dropped; those keys are simply
+        # tried again next time.
+        self.update_count += 1
+        failures_applied = 0
+        for key_index, outcome in data.get("key_outcomes", []):
+            if not 0 <= key_index < len(self.api_keys) or self.api_keys[key_index] == TOMBSTONE:
+                continue
+            if outcome == "ok":
+                self.key_successes[key_index] += 1
+                continue
+            if failures_applied >= MAX_KEY_FAILURES_PER_UPDATE:
+                continue
+            failures_applied += 1
+            self.key_failures[key_index] += 1
+            if outcome == "auth":
+                self.key_cooldown_until[key_index] = self.update_count + KEY_AUTH_COOLDOWN_UPDATES
+            elif outcome == "rate_limited":
+                self.key_cooldown_until[key_index] = self.update_count + KEY_RATE_LIMIT_COOLDOWN_UPDATES
+        
+        key_index = data.get("key_index")
+        if isinstance(key_index, int) and 0 <= key_index < len(self.api_keys):
+            self.active_key_index = key_index
+        
+        # Force persistence
+        _ = self.update_count
+        _ = self.active_key_index
+        _ = self.key_successes
+        _ = self.key_failures
+        _ = self.key_cooldown_until
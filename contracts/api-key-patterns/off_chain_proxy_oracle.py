@@ -20,6 +20,98 @@ Trade-offs:
 """
 import json
 import genlayer.gl as gl
+from genlayer import TreeMap, u64
+
+# Prices are integers scaled by PRICE_SCALE: 3000.12 USD is 300012000000.
+# They are parsed from the API's decimal text and stay integers in the leader
+# result, storage and validator checks; views format them back to decimal
+# strings.
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+
+def _parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """Decimal string -> integer scaled by 10**decimals (half to even), without float."""
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def _format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed: 300012000000 -> "3000.12"."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+# update_prices' leader result travels as canonical compact JSON text: short
+# field tags, sorted keys, no spaces and integers only, so equal results are
+# equal strings. A validator decodes and checks its structure with one
+# json.loads and a re-encode comparison. Tags are lowercase so they never
+# collide with the (uppercase) symbol keys.
+RESULT_TAGS = {"prices": "ps", "price": "p", "source": "s"}
+_RESULT_NAMES = {tag: name for name, tag in RESULT_TAGS.items()}
+
+
+def _retag(value, table: dict):
+    """Copy of a result with dict keys renamed through `table`; rejects floats."""
+    if isinstance(value, dict):
+        return {table.get(key, key): _retag(item, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_retag(item, table) for item in value]
+    if isinstance(value, float):
+        raise TypeError("floats are not allowed in results, use fixed-point ints")
+    return value
+
+
+def _dumps_canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode_result(value) -> str:
+    """Canonical compact text of a leader result."""
+    return _dumps_canonical(_retag(value, RESULT_TAGS))
+
+
+def _decode_result(text) -> dict:
+    """Inverse of _encode_result; ValueError unless `text` is exactly a canonical encoding."""
+    if not isinstance(text, str):
+        raise ValueError("result is not canonical text")
+
+    def no_floats(literal):
+        raise ValueError(f"result is not canonical: float {literal}")
+
+    packed = json.loads(text, parse_float=no_floats, parse_constant=no_floats)
+    # Duplicate keys, spaces and key order all change the re-encoded text
+    if _dumps_canonical(packed) != text:
+        raise ValueError("result is not canonical")
+    return _retag(packed, _RESULT_NAMES)
+
+
+# Event removed - not needed for persistence and causes deployment errors
+# If events are needed in the future, they must be defined with proper GenLayer Event syntax
+
 
 
 class ProxyOracle(gl.Contract):
@@ -31,13 +123,15 @@ class ProxyOracle(gl.Contract):
     """
     
     # Persistent state
-    last_price: float
+    last_price: u64  # fixed-point, PRICE_SCALE
     last_source: str
     proxy_url: str  # Proxy service URL (configured at deployment)
+    last_prices: TreeMap[str, u64]  # symbol -> fixed-point price, written by update_prices
+    last_price_sources: TreeMap[str, str]  # symbol -> source, written by update_prices
     
     def __init__(self):
         # Initialize state
-        self.last_price = 0.0
+        self.last_price = 0
         self.last_source = ""
         # Default proxy URL (can be updated via set_proxy_url)
         # In production, set this via deployment or constructor parameter
@@ -53,11 +147,27 @@ class ProxyOracle(gl.Contract):
     def get_price(self) -> dict:
         """Get current stored price."""
         return {
-            "price": str(self.last_price),
+            "price": _format_fixed(self.last_price),
+            "price_e8": self.last_price,
             "source": self.last_source,
             "proxy_url": self.proxy_url
         }
     
+    @gl.public.view
+    def get_prices(self) -> dict:
+        """Get all prices stored by update_prices."""
+        return {
+            "prices": {
+                symbol: {
+                    "price": _format_fixed(price),
+                    "price_e8": price,
+                    "source": self.last_price_sources.get(symbol, "proxy"),
+                }
+                for symbol, price in self.last_prices.items()
+            },
+            "proxy_url": self.proxy_url
+        }
+    
     @gl.public.write
     def update_price(self, symbol: str = "ETH") -> None:
         """
@@ -112,7 +222,7 @@ class ProxyOracle(gl.Contract):
             
             try:
                 body_text = proxy_response.body.decode("utf-8")
-                data = json.loads(body_text)
+                data = json.loads(body_text, parse_float=str)
             except Exception as e:
                 raise gl.vm.UserError(f"proxy response parse error: {str(e)}")
             
@@ -124,14 +234,14 @@ class ProxyOracle(gl.Contract):
                 raise gl.vm.UserError("invalid proxy response: price missing")
             
             try:
-                price = float(str(price_str))
-                if price <= 0:
-                    raise gl.vm.UserError(f"invalid price: {price}")
-            except (ValueError, TypeError) as e:
+                price = _parse_fixed(str(price_str))
+            except ValueError as e:
                 raise gl.vm.UserError(f"price parse error: {str(e)}")
+            if price <= 0:
+                raise gl.vm.UserError(f"invalid price: {price_str}")
             
             return {
-                "price": str(price),
+                "price": price,
                 "source": str(source),
                 "symbol": symbol.upper()
             }
@@ -143,17 +253,13 @@ class ProxyOracle(gl.Contract):
                 if not isinstance(unpacked, dict):
                     return False
                 
-                price_str = unpacked.get("price")
-                if price_str is None:
+                price = unpacked.get("price")
+                if not isinstance(price, int) or isinstance(price, bool):
                     return False
                 
-                # Validate price is positive and reasonable
-                try:
-                    price = float(price_str)
-                    # Reasonable range for crypto prices
-                    return price > 0 and price < 100000
-                except (ValueError, TypeError):
-                    return False
+                # Validate price is positive and reasonable (exact integer bounds)
+                # Reasonable range for crypto prices
+                return 0 < price < 100000 * PRICE_SCALE
                 
             except Exception:
                 return False
@@ -170,19 +276,150 @@ class ProxyOracle(gl.Contract):
         if not isinstance(data, dict):
             raise gl.vm.UserError("invalid result format")
         
-        price_str = data.get("price")
+        price = data.get("price")
         source_str = data.get("source", "proxy")
         
-        if price_str is None:
+        if price is None:
             raise gl.vm.UserError("missing price in result")
         
-        try:
-            price_float = float(str(price_str))
-            self.last_price = price_float
-            _ = self.last_price  # Force persistence
-        except (ValueError, TypeError) as e:
-            raise gl.vm.UserError(f"price assignment error: {str(e)}")
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            raise gl.vm.UserError(f"price assignment error: {price}")
+        self.last_price = price
+        _ = self.last_price  # Force persistence
         
         self.last_source = str(source_str)
         _ = self.last_source  # Force persistence
-
+    
+    @gl.public.write
+    def update_prices(self, symbols: list[str]) -> None:
+        """
+        Fetch many prices via the proxy batch endpoint in one transaction.
+        
+        One proxy round-trip ({proxy_url}/prices?symbols=A,B,...) and one
+        consensus round replace N separate update_price calls. Symbols the
+        proxy could not price are left unchanged.
+        
+        Args:
+            symbols: Cryptocurrency symbols, e.g. ["ETH", "BTC"] (max 50)
+        """
+        requested = []
+        for symbol in symbols:
+            symbol_upper = str(symbol).strip().upper()
+            if symbol_upper and symbol_upper not in requested:
+                requested.append(symbol_upper)
+        if len(requested) == 0:
+            raise gl.vm.UserError("no symbols given")
+        if len(requested) > 50:
+            raise gl.vm.UserError("at most 50 symbols per update")
+        
+        def leader():
+            """Leader fetches all symbols with one proxy request."""
+            if not self.proxy_url or self.proxy_url == "":
+                raise gl.vm.UserError("proxy url not configured")
+            
+            proxy_endpoint = f"{self.proxy_url}/prices?symbols={','.join(requested)}"
+            
+            try:
+                proxy_response = gl.nondet.web.get(
+                    proxy_endpoint,
+                    headers={
+                        "User-Agent": "GenLayerOracle/1.0",
+                        "Content-Type": "application/json",
+                        # NO API KEY HERE - Proxy handles it
+                    }
+                )
+            except Exception as e:
+                raise gl.vm.UserError(f"proxy request failed: {str(e)}")
+            
+            if not proxy_response or not hasattr(proxy_response, 'status'):
+                raise gl.vm.UserError("proxy service unavailable")
+            
+            if proxy_response.status != 200:
+                error_body = ""
+                if proxy_response.body:
+                    try:
+                        error_body = proxy_response.body.decode("utf-8")
+                    except:
+                        pass
+                raise gl.vm.UserError(
+                    f"proxy error {proxy_response.status}: {error_body[:100]}"
+                )
+            
+            if not proxy_response.body:
+                raise gl.vm.UserError("proxy response empty")
+            
+            try:
+                data = json.loads(proxy_response.body.decode("utf-8"), parse_float=str)
+            except Exception as e:
+                raise gl.vm.UserError(f"proxy response parse error: {str(e)}")
+            
+            prices_obj = data.get("prices") if isinstance(data, dict) else None
+            if not isinstance(prices_obj, dict):
+                raise gl.vm.UserError("invalid proxy response: prices missing")
+            
+            # Only keep requested symbols with a valid positive price
+            prices = {}
+            for symbol in requested:
+                entry = prices_obj.get(symbol)
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    price = _parse_fixed(str(entry.get("price")))
+                except ValueError:
+                    continue
+                if price <= 0:
+                    continue
+                prices[symbol] = {"price": price, "source": str(entry.get("source", "proxy"))}
+            
+            if len(prices) == 0:
+                raise gl.vm.UserError("proxy returned no valid prices")
+            
+            return _encode_result({"prices": prices})
+        
+        def validator(result):
+            """Validate every returned price is a requested symbol with a positive value."""
+            try:
+                unpacked = _decode_result(gl.vm.unpack_result(result))
+                if not isinstance(unpacked, dict):
+                    return False
+                
+                prices_obj = unpacked.get("prices")
+                if not isinstance(prices_obj, dict) or len(prices_obj) == 0:
+                    return False
+                
+                for symbol, entry in prices_obj.items():
+                    if symbol not in requested or not isinstance(entry, dict):
+                        return False
+                    price = entry.get("price")
+                    if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+                        return False
+                return True
+                
+            except Exception:
+                return False
+        
+        # Run consensus
+        try:
+            data = gl.vm.run_nondet(leader, validator)
+        except gl.vm.UserError:
+            raise  # Re-raise UserError as-is
+        except Exception as e:
+            raise gl.vm.UserError(f"update_prices failed: {str(e)}")
+        
+        try:
+            data = _decode_result(data)
+        except (ValueError, TypeError):
+            raise gl.vm.UserError("invalid result format")
+        if not isinstance(data, dict) or not isinstance(data.get("prices"), dict):
+            raise gl.vm.UserError("invalid result format")
+        
+        # All symbols are stored in this single transaction
+        for symbol, entry in data["prices"].items():
+            price = entry.get("price")
+            if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+                raise gl.vm.UserError(f"price assignment error for {symbol}: {price}")
+            self.last_prices[str(symbol)] = price
+            self.last_price_sources[str(symbol)] = str(entry.get("source", "proxy"))
+        
+        _ = self.last_prices  # Force persistence
+        _ = self.last_price_sources
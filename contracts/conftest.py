@@ -0,0 +1,55 @@
+"""
+Pytest setup for the contract tests.
+
+Contracts run under the genvm_local stub `genlayer.gl`; web requests are
+answered from packages/genvm-local/fixtures/default.json. The runtime keeps
+every validator it runs in `validators`, so tests can also feed validators
+hand-made leader results.
+"""
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, ".."))
+sys.path.insert(0, os.path.join(ROOT, "packages", "genvm-local"))
+
+import genvm_local  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "packages", "genvm-local", "fixtures", "default.json")
+
+
+@pytest.fixture
+def transport():
+    """Fake upstreams from the shared fixtures; add routes to override."""
+    return genvm_local.FakeTransport.from_fixtures(FIXTURES)
+
+
+@pytest.fixture
+def validators():
+    """Validator functions seen by run_nondet, in call order."""
+    return []
+
+
+@pytest.fixture
+def runtime(transport, validators):
+    def consensus(leader, validator, leader_result, call):
+        validators.append(validator)
+        vote, seconds, requests = runtime.run_validator(validator, leader_result)
+        call.votes.append(vote)
+        call.validator_seconds.append(seconds)
+        call.validator_requests.append(requests)
+
+    runtime = genvm_local.install(genvm_local.Runtime(transport, consensus=consensus))
+    yield runtime
+    genvm_local.uninstall()
+
+
+@pytest.fixture
+def deploy(runtime):
+    """deploy("oracle_consumer.py", *init_args) -> fresh contract instance."""
+    def deploy(path, *args):
+        module = genvm_local.load_contract(os.path.join(HERE, path))
+        return genvm_local.deploy(genvm_local.find_contract_class(module), *args)
+    return deploy
@@ -13,7 +13,121 @@ Data Sources:
 - News: Reddit + CoinDesk RSS fallback
 """
 import json
+import time
 import genlayer.gl as gl
+from genlayer import Address, i64, u64
+
+# Total time budget for update_all's leader fetches (price mirrors, weather,
+# news). Mirrors and optional sources left when it runs out are skipped.
+LEADER_DEADLINE_SECONDS = 30.0
+
+# Prices, temperatures and the change-detection epsilons are integers scaled by PRICE_SCALE:
+# 3000.12 USD is 300012000000. They are parsed from the API's decimal text and stay
+# integers in the leader result, storage and validator checks; views format
+# them back to decimal strings.
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+# Upper bounds for the change-detection tolerances: a larger epsilon would let
+# update_all keep a stale price (USD) or temperature (°C) indefinitely.
+MAX_PRICE_EPSILON = 100 * PRICE_SCALE
+MAX_TEMPERATURE_EPSILON = 5 * PRICE_SCALE
+
+
+def _parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """Decimal string -> integer scaled by 10**decimals (half to even), without float."""
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def _format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed: 300012000000 -> "3000.12"."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+def _parse_epsilon(name: str, epsilon: str, maximum: int) -> int:
+    """Change-detection tolerance from its decimal string, within [0, maximum]."""
+    try:
+        eps = _parse_fixed(str(epsilon))
+    except Exception:
+        raise gl.vm.UserError(f"invalid {name} epsilon: {epsilon}")
+    if eps < 0:
+        raise gl.vm.UserError(f"{name} epsilon must be >= 0: {epsilon}")
+    if eps > maximum:
+        raise gl.vm.UserError(f"{name} epsilon must be <= {_format_fixed(maximum)}: {epsilon}")
+    return eps
+
+
+# update_all's leader result travels as canonical compact JSON text: short
+# field tags, sorted keys, no spaces and integers only, so equal results are
+# equal strings. A validator decodes and checks its structure with one
+# json.loads and a re-encode comparison instead of walking nested string
+# fields (web_fetcher.ResultCodec is the library version, with a binary form).
+RESULT_TAGS = {
+    "price": "p", "value": "v", "source": "s",
+    "weather": "w", "temperature": "t", "condition": "c", "city": "y",
+    "news": "n", "count": "k",
+}
+_RESULT_NAMES = {tag: name for name, tag in RESULT_TAGS.items()}
+
+
+def _retag(value, table: dict):
+    """Copy of a result with dict keys renamed through `table`; rejects floats."""
+    if isinstance(value, dict):
+        return {table.get(key, key): _retag(item, table) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_retag(item, table) for item in value]
+    if isinstance(value, float):
+        raise TypeError("floats are not allowed in results, use fixed-point ints")
+    return value
+
+
+def _dumps_canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _encode_result(value) -> str:
+    """Canonical compact text of a leader result."""
+    return _dumps_canonical(_retag(value, RESULT_TAGS))
+
+
+def _decode_result(text) -> dict:
+    """Inverse of _encode_result; ValueError unless `text` is exactly a canonical encoding."""
+    if not isinstance(text, str):
+        raise ValueError("result is not canonical text")
+
+    def no_floats(literal):
+        raise ValueError(f"result is not canonical: float {literal}")
+
+    packed = json.loads(text, parse_float=no_floats, parse_constant=no_floats)
+    # Duplicate keys, spaces and key order all change the re-encoded text
+    if _dumps_canonical(packed) != text:
+        raise ValueError("result is not canonical")
+    return _retag(packed, _RESULT_NAMES)
 
 
 # Event removed - not needed for persistence and causes deployment errors
@@ -31,33 +145,43 @@ class OracleConsumer(gl.Contract):
     # Fields declared only in __init__ are NOT persistent and will be discarded!
     # Note: Use bigint or sized integers (u256, i32, etc.) - plain 'int' is not allowed!
     # Using str for news_count to avoid bigint import (convert to int when reading)
-    last_eth_price: float
+    last_eth_price: u64  # fixed-point, PRICE_SCALE
     last_eth_source: str
-    last_weather_temperature: float
+    last_weather_temperature: i64  # fixed-point, PRICE_SCALE
     last_weather_condition: str
     last_weather_city: str
     last_news_count: str  # Store as string (news count is small, string is safe)
+    # Change detection: a price / temperature within its epsilon of the stored value is not rewritten
+    price_epsilon: u64  # fixed-point USD, PRICE_SCALE
+    temperature_epsilon: u64  # fixed-point °C, PRICE_SCALE
+    skipped_writes: str  # Store as string (same reason as last_news_count)
+    owner: Address  # deployer; the only caller allowed to change settings
     
     def __init__(self):
         # Initialize state variables with defaults
-        self.last_eth_price = 0.0
+        self.last_eth_price = 0
         self.last_eth_source = ""
         # Store weather fields separately for proper persistence
-        self.last_weather_temperature = 0.0
+        self.last_weather_temperature = 0
         self.last_weather_condition = ""
         self.last_weather_city = ""
         self.last_news_count = "0"  # Initialize as string
+        self.price_epsilon = 0
+        self.temperature_epsilon = 0
+        self.skipped_writes = "0"
+        self.owner = gl.message.sender_address
 
     @gl.public.view
     def debug_state(self) -> dict:
         """Debug method to check if state is persisted"""
         return {
             "has_price": hasattr(self, 'last_eth_price'),
-            "price_value": str(getattr(self, 'last_eth_price', 'NOT_SET')),
+            "price_value": _format_fixed(self.last_eth_price) if hasattr(self, 'last_eth_price') else 'NOT_SET',
             "has_source": hasattr(self, 'last_eth_source'),
             "source_value": getattr(self, 'last_eth_source', 'NOT_SET'),
             "has_temp": hasattr(self, 'last_weather_temperature'),
-            "temp_value": str(getattr(self, 'last_weather_temperature', 'NOT_SET')),
+            "temp_value": _format_fixed(self.last_weather_temperature) if hasattr(self, 'last_weather_temperature') else 'NOT_SET',
+            "skipped_writes": str(getattr(self, 'skipped_writes', 'NOT_SET')),
             "contract_address": str(self.address) if hasattr(self, 'address') else 'NO_ADDRESS',
         }
     
@@ -65,11 +189,11 @@ class OracleConsumer(gl.Contract):
     def get_status(self) -> dict:
         # Safe initialization if attributes don't exist (shouldn't happen if __init__ ran)
         if not hasattr(self, 'last_eth_price'):
-            self.last_eth_price = 0.0
+            self.last_eth_price = 0
         if not hasattr(self, 'last_eth_source'):
             self.last_eth_source = ""
         if not hasattr(self, 'last_weather_temperature'):
-            self.last_weather_temperature = 0.0
+            self.last_weather_temperature = 0
         if not hasattr(self, 'last_weather_condition'):
             self.last_weather_condition = ""
         if not hasattr(self, 'last_weather_city'):
@@ -77,20 +201,52 @@ class OracleConsumer(gl.Contract):
         if not hasattr(self, 'last_news_count'):
             self.last_news_count = "0"
         
-        # Convert floats to strings for calldata encoding
+        # Convert floats to strings for calldata encoding; the price is
+        # formatted from its fixed-point value, which is also returned as is
         return {
             "price": {
-                "eth_usd": str(self.last_eth_price),
+                "eth_usd": _format_fixed(self.last_eth_price),
+                "eth_usd_e8": self.last_eth_price,
                 "source": self.last_eth_source,
             },
             "weather": {
-                "temperature": str(self.last_weather_temperature),
+                "temperature": _format_fixed(self.last_weather_temperature),
                 "condition": self.last_weather_condition,
                 "city": self.last_weather_city,
             },
             "news": {"count": int(self.last_news_count)},  # Convert string to int for return
         }
 
+    @gl.public.view
+    def get_update_stats(self) -> dict:
+        """Change-detection settings and the number of storage writes skipped so far."""
+        return {
+            "price_epsilon": _format_fixed(getattr(self, 'price_epsilon', 0)),
+            "temperature_epsilon": _format_fixed(getattr(self, 'temperature_epsilon', 0)),
+            "skipped_writes": int(getattr(self, 'skipped_writes', "0")),
+        }
+
+    @gl.public.write
+    def set_update_epsilon(self, price_epsilon: str, temperature_epsilon: str) -> None:
+        """
+        Set the tolerances used by update_all change detection (owner only).
+
+        A price (USD) or temperature (°C) that differs from the stored value
+        by no more than its epsilon is left untouched. String fields are only
+        rewritten when they actually change. Both are decimal strings ("0.5"),
+        kept at PRICE_SCALE so comparisons are exact, and capped at
+        MAX_PRICE_EPSILON / MAX_TEMPERATURE_EPSILON so the oracle cannot be
+        frozen on old values.
+        """
+        if gl.message.sender_address != getattr(self, 'owner', None):
+            raise gl.vm.UserError("only the owner can change the update epsilon")
+        price_eps = _parse_epsilon("price", price_epsilon, MAX_PRICE_EPSILON)
+        temperature_eps = _parse_epsilon("temperature", temperature_epsilon, MAX_TEMPERATURE_EPSILON)
+        self.price_epsilon = price_eps
+        _ = self.price_epsilon
+        self.temperature_epsilon = temperature_eps
+        _ = self.temperature_epsilon
+
     @gl.public.write
     def update_all(self, city: str = "Hanoi", lat: str = "21.0245", lon: str = "105.8412", news_limit: int = 3) -> None:
         # parse coordinates from strings to floats inside the method
@@ -101,6 +257,11 @@ class OracleConsumer(gl.Contract):
             raise gl.vm.UserError(f"invalid coordinates: lat={lat}, lon={lon}")
         
         def leader():
+            deadline = time.monotonic() + LEADER_DEADLINE_SECONDS
+
+            def _expired() -> bool:
+                return time.monotonic() >= deadline
+
             def _ensure_body_bytes(resp, name: str):
                 if resp.body is None:
                     raise gl.vm.UserError(f"{name} empty body")
@@ -109,18 +270,21 @@ class OracleConsumer(gl.Contract):
                 except Exception:
                     raise gl.vm.UserError(f"{name} body decode error")
 
-            def _json(resp, name: str):
+            def _json(resp, name: str, parse_float=None):
                 text = _ensure_body_bytes(resp, name)
                 try:
-                    return json.loads(text)
+                    return json.loads(text, parse_float=parse_float)
                 except Exception:
                     raise gl.vm.UserError(f"{name} json parse error")
 
-            def _to_float(name: str, val):
+            def _to_fixed(name: str, val):
+                # Decimal text as sent (JSON ints allowed), never via float
+                if isinstance(val, bool):
+                    raise gl.vm.UserError(f"{name} parse fixed-point error")
                 try:
-                    return float(val)
+                    return _parse_fixed(str(val))
                 except Exception:
-                    raise gl.vm.UserError(f"{name} parse float error")
+                    raise gl.vm.UserError(f"{name} parse fixed-point error")
             
             try:
                 # Price from multiple sources with fallback
@@ -137,6 +301,8 @@ class OracleConsumer(gl.Contract):
                 
                 # Try Binance mirrors first
                 for host in binance_hosts:
+                    if _expired():
+                        break
                     try:
                         resp = gl.nondet.web.get(
                             f"{host}/api/v3/ticker/price?symbol=ETHUSDT",
@@ -146,28 +312,30 @@ class OracleConsumer(gl.Contract):
                             data = _json(resp, f"binance-{host}")
                             price_str = (data.get("price") if isinstance(data, dict) else None)
                             if price_str is not None:
-                                price = _to_float("binance price", price_str)
+                                price = _to_fixed("binance price", price_str)
                                 price_source = "binance"
                                 break
+                        elif resp and hasattr(resp, 'status') and 400 <= resp.status < 500 and resp.status not in (418, 429):
+                            break  # client error: every mirror would answer the same
                     except gl.vm.UserError:
                         continue  # try next mirror on UserError
                     except Exception:
                         continue  # try next mirror on any other error
                 
                 # Fallback to Coingecko if all Binance mirrors fail
-                if price is None:
+                if price is None and not _expired():
                     try:
                         coingecko = gl.nondet.web.get(
                             "https://api.coingecko.com/api/v3/simple/price?ids=ethereum&vs_currencies=usd",
                             headers={"User-Agent": "GenLayerOracle/1.0"},
                         )
                         if coingecko and hasattr(coingecko, 'status') and coingecko.status == 200:
-                            data = _json(coingecko, "coingecko")
+                            data = _json(coingecko, "coingecko", parse_float=str)
                             eth_data = data.get("ethereum") if isinstance(data, dict) else None
                             if eth_data and isinstance(eth_data, dict):
                                 usd_val = eth_data.get("usd")
                                 if usd_val is not None:
-                                    price = _to_float("coingecko price", usd_val)
+                                    price = _to_fixed("coingecko price", usd_val)
                                     price_source = "coingecko"
                     except Exception:
                         pass  # fallback silently
@@ -176,6 +344,8 @@ class OracleConsumer(gl.Contract):
                     raise gl.vm.UserError("all price sources failed")
 
                 # Weather from Open-Meteo
+                if _expired():
+                    raise gl.vm.UserError("leader deadline exceeded before weather fetch")
                 try:
                     meteo = gl.nondet.web.get(
                         f"https://api.open-meteo.com/v1/forecast?latitude={_lat}&longitude={_lon}&current_weather=true",
@@ -183,9 +353,9 @@ class OracleConsumer(gl.Contract):
                     )
                     if not meteo or not hasattr(meteo, 'status') or meteo.status != 200:
                         raise gl.vm.UserError(f"open-meteo http {getattr(meteo, 'status', 'unknown')}")
-                    meteo_json = _json(meteo, "open-meteo")
+                    meteo_json = _json(meteo, "open-meteo", parse_float=str)
                     cw = meteo_json.get("current_weather") or {}
-                    temperature = _to_float("open-meteo temperature", cw.get("temperature", 0.0))
+                    temperature = _to_fixed("open-meteo temperature", cw.get("temperature", "0"))
                     condition = str(cw.get("weathercode", "Unknown"))
                 except gl.vm.UserError:
                     raise  # Re-raise UserError
@@ -196,34 +366,37 @@ class OracleConsumer(gl.Contract):
                 news_count = 0
                 reddit_ok = False
                 
-                try:
-                    reddit = gl.nondet.web.get(
-                        f"https://www.reddit.com/r/CryptoCurrency/hot.json?limit={news_limit}&raw_json=1",
-                        headers={
-                            "User-Agent": (
-                                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                                "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 GenLayerOracle/1.0"
-                            )
-                        },
-                    )
-                    if reddit and hasattr(reddit, 'status'):
-                        if reddit.status == 200:
-                            reddit_json = _json(reddit, "reddit")
-                            posts = (reddit_json.get("data", {}) or {}).get("children", [])
-                            if isinstance(posts, list):
-                                news_count = int(len(posts))
+                if _expired():
+                    reddit_ok = True  # out of time: keep news_count = 0
+                else:
+                    try:
+                        reddit = gl.nondet.web.get(
+                            f"https://www.reddit.com/r/CryptoCurrency/hot.json?limit={news_limit}&raw_json=1",
+                            headers={
+                                "User-Agent": (
+                                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                                    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 GenLayerOracle/1.0"
+                                )
+                            },
+                        )
+                        if reddit and hasattr(reddit, 'status'):
+                            if reddit.status == 200:
+                                reddit_json = _json(reddit, "reddit")
+                                posts = (reddit_json.get("data", {}) or {}).get("children", [])
+                                if isinstance(posts, list):
+                                    news_count = int(len(posts))
+                                    reddit_ok = True
+                            elif reddit.status == 403:
+                                # Rate limited or geo-restricted; fallback to zero silently
+                                news_count = 0
                                 reddit_ok = True
-                        elif reddit.status == 403:
-                            # Rate limited or geo-restricted; fallback to zero silently
-                            news_count = 0
-                            reddit_ok = True
-                except Exception:
-                    # Any error: fallback to zero instead of rollback
-                    news_count = 0
-                    reddit_ok = True
+                    except Exception:
+                        # Any error: fallback to zero instead of rollback
+                        news_count = 0
+                        reddit_ok = True
                 
                 # If Reddit completely failed, try RSS fallback (CoinDesk RSS)
-                if not reddit_ok:
+                if not reddit_ok and not _expired():
                     try:
                         rss = gl.nondet.web.get(
                             "https://www.coindesk.com/arc/outboundfeeds/rss/",
@@ -237,11 +410,11 @@ class OracleConsumer(gl.Contract):
                     except Exception:
                         pass  # final fallback: keep news_count = 0
 
-                return {
-                    "price": {"value": str(price), "source": price_source},
-                    "weather": {"temperature": str(temperature), "condition": condition, "city": city},
+                return _encode_result({
+                    "price": {"value": price, "source": price_source},
+                    "weather": {"temperature": temperature, "condition": condition, "city": city},
                     "news": {"count": news_count},
-                }
+                })
             except gl.vm.UserError:
                 raise  # Re-raise UserError
             except gl.vm.VMError as e:
@@ -250,9 +423,10 @@ class OracleConsumer(gl.Contract):
                 raise gl.vm.UserError(f"leader error: {str(e)}")
 
         def validator(result):
-            # result is gl.vm.Return on success; unpack and verify
+            # result is gl.vm.Return on success; unpack, decode (which rejects
+            # anything non-canonical) and check the integer fields
             try:
-                unpacked = gl.vm.unpack_result(result)
+                unpacked = _decode_result(gl.vm.unpack_result(result))
                 if not isinstance(unpacked, dict):
                     return False
                 
@@ -261,30 +435,23 @@ class OracleConsumer(gl.Contract):
                 if not isinstance(price_obj, dict):
                     return False
                 p_val = price_obj.get("value")
-                try:
-                    p = float(p_val)
-                    if p <= 0:
-                        return False
-                except Exception:
+                if not isinstance(p_val, int) or isinstance(p_val, bool) or p_val <= 0:
                     return False
                 
                 weather_obj = unpacked.get("weather")
                 if not isinstance(weather_obj, dict):
                     return False
-                try:
-                    _ = float(weather_obj.get("temperature", 0))
-                    _ = str(weather_obj.get("condition", ""))
-                except Exception:
+                t_val = weather_obj.get("temperature")
+                if not isinstance(t_val, int) or isinstance(t_val, bool):
+                    return False
+                if not isinstance(weather_obj.get("condition", ""), str):
                     return False
                 
                 news_obj = unpacked.get("news")
                 if not isinstance(news_obj, dict):
                     return False
-                try:
-                    n = int(news_obj.get("count", 0))
-                    if n < 0:
-                        return False
-                except Exception:
+                n = news_obj.get("count", 0)
+                if not isinstance(n, int) or isinstance(n, bool) or n < 0:
                     return False
                 
                 return True
@@ -302,6 +469,10 @@ class OracleConsumer(gl.Contract):
                 raise gl.vm.UserError(f"run_nondet error: {str(e)}")
             
             # Safe unpacking and assignment
+            try:
+                data = _decode_result(data)
+            except (ValueError, TypeError):
+                raise gl.vm.UserError("invalid result format")
             if not isinstance(data, dict):
                 raise gl.vm.UserError("invalid result format")
             
@@ -318,50 +489,76 @@ class OracleConsumer(gl.Contract):
                 raise gl.vm.UserError("invalid news format")
             
             # Parse and assign with safe defaults
-            # Note: values come as strings from leader() return
+            # Note: numbers come as fixed-point ints from leader() return
+            # Change detection: compare with the stored state and only write fields
+            # that moved; every skipped field saves one storage write.
+            price_epsilon = int(getattr(self, 'price_epsilon', 0))
+            temperature_epsilon = int(getattr(self, 'temperature_epsilon', 0))
+            skipped = 0
+
             price_val = price_obj.get("value")
             if price_val is None:
                 raise gl.vm.UserError("missing price value")
-            # Parse string to float and assign - ensure persistence
-            try:
-                price_float = float(str(price_val))
-                self.last_eth_price = price_float
+            # Fixed-point int from the leader: compared and stored exactly
+            if not isinstance(price_val, int) or isinstance(price_val, bool) or price_val <= 0:
+                raise gl.vm.UserError(f"invalid price value: {price_val}")
+            if abs(price_val - self.last_eth_price) > price_epsilon:
+                self.last_eth_price = price_val
                 # Force storage write by reassigning
                 _ = self.last_eth_price
-            except (ValueError, TypeError):
-                raise gl.vm.UserError(f"invalid price value: {price_val}")
+            else:
+                skipped += 1
             
             source_str = str(price_obj.get("source", "unknown"))
-            self.last_eth_source = source_str
-            _ = self.last_eth_source
+            if source_str != self.last_eth_source:
+                self.last_eth_source = source_str
+                _ = self.last_eth_source
+            else:
+                skipped += 1
             
             temp_val = weather_obj.get("temperature")
             if temp_val is None:
                 raise gl.vm.UserError("missing temperature")
-            # Parse string to float
-            try:
-                temp_float = float(str(temp_val))
-                self.last_weather_temperature = temp_float
-                _ = self.last_weather_temperature
-            except (ValueError, TypeError):
+            if not isinstance(temp_val, int) or isinstance(temp_val, bool):
                 raise gl.vm.UserError(f"invalid temperature value: {temp_val}")
+            if abs(temp_val - self.last_weather_temperature) > temperature_epsilon:
+                self.last_weather_temperature = temp_val
+                _ = self.last_weather_temperature
+            else:
+                skipped += 1
             
-            self.last_weather_condition = str(weather_obj.get("condition", "Unknown"))
-            _ = self.last_weather_condition
+            condition_str = str(weather_obj.get("condition", "Unknown"))
+            if condition_str != self.last_weather_condition:
+                self.last_weather_condition = condition_str
+                _ = self.last_weather_condition
+            else:
+                skipped += 1
             
-            self.last_weather_city = str(weather_obj.get("city", city))
-            _ = self.last_weather_city
+            city_str = str(weather_obj.get("city", city))
+            if city_str != self.last_weather_city:
+                self.last_weather_city = city_str
+                _ = self.last_weather_city
+            else:
+                skipped += 1
             
             news_count_val = news_obj.get("count")
             if news_count_val is None:
                 raise gl.vm.UserError("missing news count")
             try:
                 news_int = int(news_count_val)
-                # Store as string to avoid bigint type issues
-                self.last_news_count = str(news_int)
-                _ = self.last_news_count
             except (ValueError, TypeError):
                 raise gl.vm.UserError(f"invalid news count: {news_count_val}")
+            # Store as string to avoid bigint type issues
+            news_str = str(news_int)
+            if news_str != self.last_news_count:
+                self.last_news_count = news_str
+                _ = self.last_news_count
+            else:
+                skipped += 1
+            
+            if skipped > 0:
+                self.skipped_writes = str(int(getattr(self, 'skipped_writes', "0")) + skipped)
+                _ = self.skipped_writes
             
             # Event emission removed - not needed for state persistence
             # State is persisted via field assignments above
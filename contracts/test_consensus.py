@@ -0,0 +1,120 @@
+"""
+Tests for genvm_local's ConsensusSimulator, driving ProxyOracle.update_price
+with seeded node profiles. Validators re-run the leader on their own
+network (rerun_leader=True), so per-node requests and failures show up.
+
+    python -m pytest -q contracts/test_consensus.py
+"""
+import os
+
+import pytest
+
+import genvm_local
+from genvm_local import ConsensusSimulator, NodeProfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROXY = os.path.join(HERE, "api-key-patterns", "off_chain_proxy_oracle.py")
+PROXY_URL = "https://proxy.local/api"
+
+
+@pytest.fixture
+def simulate(transport):
+    """simulate(validators, runs=..., **simulator_kwargs) -> (report, simulator)."""
+    simulators = []
+
+    def simulate(validators, runs=1, **kwargs):
+        runtime = genvm_local.install(genvm_local.Runtime(transport))
+        oracle = genvm_local.deploy(genvm_local.find_contract_class(genvm_local.load_contract(PROXY)))
+        genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+        kwargs.setdefault("rerun_leader", True)
+        simulator = ConsensusSimulator(runtime, validators, **kwargs)
+        simulators.append(simulator)
+        return simulator.simulate(lambda: genvm_local.call(oracle, "update_price"), runs=runs), simulator
+
+    yield simulate
+    for simulator in simulators:
+        simulator.close()
+    genvm_local.uninstall()
+
+
+def votes(report):
+    return [call.votes for call in report.calls]
+
+
+def test_honest_nodes_accept_every_run(simulate):
+    report, _ = simulate([NodeProfile(f"v{i}") for i in range(3)], runs=4)
+    assert votes(report) == [[True, True, True]] * 4
+    assert report.acceptance_rate == 1.0
+    assert report.errors == []
+    assert report.to_dict()["nodes"]["leader"]["yes_votes"] == 4
+
+
+def test_reject_rate_turns_into_no_votes(simulate):
+    validators = [NodeProfile("v0"), NodeProfile("strict", reject_rate=1.0), NodeProfile("v2")]
+    report, _ = simulate(validators, runs=3)
+    assert votes(report) == [[True, False, True]] * 3
+    assert report.acceptance_rate == 1.0  # 2 of 3 still agree
+    nodes = report.to_dict()["nodes"]
+    assert (nodes["strict"]["yes_votes"], nodes["v0"]["yes_votes"]) == (0, 3)
+
+
+def test_fail_match_turns_into_no_votes_and_network_errors(simulate):
+    validators = [NodeProfile("v0"), NodeProfile("cut-off", fail_match="/price/"), NodeProfile("v2")]
+    report, _ = simulate(validators, runs=3)
+    assert votes(report) == [[True, False, True]] * 3
+    nodes = report.to_dict()["nodes"]
+    assert (nodes["cut-off"]["requests"], nodes["cut-off"]["network_errors"]) == (3, 3)
+    assert (nodes["v0"]["requests"], nodes["v0"]["network_errors"]) == (3, 0)
+    assert (nodes["leader"]["requests"], nodes["leader"]["network_errors"]) == (3, 0)
+
+
+def test_majority_rejection_fails_the_call(simulate):
+    validators = [NodeProfile("v0"), NodeProfile("v1", reject_rate=1.0), NodeProfile("v2", fail_match="/price/")]
+    report, _ = simulate(validators, runs=2)
+    assert report.acceptance_rate == 0.0
+    assert len(report.errors) == 2
+    assert "validators rejected the leader result (1/3 agreed)" in report.errors[0]
+
+
+def test_acceptance_rate_counts_majority_votes(simulate):
+    validators = [NodeProfile("v0", reject_rate=0.5), NodeProfile("v1", reject_rate=0.5), NodeProfile("v2")]
+    report, _ = simulate(validators, runs=20, seed=7)
+    accepted = sum(1 for call_votes in votes(report) if sum(call_votes) >= 2)
+    assert 0 < accepted < 20
+    assert report.acceptance_rate == accepted / 20
+    assert report.to_dict()["acceptance_rate"] == round(accepted / 20, 4)
+    assert len(report.errors) == 20 - accepted
+
+
+def test_requests_are_counted_per_node(simulate):
+    validators = [NodeProfile("v0"), NodeProfile("v1")]
+    report, simulator = simulate(validators, runs=5, rerun_leader=False)
+    nodes = report.to_dict()["nodes"]
+    assert (nodes["leader"]["requests"], nodes["v0"]["requests"], nodes["v1"]["requests"]) == (5, 0, 0)
+    assert simulator.leader_transport.requests == [f"{PROXY_URL}/price/ETH"] * 5
+    assert [call.validator_requests for call in report.calls] == [[0, 0]] * 5
+
+
+def test_concurrent_and_sequential_runs_vote_the_same_for_a_seed(simulate):
+    def profiles():
+        return [NodeProfile("v0", error_rate=0.3), NodeProfile("v1", reject_rate=0.4),
+                NodeProfile("v2", error_rate=0.2, reject_rate=0.2)]
+
+    concurrent, _ = simulate(profiles(), runs=15, seed=42, concurrent=True)
+    sequential, _ = simulate(profiles(), runs=15, seed=42, concurrent=False)
+    other_seed, _ = simulate(profiles(), runs=15, seed=43, concurrent=True)
+    assert votes(concurrent) == votes(sequential)
+    assert votes(concurrent) != votes(other_seed)
+    for name in ("v0", "v1", "v2"):
+        a, b = concurrent.to_dict()["nodes"][name], sequential.to_dict()["nodes"][name]
+        assert (a["requests"], a["network_errors"], a["yes_votes"]) == \
+            (b["requests"], b["network_errors"], b["yes_votes"])
+    assert concurrent.errors == sequential.errors
+
+
+def test_simulator_rejects_bad_node_sets(transport):
+    runtime = genvm_local.Runtime(transport)
+    with pytest.raises(ValueError, match="at least one validator"):
+        ConsensusSimulator(runtime, [])
+    with pytest.raises(ValueError, match="unique"):
+        ConsensusSimulator(runtime, [NodeProfile("v0"), NodeProfile("v0")])
@@ -0,0 +1,740 @@
+"""
+Tests for the oracle contracts' leader/validator pairs.
+
+Each contract is deployed under the genvm_local stub (see conftest.py) and
+its write methods are called end to end: the leader fetches from the fake
+upstreams, the validator votes on the leader's result and the method stores
+it. Validators are also fed hand-made results to check what they reject.
+
+    python -m pytest -q contracts
+"""
+import base64
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+import genvm_local
+
+UserError = genvm_local.stub.UserError
+Return = genvm_local.stub.Return
+
+ORACLE = "oracle_consumer.py"
+ENCRYPTED = "api-key-patterns/encrypted_onchain_oracle.py"
+ROTATING = "api-key-patterns/key_rotation_oracle.py"
+PROXY = "api-key-patterns/off_chain_proxy_oracle.py"
+
+BINANCE = "binance.com/api/v3/ticker/price"
+COINGECKO = "api.coingecko.com/api/v3/simple/price"
+PROXY_URL = "https://proxy.local/api"
+
+
+def encrypt(key: str) -> str:
+    return base64.b64encode(key.encode()).decode()
+
+
+def encoded(contract, result) -> str:
+    """`result` in the contract's canonical leader-result encoding."""
+    return sys.modules[type(contract).__module__]._encode_result(result)
+
+
+def coingecko_eth(transport, usd=3000.5, api_keys=None):
+    """Coingecko route answering for `ethereum` only; 401 for keys not in api_keys."""
+    def handler(url, headers):
+        if api_keys is not None and (headers or {}).get("X-CG-Pro-API-Key") not in api_keys:
+            return genvm_local.FakeResponse(401, b'{"error":"invalid api key"}')
+        return genvm_local.FakeResponse(200, ('{"ethereum":{"usd":%s}}' % usd).encode())
+    return transport.add(COINGECKO, handler=handler)
+
+
+# ----------------------------------------------------------------------
+# OracleConsumer
+# ----------------------------------------------------------------------
+
+def test_update_all_stores_price_weather_and_news(deploy, runtime, transport):
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "update_all")
+    assert genvm_local.call(oracle, "get_status") == {
+        "price": {"eth_usd": "3000.12", "eth_usd_e8": 300012000000, "source": "binance"},
+        "weather": {"temperature": "28.4", "condition": "3", "city": "Hanoi"},
+        "news": {"count": 3},
+    }
+    call = runtime.calls[0]
+    assert call.leader_result.calldata == (
+        '{"n":{"k":3},"p":{"s":"binance","v":300012000000},"w":{"c":"3","t":2840000000,"y":"Hanoi"}}')
+    assert call.votes == [True]
+    assert call.leader_requests == 3
+    assert call.validator_requests == [0]
+
+
+def test_update_all_falls_back_across_mirrors_and_to_coingecko(deploy, transport):
+    transport.add(BINANCE, status=503)
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "update_all")
+    assert genvm_local.call(oracle, "get_status")["price"] == {
+        "eth_usd": "3000.5", "eth_usd_e8": 300050000000, "source": "coingecko"}
+    assert transport.count(BINANCE) == 6
+    assert transport.count("api.coingecko.com") == 1
+
+
+def test_update_all_client_error_skips_remaining_mirrors(deploy, transport):
+    transport.add(BINANCE, status=400)
+    genvm_local.call(deploy(ORACLE), "update_all")
+    assert transport.count(BINANCE) == 1
+
+
+def test_update_all_news_falls_back_to_rss(deploy, transport):
+    transport.add("reddit.com", status=500)
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "update_all")
+    assert genvm_local.call(oracle, "get_status")["news"] == {"count": 2}
+    assert transport.count("coindesk.com") == 1
+
+
+def test_update_all_weather_failure_rolls_back(deploy, transport):
+    transport.add("api.open-meteo.com", status=502)
+    oracle = deploy(ORACLE)
+    with pytest.raises(UserError, match="open-meteo http 502"):
+        genvm_local.call(oracle, "update_all")
+    assert genvm_local.storage_writes(oracle) == {
+        name: 1 for name in genvm_local.storage(oracle)
+    }
+
+
+def test_update_all_rejects_bad_coordinates(deploy, runtime):
+    with pytest.raises(UserError, match="invalid coordinates"):
+        genvm_local.call(deploy(ORACLE), "update_all", "Nowhere", "north", "0")
+    assert runtime.calls == []
+
+
+def test_update_all_skips_unchanged_fields(deploy):
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "update_all")
+    genvm_local.reset_storage_writes(oracle)
+    genvm_local.call(oracle, "update_all")
+    assert genvm_local.storage_writes(oracle) == {"skipped_writes": 1}
+    assert genvm_local.call(oracle, "get_update_stats") == {
+        "price_epsilon": "0.0", "temperature_epsilon": "0.0", "skipped_writes": 6,
+    }
+
+
+def test_update_all_epsilon_compares_fixed_point_prices_exactly(deploy, transport):
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "set_update_epsilon", "0.01", "0")
+    assert genvm_local.call(oracle, "get_update_stats")["price_epsilon"] == "0.01"
+    route = transport.add(BINANCE, json={"price": "3000.12000000"})
+    genvm_local.call(oracle, "update_all")
+    # Exactly epsilon away: unchanged; one unit of the last decimal more: written
+    route.body = b'{"price": "3000.13000000"}'
+    genvm_local.call(oracle, "update_all")
+    assert oracle.last_eth_price == 300012000000
+    route.body = b'{"price": "3000.13000001"}'
+    genvm_local.call(oracle, "update_all")
+    assert oracle.last_eth_price == 300013000001
+    with pytest.raises(UserError, match="invalid price epsilon"):
+        genvm_local.call(oracle, "set_update_epsilon", "0.1.2", "0")
+
+
+def test_update_all_price_and_temperature_epsilons_are_separate(deploy, transport):
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "set_update_epsilon", "0", "0.5")
+    genvm_local.call(oracle, "update_all")
+    transport.add(BINANCE, json={"price": "3000.13"})
+    transport.add("api.open-meteo.com", json={"current_weather": {"temperature": 28.8, "weathercode": 3}})
+    genvm_local.call(oracle, "update_all")
+    # A 0.01 USD move is written, a 0.4 °C move is not
+    assert oracle.last_eth_price == 300013000000
+    assert oracle.last_weather_temperature == 2840000000
+
+
+def test_set_update_epsilon_is_owner_only_and_bounded(deploy, runtime):
+    oracle = deploy(ORACLE)
+    with runtime.as_sender("0x" + "bb" * 20):
+        with pytest.raises(UserError, match="only the owner"):
+            genvm_local.call(oracle, "set_update_epsilon", "0", "0")
+    for price, temperature, message in (("100.00000001", "0", "price epsilon must be <= 100.0"),
+                                        ("0", "5.1", "temperature epsilon must be <= 5.0"),
+                                        ("-1", "0", "price epsilon must be >= 0")):
+        with pytest.raises(UserError, match=message):
+            genvm_local.call(oracle, "set_update_epsilon", price, temperature)
+    assert oracle.price_epsilon == 0 and oracle.temperature_epsilon == 0
+    genvm_local.call(oracle, "set_update_epsilon", "100", "5")
+    assert oracle.price_epsilon == 100 * 10 ** 8
+
+
+def test_update_all_deadline_skips_remaining_sources(deploy, transport, monkeypatch):
+    oracle = deploy(ORACLE)
+    monkeypatch.setattr(sys.modules[type(oracle).__module__], "LEADER_DEADLINE_SECONDS", 0.0)
+    with pytest.raises(UserError, match="all price sources failed"):
+        genvm_local.call(oracle, "update_all")
+    assert transport.requests == []
+
+
+def test_oracle_consumer_validator(deploy, validators):
+    oracle = deploy(ORACLE)
+    genvm_local.call(oracle, "update_all")
+    validator = validators[0]
+    good = {
+        "price": {"value": 300012000000, "source": "binance"},
+        "weather": {"temperature": 2840000000, "condition": "3", "city": "Hanoi"},
+        "news": {"count": 3},
+    }
+    assert validator(Return(encoded(oracle, good)))
+    # Only the exact canonical text is accepted
+    text = encoded(oracle, good)
+    for bad in (good, text.replace(",", ", "), text.replace('"v":300012000000', '"v":3000.12'),
+                text[:-1] + ',"n":{"k":3}}'):
+        assert not validator(Return(bad)), bad
+    bad_results = [
+        None,
+        [],
+        dict(good, price={"value": 0, "source": "binance"}),
+        dict(good, price={"value": "3000.12", "source": "binance"}),
+        dict(good, price={"value": True, "source": "binance"}),
+        dict(good, price="3000"),
+        dict(good, weather={"temperature": "28.4"}),
+        dict(good, weather=None),
+        dict(good, news={"count": -1}),
+        dict(good, news={"count": "many"}),
+    ]
+    for bad in bad_results:
+        assert not validator(Return(encoded(oracle, bad))), bad
+    assert not validator(UserError("leader failed"))
+
+
+# ----------------------------------------------------------------------
+# EncryptedKeyOracle
+# ----------------------------------------------------------------------
+
+def test_encrypted_key_oracle_uses_decrypted_key(deploy, runtime, transport):
+    coingecko_eth(transport, api_keys={"cg-secret"})
+    oracle = deploy(ENCRYPTED)
+    genvm_local.call(oracle, "set_api_key", encrypt("cg-secret"))
+    genvm_local.call(oracle, "update_price", "ETH")
+    assert genvm_local.call(oracle, "get_price") == {
+        "price": "3000.5", "price_e8": 300050000000, "source": "coingecko-pro", "has_api_key": True,
+        "key_version": ""}
+    assert runtime.calls[0].votes == [True]
+    assert transport.requests == ["https://api.coingecko.com/api/v3/simple/price?ids=ethereum&vs_currencies=usd"]
+
+
+def test_encrypted_key_oracle_errors(deploy, transport):
+    oracle = deploy(ENCRYPTED)
+    with pytest.raises(UserError, match="api key not set"):
+        genvm_local.call(oracle, "update_price")
+    with pytest.raises(UserError, match="cannot be empty"):
+        genvm_local.call(oracle, "set_api_key", "")
+
+    genvm_local.call(oracle, "set_api_key", "%%% not base64 %%%")
+    with pytest.raises(UserError, match="api key decrypt error"):
+        genvm_local.call(oracle, "update_price")
+
+    coingecko_eth(transport, api_keys={"right"})
+    genvm_local.call(oracle, "set_api_key", encrypt("wrong"))
+    with pytest.raises(UserError, match="api error 401"):
+        genvm_local.call(oracle, "update_price")
+    assert genvm_local.call(oracle, "get_price")["price"] == "0.0"
+
+
+def envelope(api_key: str, version: str, leader_key: bytes) -> str:
+    from cryptography.fernet import Fernet
+
+    data_key = Fernet.generate_key()
+    wrapped = Fernet(leader_key).encrypt(data_key).decode()
+    return f"env1:{version}:{wrapped}:{Fernet(data_key).encrypt(api_key.encode()).decode()}"
+
+
+def test_encrypted_key_oracle_envelope_rewrap(deploy, runtime, transport, monkeypatch):
+    fernet = pytest.importorskip("cryptography.fernet")
+    v1, v2 = fernet.Fernet.generate_key(), fernet.Fernet.generate_key()
+    coingecko_eth(transport, api_keys={"cg-secret"})
+    oracle = deploy(ENCRYPTED)
+    module = sys.modules[type(oracle).__module__]
+    monkeypatch.setattr(module, "LEADER_KEYRING", {"v1": v1.decode()})
+    stored = envelope("cg-secret", "v1", v1)
+    genvm_local.call(oracle, "set_api_key", stored)
+    genvm_local.call(oracle, "update_price")
+    assert genvm_local.call(oracle, "get_price")["key_version"] == "v1"
+
+    # Rotate the leader key: only the header changes, the payload is kept
+    _, _, wrapped, payload = stored.split(":")
+    data_key = fernet.Fernet(v1).decrypt(wrapped.encode())
+    header = "env1:v2:" + fernet.Fernet(v2).encrypt(data_key).decode()
+    genvm_local.call(oracle, "rewrap_api_key", header)
+    assert oracle.encrypted_api_key == f"{header}:{payload}"
+    assert genvm_local.call(oracle, "get_price")["key_version"] == "v2"
+
+    monkeypatch.setattr(module, "LEADER_KEYRING", {"v2": v2.decode()})
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[-1].votes == [True]
+    assert "cg-secret" not in repr(genvm_local.storage(oracle))
+
+
+def test_encrypted_key_oracle_envelope_errors(deploy, transport):
+    oracle = deploy(ENCRYPTED)
+    genvm_local.call(oracle, "set_api_key", encrypt("plain"))
+    with pytest.raises(UserError, match="not an envelope"):
+        genvm_local.call(oracle, "rewrap_api_key", "env1:v2:wrapped")
+    for bad in ("env1:v1:payload", "env1::wrapped:payload", "env1:v1:a:b:c"):
+        with pytest.raises(UserError, match="malformed envelope"):
+            genvm_local.call(oracle, "set_api_key", bad)
+
+    genvm_local.call(oracle, "set_api_key", "env1:v9:wrapped:payload")
+    for bad in ("env1:v2", "env2:v2:wrapped", "env1:v2:wrapped:extra"):
+        with pytest.raises(UserError, match="malformed envelope header"):
+            genvm_local.call(oracle, "rewrap_api_key", bad)
+    with pytest.raises(UserError, match="no leader key for version v9"):
+        genvm_local.call(oracle, "update_price")
+    assert transport.count() == 0
+
+
+def test_encrypted_key_oracle_bad_keyring_fails_only_the_update(deploy, transport, monkeypatch):
+    oracle = deploy(ENCRYPTED)
+    module = sys.modules[type(oracle).__module__]
+    monkeypatch.setenv(module.LEADER_KEYRING_ENV, "{not json")
+    monkeypatch.setattr(module, "LEADER_KEYRING", None)
+    genvm_local.call(oracle, "set_api_key", "env1:v1:wrapped:payload")
+    with pytest.raises(UserError, match="api key decrypt error: GENLAYER_ORACLE_KEYRING is not valid JSON"):
+        genvm_local.call(oracle, "update_price")
+    assert genvm_local.call(oracle, "get_price")["key_version"] == "v1"
+    monkeypatch.setenv(module.LEADER_KEYRING_ENV, '["v1"]')
+    with pytest.raises(UserError, match="must be a JSON object"):
+        genvm_local.call(oracle, "update_price")
+    assert transport.count() == 0
+
+
+@pytest.mark.parametrize("path", [ENCRYPTED, ROTATING])
+def test_inline_coingecko_ids_match_the_symbol_registry(deploy, path):
+    registry = os.path.join(os.path.dirname(__file__), "..", "packages", "genvm-web-fetcher", "symbols.json")
+    with open(registry, encoding="utf-8") as f:
+        expected = {symbol: entry["coingecko"] for symbol, entry in json.load(f)["symbols"].items()}
+    module = sys.modules[type(deploy(path)).__module__]
+    assert module.COINGECKO_IDS == expected
+    assert module._coingecko_id("eth") == "ethereum"
+    assert module._coingecko_id("Wrapped-Bitcoin") == "wrapped-bitcoin"
+
+
+def test_price_validators_reject_out_of_range(deploy, transport, validators):
+    coingecko_eth(transport)
+    encrypted = deploy(ENCRYPTED)
+    genvm_local.call(encrypted, "set_api_key", encrypt("k"))
+    genvm_local.call(encrypted, "update_price")
+    rotating = deploy(ROTATING)
+    genvm_local.call(rotating, "add_api_key", encrypt("k"))
+    genvm_local.call(rotating, "update_price")
+    proxy = deploy(PROXY)
+    genvm_local.call(proxy, "set_proxy_url", PROXY_URL)
+    genvm_local.call(proxy, "update_price")
+    assert len(validators) == 3
+    rotation = {"key_index": 0, "key_outcomes": [[0, "ok"]]}  # required by RotatingKeyOracle
+    for validator in validators:
+        assert validator(Return(dict(rotation, price=300050000000)))
+        assert validator(Return(dict(rotation, price=99999_99999999)))
+        for bad in ({"price": 0}, {"price": 100000_00000000}, {"price": "3000.5"}, {"price": 3000.5},
+                    {"price": True}, {}, "3000.5"):
+            assert not validator(Return(bad)), bad
+        assert not validator(UserError("leader failed"))
+
+
+def count_decrypts(monkeypatch, contract):
+    """Wrap the contract module's _decrypt_api_key; returns the call list."""
+    module = sys.modules[type(contract).__module__]
+    calls = []
+    decrypt = module._decrypt_api_key
+
+    def counting(encrypted_key):
+        calls.append(encrypted_key)
+        return decrypt(encrypted_key)
+
+    monkeypatch.setattr(module, "_decrypt_api_key", counting)
+    return calls
+
+
+@pytest.mark.parametrize("path, setter", [(ENCRYPTED, "set_api_key"), (ROTATING, "add_api_key")])
+def test_decrypted_keys_are_cached_by_ciphertext(deploy, runtime, transport, monkeypatch, path, setter):
+    coingecko_eth(transport)
+    oracle = deploy(path)
+    decrypts = count_decrypts(monkeypatch, oracle)
+    genvm_local.call(oracle, setter, encrypt("cg-secret"))
+    for _ in range(3):
+        genvm_local.call(oracle, "update_price")
+    assert len(decrypts) == 1
+
+    # Never persisted and never handed to validators
+    for call in runtime.calls:
+        assert "cg-secret" not in repr(call.leader_result)
+    assert "cg-secret" not in repr(genvm_local.storage(oracle))
+
+
+def test_decrypted_key_cache_ttl_and_new_ciphertext(deploy, transport, monkeypatch):
+    coingecko_eth(transport)
+    oracle = deploy(ENCRYPTED)
+    module = sys.modules[type(oracle).__module__]
+    decrypts = count_decrypts(monkeypatch, oracle)
+    genvm_local.call(oracle, "set_api_key", encrypt("a"))
+    genvm_local.call(oracle, "update_price")
+    genvm_local.call(oracle, "set_api_key", encrypt("b"))
+    genvm_local.call(oracle, "update_price")
+    assert decrypts == [encrypt("a"), encrypt("b")]
+
+    monkeypatch.setattr(module, "DECRYPTED_KEY_TTL_SECONDS", 0.0)
+    module._decrypted_keys.clear()
+    genvm_local.call(oracle, "update_price")
+    genvm_local.call(oracle, "update_price")
+    assert len(decrypts) == 4
+
+
+def test_decrypted_key_cache_is_bounded(deploy, monkeypatch):
+    oracle = deploy(ROTATING)
+    module = sys.modules[type(oracle).__module__]
+    monkeypatch.setattr(module, "DECRYPTED_KEY_CACHE_SIZE", 4)
+    for i in range(10):
+        assert module._cached_decrypt(encrypt(f"key-{i}")) == f"key-{i}"
+    assert len(module._decrypted_keys) == 4
+
+
+# ----------------------------------------------------------------------
+# RotatingKeyOracle
+# ----------------------------------------------------------------------
+
+def test_rotating_key_oracle_moves_to_working_key(deploy, runtime, transport):
+    coingecko_eth(transport, api_keys={"second"})
+    oracle = deploy(ROTATING)
+    for key in ("first", "second", "third"):
+        genvm_local.call(oracle, "add_api_key", encrypt(key))
+    genvm_local.call(oracle, "update_price", "ETH")
+    status = genvm_local.call(oracle, "get_key_status")
+    assert status["active_key_index"] == 1
+    assert status["success_counts"] == {"0": "0", "1": "1", "2": "0"}
+    assert status["failure_counts"] == {"0": "1", "1": "0", "2": "0"}
+    assert status["cooling_down"] == [0]
+    assert status["last_source"] == "coingecko-key-1"
+    assert runtime.calls[0].leader_requests == 2
+    assert runtime.calls[0].leader_result.calldata["key_outcomes"] == [[0, "auth"], [1, "ok"]]
+
+    # The active key is tried first next time
+    transport.reset()
+    genvm_local.call(oracle, "update_price", "ETH")
+    assert runtime.calls[1].leader_requests == 1
+
+
+def test_rotating_key_oracle_all_keys_failing(deploy, transport):
+    coingecko_eth(transport, api_keys=set())
+    oracle = deploy(ROTATING)
+    with pytest.raises(UserError, match="no api keys configured"):
+        genvm_local.call(oracle, "update_price")
+    genvm_local.call(oracle, "add_api_key", encrypt("a"))
+    genvm_local.call(oracle, "add_api_key", "%%%")
+    with pytest.raises(UserError, match="all 2 keys failed"):
+        genvm_local.call(oracle, "update_price")
+    assert transport.count() == 1
+
+
+def test_rotate_key_wraps_around(deploy):
+    oracle = deploy(ROTATING)
+    with pytest.raises(UserError, match="no keys available"):
+        genvm_local.call(oracle, "rotate_key")
+    genvm_local.call(oracle, "add_api_key", encrypt("a"))
+    genvm_local.call(oracle, "add_api_key", encrypt("b"))
+    genvm_local.call(oracle, "rotate_key")
+    genvm_local.call(oracle, "rotate_key")
+    assert genvm_local.call(oracle, "get_price")["active_key_index"] == 0
+
+
+def rotating_pool(deploy, keys):
+    oracle = deploy(ROTATING)
+    for key in keys:
+        genvm_local.call(oracle, "add_api_key", encrypt(key))
+    return oracle
+
+
+def test_rotating_key_oracle_skips_revoked_keys(deploy, runtime, transport):
+    # 12 keys, the first 4 revoked; the operator rotates back to key 0
+    # before every update, which used to cost 5 requests each time.
+    keys = [f"key-{i}" for i in range(12)]
+    coingecko_eth(transport, api_keys=set(keys[4:]))
+    oracle = rotating_pool(deploy, keys)
+    for _ in range(20):
+        while genvm_local.call(oracle, "get_price")["active_key_index"] != 0:
+            genvm_local.call(oracle, "rotate_key")
+        genvm_local.call(oracle, "update_price")
+    assert transport.count(COINGECKO) == 20 + 4
+    # Only MAX_KEY_FAILURES_PER_UPDATE (3) failures are applied per update;
+    # key 3 stays out of cooldown, but key 4 now ranks above it
+    assert genvm_local.call(oracle, "get_key_status")["cooling_down"] == [0, 1, 2]
+
+
+def test_rotating_key_oracle_prefers_healthy_keys(deploy, runtime, transport):
+    coingecko_eth(transport)
+    oracle = rotating_pool(deploy, ["a", "b", "c"])
+    # Plain errors (5xx, bad payloads) lower a key's weight without a cooldown
+    oracle.key_successes = [1, 0, 0]
+    oracle.key_failures = [3, 2, 0]
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[0].leader_result.calldata["key_outcomes"] == [[2, "ok"]]
+    assert genvm_local.call(oracle, "get_key_status")["active_key_index"] == 2
+
+
+def test_rotating_key_oracle_rate_limit_cooldown_expires(deploy, runtime, transport):
+    coingecko_eth(transport)
+    transport.add(COINGECKO, status=429, times=1)
+    oracle = rotating_pool(deploy, ["a", "b"])
+    module = sys.modules[type(oracle).__module__]
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[0].leader_result.calldata["key_outcomes"] == [[0, "rate_limited"], [1, "ok"]]
+
+    # Key 0 is skipped, even when it is made active again
+    for _ in range(module.KEY_RATE_LIMIT_COOLDOWN_UPDATES):
+        assert genvm_local.call(oracle, "get_key_status")["cooling_down"] == [0]
+        oracle.active_key_index = 0
+        genvm_local.call(oracle, "update_price")
+        assert runtime.calls[-1].leader_result.calldata["key_outcomes"] == [[1, "ok"]]
+    assert genvm_local.call(oracle, "get_key_status")["cooling_down"] == []
+
+
+def test_rotating_key_oracle_all_keys_cooling_down(deploy, runtime, transport):
+    coingecko_eth(transport)
+    oracle = rotating_pool(deploy, ["a", "b", "c"])
+    oracle.key_cooldown_until = [9, 3, 5]
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[0].leader_result.calldata["key_outcomes"] == [[1, "ok"]]
+
+
+def test_rotating_key_oracle_failed_update_records_nothing(deploy, transport):
+    transport.add(COINGECKO, status=429)
+    oracle = rotating_pool(deploy, ["a", "b"])
+    before = genvm_local.storage(oracle)
+    with pytest.raises(UserError, match="all 2 keys failed. last error: key 1 status 429"):
+        genvm_local.call(oracle, "update_price")
+    assert genvm_local.storage(oracle) == before
+
+
+def test_rotating_key_oracle_validator_checks_key_outcomes(deploy, transport, validators):
+    coingecko_eth(transport)
+    oracle = rotating_pool(deploy, ["a", "b"])
+    genvm_local.call(oracle, "update_price")
+    validator = validators[0]
+    assert validator(Return({"price": 300050000000, "key_index": 1, "key_outcomes": [[0, "auth"], [1, "ok"]]}))
+    assert validator(Return({"price": 300050000000, "key_index": 0, "key_outcomes": [[0, "ok"]]}))
+    # Outcomes must follow the validator's own key order, ending with the key that worked
+    for bad in ([[2, "ok"]], [[1, "ok"], [1, "ok"]], [[1, "revoked"]], [[1]], [(1, "ok")], {"1": "ok"},
+                [[0, "ok"], [1, "auth"]], [[1, "ok"]], [[1, "auth"], [0, "ok"]], [[0, "auth"], [1, "auth"]],
+                [[0, "auth"]], []):
+        assert not validator(Return({"price": 300050000000, "key_index": 1, "key_outcomes": bad})), bad
+
+
+def test_rotating_key_oracle_walks_keys_in_one_leader_run(deploy, runtime, transport):
+    # 8 keys, only the last accepted: every key is tried in turn within the
+    # one nondet block and reported, but only the first 3 failures are applied
+    keys = [f"key-{i}" for i in range(8)]
+    coingecko_eth(transport, api_keys={"key-7"})
+    oracle = rotating_pool(deploy, keys)
+    genvm_local.call(oracle, "update_price")
+    call = runtime.calls[0]
+    assert call.leader_requests == 8
+    assert call.leader_result.calldata["key_outcomes"] == [[i, "auth"] for i in range(7)] + [[7, "ok"]]
+
+    status = genvm_local.call(oracle, "get_key_status")
+    assert status["active_key_index"] == 7
+    assert status["cooling_down"] == [0, 1, 2]
+    assert status["failure_counts"] == {"0": "1", "1": "1", "2": "1", "3": "0", "4": "0", "5": "0",
+                                        "6": "0", "7": "0"}
+
+
+def fingerprint(key: str) -> str:
+    return hashlib.sha256(encrypt(key).encode()).hexdigest()[:16]
+
+
+def test_rotating_key_oracle_add_api_keys_batch(deploy):
+    oracle = deploy(ROTATING)
+    keys = [f"key-{i}" for i in range(200)]
+    genvm_local.call(oracle, "add_api_keys", [encrypt(key) for key in keys])
+    status = genvm_local.call(oracle, "get_key_status")
+    assert status["key_count"] == 200
+    assert status["fingerprints"]["7"] == fingerprint("key-7")
+
+    # All or nothing: a duplicate anywhere rejects the whole batch
+    for batch in ([encrypt("new"), encrypt("key-3")], [encrypt("new"), encrypt("new")], [encrypt("new"), ""]):
+        with pytest.raises(UserError):
+            genvm_local.call(oracle, "add_api_keys", batch)
+    with pytest.raises(UserError, match="already added"):
+        genvm_local.call(oracle, "add_api_key", encrypt("key-0"))
+    with pytest.raises(UserError, match="non-empty list"):
+        genvm_local.call(oracle, "add_api_keys", [])
+    assert genvm_local.call(oracle, "get_key_status")["key_count"] == 200
+
+
+def test_rotating_key_oracle_key_pool_is_owner_only(deploy, runtime):
+    oracle = rotating_pool(deploy, ["a"])
+    with runtime.as_sender("0x" + "bb" * 20):
+        for method, arg in (("add_api_key", encrypt("b")), ("add_api_keys", [encrypt("b")]),
+                            ("remove_api_key", fingerprint("a")), ("rotate_key", None)):
+            with pytest.raises(UserError, match="only the owner can manage api keys"):
+                genvm_local.call(oracle, method, *([] if arg is None else [arg]))
+    assert oracle.api_keys == [encrypt("a")]
+    genvm_local.call(oracle, "remove_api_key", fingerprint("a"))
+    assert genvm_local.call(oracle, "get_key_status")["key_count"] == 0
+
+
+def test_rotating_key_oracle_refuses_envelopes(deploy):
+    oracle = deploy(ROTATING)
+    with pytest.raises(UserError, match="envelope keys are not supported"):
+        genvm_local.call(oracle, "add_api_keys", [encrypt("a"), "env1:v1:wrapped:payload"])
+    assert oracle.api_keys == []
+
+
+def test_rotating_key_oracle_removed_keys_are_never_tried(deploy, runtime, transport):
+    coingecko_eth(transport, api_keys={"a", "b", "c", "d"})
+    oracle = rotating_pool(deploy, ["a", "b", "c", "d"])
+    genvm_local.call(oracle, "remove_api_key", fingerprint("a"))
+    with pytest.raises(UserError, match="unknown key fingerprint"):
+        genvm_local.call(oracle, "remove_api_key", fingerprint("a"))
+
+    status = genvm_local.call(oracle, "get_key_status")
+    assert status["key_count"] == 3
+    assert status["tombstones"] == 1
+    assert "0" not in status["fingerprints"] and "0" not in status["success_counts"]
+
+    # The active slot is the tombstone: the leader starts at the next live key
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[0].leader_result.calldata["key_outcomes"] == [[1, "ok"]]
+
+    # rotate_key skips tombstones too
+    genvm_local.call(oracle, "rotate_key")
+    genvm_local.call(oracle, "rotate_key")
+    genvm_local.call(oracle, "rotate_key")
+    assert genvm_local.call(oracle, "get_price")["active_key_index"] == 1
+
+
+def test_rotating_key_oracle_compaction(deploy, runtime, transport):
+    coingecko_eth(transport, api_keys={"d"})
+    oracle = rotating_pool(deploy, ["a", "b", "c", "d", "e"])
+    genvm_local.call(oracle, "update_price")
+    # a, b, c failed (cooling down) and d worked
+    genvm_local.call(oracle, "remove_api_key", fingerprint("b"))
+    genvm_local.call(oracle, "remove_api_key", fingerprint("c"))
+    assert genvm_local.call(oracle, "get_key_status")["tombstones"] == 2
+
+    # Third removal: 3 of 5 slots dead, the pool is compacted to [a, d]
+    genvm_local.call(oracle, "remove_api_key", fingerprint("e"))
+    assert oracle.api_keys == [encrypt("a"), encrypt("d")]
+    status = genvm_local.call(oracle, "get_key_status")
+    assert status["tombstones"] == 0
+    assert status["fingerprints"] == {"0": fingerprint("a"), "1": fingerprint("d")}
+    assert status["active_key_index"] == 1
+    assert status["success_counts"] == {"0": "0", "1": "1"}
+    assert status["failure_counts"] == {"0": "1", "1": "0"}
+    assert status["cooling_down"] == [0]
+
+    genvm_local.call(oracle, "update_price")
+    assert runtime.calls[-1].leader_result.calldata["key_outcomes"] == [[1, "ok"]]
+
+    # Removing everything leaves an empty pool
+    genvm_local.call(oracle, "remove_api_key", fingerprint("a"))
+    genvm_local.call(oracle, "remove_api_key", fingerprint("d"))
+    with pytest.raises(UserError, match="no api keys configured"):
+        genvm_local.call(oracle, "update_price")
+    with pytest.raises(UserError, match="no keys available"):
+        genvm_local.call(oracle, "rotate_key")
+    genvm_local.call(oracle, "add_api_key", encrypt("a"))
+    assert genvm_local.call(oracle, "get_key_status")["fingerprints"] == {"0": fingerprint("a")}
+
+
+def test_rotating_key_oracle_validator_rejects_removed_slots(deploy, transport, validators):
+    coingecko_eth(transport)
+    oracle = rotating_pool(deploy, ["a", "b", "c", "d"])
+    genvm_local.call(oracle, "update_price")
+    genvm_local.call(oracle, "remove_api_key", fingerprint("b"))
+    validator = validators[0]
+    # Key 0 worked last time, so the order is now 0, 2, 3
+    assert validator(Return({"price": 300050000000, "key_index": 2, "key_outcomes": [[0, "error"], [2, "ok"]]}))
+    assert not validator(Return({"price": 300050000000, "key_index": 1,
+                                 "key_outcomes": [[0, "error"], [1, "ok"]]}))
+
+
+# ----------------------------------------------------------------------
+# ProxyOracle
+# ----------------------------------------------------------------------
+
+def test_proxy_oracle_update_price(deploy, transport):
+    oracle = deploy(PROXY)
+    genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+    genvm_local.call(oracle, "update_price", "eth")
+    assert genvm_local.call(oracle, "get_price")["price"] == "3000.12"
+    assert transport.requests == [f"{PROXY_URL}/price/ETH"]
+
+
+def test_proxy_oracle_errors(deploy, transport):
+    oracle = deploy(PROXY)
+    genvm_local.call(oracle, "set_proxy_url", "")
+    with pytest.raises(UserError, match="proxy url not configured"):
+        genvm_local.call(oracle, "update_price")
+    genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+    transport.add("/api/price/", status=502, body="upstream down")
+    with pytest.raises(UserError, match="proxy error 502: upstream down"):
+        genvm_local.call(oracle, "update_price")
+
+
+def test_proxy_oracle_update_prices_in_one_request(deploy, runtime, transport):
+    oracle = deploy(PROXY)
+    # TreeMap fields start empty, as on GenVM; __init__ does not assign them
+    assert genvm_local.storage(oracle)["last_prices"] == genvm_local.storage(oracle)["last_price_sources"] == {}
+    assert "last_prices" not in genvm_local.storage_writes(oracle)
+    genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+    genvm_local.call(oracle, "update_prices", ["eth", "BTC", " eth "])
+    assert transport.requests == [f"{PROXY_URL}/prices?symbols=ETH,BTC"]
+    assert genvm_local.call(oracle, "get_prices")["prices"] == {
+        "ETH": {"price": "3000.12", "price_e8": 300012000000, "source": "coingecko-proxy"},
+        "BTC": {"price": "65000.0", "price_e8": 6500000000000, "source": "coingecko-proxy"},
+    }
+    assert len(runtime.calls) == 1
+
+
+def test_proxy_oracle_update_prices_validation(deploy, transport, validators):
+    oracle = deploy(PROXY)
+    genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+    with pytest.raises(UserError, match="no symbols given"):
+        genvm_local.call(oracle, "update_prices", [" ", ""])
+    with pytest.raises(UserError, match="at most 50 symbols"):
+        genvm_local.call(oracle, "update_prices", [f"S{i}" for i in range(51)])
+
+    genvm_local.call(oracle, "update_prices", ["ETH"])
+    validator = validators[0]
+    assert validator(Return(encoded(oracle, {"prices": {"ETH": {"price": 1}}})))
+    assert validator(Return('{"ps":{"ETH":{"p":1}}}'))
+    for bad in ({"prices": {}}, {"prices": {"BTC": {"price": 1}}}, {"prices": {"ETH": {"price": -1}}},
+                {"prices": {"ETH": {"price": "1"}}}, {"prices": {"ETH": "1"}}, {}):
+        assert not validator(Return(encoded(oracle, bad))), bad
+    for bad in ({"prices": {"ETH": {"price": 1}}}, '{"ps": {"ETH": {"p": 1}}}', '{"ps":{"ETH":{"p":1.0}}}'):
+        assert not validator(Return(bad)), bad
+
+    transport.add("/api/prices?symbols=", json={"prices": {"ETH": {"price": "0"}}})
+    with pytest.raises(UserError, match="proxy returned no valid prices"):
+        genvm_local.call(oracle, "update_prices", ["ETH"])
+
+
+# ----------------------------------------------------------------------
+# Performance budgets: requests per update
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("setup, max_requests", [
+    (lambda t: None, 3),
+    (lambda t: t.add("reddit.com", error="reset"), 4),
+    (lambda t: t.add(BINANCE, status=400), 4),
+    (lambda t: [t.add(BINANCE, error="down"), t.add("reddit.com", status=500)], 10),
+])
+def test_update_all_request_budget(deploy, runtime, transport, setup, max_requests):
+    setup(transport)
+    genvm_local.call(deploy(ORACLE), "update_all")
+    assert len(transport.requests) <= max_requests
+    assert runtime.calls[0].validator_requests == [0]
+
+
+def test_update_prices_costs_one_request_for_many_symbols(deploy, transport):
+    oracle = deploy(PROXY)
+    genvm_local.call(oracle, "set_proxy_url", PROXY_URL)
+    genvm_local.call(oracle, "update_prices", ["ETH", "BTC"] + [f"S{i}" for i in range(48)])
+    assert transport.count() == 1
+    assert sorted(genvm_local.call(oracle, "get_prices")["prices"]) == ["BTC", "ETH"]
@@ -0,0 +1,47 @@
+"""
+GenVM Local Harness
+
+Runs GenLayer Python contracts on a normal CPython interpreter: a stub
+`genlayer.gl` module, a fake web transport and a local `run_nondet`, plus
+profilers for finding hot spots before deploying.
+
+Usage:
+    import genvm_local
+
+    runtime = genvm_local.install(genvm_local.Runtime(
+        genvm_local.FakeTransport.from_fixtures("packages/genvm-local/fixtures/default.json")
+    ))
+    module = genvm_local.load_contract("contracts/oracle_consumer.py")
+    oracle = genvm_local.deploy(genvm_local.find_contract_class(module))
+    genvm_local.call(oracle, "update_all")
+    print(genvm_local.storage(oracle), runtime.transport.requests)
+"""
+
+from .consensus import ConsensusSimulator, NodeProfile, SimulationReport
+from .harness import call, contract_classes, deploy, find_contract_class, load_contract, public_methods
+from .runtime import ConsensusFailure, NondetCall, Runtime
+from .stub import install, reset_storage_writes, storage, storage_writes, uninstall
+from .transport import FakeResponse, FakeTransport, Route
+
+__all__ = [
+    "ConsensusFailure",
+    "ConsensusSimulator",
+    "FakeResponse",
+    "FakeTransport",
+    "NodeProfile",
+    "NondetCall",
+    "Route",
+    "Runtime",
+    "SimulationReport",
+    "call",
+    "contract_classes",
+    "deploy",
+    "find_contract_class",
+    "install",
+    "load_contract",
+    "public_methods",
+    "reset_storage_writes",
+    "storage",
+    "storage_writes",
+    "uninstall",
+]
@@ -0,0 +1,259 @@
+"""
+Simulated consensus: one leader, N validator nodes with their own network.
+
+Every node sees the shared fixtures through a `NodeTransport` that adds the
+node's latency, jitter and failures, so a slow or flaky validator costs what
+it would on a real network. Validators run concurrently by default (one
+thread per node), which models how wall time scales with the validator set;
+`concurrent=False` runs them one after another for comparison.
+
+Usage:
+    sim = ConsensusSimulator(runtime, [NodeProfile("v1"), NodeProfile("v2", latency=0.2)])
+    report = sim.simulate(lambda: genvm_local.call(oracle, "update_all"), runs=5)
+    print(report.render())
+
+Simulated nodes share one process: module-level state (such as
+WebFetcher's SHARED_COOLDOWNS) is shared between them.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .runtime import NondetCall, Runtime
+
+
+class NodeProfile:
+    """
+    Network and behaviour profile of one simulated node.
+
+    Args:
+        name: Node name used in reports
+        latency: Seconds added to every request
+        jitter: Extra uniform(0, jitter) seconds per request
+        error_rate: Probability that a request fails with ConnectionError
+        fail_match: Requests whose URL contains this substring always fail
+        reject_rate: Probability that the node votes no regardless of the
+                     validator's answer (a strict or out-of-sync validator)
+    """
+
+    def __init__(self, name: str, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 fail_match: Optional[str] = None, reject_rate: float = 0.0):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_match = fail_match
+        self.reject_rate = reject_rate
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "NodeProfile":
+        return cls(**spec)
+
+
+class NodeTransport:
+    """Per-node view of a shared transport, with the node's latency and failures."""
+
+    def __init__(self, base, profile: NodeProfile, rng: random.Random):
+        self.base = base
+        self.profile = profile
+        self.rng = rng
+        self.requests: List[str] = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[dict] = None):
+        with self._lock:
+            self.requests.append(url)
+            delay = self.profile.latency + (self.rng.uniform(0, self.profile.jitter) if self.profile.jitter else 0.0)
+            fail = (self.profile.fail_match is not None and self.profile.fail_match in url) or \
+                (self.profile.error_rate > 0 and self.rng.random() < self.profile.error_rate)
+            if fail:
+                self.errors += 1
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise ConnectionError(f"{self.profile.name}: simulated network failure for {url}")
+        return self.base.get(url, headers=headers)
+
+
+class NodeStats:
+    """Work done by one node across a simulation."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.runs = 0
+        self.seconds = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.yes = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "seconds": round(self.seconds, 6),
+            "mean_ms": round(self.seconds / self.runs * 1000, 3) if self.runs else 0.0,
+            "requests": self.requests,
+            "network_errors": self.errors,
+            "yes_votes": self.yes,
+        }
+
+
+class SimulationReport:
+    """Acceptance rate, wall times and per-node work over a simulation."""
+
+    def __init__(self, validators: int, concurrent: bool):
+        self.validators = validators
+        self.concurrent = concurrent
+        self.calls: List[NondetCall] = []
+        self.wall_seconds: List[float] = []
+        self.errors: List[str] = []
+        self.nodes: Dict[str, NodeStats] = {}
+
+    @property
+    def acceptance_rate(self) -> float:
+        return sum(1 for call in self.calls if call.accepted) / len(self.calls) if self.calls else 0.0
+
+    def to_dict(self) -> dict:
+        walls = sorted(self.wall_seconds)
+        return {
+            "validators": self.validators,
+            "concurrent": self.concurrent,
+            "runs": len(self.wall_seconds),
+            "nondet_calls": len(self.calls),
+            "acceptance_rate": round(self.acceptance_rate, 4),
+            "wall_seconds": {
+                "total": round(sum(walls), 6),
+                "mean": round(sum(walls) / len(walls), 6) if walls else 0.0,
+                "max": round(walls[-1], 6) if walls else 0.0,
+            },
+            "errors": list(self.errors),
+            "nodes": {name: stats.to_dict() for name, stats in self.nodes.items()},
+        }
+
+    def render(self) -> str:
+        data = self.to_dict()
+        wall = data["wall_seconds"]
+        lines = [
+            f"validators: {self.validators} ({'concurrent' if self.concurrent else 'sequential'}), "
+            f"runs: {data['runs']}, run_nondet calls: {data['nondet_calls']}",
+            f"acceptance rate: {data['acceptance_rate'] * 100:.1f}%",
+            f"wall time: total {wall['total']:.3f}s, mean {wall['mean'] * 1000:.1f}ms, max {wall['max'] * 1000:.1f}ms",
+            f"{'node':<12} {'runs':>5} {'mean ms':>9} {'requests':>9} {'net err':>8} {'yes':>5}",
+        ]
+        for name, stats in data["nodes"].items():
+            lines.append(f"{name:<12} {stats['runs']:>5} {stats['mean_ms']:>9.1f} {stats['requests']:>9} "
+                         f"{stats['network_errors']:>8} {stats['yes_votes']:>5}")
+        for error in data["errors"]:
+            lines.append(f"error: {error}")
+        return "\n".join(lines)
+
+
+class ConsensusSimulator:
+    """
+    Plug-in consensus for a `Runtime`: leader on one node, validators on N.
+
+    Args:
+        runtime: Runtime whose transport holds the shared fixtures
+        validators: Validator node profiles
+        leader: Leader node profile (default: no latency, no errors)
+        concurrent: Run validators in parallel threads
+        seed: Seed for latency jitter, failures and rejections
+        rerun_leader: Validators execute the leader function on their own
+                      network before the validator (the cost model of
+                      re-fetching validators); a failing re-run votes no
+    """
+
+    def __init__(self, runtime: Runtime, validators: List[NodeProfile], leader: Optional[NodeProfile] = None,
+                 concurrent: bool = True, seed: int = 0, rerun_leader: bool = False):
+        if not validators:
+            raise ValueError("at least one validator is required")
+        names = [profile.name for profile in validators] + [(leader or NodeProfile("leader")).name]
+        if len(set(names)) != len(names):
+            raise ValueError("node names must be unique")
+        self.runtime = runtime
+        self.base = runtime.transport
+        self.leader_profile = leader or NodeProfile("leader")
+        self.validators = list(validators)
+        self.concurrent = concurrent
+        self.rerun_leader = rerun_leader
+        self.rng = random.Random(seed)
+        self.leader_transport = NodeTransport(self.base, self.leader_profile, random.Random(self.rng.random()))
+        self.validator_transports = [NodeTransport(self.base, profile, random.Random(self.rng.random()))
+                                     for profile in self.validators]
+        self._vote_rng = random.Random(self.rng.random())
+        self._pool = ThreadPoolExecutor(max_workers=len(self.validators)) if concurrent else None
+        self._report: Optional[SimulationReport] = None
+        runtime.transport = self.leader_transport
+        runtime.consensus = self._consensus
+
+    def _stats(self, name: str) -> NodeStats:
+        return self._report.nodes.setdefault(name, NodeStats(name))
+
+    def _consensus(self, leader: Callable, validator: Callable, leader_result, call: NondetCall) -> None:
+        def validate(result):
+            if self.rerun_leader:
+                leader()
+            return validator(result)
+
+        def run_one(index: int):
+            return self.runtime.run_validator(validate, leader_result, transport=self.validator_transports[index])
+
+        if self._pool is not None:
+            outcomes = list(self._pool.map(run_one, range(len(self.validators))))
+        else:
+            outcomes = [run_one(i) for i in range(len(self.validators))]
+
+        for profile, transport, (vote, seconds, requests) in zip(self.validators, self.validator_transports, outcomes):
+            if vote and profile.reject_rate > 0 and self._vote_rng.random() < profile.reject_rate:
+                vote = False
+            call.votes.append(vote)
+            call.validator_seconds.append(seconds)
+            call.validator_requests.append(requests)
+            if self._report is not None:
+                stats = self._stats(profile.name)
+                stats.runs += 1
+                stats.seconds += seconds
+                stats.requests += requests
+                stats.yes += int(vote)
+
+        if self._report is not None:
+            stats = self._stats(self.leader_profile.name)
+            stats.runs += 1
+            stats.seconds += call.leader_seconds
+            stats.requests += call.leader_requests
+            stats.yes += 1
+            self._report.calls.append(call)
+
+    def simulate(self, action: Callable, runs: int = 1) -> SimulationReport:
+        """
+        Run `action` (e.g. a contract write) `runs` times and report.
+
+        Exceptions raised by `action` are recorded in `report.errors`; a
+        rejected result shows up in the acceptance rate.
+        """
+        report = SimulationReport(len(self.validators), self.concurrent)
+        self._report = report
+        self._stats(self.leader_profile.name)
+        for profile in self.validators:
+            self._stats(profile.name)
+        errors_before = {t.profile.name: t.errors for t in [self.leader_transport, *self.validator_transports]}
+        try:
+            for _ in range(runs):
+                started = time.perf_counter()
+                try:
+                    action()
+                except Exception as e:
+                    report.errors.append(f"{type(e).__name__}: {e}")
+                report.wall_seconds.append(time.perf_counter() - started)
+        finally:
+            self._report = None
+        for transport in [self.leader_transport, *self.validator_transports]:
+            report.nodes[transport.profile.name].errors = transport.errors - errors_before[transport.profile.name]
+        return report
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
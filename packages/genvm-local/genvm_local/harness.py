@@ -0,0 +1,73 @@
+"""
+Load contract files and call their methods under the stub runtime.
+"""
+
+import importlib.util
+import itertools
+import os
+import sys
+from typing import List, Optional, Sequence
+
+from . import stub
+
+_module_ids = itertools.count()
+
+
+def load_contract(path: str, extra_paths: Sequence[str] = ()):
+    """
+    Execute a contract file as a fresh module (the stub must be installed).
+
+    The contract's directory and `extra_paths` are put on sys.path first, so
+    imports such as `from web_fetcher import ...` resolve.
+    """
+    if "genlayer.gl" not in sys.modules or stub._runtime is None:
+        raise RuntimeError("install the genvm_local stub before loading contracts")
+    path = os.path.abspath(path)
+    for directory in [os.path.dirname(path), *map(os.path.abspath, extra_paths)]:
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+    name = f"_genvm_local_contract_{next(_module_ids)}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def contract_classes(module) -> List[type]:
+    """gl.Contract subclasses defined in `module`, in definition order."""
+    return [obj for obj in vars(module).values()
+            if isinstance(obj, type) and issubclass(obj, stub.Contract) and obj is not stub.Contract
+            and obj.__module__ == module.__name__]
+
+
+def find_contract_class(module, name: Optional[str] = None) -> type:
+    classes = contract_classes(module)
+    if name is not None:
+        for cls in classes:
+            if cls.__name__ == name:
+                return cls
+        raise LookupError(f"no contract class {name!r} in {module.__file__}")
+    if len(classes) != 1:
+        found = ", ".join(cls.__name__ for cls in classes) or "none"
+        raise LookupError(f"expected one contract class in {module.__file__}, found: {found}")
+    return classes[0]
+
+
+def deploy(cls: type, *args, **kwargs):
+    """Instantiate a contract (runs its __init__ like a deployment)."""
+    return cls(*args, **kwargs)
+
+
+def public_methods(cls: type) -> dict:
+    """{name: "view" | "write"} for methods decorated with gl.public."""
+    return {name: getattr(fn, "__gl_public__") for name, fn in vars(cls).items()
+            if callable(fn) and hasattr(fn, "__gl_public__")}
+
+
+def call(contract, method: str, *args, **kwargs):
+    """Call a public method by name."""
+    fn = getattr(type(contract), method, None)
+    if fn is None or not hasattr(fn, "__gl_public__"):
+        raise LookupError(f"{type(contract).__name__}.{method} is not a public method")
+    return getattr(contract, method)(*args, **kwargs)
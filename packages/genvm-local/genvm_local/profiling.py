@@ -0,0 +1,173 @@
+"""
+Profilers for contract calls: cProfile, folded stacks and tracemalloc.
+
+Each helper runs a zero-argument callable and returns its outcome next to
+the measurements; an exception raised by the callable is captured rather
+than propagated, so a failing leader can still be profiled.
+
+Folded stacks ("frame;frame;frame <microseconds>" per line) are the input
+format of flamegraph.pl, inferno and speedscope.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+
+class Outcome:
+    """Return value or exception of a profiled call."""
+
+    def __init__(self, result=None, error: BaseException = None):
+        self.result = result
+        self.error = error
+
+    @classmethod
+    def capture(cls, fn: Callable) -> "Outcome":
+        try:
+            return cls(result=fn())
+        except Exception as e:
+            return cls(error=e)
+
+
+def run_cprofile(fn: Callable) -> Tuple[Outcome, pstats.Stats]:
+    """Run `fn` under cProfile."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        outcome = Outcome.capture(fn)
+    finally:
+        profiler.disable()
+    return outcome, pstats.Stats(profiler)
+
+
+def format_pstats(stats: pstats.Stats, sort: str = "cumulative", top: int = 20) -> str:
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(sort).print_stats(top)
+    return stream.getvalue()
+
+
+def _code_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _builtin_name(fn) -> str:
+    module = getattr(fn, "__module__", None) or "builtins"
+    return f"{module}.{getattr(fn, '__qualname__', getattr(fn, '__name__', '?'))}".replace(";", ":")
+
+
+class FoldedStacks:
+    """
+    Deterministic folded-stack profiler (self time per call stack).
+
+    Uses sys.setprofile, so it cannot run together with cProfile; only the
+    thread that enters it is profiled.
+    """
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self.clock = clock
+        self.stacks: Dict[str, int] = {}  # stack -> self time in ns
+        self._stack: List[list] = []  # [key, start_ns, child_ns]
+
+    def _profile(self, frame, event, arg):
+        now = self.clock()
+        if event == "call" or event == "c_call":
+            name = _code_name(frame.f_code) if event == "call" else _builtin_name(arg)
+            key = f"{self._stack[-1][0]};{name}" if self._stack else name
+            self._stack.append([key, now, 0])
+        elif self._stack:  # return, c_return, c_exception
+            key, start, child = self._stack.pop()
+            total = now - start
+            self.stacks[key] = self.stacks.get(key, 0) + total - child
+            if self._stack:
+                self._stack[-1][2] += total
+
+    def __enter__(self) -> "FoldedStacks":
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        sys.setprofile(None)
+        self._stack = []
+
+    def lines(self) -> List[str]:
+        """Folded lines with microsecond weights (zero-weight stacks dropped)."""
+        return [f"{key} {ns // 1000}" for key, ns in sorted(self.stacks.items()) if ns >= 1000]
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lines()) + "\n")
+
+    def hottest(self, top: int = 10) -> List[Tuple[str, float]]:
+        """Leaf frames by total self time in ms, across all stacks."""
+        leaves: Dict[str, int] = {}
+        for key, ns in self.stacks.items():
+            leaf = key.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + ns
+        ranked = sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [(leaf, ns / 1e6) for leaf, ns in ranked]
+
+
+def run_folded(fn: Callable) -> Tuple[Outcome, FoldedStacks]:
+    """Run `fn` under the folded-stack profiler."""
+    folded = FoldedStacks()
+    with folded:
+        outcome = Outcome.capture(fn)
+    return outcome, folded
+
+
+class AllocationReport:
+    """tracemalloc results: peak bytes and top allocation sites still alive."""
+
+    def __init__(self, peak: int, retained: int, top: List[Tuple[str, int, int]]):
+        self.peak = peak
+        self.retained = retained
+        self.top = top  # (file:line, size_bytes, count)
+
+    def render(self) -> str:
+        lines = [f"peak traced memory: {self.peak / 1024:.1f} KiB, "
+                 f"retained after call: {self.retained / 1024:.1f} KiB"]
+        for location, size, count in self.top:
+            lines.append(f"  {size / 1024:9.1f} KiB  {count:7d} blocks  {location}")
+        return "\n".join(lines)
+
+
+def run_tracemalloc(fn: Callable, top: int = 10, frames: int = 1) -> Tuple[Outcome, AllocationReport]:
+    """
+    Run `fn` with tracemalloc; report the peak and the `top` allocation
+    sites (by line) whose memory was allocated during the call and is
+    still alive afterwards.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        outcome = Outcome.capture(fn)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+        tracemalloc.Filter(False, __file__),
+    ]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    rows = []
+    for stat in diff:
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        rows.append((f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return outcome, AllocationReport(max(0, peak - base), max(0, current - base), rows[:top])
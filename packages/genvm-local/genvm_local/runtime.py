@@ -0,0 +1,162 @@
+"""
+Local stand-in for the GenVM host: non-deterministic blocks and web access.
+
+`Runtime.run_nondet` runs the leader once and then the validator against the
+leader's result, like a single-validator network. Each call is recorded as a
+`NondetCall` with timings, request counts and the validator's vote, so
+profilers and tests can see what one `gl.vm.run_nondet` cost.
+
+The transport used by `gl.nondet.web.get` can be overridden per thread
+(`use_transport`), which lets a consensus simulator give every simulated
+node its own latency and error profile.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from .transport import FakeTransport
+
+
+# Address `gl.message.sender_address` reports unless a test switches it
+DEFAULT_SENDER = "0x" + "aa" * 20
+
+
+class ConsensusFailure(Exception):
+    """Validators did not accept the leader's result."""
+
+
+class NondetCall:
+    """Record of one run_nondet: leader outcome, validator vote and timings."""
+
+    def __init__(self):
+        self.leader_result = None
+        self.leader_error: Optional[BaseException] = None
+        self.leader_seconds = 0.0
+        self.leader_requests = 0
+        self.votes: List[bool] = []
+        self.validator_seconds: List[float] = []
+        self.validator_requests: List[int] = []
+
+    @property
+    def accepted(self) -> bool:
+        return bool(self.votes) and sum(self.votes) * 2 > len(self.votes)
+
+    def to_dict(self) -> dict:
+        return {
+            "leader_seconds": round(self.leader_seconds, 6),
+            "leader_requests": self.leader_requests,
+            "leader_error": repr(self.leader_error) if self.leader_error else None,
+            "votes": list(self.votes),
+            "validator_seconds": [round(s, 6) for s in self.validator_seconds],
+            "validator_requests": list(self.validator_requests),
+            "accepted": self.accepted,
+        }
+
+
+class Runtime:
+    """
+    Host services for the stub `genlayer.gl` module.
+
+    Args:
+        transport: Transport behind gl.nondet.web.get (default: empty FakeTransport)
+        consensus: Optional callable(leader, validator, leader_result, call)
+                   that runs the validators and fills `call.votes`; the
+                   default runs the validator once on the calling thread
+        sender: Address reported as `gl.message.sender_address`
+    """
+
+    def __init__(self, transport: Optional[FakeTransport] = None, consensus: Optional[Callable] = None,
+                 sender: str = DEFAULT_SENDER):
+        self.transport = transport if transport is not None else FakeTransport()
+        self.consensus = consensus
+        self.sender = sender
+        self.calls: List[NondetCall] = []
+        self._local = threading.local()
+
+    @contextmanager
+    def as_sender(self, address: str):
+        """Make calls inside the block come from `address`."""
+        previous, self.sender = self.sender, address
+        try:
+            yield address
+        finally:
+            self.sender = previous
+
+    # ------------------------------------------------------------------
+    # Web access
+    # ------------------------------------------------------------------
+
+    def current_transport(self):
+        return getattr(self._local, "transport", None) or self.transport
+
+    @contextmanager
+    def use_transport(self, transport):
+        """Route this thread's gl.nondet.web.get calls to `transport`."""
+        previous = getattr(self._local, "transport", None)
+        self._local.transport = transport
+        try:
+            yield transport
+        finally:
+            self._local.transport = previous
+
+    def web_get(self, url: str, headers: Optional[dict] = None):
+        return self.current_transport().get(url, headers=headers)
+
+    # ------------------------------------------------------------------
+    # Non-deterministic blocks
+    # ------------------------------------------------------------------
+
+    def run_leader(self, leader: Callable, call: NondetCall, transport=None):
+        """Run the leader (on `transport` if given) and wrap its outcome."""
+        from . import stub
+
+        transport = transport or self.current_transport()
+        before = _request_count(transport)
+        started = time.perf_counter()
+        with self.use_transport(transport):
+            try:
+                call.leader_result = stub.Return(leader())
+            except stub.UserError as e:
+                call.leader_error = e
+                call.leader_result = e
+        call.leader_seconds = time.perf_counter() - started
+        call.leader_requests = _request_count(transport) - before
+        return call.leader_result
+
+    def run_validator(self, validator: Callable, leader_result, transport=None):
+        """Run one validator; returns (vote, seconds, requests)."""
+        transport = transport or self.current_transport()
+        before = _request_count(transport)
+        started = time.perf_counter()
+        with self.use_transport(transport):
+            try:
+                vote = bool(validator(leader_result))
+            except Exception:
+                vote = False
+        return vote, time.perf_counter() - started, _request_count(transport) - before
+
+    def run_nondet(self, leader: Callable, validator: Callable):
+        from . import stub
+
+        call = NondetCall()
+        self.calls.append(call)
+        leader_result = self.run_leader(leader, call)
+        if self.consensus is not None:
+            self.consensus(leader, validator, leader_result, call)
+        else:
+            vote, seconds, requests = self.run_validator(validator, leader_result)
+            call.votes.append(vote)
+            call.validator_seconds.append(seconds)
+            call.validator_requests.append(requests)
+        if call.leader_error is not None:
+            raise call.leader_error
+        if not call.accepted:
+            raise ConsensusFailure(f"validators rejected the leader result ({sum(call.votes)}/{len(call.votes)} agreed)")
+        return stub.unpack_result(leader_result)
+
+
+def _request_count(transport) -> int:
+    requests = getattr(transport, "requests", None)
+    return len(requests) if requests is not None else 0
@@ -0,0 +1,215 @@
+"""
+Stub `genlayer` / `genlayer.gl` modules for running contracts locally.
+
+Covers what the contracts in this repo use: `gl.Contract`,
+`gl.public.view` / `gl.public.write`, `gl.vm.UserError` / `VMError` /
+`Return` / `run_nondet` / `unpack_result`, `gl.nondet.web.get`,
+`gl.message.sender_address`, `Address` and the sized integer aliases
+(`u256`, `bigint`, ...). Web access, the sender and non-deterministic blocks
+are delegated to the installed `Runtime`.
+
+Storage is plain instance attributes. `Contract` counts assignments to
+annotated (persistent) fields so harnesses can report storage writes, and,
+like GenVM's zero-initialised storage, starts `TreeMap[...]` / `DynArray[...]`
+fields empty.
+"""
+
+import sys
+import types
+import typing
+from typing import Optional
+
+from .runtime import Runtime
+
+
+class UserError(Exception):
+    """Contract-level error (rolls back the transaction on GenVM)."""
+
+    def __init__(self, message: str = ""):
+        super().__init__(message)
+        self.message = message
+
+
+class VMError(Exception):
+    """VM-level failure (out of resources, internal error)."""
+
+
+class Return:
+    """Successful non-deterministic result, as handed to validators."""
+
+    def __init__(self, calldata):
+        self.calldata = calldata
+
+    def __repr__(self) -> str:
+        return f"Return({self.calldata!r})"
+
+
+def unpack_result(result):
+    """Return the calldata of a Return; raise leader errors."""
+    if isinstance(result, Return):
+        return result.calldata
+    if isinstance(result, BaseException):
+        raise result
+    raise VMError(f"cannot unpack {type(result).__name__}")
+
+
+def _persistent_fields(cls) -> set:
+    fields = set()
+    for klass in reversed(cls.__mro__):
+        fields.update(getattr(klass, "__annotations__", {}))
+    return fields
+
+
+def _container_fields(cls) -> dict:
+    """{name: dict | list} for fields annotated TreeMap[...] / DynArray[...]."""
+    fields = {}
+    for klass in reversed(cls.__mro__):
+        for name, annotation in getattr(klass, "__annotations__", {}).items():
+            if typing.get_origin(annotation) in (dict, list):
+                fields[name] = typing.get_origin(annotation)
+    return fields
+
+
+class Contract:
+    """Base class for contracts; tracks writes to persistent fields."""
+
+    address = "0x" + "00" * 20
+
+    def __new__(cls, *args, **kwargs):
+        contract = super().__new__(cls)
+        for name, container in _container_fields(cls).items():
+            object.__setattr__(contract, name, container())
+        return contract
+
+    def __setattr__(self, name, value):
+        fields = type(self).__dict__.get("_gl_fields")
+        if fields is None:
+            fields = _persistent_fields(type(self))
+            type.__setattr__(type(self), "_gl_fields", fields)
+        if name in fields:
+            counts = self.__dict__.setdefault("_gl_writes", {})
+            counts[name] = counts.get(name, 0) + 1
+        object.__setattr__(self, name, value)
+
+
+def storage(contract: Contract) -> dict:
+    """Current values of the contract's persistent (annotated) fields."""
+    return {name: contract.__dict__[name] for name in sorted(_persistent_fields(type(contract)))
+            if name in contract.__dict__}
+
+
+def storage_writes(contract: Contract) -> dict:
+    """Assignments per persistent field since deployment (or the last reset)."""
+    return dict(contract.__dict__.get("_gl_writes", {}))
+
+
+def reset_storage_writes(contract: Contract) -> None:
+    contract.__dict__["_gl_writes"] = {}
+
+
+class _Write:
+    """`gl.public.write` decorator (also usable as `gl.public.write.payable`)."""
+
+    def __call__(self, fn):
+        fn.__gl_public__ = "write"
+        return fn
+
+    def payable(self, fn):
+        fn.__gl_public__ = "write"
+        fn.__gl_payable__ = True
+        return fn
+
+
+class _Public:
+    write = _Write()
+
+    @staticmethod
+    def view(fn):
+        fn.__gl_public__ = "view"
+        return fn
+
+
+public = _Public()
+
+_runtime: Optional[Runtime] = None
+_saved_modules: dict = {}
+
+
+def current_runtime() -> Runtime:
+    if _runtime is None:
+        raise RuntimeError("genvm_local stub is not installed (call genvm_local.install())")
+    return _runtime
+
+
+def _run_nondet(leader, validator):
+    return current_runtime().run_nondet(leader, validator)
+
+
+def _web_get(url: str, headers: Optional[dict] = None):
+    return current_runtime().web_get(url, headers=headers)
+
+
+class _Message:
+    """`gl.message`: the current transaction's sender, from the runtime."""
+
+    @property
+    def sender_address(self) -> str:
+        return current_runtime().sender
+
+
+def _build_modules():
+    gl = types.ModuleType("genlayer.gl")
+    gl.__doc__ = "genvm_local stub of genlayer.gl"
+    gl.Contract = Contract
+    gl.public = public
+    gl.vm = types.SimpleNamespace(
+        UserError=UserError,
+        VMError=VMError,
+        Return=Return,
+        unpack_result=unpack_result,
+        run_nondet=_run_nondet,
+    )
+    gl.nondet = types.SimpleNamespace(web=types.SimpleNamespace(get=_web_get))
+    gl.message = _Message()
+    genlayer = types.ModuleType("genlayer")
+    genlayer.__path__ = []  # mark as package so `import genlayer.gl` works
+    genlayer.gl = gl
+    for name in ("u8", "u16", "u32", "u64", "u128", "u256", "i8", "i16", "i32", "i64", "i128", "i256", "bigint"):
+        setattr(gl, name, int)
+        setattr(genlayer, name, int)
+    gl.TreeMap = dict
+    gl.DynArray = list
+    gl.Address = str
+    genlayer.TreeMap = dict
+    genlayer.DynArray = list
+    genlayer.Address = str
+    return genlayer, gl
+
+
+def install(runtime: Optional[Runtime] = None) -> Runtime:
+    """
+    Install the stub as `genlayer` / `genlayer.gl` and make `runtime` active.
+
+    Returns the active runtime (a new default one if none is given).
+    """
+    global _runtime
+    _runtime = runtime if runtime is not None else Runtime()
+    if not _saved_modules:
+        for name in ("genlayer", "genlayer.gl"):
+            _saved_modules[name] = sys.modules.get(name)
+    genlayer, gl = _build_modules()
+    sys.modules["genlayer"] = genlayer
+    sys.modules["genlayer.gl"] = gl
+    return _runtime
+
+
+def uninstall() -> None:
+    """Restore whatever `genlayer` modules were present before install()."""
+    global _runtime
+    _runtime = None
+    for name, module in _saved_modules.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved_modules.clear()
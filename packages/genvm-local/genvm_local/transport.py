@@ -0,0 +1,137 @@
+"""
+Fake HTTP transport behind the stub `gl.nondet.web.get`.
+
+Routes match by URL substring (first match wins) and return canned
+responses, optionally after a simulated latency or by raising an error.
+Every request is recorded, so callers can assert how many calls a contract
+method made and to which hosts.
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+
+class FakeResponse:
+    """Response object shaped like GenVM's (status, headers, body bytes)."""
+
+    def __init__(self, status: int = 200, body: bytes = b"", headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers or {})
+
+    def __repr__(self) -> str:
+        return f"FakeResponse(status={self.status}, bytes={len(self.body or b'')})"
+
+
+class Route:
+    """
+    One canned upstream.
+
+    Args:
+        match: Substring of the URL this route answers
+        status: HTTP status
+        body: Raw body (str or bytes)
+        json: Body as a JSON-serialisable value (overrides body)
+        headers: Response headers
+        latency: Seconds to sleep before answering
+        error: If set, raise ConnectionError(error) instead of answering
+        handler: Optional callable(url, headers) -> FakeResponse, for dynamic routes
+        times: Answer at most this many requests (None = unlimited)
+    """
+
+    def __init__(self, match: str, status: int = 200, body: Union[str, bytes] = b"", json=None,
+                 headers: Optional[Dict[str, str]] = None, latency: float = 0.0, error: Optional[str] = None,
+                 handler: Optional[Callable] = None, times: Optional[int] = None):
+        self.match = match
+        self.status = status
+        if json is not None:
+            body = _json_dumps(json)
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.headers = dict(headers or {})
+        self.latency = latency
+        self.error = error
+        self.handler = handler
+        self.times = times
+        self.hits = 0
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "Route":
+        """Route from a fixtures-file entry (same keys as the constructor)."""
+        spec = dict(spec)
+        return cls(spec.pop("match"), **spec)
+
+    def respond(self, url: str, headers: Optional[dict]) -> FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error is not None:
+            raise ConnectionError(self.error)
+        if self.handler is not None:
+            return self.handler(url, headers)
+        return FakeResponse(self.status, self.body, self.headers)
+
+
+def _json_dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class FakeTransport:
+    """
+    Substring-routed fake upstreams with request recording.
+
+    Args:
+        routes: Initial routes (Route objects or fixture dicts)
+        strict: Raise ConnectionError for unmatched URLs instead of a 404
+    """
+
+    def __init__(self, routes: Optional[list] = None, strict: bool = False):
+        self.routes: List[Route] = []
+        self.strict = strict
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        for route in routes or []:
+            self.add(route)
+
+    @classmethod
+    def from_fixtures(cls, path: str, strict: bool = False) -> "FakeTransport":
+        """Load routes from a JSON file: {"routes": [{"match": ..., ...}, ...]}."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("routes", []), strict=strict)
+
+    def add(self, route: Union[Route, dict, str], **kwargs) -> Route:
+        """Add a route; accepts a Route, a fixture dict, or match + Route kwargs."""
+        if isinstance(route, str):
+            route = Route(route, **kwargs)
+        elif isinstance(route, dict):
+            route = Route.from_dict(route)
+        # Later routes take precedence, so tests can override fixtures
+        self.routes.insert(0, route)
+        return route
+
+    def get(self, url: str, headers: Optional[dict] = None) -> FakeResponse:
+        with self._lock:
+            self.requests.append(url)
+            route = None
+            for candidate in self.routes:
+                if candidate.match in url and (candidate.times is None or candidate.hits < candidate.times):
+                    candidate.hits += 1
+                    route = candidate
+                    break
+        if route is None:
+            if self.strict:
+                raise ConnectionError(f"no fake route for {url}")
+            return FakeResponse(404, b"not found", {"Content-Type": "text/plain"})
+        return route.respond(url, headers)
+
+    def count(self, match: str = "") -> int:
+        """Number of recorded requests whose URL contains `match`."""
+        with self._lock:
+            return sum(1 for url in self.requests if match in url)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = []
+            for route in self.routes:
+                route.hits = 0
@@ -2,12 +2,70 @@
 
 import json
 import genlayer.gl as gl
+from genlayer import u64
 
 
 # ============================================================================
 # WebFetcher Library (embedded)
 # ============================================================================
 
+# Prices are integers scaled by PRICE_SCALE: 3000.12 USD is 300012000000
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+
+def parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """Decimal string -> integer scaled by 10**decimals (half to even), without float."""
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+# Symbol -> Coingecko id, from the shared registry (symbols.json); a deployed
+# contract cannot read it. Coingecko wants ids ("ethereum"), not tickers
+# ("eth"). Anything else is passed through lower-cased, as a Coingecko id.
+COINGECKO_IDS = {
+    "BTC": "bitcoin", "ETH": "ethereum", "BNB": "binancecoin", "SOL": "solana",
+    "XRP": "ripple", "ADA": "cardano", "DOGE": "dogecoin", "TRX": "tron",
+    "AVAX": "avalanche-2", "DOT": "polkadot", "LINK": "chainlink", "LTC": "litecoin",
+    "UNI": "uniswap", "ATOM": "cosmos", "NEAR": "near", "ARB": "arbitrum",
+    "OP": "optimism", "POL": "polygon-ecosystem-token", "MATIC": "matic-network",
+    "USDC": "usd-coin", "USDT": "tether",
+}
+
+
+def _coingecko_id(symbol: str) -> str:
+    return COINGECKO_IDS.get(symbol.upper(), symbol.lower())
+
+
 class WebFetcher:
     """Core web fetcher with utility methods for common HTTP operations."""
     
@@ -19,10 +77,10 @@ class WebFetcher:
         except Exception:
             raise gl.vm.UserError(f"{name}: body decode error")
     
-    def json(self, resp, name: str) -> dict:
+    def json(self, resp, name: str, parse_float=None) -> dict:
         text = self.ensure_body_bytes(resp, name)
         try:
-            return json.loads(text)
+            return json.loads(text, parse_float=parse_float)
         except Exception:
             raise gl.vm.UserError(f"{name}: json parse error")
     
@@ -50,6 +108,16 @@ class WebFetcher:
             return float(val)
         except Exception:
             raise gl.vm.UserError(f"{name}: parse float error")
+    
+    def to_fixed(self, name: str, val, decimals: int = PRICE_DECIMALS) -> int:
+        if isinstance(val, bool):
+            raise gl.vm.UserError(f"{name}: parse fixed-point error")
+        if isinstance(val, int):
+            return val * 10 ** decimals
+        try:
+            return parse_fixed(repr(val) if isinstance(val, float) else val, decimals)
+        except Exception:
+            raise gl.vm.UserError(f"{name}: parse fixed-point error")
 
 
 class PriceFeedPattern:
@@ -82,7 +150,7 @@ class PriceFeedPattern:
                 
                 price_str = data.get("price") if isinstance(data, dict) else None
                 if price_str is not None:
-                    price = self.fetcher.to_float("binance price", price_str)
+                    price = self.fetcher.to_fixed("binance price", price_str)
                     price_source = "binance"
                     break
             except gl.vm.UserError:
@@ -93,16 +161,16 @@ class PriceFeedPattern:
         # Fallback to Coingecko
         if price is None and coingecko_fallback:
             try:
-                symbol_lower = symbol.lower()
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol_lower}&vs_currencies=usd"
+                coin_id = _coingecko_id(symbol)
+                url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd"
                 resp = self.fetcher.get(url)
-                data = self.fetcher.json(resp, "coingecko")
+                data = self.fetcher.json(resp, "coingecko", parse_float=str)
                 
-                asset_data = data.get(symbol_lower) if isinstance(data, dict) else None
+                asset_data = data.get(coin_id) if isinstance(data, dict) else None
                 if asset_data and isinstance(asset_data, dict):
                     usd_val = asset_data.get("usd")
                     if usd_val is not None:
-                        price = self.fetcher.to_float("coingecko price", usd_val)
+                        price = self.fetcher.to_fixed("coingecko price", usd_val)
                         price_source = "coingecko"
             except Exception:
                 pass
@@ -126,11 +194,11 @@ class SimplePriceFeed(gl.Contract):
     
     # CRITICAL: All persistent fields MUST be declared in class body with type annotations
     # Fields assigned only in __init__ are NOT persistent!
-    last_price: float
+    last_price: u64  # fixed-point, PRICE_SCALE
     last_source: str
     
     def __init__(self):
-        self.last_price = 0.0
+        self.last_price = 0
         self.last_source = ""
     
     @gl.public.view
@@ -138,13 +206,13 @@ class SimplePriceFeed(gl.Contract):
         """Debug method to check state persistence."""
         # Initialize if not exists
         if not hasattr(self, 'last_price'):
-            self.last_price = 0.0
+            self.last_price = 0
         if not hasattr(self, 'last_source'):
             self.last_source = ""
         
         return {
             "has_price": hasattr(self, 'last_price'),
-            "price_value": str(self.last_price),
+            "price_value": format_fixed(self.last_price),
             "price_type": type(self.last_price).__name__,
             "has_source": hasattr(self, 'last_source'),
             "source_value": self.last_source,
@@ -156,13 +224,14 @@ class SimplePriceFeed(gl.Contract):
         """Get current stored price and source."""
         # Initialize attributes if they don't exist (shouldn't happen if __init__ ran)
         if not hasattr(self, 'last_price'):
-            self.last_price = 0.0
+            self.last_price = 0
         if not hasattr(self, 'last_source'):
             self.last_source = ""
         
         # Directly read and return - don't use getattr to ensure we're reading from actual state
         return {
-            "price": str(self.last_price),
+            "price": format_fixed(self.last_price),
+            "price_e8": self.last_price,
             "source": self.last_source
         }
     
@@ -180,8 +249,9 @@ class SimplePriceFeed(gl.Contract):
             """Leader function: Fetches price from APIs."""
             price_data = pattern.get_price("ETH")
             # Return as flat dict - run_nondet returns this directly
+            # (price stays a fixed-point int, no float/str round trip)
             return {
-                "price": str(price_data["price"]),
+                "price": price_data["price"],
                 "source": price_data["source"]
             }
         
@@ -191,12 +261,11 @@ class SimplePriceFeed(gl.Contract):
                 unpacked = gl.vm.unpack_result(result)
                 if not isinstance(unpacked, dict):
                     return False
-                price_str = unpacked.get("price")
-                if price_str:
-                    price = float(price_str)
-                    # Validate: price should be positive and reasonable
-                    return price > 0 and price < 100000  # ETH reasonable range
-                return False
+                price = unpacked.get("price")
+                if not isinstance(price, int) or isinstance(price, bool):
+                    return False
+                # Validate: price should be positive and reasonable (exact integer bounds)
+                return 0 < price < 100000 * PRICE_SCALE  # ETH reasonable range
             except Exception:
                 return False
         
@@ -215,21 +284,18 @@ class SimplePriceFeed(gl.Contract):
         if not isinstance(data, dict):
             raise gl.vm.UserError("invalid result format")
         
-        price_str = data.get("price")
+        price = data.get("price")
         source_str = data.get("source")
         
-        if price_str is None or source_str is None:
+        if price is None or source_str is None:
             raise gl.vm.UserError("missing price or source in result")
         
-        # Parse and assign - EXACTLY like oracle_consumer.py
-        try:
-            # Parse string to float and assign - ensure persistence
-            price_float = float(str(price_str))
-            self.last_price = price_float
-            # Force storage write by reassigning (exact pattern from oracle_consumer)
-            _ = self.last_price
-        except (ValueError, TypeError):
-            raise gl.vm.UserError(f"invalid price value: {price_str}")
+        # Assign - EXACTLY like oracle_consumer.py
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            raise gl.vm.UserError(f"invalid price value: {price}")
+        self.last_price = price
+        # Force storage write by reassigning (exact pattern from oracle_consumer)
+        _ = self.last_price
         
         source_str_final = str(source_str)
         self.last_source = source_str_final
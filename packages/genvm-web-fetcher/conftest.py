@@ -0,0 +1,45 @@
+"""
+Pytest setup for the web fetcher tests.
+
+Installs the genvm_local stub `genlayer.gl` before web_fetcher is imported
+and answers `gl.nondet.web.get` from a fake transport loaded with the shared
+fixtures (packages/genvm-local/fixtures/default.json).
+"""
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+for path in (HERE, os.path.join(ROOT, "packages", "genvm-local")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import genvm_local  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "packages", "genvm-local", "fixtures", "default.json")
+
+# web_fetcher binds `genlayer.gl` at import time; every later install() keeps
+# the same stub classes and only swaps the active runtime.
+genvm_local.install()
+
+
+@pytest.fixture
+def transport():
+    """
+    Fake upstreams from the shared fixtures; add routes to override.
+
+    Also clears web_fetcher.SHARED_COOLDOWNS, so a 429 answered in one test
+    does not make the next one skip that upstream.
+    """
+    import web_fetcher
+
+    web_fetcher.SHARED_COOLDOWNS.reset()
+    yield genvm_local.FakeTransport.from_fixtures(FIXTURES)
+    web_fetcher.SHARED_COOLDOWNS.reset()
+
+
+@pytest.fixture
+def runtime(transport):
+    return genvm_local.install(genvm_local.Runtime(transport))
@@ -4,48 +4,50 @@ Simple Price Feed Example using WebFetcher library
 # { "Depends": "py-genlayer:latest" }
 """
 import genlayer.gl as gl
-from web_fetcher import PriceFeedPattern
+from web_fetcher import PriceFeedPattern, format_fixed, refetch_due
 
 
 class SimplePriceFeed(gl.Contract):
     """Simple contract that fetches ETH price using PriceFeedPattern"""
     
     def __init__(self):
-        self.last_price = 0.0
+        self.last_price = 0  # fixed-point, PRICE_SCALE (1e8)
         self.last_source = ""
+        self.anchor_price = 0  # last price validators fetched themselves
+        self.update_count = 0
     
     @gl.public.view
     def get_price(self) -> dict:
         return {
-            "price": str(self.last_price),
+            "price": format_fixed(self.last_price),
+            "price_e8": self.last_price,
             "source": self.last_source
         }
     
     @gl.public.write
     def update_price(self) -> None:
         pattern = PriceFeedPattern()
+        update_index = int(self.update_count)
+        reference = int(self.anchor_price) or None
         
         def leader():
-            price_data = pattern.get_price("ETH")
-            return {
-                "price": str(price_data["price"]),
-                "source": price_data["source"]
-            }
+            # The digest (source URL, timestamp, hash) lets validators skip
+            # their own fetch when it checks out
+            return pattern.get_price("ETH", digest=True)
         
         def validator(result):
             try:
                 unpacked = gl.vm.unpack_result(result)
-                if not isinstance(unpacked, dict):
-                    return False
-                price_str = unpacked.get("price")
-                if price_str:
-                    price = float(price_str)
-                    return price > 0
-                return False
+                # Skips the fetch only within 5% of the last re-fetched price,
+                # and re-fetches on every 4th update (and the first) anyway
+                return pattern.verify_price("ETH", unpacked, reference=reference, max_move_bps=500,
+                                            update_index=update_index)
             except Exception:
                 return False
         
         data = gl.vm.run_nondet(leader, validator)
-        self.last_price = float(data["price"])
+        self.last_price = int(data["price"])
         self.last_source = str(data["source"])
-
+        if refetch_due(update_index):
+            self.anchor_price = self.last_price
+        self.update_count = update_index + 1
@@ -0,0 +1,183 @@
+"""
+Rate Limiting Utilities
+
+Standard-library-only rate limiters shared by on-chain and off-chain code:
+
+- `WebFetcher(limiter=...)` uses a `KeyedRateLimiter` keyed by upstream
+  host to self-throttle outbound calls (over-budget calls fail fast
+  without issuing a request).
+- `scripts/price_proxy.py` uses one keyed by client IP to throttle callers.
+
+Every check is O(1). The key table is an LRU bounded by `max_keys`, so
+memory stays flat no matter how many distinct clients show up.
+
+Algorithms:
+    "token_bucket"   - Smooth rate with a fixed burst allowance (default)
+    "sliding_window" - Sliding-window counter; unlike fixed windows it does
+                       not allow 2x bursts at window edges
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, holding at most `burst` tokens.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = now
+
+    def try_acquire(self, now: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens if available.
+
+        Returns:
+            0.0 if allowed, otherwise seconds until enough tokens refill
+        """
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class SlidingWindow:
+    """
+    Sliding-window counter: at most `limit` events in any `window` seconds.
+
+    Keeps the previous and current fixed-window counts and weights the
+    previous one by its overlap with the sliding window.
+    """
+
+    __slots__ = ("limit", "window", "start", "current", "previous")
+
+    def __init__(self, limit: float, window: float, now: float):
+        self.limit = float(limit)
+        self.window = float(window)
+        self.start = now
+        self.current = 0.0
+        self.previous = 0.0
+
+    def try_acquire(self, now: float, cost: float = 1.0) -> float:
+        """
+        Record `cost` events if under the limit.
+
+        Returns:
+            0.0 if allowed, otherwise an estimate of seconds until allowed
+        """
+        elapsed = now - self.start
+        if elapsed >= self.window:
+            windows = int(elapsed // self.window)
+            self.previous = self.current if windows == 1 else 0.0
+            self.current = 0.0
+            self.start += windows * self.window
+            elapsed = now - self.start
+        weight = 1.0 - elapsed / self.window
+        used = self.previous * weight + self.current
+        if used + cost <= self.limit:
+            self.current += cost
+            return 0.0
+        remaining = self.window - elapsed
+        if self.previous > 0:
+            # Time until the previous window's weighted share drops enough
+            needed = (used + cost - self.limit) / self.previous * self.window
+            if needed <= remaining:
+                return needed
+        if self.current + cost > self.limit and self.current > 0:
+            # After this window ends its events count as the previous window's
+            return remaining + (self.current + cost - self.limit) / self.current * self.window
+        return remaining
+
+
+class KeyedRateLimiter:
+    """
+    Per-key rate limiter with an LRU-bounded key table.
+
+    Args:
+        rate: Allowed events per second per key
+        burst: Token-bucket capacity (token_bucket only; default: rate)
+        max_keys: Maximum tracked keys; least recently used keys are evicted
+        algorithm: "token_bucket" or "sliding_window"
+        window: Window length in seconds (sliding_window only)
+        overrides: Optional per-key {key: (rate, burst)} limits
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(self, rate: float, burst: float = None, max_keys: int = 10000,
+                 algorithm: str = "token_bucket", window: float = 60.0,
+                 overrides: dict = None, clock=time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if algorithm not in ("token_bucket", "sliding_window"):
+            raise ValueError(f"unknown algorithm: {algorithm}")
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.rate)
+        self.max_keys = max(1, int(max_keys))
+        self.algorithm = algorithm
+        self.window = float(window)
+        self.overrides = dict(overrides or {})
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.allowed = 0
+        self.throttled = 0
+        self.evicted = 0
+
+    def _new_entry(self, key, now: float):
+        rate, burst = self.overrides.get(key, (self.rate, self.burst))
+        if self.algorithm == "sliding_window":
+            # Round so e.g. (100 / 60) * 60 allows exactly 100 events
+            return SlidingWindow(round(rate * self.window, 9), self.window, now)
+        return TokenBucket(rate, burst, now)
+
+    def try_acquire(self, key, cost: float = 1.0) -> float:
+        """
+        Check and consume budget for `key`.
+
+        Returns:
+            0.0 if allowed, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._new_entry(key, now)
+                self._entries[key] = entry
+                if len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._entries.move_to_end(key)
+            wait = entry.try_acquire(now, cost)
+            self.checks += 1
+            if wait > 0:
+                self.throttled += 1
+            else:
+                self.allowed += 1
+            return wait
+
+    def allow(self, key, cost: float = 1.0) -> bool:
+        """True if the event for `key` is within budget (and consumes it)."""
+        return self.try_acquire(key, cost) == 0.0
+
+    def metrics(self) -> dict:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "checks": self.checks,
+                "allowed": self.allowed,
+                "throttled": self.throttled,
+                "evicted": self.evicted,
+                "tracked_keys": len(self._entries),
+            }
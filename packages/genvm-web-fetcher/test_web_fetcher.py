@@ -1,80 +1,980 @@
 """
-Test script for Web Fetcher Library
+Tests for the Web Fetcher Library
 
-This script validates the web_fetcher.py library structure and syntax.
-Run this before deploying to GenLayer.
+Runs web_fetcher.py against the genvm_local stub `genlayer.gl` and a fake
+transport (see conftest.py), so every request a pattern makes is recorded.
 
-# { "Depends": "py-genlayer:latest" }
+    python -m pytest -q packages/genvm-web-fetcher
 """
-import sys
+import calendar
+import json
+import os
+import random
+import time
+import tracemalloc
 
-def test_imports():
-    """Test that web_fetcher can be imported"""
-    try:
-        # Simulate import check
-        print("Testing web_fetcher.py structure...")
-        print("✅ WebFetcher class structure OK")
-        print("✅ PriceFeedPattern class structure OK")
-        print("✅ WeatherPattern class structure OK")
-        print("✅ NewsPattern class structure OK")
-        return True
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
-
-def test_patterns():
-    """Test pattern classes have required methods"""
-    patterns = {
-        "PriceFeedPattern": ["get_price"],
-        "WeatherPattern": ["get_weather"],
-        "NewsPattern": ["get_news"]
+import pytest
+
+import genvm_local
+from rate_limit import KeyedRateLimiter
+from web_fetcher import (
+    Deadline,
+    FetchError,
+    HostCooldowns,
+    NewsPattern,
+    PRICE_SCALE,
+    PriceFeedPattern,
+    ResultCodec,
+    RetryPolicy,
+    SYMBOLS,
+    SymbolRegistry,
+    Tracer,
+    WeatherPattern,
+    WebFetcher,
+    check_digest,
+    digest_hash,
+    format_fixed,
+    make_digest,
+    parse_fixed,
+    quota_key,
+    status_kind,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BINANCE_HOSTS = [
+    "https://api.binance.com",
+    "https://api-gcp.binance.com",
+    "https://api1.binance.com",
+    "https://api2.binance.com",
+    "https://api3.binance.com",
+    "https://api4.binance.com",
+]
+BINANCE = "binance.com/api/v3/ticker/price"
+COINGECKO = "api.coingecko.com/api/v3/simple/price"
+REDDIT = "https://www.reddit.com/r/CryptoCurrency/hot.json?limit=3"
+RSS = "https://www.coindesk.com/arc/outboundfeeds/rss/"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fetcher(**kwargs) -> WebFetcher:
+    """WebFetcher with private cooldowns unless the test passes its own."""
+    kwargs.setdefault("cooldowns", HostCooldowns())
+    return WebFetcher(**kwargs)
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("url, key", [
+    ("https://api.binance.com/api/v3/ticker/price", "binance.com"),
+    ("https://api-gcp.binance.com", "binance.com"),
+    ("api3.binance.com:443", "binance.com"),
+    ("https://api.coingecko.com/x", "coingecko.com"),
+    ("https://127.0.0.1:8080/api", "127.0.0.1:8080"),
+    ("http://localhost:3000/api", "localhost:3000"),
+    ("https://user@API.Example.com/", "example.com"),
+])
+def test_quota_key_groups_mirrors(url, key):
+    assert quota_key(url) == key
+
+
+@pytest.mark.parametrize("status, kind", [
+    (400, "client"), (404, "client"), (418, "rate_limited"), (429, "rate_limited"),
+    (500, "server"), (503, "server"), (302, "http"),
+])
+def test_status_kind(status, kind):
+    assert status_kind(status) == kind
+
+
+# ----------------------------------------------------------------------
+# WebFetcher
+# ----------------------------------------------------------------------
+
+def test_get_returns_response_and_parses_json(runtime, transport):
+    f = fetcher()
+    resp = f.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT")
+    assert f.json(resp, "binance") == {"symbol": "ETHUSDT", "price": "3000.12000000"}
+    assert transport.requests == ["https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT"]
+    assert f.requests_by_key == {"binance.com": 1}
+
+
+@pytest.mark.parametrize("status, kind", [(404, "client"), (429, "rate_limited"), (503, "server")])
+def test_get_classifies_unexpected_status(runtime, transport, status, kind):
+    transport.add("example.com", status=status)
+    with pytest.raises(FetchError) as info:
+        fetcher().get("https://example.com/data")
+    assert info.value.kind == kind
+    assert info.value.status == status
+    assert isinstance(info.value, genvm_local.stub.UserError)
+
+
+def test_get_wraps_transport_errors_as_network(runtime, transport):
+    transport.add("example.com", error="connection reset")
+    with pytest.raises(FetchError) as info:
+        fetcher().get("https://example.com/data")
+    assert info.value.kind == "network"
+    assert "connection reset" in str(info.value)
+
+
+def test_expected_status_other_than_200(runtime, transport):
+    transport.add("example.com", status=204)
+    assert fetcher().get("https://example.com/data", expected_status=204).status == 204
+
+
+@pytest.mark.parametrize("body, message", [
+    (None, "empty body"),
+    (b"\xff\xfe\xfa", "body decode error"),
+    (b"{not json", "json parse error"),
+])
+def test_json_errors_are_user_errors(runtime, body, message):
+    resp = genvm_local.FakeResponse(200, body)
+    with pytest.raises(genvm_local.stub.UserError) as info:
+        fetcher().json(resp, "src")
+    assert str(info.value) == f"src: {message}"
+
+
+def test_to_float_and_to_int():
+    f = fetcher()
+    assert f.to_float("p", "1.5") == 1.5
+    assert f.to_int("n", "7") == 7
+    with pytest.raises(genvm_local.stub.UserError, match="p: parse float error"):
+        f.to_float("p", "abc")
+    with pytest.raises(genvm_local.stub.UserError, match="n: parse int error"):
+        f.to_int("n", None)
+
+
+PARSE_FIXED_CASES = [
+    ("3000.12000000", 300012000000),
+    ("3000.5", 300050000000),
+    ("65000", 6500000000000),
+    ("-2.5", -250000000),
+    ("+.5", 50000000),
+    ("1e-05", 1000),
+    ("1.5E3", 150000000000),
+    ("0.000000015", 2),  # half to even
+    ("0.000000025", 2),
+    ("0.0000000251", 3),
+    ("1e-30", 0),
+]
+NOT_DECIMALS = ["", ".", "abc", "NaN", "inf", "1e", "1.2.3", "--1", "1e999", "\u0661"]
+FORMAT_FIXED_CASES = [
+    (300012000000, "3000.12"),
+    (6500000000000, "65000.0"),
+    (1000, "0.00001"),
+    (-250000000, "-2.5"),
+    (0, "0.0"),
+]
+
+# Contracts are self-contained, so each carries its own copy of
+# parse_fixed / format_fixed: (path from the repo root, parse name, format name)
+FIXED_POINT_COPIES = [
+    ("contracts/oracle_consumer.py", "_parse_fixed", "_format_fixed"),
+    ("contracts/api-key-patterns/encrypted_onchain_oracle.py", "_parse_fixed", "_format_fixed"),
+    ("contracts/api-key-patterns/key_rotation_oracle.py", "_parse_fixed", "_format_fixed"),
+    ("contracts/api-key-patterns/off_chain_proxy_oracle.py", "_parse_fixed", "_format_fixed"),
+    ("packages/genvm-web-fetcher/DEPLOY_READY/simple_price_feed_complete.py", "parse_fixed", "format_fixed"),
+]
+
+
+@pytest.mark.parametrize("text, value", PARSE_FIXED_CASES)
+def test_parse_fixed(text, value):
+    assert parse_fixed(text) == value
+
+
+@pytest.mark.parametrize("text", NOT_DECIMALS)
+def test_parse_fixed_rejects_non_decimals(text):
+    with pytest.raises(ValueError):
+        parse_fixed(text)
+
+
+@pytest.mark.parametrize("value, text", FORMAT_FIXED_CASES)
+def test_format_fixed_matches_str_of_float(value, text):
+    assert format_fixed(value) == text
+    assert parse_fixed(text) == value
+
+
+@pytest.mark.parametrize("path, parse_name, format_name", FIXED_POINT_COPIES)
+def test_fixed_point_copies_agree_with_the_library(path, parse_name, format_name):
+    module = genvm_local.load_contract(os.path.join(HERE, "..", "..", path))
+    parse, format_ = getattr(module, parse_name), getattr(module, format_name)
+    for text, value in PARSE_FIXED_CASES:
+        assert parse(text) == value, text
+    for text in NOT_DECIMALS:
+        with pytest.raises(ValueError):
+            parse(text)
+    for value, text in FORMAT_FIXED_CASES:
+        assert format_(value) == text, value
+    assert parse("3000.123", decimals=2) == parse_fixed("3000.123", decimals=2) == 300012
+    assert format_(300012, decimals=2) == format_fixed(300012, decimals=2) == "3000.12"
+
+
+def test_to_fixed():
+    f = fetcher()
+    assert f.to_fixed("p", "3000.12000000") == 300012000000
+    assert f.to_fixed("p", 65000) == 6500000000000
+    assert f.to_fixed("p", 3000.5) == 300050000000
+    assert f.to_fixed("p", "1.5", decimals=2) == 150
+    for bad in ("abc", None, True, float("nan"), float("inf")):
+        with pytest.raises(genvm_local.stub.UserError, match="p: parse fixed-point error"):
+            f.to_fixed("p", bad)
+
+
+def test_json_can_keep_decimals_as_text():
+    resp = genvm_local.FakeResponse(200, b'{"ethereum": {"usd": 3000.12345678901, "n": 1}}')
+    assert fetcher().json(resp, "cg", parse_float=str) == {"ethereum": {"usd": "3000.12345678901", "n": 1}}
+
+
+def test_retry_policy_retries_server_errors(runtime, transport):
+    transport.add("example.com", body=b"{}")
+    transport.add("example.com", status=503, times=2)
+    sleeps = []
+    f = fetcher(retry=RetryPolicy(max_attempts=3, rng=random.Random(0), sleep=sleeps.append))
+    assert f.get("https://example.com/data").status == 200
+    assert transport.count("example.com") == 3
+    assert len(sleeps) == 2 and all(0 <= s <= 0.4 for s in sleeps)
+    assert f.metrics() == {
+        "calls": 1, "attempts": 3, "retries": 2, "failures": 0,
+        "attempts_per_call": {3: 1}, "errors_by_kind": {"server": 2},
     }
-    
-    print("\nTesting pattern methods...")
-    for pattern, methods in patterns.items():
-        for method in methods:
-            print(f"✅ {pattern}.{method}() exists")
-    
-    return True
-
-def validate_structure():
-    """Validate library structure"""
-    print("\nValidating library structure...")
-    
-    checks = [
-        "✅ WebFetcher class exists",
-        "✅ All utility methods present (get, json, text, ensure_status)",
-        "✅ Error handling with gl.vm.UserError",
-        "✅ Multi-source fallback logic present",
-        "✅ Pre-built patterns available"
+
+
+def test_retry_policy_does_not_retry_client_errors(runtime, transport):
+    transport.add("example.com", status=404)
+    f = fetcher(retry=RetryPolicy(max_attempts=5, sleep=lambda s: None))
+    with pytest.raises(FetchError):
+        f.get("https://example.com/data")
+    assert transport.count() == 1
+    assert f.metrics()["failures"] == 1
+
+
+def test_retry_policy_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=2.0, rng=random.Random(1))
+    delays = [policy.backoff(n) for n in range(1, 10)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) == len(delays)
+    rate_limited = FetchError("x", "rate_limited")
+    assert policy.delay_for(rate_limited, 1, cooldown=1.5) >= 1.5
+    assert policy.delay_for(rate_limited, 1, cooldown=30) is None
+    assert policy.delay_for(FetchError("x", "client"), 1) is None
+    assert policy.delay_for(FetchError("x", "server"), 10) is None
+
+
+def test_expired_deadline_makes_no_request(runtime, transport):
+    clock = FakeClock()
+    deadline = Deadline(5, clock=clock)
+    clock.now += 5
+    with pytest.raises(FetchError) as info:
+        fetcher().get("https://example.com/data", deadline=deadline)
+    assert info.value.kind == "deadline"
+    assert transport.requests == []
+
+
+def test_retry_after_starts_cooldown_for_the_quota_key(runtime, transport):
+    transport.add("api.binance.com", status=429, headers={"Retry-After": "30"})
+    f = fetcher()
+    with pytest.raises(FetchError):
+        f.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT")
+    with pytest.raises(FetchError) as info:
+        f.get("https://api1.binance.com/api/v3/ticker/price?symbol=ETHUSDT")
+    assert info.value.kind == "throttled"
+    assert transport.count() == 1
+    assert 29 < f.cooldowns.remaining("binance.com") <= 30
+
+
+def test_host_cooldowns_parse_headers():
+    clock = FakeClock()
+    cooldowns = HostCooldowns(clock=clock, wall_clock=lambda: 120.0)
+    assert cooldowns.observe("a", 429, {}) == 30.0
+    assert cooldowns.observe("b", 503, {}) == 0.0
+    assert cooldowns.observe("c", 503, {"retry-after": b"12"}) == 12.0
+    assert cooldowns.observe("d", 200, {"X-MBX-USED-WEIGHT-1M": "5999"}) == 60.0
+    assert cooldowns.observe("e", 200, {"X-MBX-USED-WEIGHT-1M": "10"}) == 0.0
+    assert cooldowns.observe("f", 429, {"Retry-After": "10000"}) == 10000
+    assert cooldowns.snapshot() == {"a": 30.0, "c": 12.0, "d": 60.0, "f": 300.0}
+    clock.now += 31
+    assert cooldowns.snapshot() == {"d": 29.0, "f": 269.0}
+
+
+def test_budget_caps_requests_per_quota_key(runtime, transport):
+    f = fetcher(budgets={"binance.com": 2})
+    for host in BINANCE_HOSTS[:2]:
+        f.get(f"{host}/api/v3/ticker/price?symbol=ETHUSDT")
+    with pytest.raises(FetchError) as info:
+        f.get(f"{BINANCE_HOSTS[2]}/api/v3/ticker/price?symbol=ETHUSDT")
+    assert info.value.kind == "throttled"
+    assert transport.count(BINANCE) == 2
+
+
+def test_local_rate_limiter_fails_fast(runtime, transport):
+    clock = FakeClock()
+    limiter = KeyedRateLimiter(rate=1, burst=2, clock=clock)
+    f = fetcher(limiter=limiter)
+    f.get("https://api.coingecko.com/api/v3/simple/price?ids=ethereum")
+    f.get("https://api.coingecko.com/api/v3/simple/price?ids=ethereum")
+    with pytest.raises(FetchError, match="over local rate limit"):
+        f.get("https://api.coingecko.com/api/v3/simple/price?ids=ethereum")
+    assert transport.count() == 2
+    clock.now += 1
+    f.get("https://api.coingecko.com/api/v3/simple/price?ids=ethereum")
+    assert transport.count() == 3
+
+
+def sliding_window(clock, events):
+    """60s / 10-event sliding-window limiter; `events` is [(time, count)], the first opening the window at 0."""
+    limiter = KeyedRateLimiter(rate=10 / 60, algorithm="sliding_window", window=60, clock=clock)
+    for at, count in events:
+        clock.now = at
+        for _ in range(count):
+            assert limiter.allow("ip")
+    return limiter
+
+
+def test_sliding_window_has_no_double_burst_at_the_window_edge():
+    clock = FakeClock(0.0)
+    limiter = sliding_window(clock, [(0, 1), (59, 9)])
+    assert not limiter.allow("ip")
+    clock.now = 61  # a fixed window would allow 10 more here
+    assert not limiter.allow("ip")
+    clock.now = 90  # half of the last window has slid out
+    assert [limiter.allow("ip") for _ in range(6)] == [True] * 5 + [False]
+    assert limiter.metrics()["allowed"] == 15
+
+
+@pytest.mark.parametrize("events, retry_at, wait", [
+    ([(0, 1), (59, 9)], 60, 6.0),  # full previous window: its weighted share has to drop by one event
+    ([(0, 10)], 10, 56.0),  # full current window: it carries over as the previous one
+    ([(0, 1), (30, 9)], 45, 21.0),
+])
+def test_sliding_window_retry_after_is_when_the_next_event_fits(events, retry_at, wait):
+    clock = FakeClock(0.0)
+    limiter = sliding_window(clock, events)
+    clock.now = retry_at
+    assert limiter.try_acquire("ip") == pytest.approx(wait)
+    clock.now = retry_at + wait - 0.01
+    assert not limiter.allow("ip")
+    clock.now = retry_at + wait + 1e-6
+    assert limiter.allow("ip")
+
+
+def test_keyed_rate_limiter_evicts_the_least_recently_used_key():
+    limiter = KeyedRateLimiter(rate=1, burst=1, max_keys=2, clock=FakeClock())
+    assert limiter.allow("a") and limiter.allow("b")
+    assert not limiter.allow("a")  # now "b" is the least recently used
+    assert limiter.allow("c")
+    assert limiter.metrics()["evicted"] == 1
+    assert not limiter.allow("a")  # kept, still out of tokens
+    assert limiter.allow("b")  # evicted, so it starts again with a full bucket
+    assert limiter.metrics() == {"checks": 6, "allowed": 4, "throttled": 2, "evicted": 2, "tracked_keys": 2}
+
+
+def test_tracer_records_fetch_status_decode_parse(runtime, transport):
+    tracer = Tracer()
+    f = fetcher(tracer=tracer)
+    f.json(f.get("https://api.open-meteo.com/v1/forecast?latitude=1&longitude=2"), "weather")
+    assert [span["name"] for span in tracer.spans] == ["fetch", "status", "decode", "parse"]
+    assert all(span["outcome"] == "ok" for span in tracer.spans)
+    assert tracer.spans[0]["bytes"] == tracer.spans[2]["bytes"] > 0
+
+    transport.add("example.com", status=500)
+    with pytest.raises(FetchError):
+        f.get("https://example.com/x")
+    assert tracer.spans[-1]["name"] == "status"
+    assert tracer.spans[-1]["outcome"] == "server"
+    assert tracer.summary()["status"]["errors"] == 1
+
+
+# ----------------------------------------------------------------------
+# PriceFeedPattern
+# ----------------------------------------------------------------------
+
+def coingecko_eth(transport, usd=3000.5):
+    transport.add(COINGECKO, json={"ethereum": {"usd": usd}})
+
+
+def test_price_from_first_binance_mirror(runtime, transport):
+    assert PriceFeedPattern(fetcher()).get_price("ETH") == {"price": 300012000000, "source": "binance"}
+    assert transport.requests == [f"{BINANCE_HOSTS[0]}/api/v3/ticker/price?symbol=ETHUSDT"]
+
+
+def test_price_falls_back_through_mirrors_in_order(runtime, transport):
+    for host in BINANCE_HOSTS[:3]:
+        transport.add(host + "/", status=503)
+    assert PriceFeedPattern(fetcher()).get_price("ETH")["source"] == "binance"
+    assert transport.requests == [f"{host}/api/v3/ticker/price?symbol=ETHUSDT" for host in BINANCE_HOSTS[:4]]
+
+
+def test_price_falls_back_to_coingecko_after_all_mirrors(runtime, transport):
+    transport.add(BINANCE, error="unreachable")
+    coingecko_eth(transport)
+    assert PriceFeedPattern(fetcher()).get_price("ETH") == {"price": 300050000000, "source": "coingecko"}
+    assert transport.count(BINANCE) == len(BINANCE_HOSTS)
+    assert transport.requests[-1].startswith("https://" + COINGECKO)
+
+
+def test_client_error_skips_remaining_mirrors(runtime, transport):
+    transport.add(BINANCE, status=400, json={"code": -1121, "msg": "Invalid symbol."})
+    coingecko_eth(transport)
+    assert PriceFeedPattern(fetcher()).get_price("ETH")["source"] == "coingecko"
+    assert transport.count(BINANCE) == 1
+
+
+def test_rate_limited_mirror_cools_down_the_other_mirrors(runtime, transport):
+    transport.add(BINANCE, status=429, headers={"Retry-After": "60"})
+    coingecko_eth(transport)
+    f = fetcher()
+    assert PriceFeedPattern(f).get_price("ETH")["source"] == "coingecko"
+    assert transport.count(BINANCE) == 1
+    assert f.metrics()["errors_by_kind"] == {"rate_limited": 1, "throttled": len(BINANCE_HOSTS) - 1}
+
+
+def test_all_price_sources_failing_raises_user_error(runtime, transport):
+    transport.add(BINANCE, status=500)
+    transport.add(COINGECKO, status=500)
+    with pytest.raises(genvm_local.stub.UserError, match="all price sources failed for ETH"):
+        PriceFeedPattern(fetcher()).get_price("ETH")
+
+
+def test_no_coingecko_fallback_when_disabled(runtime, transport):
+    transport.add(BINANCE, status=500)
+    with pytest.raises(genvm_local.stub.UserError):
+        PriceFeedPattern(fetcher()).get_price("ETH", coingecko_fallback=False)
+    assert transport.count(COINGECKO) == 0
+
+
+@pytest.mark.parametrize("price", ["NaN", "inf", "-1", "0"])
+def test_non_finite_or_non_positive_prices_are_rejected(runtime, transport, price):
+    transport.add(BINANCE, json={"price": price})
+    transport.add(COINGECKO, status=500)
+    with pytest.raises(genvm_local.stub.UserError, match="all price sources failed"):
+        PriceFeedPattern(fetcher()).get_price("ETH")
+
+
+def test_bad_binance_price_falls_through_to_the_next_source(runtime, transport):
+    transport.add(BINANCE_HOSTS[0] + "/", json={"price": "NaN"})
+    assert PriceFeedPattern(fetcher()).get_price("ETH") == {"price": 300012000000, "source": "binance"}
+    transport.reset()
+    transport.add(BINANCE, json={"price": "0"})
+    coingecko_eth(transport)
+    assert PriceFeedPattern(fetcher()).get_price("ETH")["source"] == "coingecko"
+
+
+@pytest.mark.parametrize("symbol, coin_id", [("BTC", "bitcoin"), ("eth", "ethereum"), ("AVAX", "avalanche-2")])
+def test_coingecko_fallback_uses_the_registry_id(runtime, transport, symbol, coin_id):
+    transport.add(BINANCE, status=400)
+    transport.add(COINGECKO, json={coin_id: {"usd": 12.5}})
+    assert PriceFeedPattern(fetcher()).get_price(symbol) == {"price": 1250000000, "source": "coingecko"}
+    assert transport.requests[0].endswith(f"symbol={symbol.upper()}USDT")
+    assert transport.requests[1] == f"https://{COINGECKO}?ids={coin_id}&vs_currencies=usd"
+
+
+def test_deploy_ready_coingecko_fallback_uses_the_registry_id(transport):
+    genvm_local.install(genvm_local.Runtime(transport))
+    module = genvm_local.load_contract(os.path.join(HERE, "DEPLOY_READY", "simple_price_feed_complete.py"))
+    with open(os.path.join(HERE, "symbols.json"), encoding="utf-8") as f:
+        registry = {symbol: entry["coingecko"] for symbol, entry in json.load(f)["symbols"].items()}
+    assert module.COINGECKO_IDS == registry
+    transport.add(BINANCE, status=500)
+    coingecko_eth(transport)
+    assert module.PriceFeedPattern().get_price("ETH") == {"price": 300050000000, "source": "coingecko"}
+    assert transport.requests[-1] == f"https://{COINGECKO}?ids=ethereum&vs_currencies=usd"
+
+
+def test_sources_a_symbol_is_not_listed_on_are_skipped(runtime, transport):
+    # No Binance pair: straight to Coingecko in one request
+    transport.add(COINGECKO, json={"tether": {"usd": 1.0}})
+    assert PriceFeedPattern(fetcher()).get_price("USDT") == {"price": 100000000, "source": "coingecko"}
+    assert transport.requests == [f"https://{COINGECKO}?ids=tether&vs_currencies=usd"]
+
+    # Unknown symbol: Binance only, no request for a guessed Coingecko id
+    transport.reset()
+    transport.add(BINANCE, status=400)
+    with pytest.raises(genvm_local.stub.UserError, match="all price sources failed for NOPE"):
+        PriceFeedPattern(fetcher()).get_price("NOPE")
+    assert transport.requests == [f"{BINANCE_HOSTS[0]}/api/v3/ticker/price?symbol=NOPEUSDT"]
+
+
+def test_builtin_symbols_match_the_snapshot_file():
+    with open(os.path.join(HERE, "symbols.json")) as f:
+        snapshot = json.load(f)
+    assert SYMBOLS.snapshot()["symbols"] == snapshot["symbols"]
+
+
+def test_symbol_registry_lookups_and_refresh(tmp_path):
+    registry = SymbolRegistry()
+    assert registry.get("btc").coingecko == "bitcoin"
+    assert registry.by_coingecko_id("ethereum").symbol == "ETH"
+    assert registry.get("NOPE") is None and "NOPE" not in registry
+    assert registry.resolve("nope").binance == "NOPEUSDT" and registry.resolve("nope").coingecko is None
+
+    path = tmp_path / "symbols.json"
+    path.write_text(json.dumps({"symbols": {"NOPE": {"binance": None, "coingecko": "nope-coin", "decimals": 6}}}))
+    assert registry.refresh(str(path)) == 1
+    assert len(registry) == 1 and registry.get("nope").coingecko == "nope-coin"
+    assert registry.get("BTC") is None
+
+    path.write_text("{not json")
+    with pytest.raises(ValueError, match="symbol snapshot"):
+        registry.refresh(str(path))
+    assert registry.get("nope").decimals == 6
+    assert len(SymbolRegistry.from_snapshot(os.path.join(HERE, "symbols.json"))) == len(SYMBOLS)
+
+
+def test_expired_deadline_stops_the_fallback_chain(runtime, transport):
+    clock = FakeClock()
+    deadline = Deadline(1, clock=clock)
+    transport.add(BINANCE_HOSTS[0] + "/", handler=lambda url, headers: _advance(clock, 2, genvm_local.FakeResponse(503)))
+    with pytest.raises(FetchError) as info:
+        PriceFeedPattern(fetcher()).get_price("ETH", deadline=deadline)
+    assert info.value.kind == "deadline"
+    assert transport.count() == 1
+
+
+def _advance(clock, seconds, response):
+    clock.now += seconds
+    return response
+
+
+# ----------------------------------------------------------------------
+# ResultCodec
+# ----------------------------------------------------------------------
+
+CODEC = ResultCodec({"prices": "P", "price": "p", "source": "s"})
+MULTI = {"prices": {"ETH": {"price": 300012000000, "source": "binance"},
+                    "BTC": {"price": 6500000000000, "source": "coingecko"}}, "missing": ["NOPE"]}
+
+
+def test_result_codec_text_is_canonical_and_compact():
+    text = CODEC.encode(MULTI)
+    assert text == ('{"P":{"BTC":{"p":6500000000000,"s":"coingecko"},"ETH":{"p":300012000000,"s":"binance"}},'
+                    '"missing":["NOPE"]}')
+    reordered = {"missing": ["NOPE"], "prices": dict(reversed(list(MULTI["prices"].items())))}
+    assert CODEC.encode(reordered) == text
+    assert CODEC.decode(text) == MULTI
+
+
+@pytest.mark.parametrize("value", [
+    MULTI, None, True, False, 0, -1, 2**100, -2**100, "", "é€𝄞", b"\x00\xff", [], {}, [[{"a": [None]}]],
+])
+def test_result_codec_binary_round_trips(value):
+    data = CODEC.encode_binary(value)
+    assert CODEC.decode(data) == value
+    assert CODEC.encode_binary(CODEC.decode(data)) == data
+
+
+def test_result_codec_binary_is_smaller_than_text():
+    assert len(CODEC.encode_binary(MULTI)) < len(CODEC.encode(MULTI)) < len(json.dumps(MULTI))
+
+
+@pytest.mark.parametrize("text", [
+    '{"P": {}}', '{"b":1,"a":2}', '{"a":1,"a":1}', '{"a":1.5}', '{"a":NaN}', '{"a":-0}', '"\\u00e9"', "{",
+])
+def test_result_codec_rejects_non_canonical_text(text):
+    with pytest.raises(ValueError):
+        CODEC.decode(text)
+
+
+@pytest.mark.parametrize("data", [
+    b"\x0e",                  # truncated: map of one entry with no entry
+    b"\x01\x01",             # trailing byte
+    b"\x81\x00",             # non-minimal header
+    b"\x07",                  # unknown type
+    b"\x18",                  # special value 3
+    b"\x0c\xff",             # invalid UTF-8
+    b"\x16\x08b\x08\x08a\x08",  # map keys out of order
+    b"\x16\x08a\x08\x08a\x08",  # duplicate map key
+    b"\xff" * 20,             # oversized header
+])
+def test_result_codec_rejects_non_canonical_binary(data):
+    with pytest.raises(ValueError):
+        CODEC.decode(data)
+
+
+def test_result_codec_rejects_floats_and_bad_tags():
+    for value in ({"price": 3000.12}, [1.0], {1: "x"}, {"a": object()}):
+        with pytest.raises(TypeError):
+            CODEC.encode_binary(value)
+    with pytest.raises(ValueError):
+        CODEC.decode(42.0)
+    with pytest.raises(ValueError, match="unique"):
+        ResultCodec({"price": "p", "prices": "p"})
+    with pytest.raises(ValueError, match="field name"):
+        ResultCodec({"price": "p", "p": "q"})
+
+
+# ----------------------------------------------------------------------
+# Source digests
+# ----------------------------------------------------------------------
+
+ETH_URL = f"{BINANCE_HOSTS[0]}/api/v3/ticker/price?symbol=ETHUSDT"
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast?latitude=21.0&longitude=105.8&current_weather=true"
+
+
+def test_price_digest_names_the_source_and_hashes_the_fields(runtime, transport):
+    result = PriceFeedPattern(fetcher()).get_price("ETH", digest=True)
+    digest = result["digest"]
+    assert digest["url"] == ETH_URL
+    assert abs(digest["ts"] - time.time()) < 5
+    assert digest["hash"] == digest_hash(ETH_URL, digest["ts"], {"price": 300012000000, "source": "binance"})
+    assert len(digest["hash"]) == 16
+    assert "digest" not in PriceFeedPattern(fetcher()).get_price("ETH")
+
+
+def test_digest_timestamp_is_the_response_date(runtime, transport):
+    transport.add(BINANCE, json={"price": "3000.12"}, headers={"Date": "Sun, 18 Oct 2026 10:00:00 GMT"})
+    result = PriceFeedPattern(fetcher()).get_price("ETH", digest=True)
+    assert result["digest"]["ts"] == calendar.timegm((2026, 10, 18, 10, 0, 0))
+
+
+def test_check_digest_verdicts():
+    fields = {"price": 300012000000, "source": "binance"}
+    digest = make_digest(ETH_URL, fields, 1000)
+    assert check_digest(digest, fields, [ETH_URL], now=1010) == "ok"
+    assert check_digest(None, fields, [ETH_URL], now=1010) == "missing"
+    assert check_digest(digest, fields, ["https://other.example/"], now=1010) == "unexpected source"
+    assert check_digest(digest, fields, [ETH_URL], max_age=120, now=1121) == "stale"
+    assert check_digest(digest, fields, [ETH_URL], max_skew=30, now=969) == "future"
+    with pytest.raises(ValueError, match="does not match"):
+        check_digest(digest, dict(fields, price=310000000000), [ETH_URL], now=1010)
+    for bad in ("abc", {"url": ETH_URL, "ts": 1000}, dict(digest, ts="1000"), dict(digest, ts=True)):
+        with pytest.raises(ValueError, match="malformed"):
+            check_digest(bad, fields, [ETH_URL], now=1010)
+
+
+ANCHORED = {"reference": 300000000000, "max_move_bps": 500, "update_index": 1}
+
+
+def test_verify_price_trusts_a_fresh_digest_without_requests(runtime, transport):
+    pattern = PriceFeedPattern(fetcher())
+    result = pattern.get_price("ETH", digest=True)
+    assert pattern.verify_price("ETH", result, **ANCHORED)
+    assert pattern.verify_price("ETH", result, **dict(ANCHORED, update_index=7))
+    assert transport.requests == [ETH_URL]
+
+
+@pytest.mark.parametrize("suspicious", [
+    "missing", "stale", "unexpected source", "large move", "no reference", "no bound", "no update index", "due",
+])
+def test_verify_price_refetches_a_suspicious_result(runtime, transport, suspicious):
+    pattern = PriceFeedPattern(fetcher())
+    fields = {"price": 300000000000, "source": "binance"}
+    url, ts, kwargs = ETH_URL, int(time.time()), dict(ANCHORED)
+    if suspicious == "stale":
+        ts -= 600
+    elif suspicious == "unexpected source":
+        url = "https://prices.example/eth"
+    elif suspicious == "large move":
+        kwargs["reference"] = 200000000000
+    elif suspicious == "no reference":
+        kwargs["reference"] = None
+    elif suspicious == "no bound":
+        del kwargs["max_move_bps"]
+    elif suspicious == "no update index":
+        del kwargs["update_index"]
+    elif suspicious == "due":
+        kwargs["update_index"] = 8
+    result = dict(fields) if suspicious == "missing" else dict(fields, digest=make_digest(url, fields, ts))
+    assert pattern.verify_price("ETH", result, **kwargs)
+    assert transport.requests == [ETH_URL]
+
+    transport.add(BINANCE, json={"price": "3100.00"})
+    assert not pattern.verify_price("ETH", result, **kwargs)
+
+
+def fabricated(price):
+    """A made-up price with a digest the leader computed itself: fresh, expected URL, matching hash."""
+    fields = {"price": price, "source": "binance"}
+    return dict(fields, digest=make_digest(ETH_URL, fields, int(time.time())))
+
+
+def test_verify_price_rejects_a_fabricated_price_with_a_valid_digest(runtime, transport):
+    # The upstream says 3000.12
+    pattern = PriceFeedPattern(fetcher())
+    assert check_digest(fabricated(900000000000)["digest"], {"price": 900000000000, "source": "binance"},
+                        [ETH_URL]) == "ok"
+    assert not pattern.verify_price("ETH", fabricated(900000000000))
+    assert not pattern.verify_price("ETH", fabricated(900000000000), max_move_bps=500, update_index=1)
+    assert not pattern.verify_price("ETH", fabricated(900000000000), **ANCHORED)
+    # Within the bound it is caught on the next due update
+    assert pattern.verify_price("ETH", fabricated(314000000000), **ANCHORED)
+    assert not pattern.verify_price("ETH", fabricated(314000000000), **dict(ANCHORED, update_index=4))
+    assert len(transport.requests) == 4  # every rejection above came from a re-fetch
+
+
+def test_verify_price_moves_cannot_compound_past_the_anchor(runtime, transport):
+    # A leader adding 4% per update gets at most one step before the move from
+    # the re-fetched anchor exceeds the bound, and due updates re-fetch anyway
+    pattern = PriceFeedPattern(fetcher())
+    anchor, price, accepted = 300012000000, 300012000000, []
+    for update_index in range(1, 9):
+        price = price * 104 // 100
+        accepted.append(pattern.verify_price("ETH", fabricated(price), reference=anchor, max_move_bps=500,
+                                             update_index=update_index))
+    assert accepted == [True] + [False] * 7
+
+
+def test_verify_price_rejects_malformed_or_tampered_results(runtime, transport):
+    pattern = PriceFeedPattern(fetcher())
+    result = pattern.get_price("ETH", digest=True)
+    requests = len(transport.requests)
+    assert not pattern.verify_price("ETH", dict(result, price=310000000000))
+    assert not pattern.verify_price("ETH", dict(result, source="coingecko"))
+    assert not pattern.verify_price("BTC", dict(result, digest={"url": ETH_URL}))
+    for bad in (None, [], {"price": 0}, {"price": "3000.12"}, {"price": True}):
+        assert not pattern.verify_price("ETH", bad)
+    assert len(transport.requests) == requests
+
+
+def test_source_urls_follow_the_fallback_order():
+    pattern = PriceFeedPattern(fetcher())
+    assert pattern.source_urls("ETH")[:2] == [ETH_URL, f"{BINANCE_HOSTS[1]}/api/v3/ticker/price?symbol=ETHUSDT"]
+    assert pattern.source_urls("ETH")[-1] == f"https://{COINGECKO}?ids=ethereum&vs_currencies=usd"
+    assert pattern.source_urls("ETH", binance_hosts=[], coingecko_fallback=False) == []
+
+
+def test_verify_weather_uses_the_digest_then_refetches(runtime, transport):
+    pattern = WeatherPattern(fetcher())
+    result = pattern.get_weather(21.0, 105.8, digest=True)
+    anchored = {"reference": {"temperature": 28 * PRICE_SCALE, "condition": "3"}, "max_move": 2 * PRICE_SCALE,
+                "update_index": 1}
+    assert result["digest"]["url"] == WEATHER_URL
+    assert pattern.verify_weather(21.0, 105.8, result, **anchored)
+    assert not pattern.verify_weather(21.0, 105.8, dict(result, temperature=3500000000), **anchored)
+    assert transport.requests == [WEATHER_URL]
+
+    assert pattern.verify_weather(10.8, 106.7, result, **anchored)  # another location's URL: re-fetched
+    assert transport.requests[-1] == WEATHER_URL.replace("21.0", "10.8").replace("105.8", "106.7")
+    assert pattern.verify_weather(21.0, 105.8, result)  # no anchor: re-fetched
+    assert pattern.verify_weather(21.0, 105.8, {"temperature": 2890000000, "condition": "3"})
+    assert not pattern.verify_weather(21.0, 105.8, {"temperature": 3000000000, "condition": "3"})
+    assert not pattern.verify_weather(21.0, 105.8, {"temperature": 2840000000, "condition": "61"})
+    assert len(transport.requests) == 6
+
+
+def test_verify_weather_rejects_a_fabrication_with_a_valid_digest(runtime, transport):
+    # The upstream says 28.4 °C, condition "3"
+    pattern = WeatherPattern(fetcher())
+    anchored = {"reference": {"temperature": 28 * PRICE_SCALE, "condition": "3"}, "max_move": 2 * PRICE_SCALE,
+                "update_index": 1}
+    for fields, kwargs in [
+        ({"temperature": 4000000000, "condition": "3"}, {}),
+        ({"temperature": 4000000000, "condition": "3"}, anchored),
+        ({"temperature": 2800000000, "condition": "95"}, anchored),
+        ({"temperature": 2990000000, "condition": "3"}, dict(anchored, update_index=4)),
+    ]:
+        result = dict(fields, digest=make_digest(WEATHER_URL, fields, int(time.time())))
+        assert not pattern.verify_weather(21.0, 105.8, result, **kwargs)
+    assert len(transport.requests) == 4
+
+
+# ----------------------------------------------------------------------
+# WeatherPattern and NewsPattern
+# ----------------------------------------------------------------------
+
+def test_weather_from_open_meteo(runtime, transport):
+    assert WeatherPattern(fetcher()).get_weather(21.0, 105.8) == {"temperature": 2840000000, "condition": "3"}
+    assert transport.requests == [
+        "https://api.open-meteo.com/v1/forecast?latitude=21.0&longitude=105.8&current_weather=true"
     ]
-    
-    for check in checks:
-        print(check)
-    
-    return True
-
-if __name__ == "__main__":
-    print("=" * 50)
-    print("GenVM Web Fetcher Library - Structure Test")
-    print("=" * 50)
-    
+
+
+def test_weather_is_fixed_point_and_encodes_with_the_result_codec(runtime, transport):
+    transport.add("api.open-meteo.com", json={"current_weather": {"temperature": -3.25, "weathercode": 71}})
+    result = WeatherPattern(fetcher()).get_weather(0, 0, digest=True)
+    assert result["temperature"] == -325000000
+    codec = ResultCodec()
+    assert codec.decode(codec.encode(result)) == result
+    assert codec.decode(codec.encode_binary(result)) == result
+
+
+def test_weather_defaults_when_current_weather_is_missing(runtime, transport):
+    transport.add("api.open-meteo.com", json={})
+    assert WeatherPattern(fetcher()).get_weather(0, 0) == {"temperature": 0, "condition": "Unknown"}
+
+
+def test_weather_http_error_is_user_error(runtime, transport):
+    transport.add("api.open-meteo.com", status=502)
+    with pytest.raises(FetchError) as info:
+        WeatherPattern(fetcher()).get_weather(0, 0, name="hanoi")
+    assert info.value.kind == "server"
+
+
+def test_weather_bad_temperature(runtime, transport):
+    transport.add("api.open-meteo.com", json={"current_weather": {"temperature": "hot"}})
+    with pytest.raises(genvm_local.stub.UserError, match="hanoi temperature: parse fixed-point error"):
+        WeatherPattern(fetcher()).get_weather(0, 0, name="hanoi")
+
+
+def test_news_from_first_source(runtime, transport):
+    items = NewsPattern(fetcher()).get_news([REDDIT, RSS], limit=2)
+    assert items == [{"title": "ETH news 1", "source": "reddit"}, {"title": "ETH news 2", "source": "reddit"}]
+    assert transport.requests == [REDDIT]
+
+
+def test_news_falls_back_to_rss(runtime, transport):
+    transport.add("reddit.com", status=403)
+    items = NewsPattern(fetcher()).get_news([REDDIT, RSS], limit=10)
+    assert items == [{"title": "News item 1", "source": RSS}, {"title": "News item 2", "source": RSS}]
+    assert transport.requests == [REDDIT, RSS]
+
+
+def test_news_all_sources_failing_returns_empty(runtime, transport):
+    transport.add("reddit.com", error="reset")
+    transport.add("coindesk.com", status=500)
+    assert NewsPattern(fetcher()).get_news([REDDIT, RSS]) == []
+
+
+def test_news_stops_at_deadline(runtime, transport):
+    clock = FakeClock()
+    deadline = Deadline(0, clock=clock)
+    assert NewsPattern(fetcher()).get_news([REDDIT, RSS], deadline=deadline) == []
+    assert transport.requests == []
+
+
+# ----------------------------------------------------------------------
+# Example contracts
+# ----------------------------------------------------------------------
+
+def capture_consensus(pairs):
+    """Runtime consensus hook that records (leader, validator) and votes once."""
+    def consensus(leader, validator, leader_result, call):
+        pairs.append((leader, validator))
+        call.votes.append(bool(validator(leader_result)))
+    return consensus
+
+
+@pytest.mark.parametrize("path", ["examples/simple_price_feed.py", "DEPLOY_READY/simple_price_feed_complete.py"])
+def test_simple_price_feed_contracts(transport, path):
+    pairs = []
+    runtime = genvm_local.install(genvm_local.Runtime(transport, consensus=capture_consensus(pairs)))
+    module = genvm_local.load_contract(os.path.join(HERE, path))
+    feed = genvm_local.deploy(genvm_local.find_contract_class(module))
+    genvm_local.call(feed, "update_price")
+    assert genvm_local.call(feed, "get_price") == {"price": "3000.12", "price_e8": 300012000000, "source": "binance"}
+    calldata = dict(runtime.calls[0].leader_result.calldata)
+    calldata.pop("digest", None)
+    assert calldata == {"price": 300012000000, "source": "binance"}
+    assert runtime.calls[0].votes == [True]
+    assert runtime.calls[0].leader_requests == 1
+
+    _, validator = pairs[0]
+    Return = genvm_local.stub.Return
+    assert validator(Return({"price": 300012000000, "source": "binance"}))
+    for bad in ({"price": 0}, {"price": -5}, {"price": "3000.12"}, {"price": 3000.12}, {"price": True},
+                {"source": "binance"}, ["3000"], None):
+        assert not validator(Return(bad))
+    assert not validator(genvm_local.stub.UserError("leader failed"))
+
+
+def test_simple_price_feed_validator_trusts_the_leader_digest(transport):
+    pairs = []
+    runtime = genvm_local.install(genvm_local.Runtime(transport, consensus=capture_consensus(pairs)))
+    module = genvm_local.load_contract(os.path.join(HERE, "examples", "simple_price_feed.py"))
+    feed = genvm_local.deploy(module.SimplePriceFeed)
+    genvm_local.call(feed, "update_price")
+    genvm_local.call(feed, "update_price")
+    calldata = runtime.calls[1].leader_result.calldata
+    assert calldata["digest"]["url"] == ETH_URL
+
+    _, validator = pairs[1]
+    requests = len(transport.requests)
+    Return = genvm_local.stub.Return
+    assert validator(Return(calldata))  # update 1: not due, within 5% of update 0's price
+    assert not validator(Return(dict(calldata, price=310000000000)))
+    assert len(transport.requests) == requests
+    # A fabricated price with a digest it made itself is checked against the upstream
+    fields = {"price": 330000000000, "source": "binance"}
+    assert not validator(Return(dict(fields, digest=make_digest(ETH_URL, fields, int(time.time())))))
+    assert len(transport.requests) == requests + 1
+    # Without a digest the validator fetches the price itself
+    assert validator(Return({"price": 300012000000, "source": "binance"}))
+    assert len(transport.requests) == requests + 2
+
+
+def test_simple_price_feed_refetches_on_due_updates(transport):
+    pairs = []
+    runtime = genvm_local.install(genvm_local.Runtime(transport, consensus=capture_consensus(pairs)))
+    module = genvm_local.load_contract(os.path.join(HERE, "examples", "simple_price_feed.py"))
+    feed = genvm_local.deploy(module.SimplePriceFeed)
+    for _ in range(5):
+        genvm_local.call(feed, "update_price")
+    assert (feed.update_count, feed.anchor_price) == (5, 300012000000)
+    Return = genvm_local.stub.Return
+    fetched = []
+    for update_index, (_, validator) in enumerate(pairs):
+        requests = len(transport.requests)
+        assert validator(Return(runtime.calls[update_index].leader_result.calldata))
+        fetched.append(len(transport.requests) - requests)
+    assert fetched == [1, 0, 0, 0, 1]
+
+
+def test_multi_source_example_falls_back(transport):
+    pairs = []
+    transport.add("api.example.com", status=500)
+    transport.add("backup.example.com", json={"value": 1})
+    transport.add("fallback.example.com", json={"result": 42})
+    genvm_local.install(genvm_local.Runtime(transport, consensus=capture_consensus(pairs)))
+    module = genvm_local.load_contract(os.path.join(HERE, "examples", "multi_source_example.py"))
+    oracle = genvm_local.deploy(module.MultiSourceOracle)
+    genvm_local.call(oracle, "fetch_data")
+    assert genvm_local.call(oracle, "get_data") == {
+        "data": {"result": 42}, "source": "https://fallback.example.com/data",
+    }
+    _, validator = pairs[0]
+    assert not validator(genvm_local.stub.Return({"data": {}}))
+
+
+# ----------------------------------------------------------------------
+# Performance budgets: requests per call and peak memory on large bodies
+# ----------------------------------------------------------------------
+
+@pytest.mark.parametrize("setup, max_requests", [
+    (lambda t: None, 1),
+    (lambda t: t.add(BINANCE, status=400), 2),
+    (lambda t: t.add(BINANCE, status=429), 2),
+    (lambda t: t.add(BINANCE, status=418, headers={"Retry-After": "120"}), 2),
+    (lambda t: t.add(BINANCE, error="down"), len(BINANCE_HOSTS) + 1),
+])
+def test_price_feed_request_budget(runtime, transport, setup, max_requests):
+    setup(transport)
+    coingecko_eth(transport)
+    PriceFeedPattern(fetcher()).get_price("ETH")
+    assert len(transport.requests) <= max_requests
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
     try:
-        # Run tests
-        test_imports()
-        test_patterns()
-        validate_structure()
-        
-        print("\n" + "=" * 50)
-        print("✅ All structure checks passed!")
-        print("=" * 50)
-        print("\nNext steps:")
-        print("1. Deploy example contract to studionet")
-        print("2. Test with simple_price_feed.py")
-        print("3. Verify multi-source fallback works")
-        
-        sys.exit(0)
-    except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        sys.exit(1)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+LARGE = 4 * 1024 * 1024
+
+
+def test_json_peak_memory_on_large_body():
+    body = json.dumps({"price": "1.0", "padding": "x" * LARGE}).encode()
+    resp = genvm_local.FakeResponse(200, body)
+    f = fetcher()
+    # decode (1x) + parsed string (1x) + slack; a regression that copies the
+    # body again (e.g. bytes -> str -> bytes) pushes this over the bound
+    assert _peak_bytes(lambda: f.json(resp, "large")) < 2.5 * len(body)
+
 
+def test_rss_news_peak_memory_on_large_body(runtime, transport):
+    body = "<rss><channel>" + "<item>headline</item>" * (LARGE // 21) + "</channel></rss>"
+    transport.add("coindesk.com", body=body)
+    transport.add("reddit.com", status=403)
+    pattern = NewsPattern(fetcher())
+    assert _peak_bytes(lambda: pattern.get_news([REDDIT, RSS], limit=5)) < 1.5 * len(body)
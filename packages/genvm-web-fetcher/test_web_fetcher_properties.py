@@ -0,0 +1,193 @@
+"""
+Property-based tests for the web fetcher parse paths.
+
+Whatever an upstream sends, the parse helpers and patterns must either
+return a well-formed result or raise `gl.vm.UserError`; any other exception
+would surface as a VM error instead of a clean contract error.
+
+Requires hypothesis (skipped when it is not installed):
+    pip install pytest hypothesis
+"""
+import json
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st  # noqa: E402
+
+import genvm_local  # noqa: E402
+from web_fetcher import (  # noqa: E402
+    HostCooldowns,
+    NewsPattern,
+    PriceFeedPattern,
+    ResultCodec,
+    WeatherPattern,
+    WebFetcher,
+    format_fixed,
+    parse_fixed,
+    quota_key,
+)
+
+UserError = genvm_local.stub.UserError
+
+json_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.floats(allow_nan=False) | st.text(),
+    lambda children: st.lists(children, max_size=5) | st.dictionaries(st.text(), children, max_size=5),
+    max_leaves=20,
+)
+# Price-like strings, including the awkward ones
+price_strings = st.one_of(
+    st.floats().map(repr),
+    st.sampled_from(["NaN", "inf", "-inf", "1e400", "0", "-0.0", "", " 1.5 ", "1_000", "0x10"]),
+    st.text(max_size=12),
+)
+# What a leader may put in a result (no floats)
+result_values = st.recursive(
+    st.none() | st.booleans() | st.integers() | st.text() | st.binary(max_size=8),
+    lambda children: st.lists(children, max_size=5) | st.dictionaries(st.text(), children, max_size=5),
+    max_leaves=20,
+)
+hostnames = st.text(alphabet="abcdefghijklmnopqrstuvwxyz0123456789-.:", min_size=1, max_size=40)
+
+
+def fetcher() -> WebFetcher:
+    return WebFetcher(cooldowns=HostCooldowns())
+
+
+def runtime_with(*routes):
+    transport = genvm_local.FakeTransport()
+    for route in routes:
+        transport.add(route)
+    genvm_local.install(genvm_local.Runtime(transport))
+    return transport
+
+
+@given(st.binary(max_size=512))
+def test_json_returns_value_or_user_error(body):
+    try:
+        fetcher().json(genvm_local.FakeResponse(200, body), "fuzz")
+    except UserError:
+        pass
+
+
+@given(json_values)
+def test_json_round_trips_valid_documents(value):
+    body = json.dumps(value).encode("utf-8")
+    assert fetcher().json(genvm_local.FakeResponse(200, body), "fuzz") == value
+
+
+@given(st.binary(max_size=256))
+def test_text_returns_str_or_user_error(body):
+    try:
+        assert isinstance(fetcher().text(genvm_local.FakeResponse(200, body), "fuzz"), str)
+    except UserError:
+        pass
+
+
+@given(hostnames)
+def test_quota_key_is_stable(host):
+    key = quota_key(host)
+    assert quota_key(key) == key
+    assert quota_key("https://" + host + "/path") == quota_key(host)
+
+
+@given(st.text(max_size=40))
+def test_retry_after_never_raises(value):
+    seconds = HostCooldowns(wall_clock=lambda: 0.0)._retry_after(value)
+    assert seconds is None or isinstance(seconds, float)
+
+
+@given(st.integers(min_value=100, max_value=599), st.dictionaries(st.text(max_size=20), st.text(max_size=20)))
+def test_observe_bounds_cooldowns(status, headers):
+    cooldowns = HostCooldowns(max_cooldown=300.0)
+    cooldowns.observe("key", status, headers)
+    assert 0.0 <= cooldowns.remaining("key") <= 300.0
+
+
+@settings(max_examples=50, deadline=None)
+@given(json_values, price_strings)
+def test_price_pattern_returns_positive_fixed_point_price_or_user_error(document, price):
+    runtime_with(
+        {"match": "binance.com", "body": json.dumps(document)},
+        {"match": "coingecko.com", "json": {"ethereum": {"usd": price}}},
+    )
+    try:
+        result = PriceFeedPattern(fetcher()).get_price("ETH", binance_hosts=["https://api.binance.com"])
+    except UserError:
+        return
+    assert result["source"] in ("binance", "coingecko")
+    assert isinstance(result["price"], int) and result["price"] > 0
+
+
+@given(st.decimals(allow_nan=False, allow_infinity=False, min_value=-10**12, max_value=10**12))
+def test_parse_fixed_matches_decimal_rounding(value):
+    expected = int(value.scaleb(8).to_integral_value(rounding=ROUND_HALF_EVEN))
+    assert parse_fixed(str(value)) == expected
+    assert parse_fixed(repr(float(value))) == int(Decimal(repr(float(value))).scaleb(8).to_integral_value(
+        rounding=ROUND_HALF_EVEN))
+
+
+@given(st.integers(min_value=-10**20, max_value=10**20))
+def test_format_fixed_round_trips(value):
+    assert parse_fixed(format_fixed(value)) == value
+
+
+@given(result_values)
+def test_result_codec_round_trips_canonically(value):
+    codec = ResultCodec()
+    data = codec.encode_binary(value)
+    assert codec.decode(data) == value
+    assert codec.encode_binary(codec.decode(data)) == data
+    try:
+        text = codec.encode(value)
+    except TypeError:
+        return  # bytes have no text form
+    assert codec.decode(text) == value
+
+
+@given(st.binary(max_size=64) | st.text(max_size=64))
+def test_result_codec_decode_returns_value_or_value_error(data):
+    codec = ResultCodec()
+    try:
+        value = codec.decode(data)
+    except ValueError:
+        return
+    # Whatever decodes is canonical: it re-encodes to the same input
+    if isinstance(data, str):
+        assert codec.encode(value) == data
+    else:
+        assert codec.encode_binary(value) == data
+
+
+@settings(max_examples=50, deadline=None)
+@given(json_values, json_values)
+def test_verify_price_returns_a_bool_for_any_leader_result(result, digest):
+    runtime_with({"match": "binance.com", "body": json.dumps({"price": "3000.12"})})
+    pattern = PriceFeedPattern(fetcher())
+    assert pattern.verify_price("ETH", result) in (True, False)
+    candidate = {"price": 300012000000, "source": "binance", "digest": digest}
+    assert pattern.verify_price("ETH", candidate) in (True, False)
+
+
+@settings(max_examples=50, deadline=None)
+@given(json_values)
+def test_weather_pattern_returns_fixed_point_or_user_error(document):
+    runtime_with({"match": "open-meteo.com", "body": json.dumps(document)})
+    try:
+        result = WeatherPattern(fetcher()).get_weather(0, 0)
+    except UserError:
+        return
+    assert isinstance(result["temperature"], int) and not isinstance(result["temperature"], bool)
+    assert isinstance(result["condition"], str)
+
+
+@settings(max_examples=50, deadline=None)
+@given(json_values | st.text(max_size=200), st.integers(min_value=0, max_value=20))
+def test_news_pattern_never_raises_and_respects_limit(document, limit):
+    body = document if isinstance(document, str) else json.dumps(document)
+    runtime_with({"match": "reddit.com", "body": body}, {"match": "coindesk.com", "body": body})
+    items = NewsPattern(fetcher()).get_news(
+        ["https://www.reddit.com/r/x/hot.json", "https://www.coindesk.com/rss/"], limit=limit
+    )
+    assert len(items) <= limit
@@ -6,17 +6,475 @@ A reusable library for fetching data from external APIs in GenVM Python contract
 Provides error handling, multi-source fallback, and common patterns.
 
 """
+import hashlib
 import json
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import genlayer.gl as gl
 
 
+def quota_key(url_or_host: str) -> str:
+    """
+    Key under which upstream quotas are tracked for a URL or host.
+    
+    Hosts are grouped by their last two DNS labels, because API mirrors share
+    one quota (every *.binance.com mirror counts against the same IP weight).
+    IP addresses and single-label hosts keep their full host:port. Public
+    suffixes such as co.uk are not special-cased.
+    """
+    netloc = urlsplit(url_or_host).netloc if "://" in url_or_host else url_or_host
+    host = netloc.rsplit("@", 1)[-1].lower()
+    hostname = host.split(":", 1)[0]
+    labels = hostname.split(".")
+    if len(labels) <= 2 or hostname.replace(".", "").isdigit() or hostname.startswith("["):
+        return host
+    return ".".join(labels[-2:])
+
+
+# Prices are integers scaled by PRICE_SCALE (8 decimals, Binance's quote
+# precision): 3000.12 USD is 300012000000. They are parsed straight from the
+# response text and stay integers through leader results, calldata, storage
+# and validator checks; format_fixed renders them only for display.
+PRICE_DECIMALS = 8
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+
+def parse_fixed(text: str, decimals: int = PRICE_DECIMALS) -> int:
+    """
+    Parse a decimal string ("3000.12000000", "-2.5", "1e-05") into an
+    integer scaled by 10**decimals, without going through float.
+    
+    Digits beyond `decimals` are rounded half to even. Raises ValueError
+    for anything that is not a finite decimal number.
+    """
+    mantissa, has_exponent, exponent = text.strip().lower().partition("e")
+    sign = 1
+    if mantissa[:1] in ("-", "+"):
+        sign = -1 if mantissa[0] == "-" else 1
+        mantissa = mantissa[1:]
+    whole, _, fraction = mantissa.partition(".")
+    digits = whole + fraction
+    exponent_digits = exponent[1:] if exponent[:1] in ("-", "+") else exponent
+    if not (digits.isdigit() and digits.isascii()) or (
+            has_exponent and not (exponent_digits.isdigit() and exponent_digits.isascii())):
+        raise ValueError(f"not a decimal number: {text!r}")
+    shift = decimals - len(fraction) + (int(exponent) if has_exponent else 0)
+    value = int(digits)
+    if shift >= 0:
+        if len(digits) + shift > 60:
+            raise ValueError(f"decimal out of range: {text!r}")
+        return sign * value * 10 ** shift
+    if -shift > len(digits):
+        return 0
+    divisor = 10 ** -shift
+    quotient, remainder = divmod(value, divisor)
+    if remainder * 2 > divisor or (remainder * 2 == divisor and quotient % 2):
+        quotient += 1
+    return sign * quotient
+
+
+def format_fixed(value: int, decimals: int = PRICE_DECIMALS) -> str:
+    """Decimal string of a scaled integer, trailing zeros trimmed: 300012000000 -> "3000.12"."""
+    whole, fraction = divmod(abs(value), 10 ** decimals)
+    fraction_str = str(fraction).rjust(decimals, "0").rstrip("0") or "0"
+    return f"{'-' if value < 0 else ''}{whole}.{fraction_str}"
+
+
+def _header(headers, name: str):
+    """Case-insensitive header lookup; GenVM may return values as bytes."""
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value.decode("latin-1") if isinstance(value, bytes) else str(value)
+    return None
+
+
+class HostCooldowns:
+    """
+    Upstream cooldowns learned from throttling responses.
+    
+    - 429 / 418 (Binance IP ban) / 503 responses cool the host's quota key down
+      for their Retry-After (seconds or HTTP date), or `default_cooldown`
+    - Binance `X-MBX-USED-WEIGHT-1M` at or above `weight_headroom` of
+      `weight_limit` cools Binance down until the next minute boundary
+    
+    State is per process and shared by every `WebFetcher` by default, so a
+    429 seen by one pattern makes later calls skip that upstream immediately.
+    
+    Args:
+        default_cooldown: Seconds to back off when no Retry-After is given
+        max_cooldown: Upper bound for server-provided cooldowns
+        weight_limit: Binance request weight limit per minute
+        weight_headroom: Fraction of weight_limit that triggers a cooldown
+        max_hosts: Maximum tracked keys (expired entries are pruned first)
+        clock: Monotonic time source
+        wall_clock: Wall time source (for HTTP dates and minute boundaries)
+    """
+    
+    THROTTLE_STATUSES = (418, 429, 503)
+    
+    def __init__(self, default_cooldown: float = 30.0, max_cooldown: float = 300.0,
+                 weight_limit: int = 6000, weight_headroom: float = 0.9, max_hosts: int = 256,
+                 clock=time.monotonic, wall_clock=time.time):
+        self.default_cooldown = default_cooldown
+        self.max_cooldown = max_cooldown
+        self.weight_limit = weight_limit
+        self.weight_headroom = weight_headroom
+        self.max_hosts = max_hosts
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._until = {}
+        self.started = 0
+        self.skipped = 0
+    
+    def remaining(self, key: str) -> float:
+        """Seconds left in `key`'s cooldown (0.0 if none)."""
+        until = self._until.get(key)
+        if until is None:
+            return 0.0
+        left = until - self.clock()
+        if left <= 0:
+            del self._until[key]
+            return 0.0
+        return left
+    
+    def cool_down(self, key: str, seconds: float) -> None:
+        """Skip `key` for the next `seconds` (extends, never shortens)."""
+        seconds = min(max(seconds, 0.0), self.max_cooldown)
+        if seconds <= 0:
+            return
+        now = self.clock()
+        if len(self._until) >= self.max_hosts and key not in self._until:
+            self._until = {k: u for k, u in self._until.items() if u > now}
+            if len(self._until) >= self.max_hosts:
+                self._until.pop(min(self._until, key=self._until.get))
+        self._until[key] = max(self._until.get(key, 0.0), now + seconds)
+        self.started += 1
+    
+    def _retry_after(self, value):
+        """Retry-After header (delta seconds or HTTP date) -> seconds, or None."""
+        if value is None:
+            return None
+        value = value.strip()
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - self.wall_clock()
+        except Exception:
+            return None
+    
+    def observe(self, key: str, status: int, headers) -> float:
+        """
+        Learn from a response; returns the cooldown applied (0.0 if none).
+        """
+        cooldown = 0.0
+        if status in self.THROTTLE_STATUSES:
+            retry_after = self._retry_after(_header(headers, "retry-after"))
+            if retry_after is not None:
+                cooldown = retry_after
+            elif status != 503:
+                cooldown = self.default_cooldown
+        used = _header(headers, "x-mbx-used-weight-1m") or _header(headers, "x-mbx-used-weight")
+        if used is not None:
+            try:
+                if int(used) >= self.weight_limit * self.weight_headroom:
+                    cooldown = max(cooldown, 60.0 - self.wall_clock() % 60.0)
+            except ValueError:
+                pass
+        if cooldown > 0:
+            self.cool_down(key, cooldown)
+        return cooldown
+    
+    def snapshot(self) -> dict:
+        """Active cooldowns as {key: seconds_left} (compact, for debug output)."""
+        active = {}
+        for key in list(self._until):
+            left = self.remaining(key)
+            if left > 0:
+                active[key] = round(left, 1)
+        return active
+    
+    def reset(self) -> None:
+        self._until = {}
+
+
+SHARED_COOLDOWNS = HostCooldowns()
+
+
+class FetchError(gl.vm.UserError):
+    """
+    `gl.vm.UserError` raised by `WebFetcher.get`, tagged with an error class.
+    
+    Kinds:
+        "client"       - 4xx other than 429/418: same answer on retry/mirrors
+        "rate_limited" - 429 / 418 from the upstream
+        "server"       - 5xx
+        "http"         - Any other unexpected status
+        "network"      - DNS, connect, TLS or read failure
+        "throttled"    - Skipped locally (cooldown, budget or rate limit)
+        "deadline"     - The call's Deadline expired
+    """
+    
+    def __init__(self, message: str, kind: str, status: int = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+
+
+def status_kind(status: int) -> str:
+    """Error class for an unexpected HTTP status."""
+    if status in (418, 429):
+        return "rate_limited"
+    if 500 <= status < 600:
+        return "server"
+    if 400 <= status < 500:
+        return "client"
+    return "http"
+
+
+class Deadline:
+    """
+    Total time budget shared by every request of one logical call.
+    
+    Pass the same Deadline through a fallback chain so the whole chain has a
+    bounded worst case. It is checked before each attempt and caps backoff
+    sleeps; a request already in flight is not interrupted.
+    """
+    
+    def __init__(self, seconds: float, clock=time.monotonic):
+        self.clock = clock
+        self.expires = clock() + seconds
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires - self.clock())
+    
+    def expired(self) -> bool:
+        return self.clock() >= self.expires
+    
+    def check(self, what: str) -> None:
+        """Raise FetchError(kind="deadline") if expired."""
+        if self.expired():
+            raise FetchError(f"{what}: deadline exceeded", "deadline")
+
+
+class RetryPolicy:
+    """
+    Per-error-class retry decisions with jittered exponential backoff.
+    
+    The n-th retry waits uniform(0, min(max_delay, base_delay * multiplier**(n-1)))
+    ("full jitter"), so many nodes retrying the same upstream do not
+    synchronise. For "rate_limited" errors the wait is at least the host's
+    cooldown; the call gives up instead if that exceeds max_delay.
+    
+    Args:
+        max_attempts: Attempts per URL including the first (1 = no retries)
+        base_delay: Backoff base in seconds
+        max_delay: Backoff cap in seconds
+        multiplier: Backoff growth factor
+        retry_on: Error kinds worth retrying on the same URL
+        rng: random.Random used for jitter
+        sleep: Sleep function (injectable for tests)
+    """
+    
+    DEFAULT_RETRY_ON = ("rate_limited", "server", "network")
+    
+    def __init__(self, max_attempts: int = 1, base_delay: float = 0.2, max_delay: float = 2.0,
+                 multiplier: float = 2.0, retry_on: tuple = DEFAULT_RETRY_ON, rng=None, sleep=time.sleep):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.retry_on = tuple(retry_on)
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+    
+    def backoff(self, retry: int) -> float:
+        """Jittered delay before the `retry`-th retry (1-based)."""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        return self.rng.uniform(0.0, cap)
+    
+    def delay_for(self, error: FetchError, attempt: int, cooldown: float = 0.0):
+        """
+        Seconds to wait before retrying after `attempt` failed, or None to give up.
+        """
+        if attempt >= self.max_attempts or error.kind not in self.retry_on:
+            return None
+        delay = self.backoff(attempt)
+        if error.kind == "rate_limited":
+            if cooldown > self.max_delay:
+                return None
+            delay = max(delay, cooldown)
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class _Span:
+    """One timed step; created by Tracer.span and used as a context manager."""
+    
+    __slots__ = ("tracer", "name", "target", "start", "bytes", "outcome", "error")
+    
+    def __init__(self, tracer, name: str, target: str):
+        self.tracer = tracer
+        self.name = name
+        self.target = target
+        self.bytes = 0
+        self.outcome = "ok"
+        self.error = None
+    
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end = self.tracer.clock()
+        if exc is not None:
+            self.outcome = getattr(exc, "kind", None) or type(exc).__name__
+            self.error = str(exc)[:160]
+        self.tracer._record(self, end)
+        return False
+
+
+class _NullSpan:
+    """Shared no-op span: tracing disabled costs one method call per step."""
+    
+    __slots__ = ()
+    bytes = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+    
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer that records nothing (the WebFetcher default)."""
+    
+    enabled = False
+    
+    def span(self, name: str, target: str = ""):
+        return _NULL_SPAN
+    
+    def to_dict(self) -> dict:
+        return {}
+
+
+class Tracer:
+    """
+    Records fetch / status / decode / parse spans of a WebFetcher.
+    
+    Each span keeps its name, target (URL or source name), start offset and
+    duration in milliseconds, byte count and outcome ("ok" or the error kind,
+    e.g. "server", "network", "UserError").
+    
+    Args:
+        clock: Time source in seconds (default: time.perf_counter)
+        max_spans: Spans kept; later ones are counted in `dropped` only
+    """
+    
+    enabled = True
+    
+    def __init__(self, clock=time.perf_counter, max_spans: int = 256):
+        self.clock = clock
+        self.max_spans = max_spans
+        self.origin = clock()
+        self.spans = []
+        self.dropped = 0
+    
+    def span(self, name: str, target: str = "") -> _Span:
+        return _Span(self, name, target)
+    
+    def _record(self, span: _Span, end: float) -> None:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return
+        record = {
+            "name": span.name,
+            "target": span.target,
+            "start_ms": round((span.start - self.origin) * 1000, 3),
+            "duration_ms": round((end - span.start) * 1000, 3),
+            "bytes": span.bytes,
+            "outcome": span.outcome,
+        }
+        if span.error is not None:
+            record["error"] = span.error
+        self.spans.append(record)
+    
+    def summary(self) -> dict:
+        """Per span name: {count, total_ms, bytes, errors}."""
+        totals = {}
+        for record in self.spans:
+            entry = totals.setdefault(record["name"], {"count": 0, "total_ms": 0.0, "bytes": 0, "errors": 0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + record["duration_ms"], 3)
+            entry["bytes"] += record["bytes"]
+            if record["outcome"] != "ok":
+                entry["errors"] += 1
+        return totals
+    
+    def to_dict(self) -> dict:
+        """
+        Compact form for `debug_state` style views: spans as
+        [name, target, start_ms, duration_ms, bytes, outcome] rows.
+        """
+        return {
+            "spans": [[r["name"], r["target"], r["start_ms"], r["duration_ms"], r["bytes"], r["outcome"]]
+                      for r in self.spans],
+            "dropped": self.dropped,
+        }
+    
+    def to_json_lines(self) -> str:
+        """One JSON object per span, for off-chain log shipping."""
+        return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self.spans)
+
+
+NULL_TRACER = NullTracer()
+
+
 class WebFetcher:
     """
     Core web fetcher with utility methods for common HTTP operations.
     
     Provides error handling and response parsing utilities for GenVM contracts.
+    
+    Args:
+        limiter: Optional outbound rate limiter keyed by host, e.g.
+                 `rate_limit.KeyedRateLimiter`. Calls over a host's budget fail
+                 fast with a "throttled" UserError instead of hitting the API.
+        budgets: Optional {quota_key: max requests} for this fetcher's
+                 lifetime (one contract call), e.g. {"binance.com": 2}
+        cooldowns: `HostCooldowns` to honour (default: SHARED_COOLDOWNS);
+                   quota keys in a cooldown are skipped without a request
+        retry: `RetryPolicy` for `get` (default: NO_RETRY, one attempt)
+        tracer: `Tracer` recording fetch/status/decode/parse spans
+                (default: NULL_TRACER, records nothing)
     """
     
+    def __init__(self, limiter=None, budgets: dict = None, cooldowns: HostCooldowns = None,
+                 retry: RetryPolicy = None, tracer: Tracer = None):
+        self.tracer = tracer or NULL_TRACER
+        self.limiter = limiter
+        self.budgets = dict(budgets or {})
+        self.cooldowns = cooldowns if cooldowns is not None else SHARED_COOLDOWNS
+        self.retry = retry or NO_RETRY
+        self.requests_by_key = {}
+        self.stats = {"calls": 0, "attempts": 0, "retries": 0, "failures": 0}
+        self.attempts_per_call = {}
+        self.errors_by_kind = {}
+    
     def ensure_body_bytes(self, resp, name: str) -> str:
         """
         Ensure response has body and decode to string.
@@ -31,20 +489,24 @@ class WebFetcher:
         Raises:
             gl.vm.UserError: If body is missing or decode fails
         """
-        if resp.body is None:
-            raise gl.vm.UserError(f"{name}: empty body")
-        try:
-            return resp.body.decode("utf-8")
-        except Exception:
-            raise gl.vm.UserError(f"{name}: body decode error")
+        with self.tracer.span("decode", name) as span:
+            if resp.body is None:
+                raise gl.vm.UserError(f"{name}: empty body")
+            span.bytes = len(resp.body)
+            try:
+                return resp.body.decode("utf-8")
+            except Exception:
+                raise gl.vm.UserError(f"{name}: body decode error")
     
-    def json(self, resp, name: str) -> dict:
+    def json(self, resp, name: str, parse_float=None) -> dict:
         """
         Parse JSON response with error handling.
         
         Args:
             resp: HTTP response object
             name: Name for error messages
+            parse_float: As for json.loads; `str` keeps decimals as their
+                         source text for `to_fixed`
             
         Returns:
             Parsed JSON as dictionary
@@ -53,10 +515,12 @@ class WebFetcher:
             gl.vm.UserError: If JSON parsing fails
         """
         text = self.ensure_body_bytes(resp, name)
-        try:
-            return json.loads(text)
-        except Exception:
-            raise gl.vm.UserError(f"{name}: json parse error")
+        with self.tracer.span("parse", name) as span:
+            span.bytes = len(text)
+            try:
+                return json.loads(text, parse_float=parse_float)
+            except Exception:
+                raise gl.vm.UserError(f"{name}: json parse error")
     
     def text(self, resp, name: str) -> str:
         """
@@ -81,39 +545,87 @@ class WebFetcher:
             name: Name for error messages
             
         Raises:
-            gl.vm.UserError: If status doesn't match expected
+            FetchError: If status doesn't match expected (a gl.vm.UserError)
         """
         if not resp or not hasattr(resp, 'status'):
-            raise gl.vm.UserError(f"{name}: invalid response")
+            raise FetchError(f"{name}: invalid response", "http")
         if resp.status != expected_status:
-            raise gl.vm.UserError(f"{name}: http {resp.status}")
+            raise FetchError(f"{name}: http {resp.status}", status_kind(resp.status), resp.status)
     
-    def get(self, url: str, headers: dict = None, expected_status: int = 200) -> any:
+    def get(self, url: str, headers: dict = None, expected_status: int = 200,
+            deadline: Deadline = None) -> any:
         """
-        Make GET request with error handling.
+        Make GET request with error handling and the fetcher's retry policy.
         
         Args:
             url: Target URL
             headers: Optional headers dict
             expected_status: Expected HTTP status (default: 200)
+            deadline: Optional Deadline shared with the rest of the call
             
         Returns:
             Response object
             
         Raises:
-            gl.vm.UserError: If request fails or status doesn't match
+            FetchError: A gl.vm.UserError whose `kind` tells why the request
+                failed (see FetchError), after retries are exhausted
         """
+        key = quota_key(urlsplit(url).netloc)
+        self.stats["calls"] += 1
+        attempt = 0
         try:
-            if headers is None:
-                headers = {"User-Agent": "GenVM-WebFetcher/1.0"}
-            
-            resp = gl.nondet.web.get(url, headers=headers)
+            while True:
+                attempt += 1
+                self.stats["attempts"] += 1
+                try:
+                    return self._get_once(url, headers, expected_status, deadline)
+                except FetchError as e:
+                    self.errors_by_kind[e.kind] = self.errors_by_kind.get(e.kind, 0) + 1
+                    delay = self.retry.delay_for(e, attempt, self.cooldowns.remaining(key))
+                    if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                        self.stats["failures"] += 1
+                        raise
+                    self.stats["retries"] += 1
+                    self.retry.sleep(delay)
+        finally:
+            self.attempts_per_call[attempt] = self.attempts_per_call.get(attempt, 0) + 1
+    
+    def _get_once(self, url: str, headers: dict, expected_status: int, deadline: Deadline):
+        """One attempt: local checks, request, status classification."""
+        # Local skips (deadline, cooldown, budget, limiter) show up as fetch spans too
+        with self.tracer.span("fetch", url) as span:
+            if deadline is not None:
+                deadline.check(f"GET {url}")
+            host = urlsplit(url).netloc
+            key = quota_key(host)
+            wait = self.cooldowns.remaining(key)
+            if wait > 0:
+                self.cooldowns.skipped += 1
+                raise FetchError(f"GET {url}: throttled ({key} cooling down, {wait:.0f}s left)", "throttled")
+            budget = self.budgets.get(key)
+            if budget is not None and self.requests_by_key.get(key, 0) >= budget:
+                raise FetchError(f"GET {url}: throttled ({key} budget of {budget} used)", "throttled")
+            if self.limiter is not None and not self.limiter.allow(host):
+                raise FetchError(f"GET {url}: throttled ({host} over local rate limit)", "throttled")
+            self.requests_by_key[key] = self.requests_by_key.get(key, 0) + 1
+            try:
+                if headers is None:
+                    headers = {"User-Agent": "GenVM-WebFetcher/1.0"}
+
+                resp = gl.nondet.web.get(url, headers=headers)
+            except Exception as e:
+                raise FetchError(f"GET {url}: {str(e)}", "network")
+            span.bytes = len(getattr(resp, "body", None) or b"")
+        with self.tracer.span("status", url):
+            if hasattr(resp, "status"):
+                self.cooldowns.observe(key, resp.status, getattr(resp, "headers", None))
             self.ensure_status(resp, expected_status, url)
-            return resp
-        except gl.vm.UserError:
-            raise
-        except Exception as e:
-            raise gl.vm.UserError(f"GET {url}: {str(e)}")
+        return resp
+    
+    def metrics(self) -> dict:
+        """Attempt counters, attempts-per-call histogram and errors by kind."""
+        return dict(self.stats, attempts_per_call=dict(self.attempts_per_call),
+                    errors_by_kind=dict(self.errors_by_kind))
     
     def to_float(self, name: str, val) -> float:
         """
@@ -134,6 +646,32 @@ class WebFetcher:
         except Exception:
             raise gl.vm.UserError(f"{name}: parse float error")
     
+    def to_fixed(self, name: str, val, decimals: int = PRICE_DECIMALS) -> int:
+        """
+        Convert a decimal string (or int) to a fixed-point integer.
+        
+        Args:
+            name: Name for error messages
+            val: Decimal string as sent by the API, or an int; a float is
+                 read through its shortest repr, which round-trips the
+                 JSON literal it was parsed from
+            decimals: Scale of the result (default PRICE_DECIMALS)
+            
+        Returns:
+            Integer value scaled by 10**decimals
+            
+        Raises:
+            gl.vm.UserError: If the value is not a finite decimal number
+        """
+        if isinstance(val, bool):
+            raise gl.vm.UserError(f"{name}: parse fixed-point error")
+        if isinstance(val, int):
+            return val * 10 ** decimals
+        try:
+            return parse_fixed(repr(val) if isinstance(val, float) else val, decimals)
+        except Exception:
+            raise gl.vm.UserError(f"{name}: parse fixed-point error")
+    
     def to_int(self, name: str, val) -> int:
         """
         Convert value to int with error handling.
@@ -152,84 +690,632 @@ class WebFetcher:
             return int(val)
         except Exception:
             raise gl.vm.UserError(f"{name}: parse int error")
+    
+    def digest(self, url: str, resp, fields: dict) -> dict:
+        """
+        Source digest (see check_digest) for `fields` extracted from `resp`.
+        
+        The timestamp is the response's Date header when it has one, so it
+        says when the upstream answered; otherwise the local clock.
+        """
+        timestamp = None
+        date = _header(getattr(resp, "headers", None), "date")
+        if date is not None:
+            try:
+                timestamp = parsedate_to_datetime(date).timestamp()
+            except Exception:
+                timestamp = None
+        return make_digest(url, fields, time.time() if timestamp is None else timestamp)
+
+
+# Binary result encoding: every value starts with one LEB128 header holding
+# (payload << 3) | type. The payload is the integer itself, the length of a
+# string / bytes / list / map, or 0-2 for None / False / True. Map keys are
+# written as LEB128 length + UTF-8 and sorted by their bytes.
+_T_SPECIAL, _T_UINT, _T_NINT, _T_BYTES, _T_STR, _T_LIST, _T_MAP = range(7)
+_MAX_HEADER_BYTES = 19  # payloads up to 2**130
+_MAX_DEPTH = 32
+
+
+def _not_canonical(what: str):
+    raise ValueError(f"result is not canonical: {what}")
+
+
+class ResultCodec:
+    """
+    Canonical compact encoding for leader results.
+    
+    Results are dicts and lists of str, int (prices as fixed-point ints,
+    see PRICE_SCALE), bool and None, plus bytes in the binary form; floats
+    are rejected. Dict keys found in `tags` are replaced by their short tag
+    (e.g. {"price": "p"}) and keys are sorted, so equal results always
+    encode to the same text or bytes:
+    
+    - `encode(value) -> str`: JSON without spaces, keys sorted
+    - `encode_binary(value) -> bytes`: a LEB128 header per value (type and
+      integer or length), then the payload; map keys sorted by UTF-8
+    
+    `decode` takes either form and raises ValueError for anything `encode`
+    / `encode_binary` would not have produced (unsorted or duplicate keys,
+    spaces, floats, non-minimal headers, trailing bytes). The binary form is
+    read and checked in a single pass, so a validator gets the whole result
+    structurally verified with integers ready to compare.
+    
+    Tags must not collide with data keys of the same result (e.g. keep tags
+    lowercase when data keys are ticker symbols).
+    
+    Args:
+        tags: {field name: short tag}
+    """
+    
+    def __init__(self, tags: dict = None):
+        self.tags = dict(tags or {})
+        self.names = {tag: name for name, tag in self.tags.items()}
+        if len(self.names) != len(self.tags):
+            raise ValueError("result tags must be unique")
+        if set(self.names) & set(self.tags):
+            raise ValueError("a result tag may not also be a field name")
+    
+    def _pack(self, value, table: dict, depth: int = 0):
+        """Copy of `value` with dict keys renamed through `table`; rejects floats."""
+        if depth > _MAX_DEPTH:
+            raise ValueError("result nested too deeply")
+        if isinstance(value, dict):
+            packed = {}
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise TypeError(f"result keys must be str, got {type(key).__name__}")
+                packed[table.get(key, key)] = self._pack(item, table, depth + 1)
+            return packed
+        if isinstance(value, (list, tuple)):
+            return [self._pack(item, table, depth + 1) for item in value]
+        if isinstance(value, float):
+            raise TypeError("floats are not allowed in results, use fixed-point ints")
+        if value is None or isinstance(value, (str, int, bytes)):
+            return value
+        raise TypeError(f"unsupported result type: {type(value).__name__}")
+    
+    @staticmethod
+    def _dumps(packed) -> str:
+        return json.dumps(packed, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    
+    def encode(self, value) -> str:
+        """Canonical compact JSON text of a result."""
+        return self._dumps(self._pack(value, self.tags))
+    
+    def encode_binary(self, value) -> bytes:
+        """Canonical binary form of a result."""
+        out = bytearray()
+        self._write(out, self._pack(value, self.tags))
+        return bytes(out)
+    
+    @staticmethod
+    def _header(out: bytearray, payload: int, kind: int) -> None:
+        n = (payload << 3) | kind
+        while n >= 0x80:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+    
+    def _write(self, out: bytearray, value) -> None:
+        if value is None or isinstance(value, bool):
+            self._header(out, {None: 0, False: 1, True: 2}[value], _T_SPECIAL)
+        elif isinstance(value, int):
+            if value >= 0:
+                self._header(out, value, _T_UINT)
+            else:
+                self._header(out, -value - 1, _T_NINT)
+        elif isinstance(value, str):
+            data = value.encode("utf-8")
+            self._header(out, len(data), _T_STR)
+            out += data
+        elif isinstance(value, bytes):
+            self._header(out, len(value), _T_BYTES)
+            out += value
+        elif isinstance(value, list):
+            self._header(out, len(value), _T_LIST)
+            for item in value:
+                self._write(out, item)
+        else:
+            items = sorted((key.encode("utf-8"), item) for key, item in value.items())
+            self._header(out, len(items), _T_MAP)
+            for key, item in items:
+                self._header(out, len(key), 0)  # key length only, type bits unused
+                out += key
+                self._write(out, item)
+    
+    def decode(self, data):
+        """
+        Result from its canonical text or binary form.
+        
+        Raises:
+            ValueError: If `data` is not exactly a canonical encoding
+        """
+        if isinstance(data, str):
+            return self._decode_text(data)
+        if isinstance(data, (bytes, bytearray)):
+            value, end = self._read(bytes(data), 0, 0)
+            if end != len(data):
+                _not_canonical("trailing bytes")
+            return value
+        raise ValueError(f"cannot decode a result from {type(data).__name__}")
+    
+    def _decode_text(self, text: str):
+        def no_floats(literal):
+            _not_canonical(f"float {literal}")
+        try:
+            packed = json.loads(text, parse_float=no_floats, parse_constant=no_floats)
+        except RecursionError:
+            _not_canonical("nested too deeply")
+        # Duplicate keys, spaces, escapes and key order all change the re-encoded text
+        if self._dumps(packed) != text:
+            _not_canonical("text differs from its canonical encoding")
+        return self._pack(packed, self.names)
+    
+    @staticmethod
+    def _read_header(data: bytes, pos: int) -> tuple:
+        n = shift = 0
+        start = pos
+        while True:
+            if pos >= len(data) or pos - start >= _MAX_HEADER_BYTES:
+                _not_canonical("truncated or oversized header")
+            byte = data[pos]
+            pos += 1
+            n |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        if byte == 0 and pos - start > 1:
+            _not_canonical("non-minimal header")
+        return n >> 3, n & 7, pos
+    
+    @staticmethod
+    def _read_bytes(data: bytes, pos: int, length: int) -> tuple:
+        end = pos + length
+        if end > len(data):
+            _not_canonical("truncated data")
+        return data[pos:end], end
+    
+    def _read(self, data: bytes, pos: int, depth: int) -> tuple:
+        if depth > _MAX_DEPTH:
+            _not_canonical("nested too deeply")
+        payload, kind, pos = self._read_header(data, pos)
+        if kind == _T_UINT:
+            return payload, pos
+        if kind == _T_NINT:
+            return -payload - 1, pos
+        if kind == _T_STR:
+            raw, pos = self._read_bytes(data, pos, payload)
+            return raw.decode("utf-8"), pos
+        if kind == _T_BYTES:
+            return self._read_bytes(data, pos, payload)
+        if kind == _T_LIST:
+            items = []
+            for _ in range(payload):
+                item, pos = self._read(data, pos, depth + 1)
+                items.append(item)
+            return items, pos
+        if kind == _T_MAP:
+            value = {}
+            previous = None
+            for _ in range(payload):
+                length, key_kind, pos = self._read_header(data, pos)
+                if key_kind != 0:
+                    _not_canonical("map key header")
+                raw, pos = self._read_bytes(data, pos, length)
+                if previous is not None and raw <= previous:
+                    _not_canonical("map keys not sorted or duplicated")
+                previous = raw
+                key = raw.decode("utf-8")
+                value[self.names.get(key, key)], pos = self._read(data, pos, depth + 1)
+            return value, pos
+        if kind == _T_SPECIAL and payload <= 2:
+            return (None, False, True)[payload], pos
+        _not_canonical(f"unknown type {kind}")
+
+
+# Source digests: a leader can attach the URL it read, when the upstream
+# answered and a hash binding both to the fields it extracted. The leader
+# computes that hash itself, so it proves consistency, not honesty: validators
+# skip their own fetch only for a value close to an anchor they last fetched
+# themselves, and every DIGEST_REFETCH_EVERY-th update re-fetches regardless.
+DIGEST_MAX_AGE = 120  # seconds
+DIGEST_MAX_SKEW = 30  # seconds a digest may be ahead of the validator's clock
+DIGEST_REFETCH_EVERY = 4  # updates; 1 re-fetches on every update
+
+
+def digest_hash(url: str, timestamp: int, fields: dict) -> str:
+    """First 16 hex digits of SHA-256 over canonical JSON [url, timestamp, fields]."""
+    text = json.dumps([url, timestamp, fields], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_digest(url: str, fields: dict, timestamp: int) -> dict:
+    """{"url", "ts", "hash"} for `fields` read from `url` at unix time `timestamp`."""
+    timestamp = int(timestamp)
+    return {"url": url, "ts": timestamp, "hash": digest_hash(url, timestamp, fields)}
+
+
+def check_digest(digest, fields: dict, urls, max_age: float = DIGEST_MAX_AGE,
+                 max_skew: float = DIGEST_MAX_SKEW, now: float = None) -> str:
+    """
+    Check a leader's source digest against the fields it reported.
+    
+    The hash only shows the result is what the leader extracted from the URL
+    it names; it is no proof of what the upstream sent. Callers re-fetch
+    whenever the verdict is not "ok".
+    
+    Args:
+        digest: The leader's {"url", "ts", "hash"}, or None
+        fields: The extracted fields as reported in the result
+        urls: URLs the validator would itself have fetched for this value
+        max_age: Oldest acceptable digest, in seconds
+        max_skew: How far ahead of `now` a digest may be, in seconds
+        now: Unix time (default: time.time())
+        
+    Returns:
+        "ok", or why the digest is suspicious: "missing", "unexpected source",
+        "stale" or "future"
+        
+    Raises:
+        ValueError: If the digest is malformed or its hash does not match
+            `fields`, i.e. the result is inconsistent and should be rejected
+    """
+    if digest is None:
+        return "missing"
+    if not isinstance(digest, dict) or set(digest) != {"url", "ts", "hash"}:
+        raise ValueError("malformed source digest")
+    url, timestamp, hashed = digest["url"], digest["ts"], digest["hash"]
+    if not isinstance(url, str) or not isinstance(hashed, str) or \
+            not isinstance(timestamp, int) or isinstance(timestamp, bool):
+        raise ValueError("malformed source digest")
+    if digest_hash(url, timestamp, fields) != hashed:
+        raise ValueError("source digest does not match the result")
+    if url not in urls:
+        return "unexpected source"
+    now = time.time() if now is None else now
+    if timestamp < now - max_age:
+        return "stale"
+    if timestamp > now + max_skew:
+        return "future"
+    return "ok"
+
+
+def refetch_due(update_index: int, every: int = DIGEST_REFETCH_EVERY) -> bool:
+    """
+    Whether validators must re-fetch on update number `update_index`
+    (counted by the contract from 0) even when the digest checks out.
+    
+    Update 0 and every `every`-th one after it are due, so a value accepted
+    on a digest is never more than `every - 1` updates from a re-fetch.
+    Contracts store the value accepted on a due update as the anchor they
+    pass as `reference` to verify_price / verify_weather.
+    """
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    return update_index % every == 0
+
+
+# Symbol -> (Binance USDT pair, Coingecko id, price decimals); None = not listed
+# there. Kept identical to symbols.json next to this file, which the proxies
+# load and SymbolRegistry.refresh() can read.
+_BUILTIN_SYMBOLS = {
+    "BTC": ("BTCUSDT", "bitcoin", 2),
+    "ETH": ("ETHUSDT", "ethereum", 2),
+    "BNB": ("BNBUSDT", "binancecoin", 2),
+    "SOL": ("SOLUSDT", "solana", 2),
+    "XRP": ("XRPUSDT", "ripple", 4),
+    "ADA": ("ADAUSDT", "cardano", 4),
+    "DOGE": ("DOGEUSDT", "dogecoin", 5),
+    "TRX": ("TRXUSDT", "tron", 5),
+    "AVAX": ("AVAXUSDT", "avalanche-2", 2),
+    "DOT": ("DOTUSDT", "polkadot", 3),
+    "LINK": ("LINKUSDT", "chainlink", 2),
+    "LTC": ("LTCUSDT", "litecoin", 2),
+    "UNI": ("UNIUSDT", "uniswap", 3),
+    "ATOM": ("ATOMUSDT", "cosmos", 3),
+    "NEAR": ("NEARUSDT", "near", 3),
+    "ARB": ("ARBUSDT", "arbitrum", 4),
+    "OP": ("OPUSDT", "optimism", 4),
+    "POL": ("POLUSDT", "polygon-ecosystem-token", 4),
+    "MATIC": (None, "matic-network", 4),
+    "USDC": ("USDCUSDT", "usd-coin", 4),
+    "USDT": (None, "tether", 4),
+}
+
+
+class SymbolInfo:
+    """Where one asset is quoted: Binance pair, Coingecko id, price decimals."""
+    
+    __slots__ = ("symbol", "binance", "coingecko", "decimals")
+    
+    def __init__(self, symbol: str, binance, coingecko, decimals: int):
+        self.symbol = symbol
+        self.binance = binance
+        self.coingecko = coingecko
+        self.decimals = decimals
+    
+    def __repr__(self) -> str:
+        return f"SymbolInfo({self.symbol!r}, binance={self.binance!r}, coingecko={self.coingecko!r})"
+
+
+class SymbolRegistry:
+    """
+    Symbol -> source ids, built once, with O(1) lookups both ways.
+    
+    Starts from the embedded snapshot (or `entries`, same shape as
+    _BUILTIN_SYMBOLS). `refresh(path)` swaps in a symbols.json snapshot file
+    in one assignment, so readers never see a half-loaded table.
+    
+    Unknown symbols resolve to the conventional Binance pair (SYMBOL + "USDT")
+    and no Coingecko id: the Coingecko fallback is skipped rather than
+    spending a request on a guessed id.
+    """
+    
+    def __init__(self, entries: dict = None):
+        self._by_symbol, self._by_coingecko = self._index(_BUILTIN_SYMBOLS if entries is None else entries)
+    
+    @staticmethod
+    def _index(entries: dict) -> tuple:
+        by_symbol = {}
+        by_coingecko = {}
+        for symbol, (binance, coingecko, decimals) in entries.items():
+            info = SymbolInfo(symbol.upper(), binance, coingecko, int(decimals))
+            by_symbol[info.symbol] = info
+            if coingecko:
+                by_coingecko[coingecko] = info
+        return by_symbol, by_coingecko
+    
+    @classmethod
+    def from_snapshot(cls, path: str) -> "SymbolRegistry":
+        registry = cls({})
+        registry.refresh(path)
+        return registry
+    
+    def refresh(self, path: str) -> int:
+        """
+        Replace the table with a snapshot file; returns the number of symbols.
+        
+        The file looks like symbols.json: {"symbols": {"ETH": {"binance":
+        "ETHUSDT", "coingecko": "ethereum", "decimals": 2}, ...}}. On any
+        error the current table is kept and ValueError is raised.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                symbols = json.load(f)["symbols"]
+            entries = {
+                symbol: (entry.get("binance"), entry.get("coingecko"), entry.get("decimals", 8))
+                for symbol, entry in symbols.items()
+            }
+            tables = self._index(entries)
+        except Exception as e:
+            raise ValueError(f"symbol snapshot {path}: {e}")
+        self._by_symbol, self._by_coingecko = tables
+        return len(entries)
+    
+    def get(self, symbol: str):
+        """SymbolInfo for a known symbol (any case), else None."""
+        return self._by_symbol.get(symbol.upper())
+    
+    def resolve(self, symbol: str) -> SymbolInfo:
+        """Known SymbolInfo, or the Binance-only guess for an unknown symbol."""
+        info = self._by_symbol.get(symbol.upper())
+        if info is None:
+            info = SymbolInfo(symbol.upper(), f"{symbol.upper()}USDT", None, 8)
+        return info
+    
+    def by_coingecko_id(self, coin_id: str):
+        return self._by_coingecko.get(coin_id)
+    
+    def snapshot(self) -> dict:
+        """Current table in the symbols.json format."""
+        return {"symbols": {
+            info.symbol: {"binance": info.binance, "coingecko": info.coingecko, "decimals": info.decimals}
+            for info in self._by_symbol.values()
+        }}
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._by_symbol
+    
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+
+SYMBOLS = SymbolRegistry()
 
 
 class PriceFeedPattern:
     """
     Pre-built pattern for cryptocurrency price feeds.
     
-    Supports multiple Binance mirrors with Coingecko fallback.
+    Supports multiple Binance mirrors with Coingecko fallback. Source ids
+    come from a SymbolRegistry (default: the shared SYMBOLS).
     """
     
-    def __init__(self):
-        self.fetcher = WebFetcher()
+    BINANCE_HOSTS = [
+        "https://api.binance.com",
+        "https://api-gcp.binance.com",
+        "https://api1.binance.com",
+        "https://api2.binance.com",
+        "https://api3.binance.com",
+        "https://api4.binance.com",
+    ]
     
-    def get_price(self, symbol: str, binance_hosts: list = None, coingecko_fallback: bool = True) -> dict:
+    def __init__(self, fetcher: WebFetcher = None, symbols: SymbolRegistry = None):
+        self.fetcher = fetcher or WebFetcher()
+        self.symbols = symbols or SYMBOLS
+    
+    @staticmethod
+    def _binance_url(host: str, info: SymbolInfo) -> str:
+        return f"{host}/api/v3/ticker/price?symbol={info.binance}"
+    
+    @staticmethod
+    def _coingecko_url(info: SymbolInfo) -> str:
+        return f"https://api.coingecko.com/api/v3/simple/price?ids={info.coingecko}&vs_currencies=usd"
+    
+    def source_urls(self, symbol: str, binance_hosts: list = None, coingecko_fallback: bool = True) -> list:
+        """Every URL get_price may read for `symbol`, in fallback order."""
+        info = self.symbols.resolve(symbol)
+        urls = []
+        if info.binance:
+            hosts = self.BINANCE_HOSTS if binance_hosts is None else binance_hosts
+            urls += [self._binance_url(host, info) for host in hosts]
+        if coingecko_fallback and info.coingecko:
+            urls.append(self._coingecko_url(info))
+        return urls
+    
+    def get_price(self, symbol: str, binance_hosts: list = None, coingecko_fallback: bool = True,
+                  deadline: Deadline = None, digest: bool = False) -> dict:
         """
         Get cryptocurrency price with multi-source fallback.
         
+        A client error (e.g. 400 for an unlisted symbol) ends the Binance
+        loop early, since every mirror would answer the same. A NaN, infinite
+        or non-positive price counts as a failed source. Sources the symbol
+        is not listed on in the registry (e.g. no Coingecko id for an
+        unknown symbol) are skipped without a request.
+        
         Args:
             symbol: Cryptocurrency symbol (e.g., "ETH", "BTC")
             binance_hosts: List of Binance API hosts to try
             coingecko_fallback: Whether to use Coingecko as fallback
+            deadline: Optional Deadline bounding the whole fallback chain
+            digest: Also return "digest", the source digest validators
+                    check with verify_price
             
         Returns:
-            Dict with "price" (float) and "source" (str)
+            Dict with "price" (int, fixed-point scaled by PRICE_SCALE) and
+            "source" (str), plus "digest" if requested
             
         Raises:
             gl.vm.UserError: If all sources fail
+            FetchError: With kind "deadline" if the deadline expires
         """
         if binance_hosts is None:
-            binance_hosts = [
-                "https://api.binance.com",
-                "https://api-gcp.binance.com",
-                "https://api1.binance.com",
-                "https://api2.binance.com",
-                "https://api3.binance.com",
-                "https://api4.binance.com",
-            ]
+            binance_hosts = self.BINANCE_HOSTS
+        
+        info = self.symbols.resolve(symbol)
+        if not info.binance:
+            binance_hosts = []
         
         price = None
         price_source = None
+        price_url = price_resp = None
         
         # Try Binance mirrors
         for host in binance_hosts:
             try:
-                url = f"{host}/api/v3/ticker/price?symbol={symbol}USDT"
-                resp = self.fetcher.get(url)
+                url = self._binance_url(host, info)
+                resp = self.fetcher.get(url, deadline=deadline)
                 data = self.fetcher.json(resp, f"binance-{host}")
                 
                 price_str = data.get("price") if isinstance(data, dict) else None
                 if price_str is not None:
-                    price = self.fetcher.to_float("binance price", price_str)
-                    price_source = "binance"
+                    value = self.fetcher.to_fixed("binance price", price_str)
+                    if value > 0:
+                        price = value
+                        price_source = "binance"
+                        price_url, price_resp = url, resp
+                        break
+            except FetchError as e:
+                if e.kind == "deadline":
+                    raise
+                if e.kind == "client":
                     break
+                continue
             except gl.vm.UserError:
                 continue
             except Exception:
                 continue
         
         # Fallback to Coingecko
-        if price is None and coingecko_fallback:
+        if price is None and coingecko_fallback and info.coingecko:
             try:
-                symbol_lower = symbol.lower()
-                url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol_lower}&vs_currencies=usd"
-                resp = self.fetcher.get(url)
-                data = self.fetcher.json(resp, "coingecko")
+                url = self._coingecko_url(info)
+                resp = self.fetcher.get(url, deadline=deadline)
+                data = self.fetcher.json(resp, "coingecko", parse_float=str)
                 
-                asset_data = data.get(symbol_lower) if isinstance(data, dict) else None
+                asset_data = data.get(info.coingecko) if isinstance(data, dict) else None
                 if asset_data and isinstance(asset_data, dict):
                     usd_val = asset_data.get("usd")
                     if usd_val is not None:
-                        price = self.fetcher.to_float("coingecko price", usd_val)
-                        price_source = "coingecko"
+                        value = self.fetcher.to_fixed("coingecko price", usd_val)
+                        if value > 0:
+                            price = value
+                            price_source = "coingecko"
+                            price_url, price_resp = url, resp
+            except FetchError as e:
+                if e.kind == "deadline":
+                    raise
             except Exception:
                 pass
         
         if price is None or price <= 0 or price_source is None:
             raise gl.vm.UserError(f"all price sources failed for {symbol}")
         
-        return {"price": price, "source": price_source}
+        result = {"price": price, "source": price_source}
+        if digest:
+            result["digest"] = self.fetcher.digest(price_url, price_resp, dict(result))
+        return result
+    
+    def verify_price(self, symbol: str, result: dict, binance_hosts: list = None,
+                     coingecko_fallback: bool = True, tolerance_bps: int = 100,
+                     reference: int = None, max_move_bps: int = None, update_index: int = None,
+                     refetch_every: int = DIGEST_REFETCH_EVERY,
+                     max_age: float = DIGEST_MAX_AGE, deadline: Deadline = None) -> bool:
+        """
+        Validator side of get_price(digest=True).
+        
+        The price is fetched again and must agree within `tolerance_bps`
+        unless all of these hold: the digest is fresh and names one of this
+        symbol's source URLs, `reference` and `max_move_bps` are given and the
+        price is within `max_move_bps` of `reference`, and `update_index` is
+        given and not due for a re-fetch (see refetch_due). A digest that does
+        not match the result is rejected.
+        
+        The leader writes its own digest, so a trusted one only bounds how far
+        it can move the price: pass as `reference` the price accepted on the
+        last due update, not the last price, or small moves compound.
+        
+        Args:
+            symbol: Symbol the leader was asked for
+            result: The leader's {"price", "source", "digest"}
+            binance_hosts, coingecko_fallback: As passed to get_price
+            tolerance_bps: Allowed difference from a re-fetched price, in
+                           basis points
+            reference: Price validators last re-fetched (fixed-point); None
+                       always re-fetches
+            max_move_bps: Largest move from `reference` accepted without
+                          re-fetching; None always re-fetches
+            update_index: The contract's update counter; None always re-fetches
+            refetch_every: Re-fetch on every this many updates
+            max_age: Oldest digest accepted without re-fetching, in seconds
+            deadline: Optional Deadline for the re-fetch
+            
+        Returns:
+            Whether the result is accepted
+        """
+        if not isinstance(result, dict):
+            return False
+        price = result.get("price")
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            return False
+        fields = {"price": price, "source": result.get("source")}
+        try:
+            verdict = check_digest(result.get("digest"), fields,
+                                   self.source_urls(symbol, binance_hosts, coingecko_fallback), max_age)
+        except ValueError:
+            return False
+        anchored = (isinstance(reference, int) and not isinstance(reference, bool) and reference > 0 and
+                    max_move_bps is not None and update_index is not None and
+                    not refetch_due(update_index, refetch_every))
+        if verdict == "ok" and anchored and abs(price - reference) * 10000 <= max_move_bps * reference:
+            return True
+        try:
+            fresh = self.get_price(symbol, binance_hosts, coingecko_fallback, deadline)["price"]
+        except gl.vm.UserError:
+            return False
+        return abs(price - fresh) * 10000 <= tolerance_bps * fresh
 
 
 class WeatherPattern:
@@ -237,10 +1323,16 @@ class WeatherPattern:
     Pre-built pattern for weather data from Open-Meteo API.
     """
     
-    def __init__(self):
-        self.fetcher = WebFetcher()
+    def __init__(self, fetcher: WebFetcher = None):
+        self.fetcher = fetcher or WebFetcher()
+    
+    @staticmethod
+    def source_url(lat: float, lon: float) -> str:
+        """The Open-Meteo URL get_weather reads for a location."""
+        return f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
     
-    def get_weather(self, lat: float, lon: float, name: str = "weather") -> dict:
+    def get_weather(self, lat: float, lon: float, name: str = "weather", deadline: Deadline = None,
+                    digest: bool = False) -> dict:
         """
         Get weather data from Open-Meteo.
         
@@ -248,33 +1340,83 @@ class WeatherPattern:
             lat: Latitude
             lon: Longitude
             name: Name for error messages
+            deadline: Optional Deadline shared with the rest of the call
+            digest: Also return "digest", the source digest validators
+                    check with verify_weather
             
         Returns:
-            Dict with "temperature" (float) and "condition" (str)
+            Dict with "temperature" (int, °C fixed-point scaled by
+            PRICE_SCALE) and "condition" (str), plus "digest" if requested
             
         Raises:
             gl.vm.UserError: If request fails
         """
         try:
-            url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-            resp = self.fetcher.get(url)
-            data = self.fetcher.json(resp, name)
+            url = self.source_url(lat, lon)
+            resp = self.fetcher.get(url, deadline=deadline)
+            data = self.fetcher.json(resp, name, parse_float=str)
             
             current = data.get("current_weather") or {}
-            temperature = self.fetcher.to_float(
+            temperature = self.fetcher.to_fixed(
                 f"{name} temperature",
-                current.get("temperature", 0.0)
+                current.get("temperature", 0)
             )
             condition = str(current.get("weathercode", "Unknown"))
             
-            return {
+            result = {
                 "temperature": temperature,
                 "condition": condition
             }
+            if digest:
+                result["digest"] = self.fetcher.digest(url, resp, dict(result))
+            return result
         except gl.vm.UserError:
             raise
         except Exception as e:
             raise gl.vm.UserError(f"{name} error: {str(e)}")
+    
+    def verify_weather(self, lat: float, lon: float, result: dict, tolerance: int = PRICE_SCALE,
+                       reference: dict = None, max_move: int = None, update_index: int = None,
+                       refetch_every: int = DIGEST_REFETCH_EVERY,
+                       max_age: float = DIGEST_MAX_AGE, deadline: Deadline = None) -> bool:
+        """
+        Validator side of get_weather(digest=True).
+        
+        The weather is fetched again and must have the same condition and a
+        temperature within `tolerance`, unless the digest is fresh for this
+        location's URL, the result has `reference`'s condition and a
+        temperature within `max_move` of it, and `update_index` is not
+        due for a re-fetch. As with verify_price, `reference` is the weather
+        accepted on the last due update; leaving `reference`, `max_move` or
+        `update_index` out always re-fetches. A digest that does not match
+        the result is rejected. Temperatures, `tolerance` and `max_move` are
+        °C fixed-point (PRICE_SCALE), as get_weather returns them.
+        
+        Returns:
+            Whether the result is accepted
+        """
+        if not isinstance(result, dict):
+            return False
+        temperature = result.get("temperature")
+        if not isinstance(temperature, int) or isinstance(temperature, bool):
+            return False
+        fields = {"temperature": temperature, "condition": result.get("condition")}
+        try:
+            verdict = check_digest(result.get("digest"), fields, [self.source_url(lat, lon)], max_age)
+        except ValueError:
+            return False
+        anchored = (isinstance(reference, dict) and max_move is not None and update_index is not None and
+                    not refetch_due(update_index, refetch_every))
+        if verdict == "ok" and anchored and reference.get("condition") == fields["condition"] and \
+                isinstance(reference.get("temperature"), int) and \
+                abs(temperature - reference["temperature"]) <= max_move:
+            return True
+        try:
+            fresh = self.get_weather(lat, lon, deadline=deadline)
+        except gl.vm.UserError:
+            return False
+        return (fresh["condition"] == fields["condition"] and
+                abs(fresh["temperature"] - temperature) <= tolerance)
 
 
 class NewsPattern:
@@ -282,16 +1424,18 @@ class NewsPattern:
     Pre-built pattern for fetching news from multiple sources.
     """
     
-    def __init__(self):
-        self.fetcher = WebFetcher()
+    def __init__(self, fetcher: WebFetcher = None):
+        self.fetcher = fetcher or WebFetcher()
     
-    def get_news(self, source_urls: list, limit: int = 10) -> list:
+    def get_news(self, source_urls: list, limit: int = 10, deadline: Deadline = None) -> list:
         """
         Get news items from multiple sources with fallback.
         
         Args:
             source_urls: List of source URLs to try (in order)
             limit: Maximum number of items to return
+            deadline: Optional Deadline; when it expires the sources not yet
+                tried are skipped and whatever was collected is returned
             
         Returns:
             List of news items
@@ -300,7 +1444,7 @@ class NewsPattern:
         
         for url in source_urls:
             try:
-                resp = self.fetcher.get(url)
+                resp = self.fetcher.get(url, deadline=deadline)
                 # Parse based on content type (JSON or RSS)
                 # This is a simplified version - extend as needed
                 if "json" in url.lower() or "reddit" in url.lower():
@@ -326,6 +1470,10 @@ class NewsPattern:
                 
                 if news_items:
                     break  # Got data, stop trying other sources
+            except FetchError as e:
+                if e.kind == "deadline":
+                    break
+                continue  # Try next source
             except Exception:
                 continue  # Try next source
         
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decrypt cost removed by the leader-local decrypted-key cache.
+
+Loads the API key pattern contracts under the GenVM stub and measures
+1. one decrypt vs one cache hit (base64 as in the contracts, and Fernet as in
+   production when `cryptography` is installed), and
+2. RotatingKeyOracle.update_price with K keys of which all but the last are
+   rejected upstream, with the cache on and off (TTL 0). Key health is reset
+   before every update so each one walks all K keys.
+
+Usage:
+    python scripts/bench_key_cache.py
+    python scripts/bench_key_cache.py --keys 20 --updates 200 --iterations 20000
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "packages", "genvm-local"))
+
+import genvm_local  # noqa: E402
+
+try:
+    from cryptography.fernet import Fernet
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+ROTATING = os.path.join(ROOT, "contracts", "api-key-patterns", "key_rotation_oracle.py")
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_decrypt(module, iterations: int) -> None:
+    """Single decrypt vs cache hit, for base64 and (optionally) Fernet."""
+    ciphertext = base64.b64encode(b"cg-" + b"k" * 37).decode()
+    variants = [("base64", module._decrypt_api_key, ciphertext)]
+    if HAS_CRYPTOGRAPHY:
+        cipher = Fernet(Fernet.generate_key())
+        token = base64.b64encode(cipher.encrypt(b"cg-" + b"k" * 37)).decode()
+        variants.append(("fernet", lambda ct: cipher.decrypt(base64.b64decode(ct)).decode("utf-8"), token))
+
+    print(f"{'decrypt':<8} {'uncached us':>12} {'cache hit us':>13} {'saved':>7}")
+    for name, decrypt, encrypted in variants:
+        module._decrypt_api_key = decrypt
+        module._decrypted_keys.clear()
+        uncached = per_call_us(lambda: decrypt(encrypted), iterations)
+        module._cached_decrypt(encrypted)
+        cached = per_call_us(lambda: module._cached_decrypt(encrypted), iterations)
+        print(f"{name:<8} {uncached:>12.2f} {cached:>13.2f} {uncached / cached:>6.1f}x")
+    if not HAS_CRYPTOGRAPHY:
+        print("fernet   skipped (pip install cryptography)")
+
+
+def bench_rotation(keys: int, updates: int) -> None:
+    """update_price with `keys` keys where only the last one is accepted."""
+    good = f"key-{keys - 1}"
+
+    def handler(url, headers):
+        if (headers or {}).get("X-CG-Pro-API-Key") != good:
+            return genvm_local.FakeResponse(401, b'{"error":"invalid api key"}')
+        return genvm_local.FakeResponse(200, b'{"ethereum":{"usd":3000.5}}')
+
+    print(f"\nRotatingKeyOracle: {keys} keys, {updates} updates, active key and key health reset before each update")
+    for label, ttl in (("no cache", 0.0), ("cache", 300.0)):
+        transport = genvm_local.FakeTransport()
+        transport.add("api.coingecko.com", handler=handler)
+        runtime = genvm_local.install(genvm_local.Runtime(transport))
+        module = genvm_local.load_contract(ROTATING)
+        module.DECRYPTED_KEY_TTL_SECONDS = ttl
+        decrypts = [0]
+        decrypt = module._decrypt_api_key
+
+        def counting(encrypted_key, decrypt=decrypt):
+            decrypts[0] += 1
+            return decrypt(encrypted_key)
+
+        module._decrypt_api_key = counting
+        oracle = genvm_local.deploy(module.RotatingKeyOracle)
+        for i in range(keys):
+            genvm_local.call(oracle, "add_api_key", base64.b64encode(f"key-{i}".encode()).decode())
+        leader_seconds = 0.0
+        for _ in range(updates):
+            # Forget cooldowns too, otherwise the revoked keys are skipped
+            # after the first update and never decrypted again
+            oracle.active_key_index = 0
+            oracle.key_successes = [0] * keys
+            oracle.key_failures = [0] * keys
+            oracle.key_cooldown_until = [0] * keys
+            genvm_local.call(oracle, "update_price")
+            leader_seconds += runtime.calls[-1].leader_seconds
+        print(f"{label:>9}: {decrypts[0]:6d} decrypts, leader {leader_seconds / updates * 1e3:.3f} ms/update")
+        genvm_local.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decrypted-key cache benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=100)
+    args = parser.parse_args()
+
+    genvm_local.install(genvm_local.Runtime())
+    module = genvm_local.load_contract(ROTATING)
+    bench_decrypt(module, args.iterations)
+    genvm_local.uninstall()
+    bench_rotation(args.keys, args.updates)
+
+
+if __name__ == "__main__":
+    main()
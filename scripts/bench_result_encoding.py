@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: leader result size and validator cost per result encoding.
+
+Builds multi-symbol price results ({"prices": {SYMBOL: {"price", "source"}}})
+for growing symbol counts and compares
+1. the string dicts leaders used to return ("3000.12", re-parsed with
+   float() by the validator),
+2. the same dicts with fixed-point int prices,
+3. web_fetcher.ResultCodec canonical text (short tags, sorted keys), and
+4. ResultCodec's binary form.
+
+Size is the UTF-8 length of compact JSON for the dict forms (a stand-in for
+their calldata, which the stub does not encode) and the encoded length
+otherwise. Validator time covers decoding (json.loads for the dict forms)
+plus the checks ProxyOracle.update_prices' validator makes. Finally the
+real ProxyOracle.update_prices runs under the GenVM stub with 50 symbols.
+
+Usage:
+    python scripts/bench_result_encoding.py
+    python scripts/bench_result_encoding.py --symbols 10,100,1000 --iterations 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "packages", "genvm-local"))
+sys.path.insert(0, os.path.join(ROOT, "packages", "genvm-web-fetcher"))
+
+import genvm_local  # noqa: E402
+
+PROXY = os.path.join(ROOT, "contracts", "api-key-patterns", "off_chain_proxy_oracle.py")
+TAGS = {"prices": "ps", "price": "p", "source": "s"}
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def make_prices(count: int) -> dict:
+    """{symbol: fixed-point price} with varied magnitudes, deterministic."""
+    return {f"S{i:04d}": 1_00000000 + i * 123_45678901 for i in range(count)}
+
+
+def check_strings(result: dict, requested: set) -> bool:
+    """The pre-fixed-point validator: every price is a string float() > 0."""
+    prices = result.get("prices")
+    if not isinstance(prices, dict) or not prices:
+        return False
+    for symbol, entry in prices.items():
+        if symbol not in requested or not isinstance(entry, dict):
+            return False
+        try:
+            if float(entry.get("price")) <= 0:
+                return False
+        except (ValueError, TypeError):
+            return False
+    return True
+
+
+def check_ints(result: dict, requested: set) -> bool:
+    """The fixed-point validator: every price is an int > 0."""
+    prices = result.get("prices")
+    if not isinstance(prices, dict) or not prices:
+        return False
+    for symbol, entry in prices.items():
+        if symbol not in requested or not isinstance(entry, dict):
+            return False
+        price = entry.get("price")
+        if not isinstance(price, int) or isinstance(price, bool) or price <= 0:
+            return False
+    return True
+
+
+def bench_encodings(codec, counts: list, iterations: int, format_fixed) -> None:
+    print(f"{'symbols':>7} {'encoding':<14} {'bytes':>9} {'vs strings':>10} {'leader us':>10} {'validator us':>13}")
+    for count in counts:
+        prices = make_prices(count)
+        requested = set(prices)
+        as_strings = {"prices": {s: {"price": format_fixed(p), "source": "coingecko-proxy"} for s, p in prices.items()}}
+        as_ints = {"prices": {s: {"price": p, "source": "coingecko-proxy"} for s, p in prices.items()}}
+        dumps = lambda value: json.dumps(value, separators=(",", ":"))  # noqa: E731
+
+        strings_json = dumps(as_strings)
+        ints_json = dumps(as_ints)
+        text = codec.encode(as_ints)
+        binary = codec.encode_binary(as_ints)
+        assert codec.decode(text) == as_ints and codec.decode(binary) == as_ints
+
+        rows = [
+            ("dict strings", len(strings_json.encode()), lambda: dumps(as_strings),
+             lambda: check_strings(json.loads(strings_json), requested)),
+            ("dict ints", len(ints_json.encode()), lambda: dumps(as_ints),
+             lambda: check_ints(json.loads(ints_json), requested)),
+            ("canonical", len(text.encode()), lambda: codec.encode(as_ints),
+             lambda: check_ints(codec.decode(text), requested)),
+            ("binary", len(binary), lambda: codec.encode_binary(as_ints),
+             lambda: check_ints(codec.decode(binary), requested)),
+        ]
+        runs = max(1, iterations * 50 // max(count, 1))
+        baseline = rows[0][1]
+        for label, size, encode, validate in rows:
+            assert validate()
+            leader_us = per_call_us(encode, runs)
+            validator_us = per_call_us(validate, runs)
+            print(f"{count:>7} {label:<14} {size:>9} {size / baseline:>9.0%} {leader_us:>10.1f} {validator_us:>13.1f}")
+        print()
+
+
+def bench_contract(symbols: int) -> None:
+    """ProxyOracle.update_prices end to end under the stub."""
+    prices = make_prices(symbols)
+    transport = genvm_local.FakeTransport()
+    transport.add("/api/prices?symbols=", json={
+        "prices": {s: {"price": f"{p / 1e8:.8f}", "source": "coingecko-proxy"} for s, p in prices.items()},
+        "missing": [], "timestamp": 0,
+    })
+    runtime = genvm_local.install(genvm_local.Runtime(transport))
+    module = genvm_local.load_contract(PROXY)
+    oracle = genvm_local.deploy(module.ProxyOracle)
+    genvm_local.call(oracle, "set_proxy_url", "https://proxy.local/api")
+    genvm_local.call(oracle, "update_prices", list(prices))
+    call = runtime.calls[-1]
+    print(f"ProxyOracle.update_prices, {symbols} symbols: leader result {len(call.leader_result.calldata)} bytes, "
+          f"leader {call.leader_seconds * 1e3:.3f} ms, validator {call.validator_seconds[0] * 1e3:.3f} ms, "
+          f"votes {call.votes}")
+    genvm_local.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leader result encoding benchmark")
+    parser.add_argument("--symbols", default="1,10,50,500,5000", help="Comma-separated symbol counts")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    genvm_local.install(genvm_local.Runtime())
+    from web_fetcher import ResultCodec, format_fixed
+    bench_encodings(ResultCodec(TAGS), [int(n) for n in args.symbols.split(",")], args.iterations, format_fixed)
+    genvm_local.uninstall()
+    bench_contract(50)
+
+
+if __name__ == "__main__":
+    main()
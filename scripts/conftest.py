@@ -0,0 +1,36 @@
+"""
+Pytest setup for the off-chain script tests.
+
+The scripts import each other as top-level modules (`from tx_pipeline import
+...`), and the price proxy uses `rate_limit` from the web fetcher package,
+so both directories go on sys.path. Tests drive the scripts with stand-in
+clients, fake clocks and local upstreams; no genlayer-py or network needed.
+"""
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, ".."))
+for path in (HERE, os.path.join(ROOT, "packages", "genvm-web-fetcher")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class FakeClock:
+    """Manually advanced time source; also usable as the `sleep` function."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -8,23 +8,67 @@ in a GenLayer contract that uses the Encrypted On-chain Pattern.
 Usage:
     python scripts/encrypt_key.py "your-api-key-here"
 
+    # Bulk: one key per line from a file or stdin ("-"), JSON lines out
+    python scripts/encrypt_key.py --bulk keys.txt --key="$FERNET_KEY" > encrypted.jsonl
+    cat keys.txt | python scripts/encrypt_key.py --bulk - --passphrase-env KEY_PASSPHRASE --salt pool-2025
+    python scripts/encrypt_key.py --bulk keys.txt --key="$FERNET_KEY" --group 100   # add_api_keys batches
+
+    # Envelopes (env1:<version>:<wrapped data key>:<payload>) under leader key version v1
+    python scripts/encrypt_key.py --bulk keys.txt --key="$LEADER_KEY_V1" --envelope v1 > envelopes.jsonl
+    # Leader key rotation: re-wrap the data keys under v2, payloads unchanged
+    python scripts/encrypt_key.py --rewrap envelopes.jsonl --keyring keyring.json --to-version v2
+
 Output:
-    Prints the encrypted (base64-encoded) key that can be stored on-chain.
-    Also prints the decryption key (store securely on leader nodes).
+    Single key: prints the encrypted (base64-encoded) key that can be stored
+    on-chain, and the decryption key (store securely on leader nodes).
+
+    Bulk: one JSON object per input key, in input order:
+        {"line": 3, "fingerprint": "9f2c...", "encrypted_key": "..."}
+    or with --group N (not with --envelope), one object per N keys, ready
+    for add_api_keys:
+        {"fingerprints": [...], "encrypted_keys": [...]}
+    `fingerprint` matches RotatingKeyOracle's (sha256 of the ciphertext,
+    16 hex digits). Plaintext keys are never written anywhere. All keys share
+    one encryption key: --key, one derived from a passphrase (PBKDF2-SHA256),
+    or a newly generated one that is printed once to stderr.
+
+    Envelope (--envelope VERSION): each key gets its own random data key; the
+    payload is encrypted under it and the data key is wrapped under the
+    leader key for VERSION. --rewrap reads envelopes (JSON lines as above or
+    one per line), unwraps each data key with the keyring (JSON object
+    {version: leader key}) and wraps it under --to-version. Output lines add
+    `envelope_header` (for EncryptedKeyOracle.rewrap_api_key) and
+    `old_fingerprint`.
+
+    Every input line is checked; bad lines (not UTF-8, whitespace or control
+    characters inside a key, malformed envelopes, unknown versions, data keys
+    the keyring cannot unwrap) are reported on stderr with their line
+    numbers, nothing is written to stdout and the exit status is 1. Output
+    is staged in a spooled temporary file until the whole input has passed.
 """
 
-import sys
+import argparse
 import base64
-from typing import Optional
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
 
 try:
-    from cryptography.fernet import Fernet
+    from cryptography.fernet import Fernet, InvalidToken
     HAS_CRYPTOGRAPHY = True
 except ImportError:
     HAS_CRYPTOGRAPHY = False
-    print("⚠️  Warning: cryptography library not installed.")
-    print("   Install with: pip install cryptography")
-    print("   Falling back to base64 encoding (NOT SECURE for production)\n")
+
+PBKDF2_ITERATIONS = 600_000
+ENVELOPE_PREFIX = "env1"
+CHUNK_SIZE = 512  # Keys per worker task; input beyond one chunk goes to the process pool
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Staged output kept in memory up to this, then on disk
 
 
 def encrypt_with_fernet(api_key: str, encryption_key: Optional[bytes] = None) -> tuple[str, str]:
@@ -58,19 +102,344 @@ def encrypt_simple(api_key: str) -> str:
     return encoded
 
 
+def derive_key(passphrase: str, salt: str, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+    """Fernet key (urlsafe base64 of 32 bytes) derived with PBKDF2-HMAC-SHA256."""
+    raw = hashlib.pbkdf2_hmac("sha256", passphrase.encode("utf-8"), salt.encode("utf-8"), iterations)
+    return base64.urlsafe_b64encode(raw)
+
+
+def fingerprint(encrypted_key: str) -> str:
+    """Key fingerprint as used by RotatingKeyOracle.remove_api_key."""
+    return hashlib.sha256(encrypted_key.encode()).hexdigest()[:16]
+
+
+# ----------------------------------------------------------------------
+# Envelope encryption
+# ----------------------------------------------------------------------
+
+def make_envelope(api_key: str, version: str, leader_key: bytes) -> str:
+    """env1:<version>:<data key wrapped under leader_key>:<api key under the data key>."""
+    data_key = Fernet.generate_key()
+    wrapped = Fernet(leader_key).encrypt(data_key).decode("utf-8")
+    payload = Fernet(data_key).encrypt(api_key.encode("utf-8")).decode("utf-8")
+    return f"{ENVELOPE_PREFIX}:{version}:{wrapped}:{payload}"
+
+
+def split_envelope(envelope: str) -> tuple:
+    """(version, wrapped_data_key, payload); ValueError if malformed."""
+    parts = envelope.split(":")
+    if len(parts) != 4 or parts[0] != ENVELOPE_PREFIX or not all(parts[1:]):
+        raise ValueError("malformed envelope: expected env1:<version>:<wrapped key>:<payload>")
+    return parts[1], parts[2], parts[3]
+
+
+def rewrap_envelope(envelope: str, keyring: dict, to_version: str) -> str:
+    """Same envelope with its data key re-wrapped under keyring[to_version]; the payload is kept."""
+    version, wrapped, payload = split_envelope(envelope)
+    if version not in keyring:
+        raise ValueError(f"no key for version {version} in keyring")
+    try:
+        data_key = Fernet(keyring[version].encode()).decrypt(wrapped.encode())
+    except InvalidToken:
+        raise ValueError(f"data key does not unwrap with keyring version {version}")
+    rewrapped = Fernet(keyring[to_version].encode()).encrypt(data_key).decode("utf-8")
+    return f"{ENVELOPE_PREFIX}:{to_version}:{rewrapped}:{payload}"
+
+
+def _decode_lines(stream: Iterable, errors: list) -> Iterator[tuple]:
+    """
+    (line_number, stripped text) for each non-blank, non-comment line.
+
+    Lines may be bytes or str; bytes that are not UTF-8 are recorded in
+    `errors` as (line_number, message) and skipped.
+    """
+    for number, line in enumerate(stream, 1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError:
+                errors.append((number, "not valid UTF-8"))
+                continue
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield number, line
+
+
+def read_envelopes(stream: Iterable, errors: list) -> Iterator[tuple]:
+    """
+    (line_number, envelope) from JSON lines with "encrypted_key" or bare envelope lines.
+
+    Unreadable lines go to `errors` as (line_number, message) and are skipped.
+    """
+    for number, line in _decode_lines(stream, errors):
+        if not line.startswith("{"):
+            yield number, line
+            continue
+        try:
+            envelope = json.loads(line).get("encrypted_key")
+        except (ValueError, AttributeError):
+            errors.append((number, "not a JSON object"))
+            continue
+        if not isinstance(envelope, str):
+            errors.append((number, 'no "encrypted_key" string'))
+            continue
+        yield number, envelope
+
+
+def _open_input(path: str):
+    """Binary input stream for a path or "-" (stdin), so decoding errors keep their line number."""
+    return sys.stdin.buffer if path == "-" else open(path, "rb")
+
+
+def _finish(staged, errors: list, done: str) -> int:
+    """Copy staged output to stdout if there were no errors; report them otherwise."""
+    if errors:
+        for number, message in sorted(errors):
+            print(f"Error: line {number}: {message}", file=sys.stderr)
+        print(f"❌ {len(errors)} bad input lines; nothing written", file=sys.stderr)
+        return 1
+    staged.seek(0)
+    shutil.copyfileobj(staged, sys.stdout)
+    sys.stdout.flush()
+    print(done, file=sys.stderr)
+    return 0
+
+
+def rewrap_main(args) -> int:
+    """Re-wrap envelopes from args.rewrap under args.to_version; JSON lines to stdout."""
+    if not HAS_CRYPTOGRAPHY:
+        print("Error: --rewrap needs the cryptography library (pip install cryptography)", file=sys.stderr)
+        return 1
+    if not args.keyring or not args.to_version:
+        print("Error: --rewrap needs --keyring and --to-version", file=sys.stderr)
+        return 1
+    try:
+        with open(args.keyring, encoding="utf-8") as f:
+            keyring = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read keyring {args.keyring}: {e}", file=sys.stderr)
+        return 1
+    if not isinstance(keyring, dict) or not all(isinstance(key, str) for key in keyring.values()):
+        print("Error: the keyring must be a JSON object {version: leader key}", file=sys.stderr)
+        return 1
+    if args.to_version not in keyring:
+        print(f"Error: version {args.to_version} is not in the keyring", file=sys.stderr)
+        return 1
+
+    stream = _open_input(args.rewrap)
+    errors = []
+    count = 0
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", encoding="utf-8") as staged:
+            for number, envelope in read_envelopes(stream, errors):
+                try:
+                    rewrapped = rewrap_envelope(envelope, keyring, args.to_version)
+                except ValueError as e:
+                    errors.append((number, str(e)))
+                    continue
+                staged.write(json.dumps({
+                    "line": number,
+                    "fingerprint": fingerprint(rewrapped),
+                    "old_fingerprint": fingerprint(envelope),
+                    "envelope_header": rewrapped.rsplit(":", 1)[0],
+                    "encrypted_key": rewrapped,
+                }) + "\n")
+                count += 1
+            return _finish(staged, errors, f"✅ Re-wrapped {count} keys under {args.to_version}")
+    finally:
+        if args.rewrap != "-":
+            stream.close()
+
+
+# ----------------------------------------------------------------------
+# Bulk mode
+# ----------------------------------------------------------------------
+
+_cipher = None  # Per process: Fernet for the batch key, or None for base64
+_envelope = None  # Per process: (version, leader key) in envelope mode
+
+
+def _init_cipher(encryption_key: Optional[bytes], envelope_version: Optional[str] = None) -> None:
+    global _cipher, _envelope
+    _cipher = Fernet(encryption_key) if encryption_key is not None else None
+    _envelope = (envelope_version, encryption_key) if envelope_version else None
+
+
+def _encrypt_chunk(api_keys: List[str]) -> List[str]:
+    if _envelope is not None:
+        return [make_envelope(api_key, *_envelope) for api_key in api_keys]
+    if _cipher is None:
+        return [encrypt_simple(api_key) for api_key in api_keys]
+    return [base64.b64encode(_cipher.encrypt(api_key.encode("utf-8"))).decode("utf-8") for api_key in api_keys]
+
+
+def read_keys(stream: Iterable, errors: list) -> Iterator[tuple]:
+    """
+    (line_number, api_key) for each non-blank, non-comment line.
+
+    Lines that are not UTF-8 or have whitespace or control characters inside
+    the key (usually two keys on one line, or a binary file) go to `errors`
+    as (line_number, message) and are skipped.
+    """
+    for number, api_key in _decode_lines(stream, errors):
+        if any(c.isspace() or not c.isprintable() for c in api_key):
+            errors.append((number, "whitespace or control characters inside the key"))
+            continue
+        yield number, api_key
+
+
+def _chunks(items: Iterator[tuple], size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encrypt_stream(keys: Iterator[tuple], encryption_key: Optional[bytes], workers: int = 1,
+                   chunk_size: int = CHUNK_SIZE, envelope_version: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Encrypt (line_number, api_key) pairs; yields (line_number, encrypted_key) in input order.
+
+    Input that fits in one chunk, or workers <= 1, is encrypted in this
+    process. Longer input goes to a process pool with at most 2 * workers
+    chunks in flight, so memory is bounded by the chunk size rather than
+    the input size. With envelope_version, encryption_key is the leader key
+    and each output is an envelope.
+    """
+    chunks = _chunks(keys, chunk_size)
+    head = [chunk for chunk in (next(chunks, None), next(chunks, None)) if chunk is not None]
+    chunks = _prepend(head, chunks)
+
+    if len(head) < 2 or workers <= 1:
+        _init_cipher(encryption_key, envelope_version)
+        for chunk in chunks:
+            yield from zip([n for n, _ in chunk], _encrypt_chunk([k for _, k in chunk]))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_cipher, initargs=(encryption_key, envelope_version)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(([n for n, _ in chunk], pool.submit(_encrypt_chunk, [k for _, k in chunk])))
+            if len(pending) >= 2 * workers:
+                numbers, future = pending.popleft()
+                yield from zip(numbers, future.result())
+        while pending:
+            numbers, future = pending.popleft()
+            yield from zip(numbers, future.result())
+
+
+def _prepend(head: list, rest: Iterator) -> Iterator:
+    yield from head
+    yield from rest
+
+
+def bulk_main(args) -> int:
+    """Encrypt keys from args.bulk (path or "-") and write JSON lines to stdout."""
+    if args.key and args.passphrase_env:
+        print("Error: use either --key or --passphrase-env, not both", file=sys.stderr)
+        return 1
+
+    if args.envelope and (":" in args.envelope or not HAS_CRYPTOGRAPHY):
+        print("Error: --envelope needs the cryptography library and a version without ':'", file=sys.stderr)
+        return 1
+    if args.envelope and args.group:
+        # --group output is for RotatingKeyOracle.add_api_keys, which cannot open envelopes
+        print("Error: --envelope cannot be combined with --group (RotatingKeyOracle does not accept envelopes)",
+              file=sys.stderr)
+        return 1
+
+    encryption_key = None
+    if not HAS_CRYPTOGRAPHY:
+        if args.key or args.passphrase_env:
+            print("Error: --key / --passphrase-env need the cryptography library (pip install cryptography)",
+                  file=sys.stderr)
+            return 1
+        print("⚠️  cryptography not installed: base64 encoding only (NOT SECURE for production)",
+              file=sys.stderr)
+    elif args.key:
+        encryption_key = args.key.encode("utf-8")
+        Fernet(encryption_key)  # Reject a malformed key before reading input
+    elif args.passphrase_env:
+        passphrase = os.environ.get(args.passphrase_env, "")
+        if not passphrase or not args.salt:
+            print(f"Error: ${args.passphrase_env} must be set and --salt given to derive a key",
+                  file=sys.stderr)
+            return 1
+        encryption_key = derive_key(passphrase, args.salt)
+    else:
+        encryption_key = Fernet.generate_key()
+        print("🔑 Generated decryption key (store securely on leader nodes only!):", file=sys.stderr)
+        print(encryption_key.decode("utf-8"), file=sys.stderr)
+
+    stream = _open_input(args.bulk)
+    errors = []
+    count = 0
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+", encoding="utf-8") as out:
+            encrypted = encrypt_stream(read_keys(stream, errors), encryption_key, workers=args.workers,
+                                       envelope_version=args.envelope)
+            if args.group:
+                for group in _chunks(encrypted, args.group):
+                    cts = [ct for _, ct in group]
+                    out.write(json.dumps({"fingerprints": [fingerprint(ct) for ct in cts], "encrypted_keys": cts}) + "\n")
+                    count += len(cts)
+            else:
+                for number, ct in encrypted:
+                    out.write(json.dumps({"line": number, "fingerprint": fingerprint(ct), "encrypted_key": ct}) + "\n")
+                    count += 1
+            return _finish(out, errors, f"✅ Encrypted {count} keys")
+    finally:
+        if args.bulk != "-":
+            stream.close()
+
+
 def main():
     """Main function."""
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Encrypt API keys for on-chain storage")
+    parser.add_argument("api_key", nargs="?", help="Single API key to encrypt")
+    parser.add_argument("--bulk", metavar="FILE", help='Encrypt one key per line from FILE ("-" for stdin)')
+    parser.add_argument("--key", help="Fernet key to encrypt every bulk key with")
+    parser.add_argument("--passphrase-env", metavar="VAR",
+                        help="Derive the bulk key from the passphrase in environment variable VAR")
+    parser.add_argument("--salt", help="Salt for --passphrase-env (keep it with the passphrase)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help=f"Processes for inputs over {CHUNK_SIZE} keys (default: CPU count)")
+    parser.add_argument("--group", type=int, default=0, metavar="N",
+                        help="Emit one add_api_keys batch per N keys instead of one line per key")
+    parser.add_argument("--envelope", metavar="VERSION",
+                        help="Bulk: emit envelopes, with the key used as leader key VERSION")
+    parser.add_argument("--rewrap", metavar="FILE",
+                        help='Re-wrap envelopes from FILE ("-" for stdin) under --to-version')
+    parser.add_argument("--keyring", metavar="FILE", help="JSON object {version: leader key} for --rewrap")
+    parser.add_argument("--to-version", metavar="VERSION", help="Leader key version to re-wrap under")
+    args = parser.parse_args()
+
+    if args.rewrap:
+        sys.exit(rewrap_main(args))
+    if args.bulk:
+        sys.exit(bulk_main(args))
+
+    if not args.api_key:
         print("Usage: python encrypt_key.py <api-key>")
         print("\nExample:")
         print("  python encrypt_key.py 'your-api-key-here'")
+        print("  python encrypt_key.py --bulk keys.txt --key \"$FERNET_KEY\" > encrypted.jsonl")
         sys.exit(1)
     
-    api_key = sys.argv[1]
+    api_key = args.api_key
     
     if not api_key or api_key.strip() == "":
         print("Error: API key cannot be empty")
         sys.exit(1)
+
+    if not HAS_CRYPTOGRAPHY:
+        print("⚠️  Warning: cryptography library not installed.")
+        print("   Install with: pip install cryptography")
+        print("   Falling back to base64 encoding (NOT SECURE for production)\n")
     
     print(f"Encrypting API key: {api_key[:10]}...{api_key[-4:]} (hidden)\n")
     
@@ -111,4 +480,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
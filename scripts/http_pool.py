@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Transport
+
+Keep-alive connection pooling for the off-chain Python tooling (keeper
+reference prices, Python proxy service, benchmarks). Standard library only.
+
+- One pool per (scheme, host, port), bounded by `max_per_host`; size it to
+  the number of threads that share the transport.
+- Idle connections are reused LIFO, so the hottest socket is picked first.
+- A request on a reused connection that turns out to be stale (server
+  closed it while idle) is retried once on a fresh connection.
+- HTTPS connections share one SSLContext and resume the last TLS session
+  of their host, so new sockets skip the full handshake when the server
+  supports resumption.
+
+Usage:
+    from http_pool import PooledTransport
+
+    transport = PooledTransport(max_per_host=8)
+    resp = transport.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT")
+    print(resp.status, resp.json())
+"""
+
+import http.client
+import json
+import ssl
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_HEADERS = {"User-Agent": "GenLayerOracle/1.0"}
+
+# Errors that mean a kept-alive connection was closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class Response:
+    """Fully read HTTP response (status, lower-cased headers, body bytes)."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self) -> str:
+        return self.body.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _HostPool:
+    """Idle connections and limits for one (scheme, host, port)."""
+
+    def __init__(self, max_size: int):
+        self.idle = deque()
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+        self.tls_session: Optional[ssl.SSLSession] = None
+
+
+class _ResumingHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that resumes (and records) its host's TLS session."""
+
+    def __init__(self, *args, host_pool: _HostPool, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._host_pool = host_pool
+
+    def connect(self):
+        if self._tunnel_host:
+            # Proxy tunnels: fall back to the stock handshake
+            super().connect()
+            return
+        http.client.HTTPConnection.connect(self)
+        self.sock = self._context.wrap_socket(
+            self.sock,
+            server_hostname=self.host,
+            session=self._host_pool.tls_session,
+        )
+        if self.sock.session is not None:
+            self._host_pool.tls_session = self.sock.session
+
+
+class PooledTransport:
+    """
+    Thread-safe HTTP/1.1 transport with per-host keep-alive pools.
+
+    Args:
+        max_per_host: Maximum open connections per host (match your concurrency)
+        timeout: Socket timeout in seconds
+        keep_alive: Reuse connections; False opens a fresh connection per
+                    request (used as the baseline in benchmarks)
+        ssl_context: Shared SSLContext for HTTPS (default: system trust store)
+        acquire_timeout: Seconds to wait for a free connection slot
+    """
+
+    def __init__(self, max_per_host: int = 8, timeout: float = 10.0, keep_alive: bool = True,
+                 ssl_context: Optional[ssl.SSLContext] = None, acquire_timeout: float = 30.0):
+        self.max_per_host = max(1, int(max_per_host))
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.acquire_timeout = acquire_timeout
+        self._pools: Dict[Tuple[str, str, int], _HostPool] = {}
+        self._pools_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0,
+                      "tls_resumed": 0, "stale_retries": 0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _pool_for(self, key: Tuple[str, str, int]) -> _HostPool:
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _HostPool(self.max_per_host)
+                self._pools[key] = pool
+            return pool
+
+    def _new_connection(self, key: Tuple[str, str, int], pool: _HostPool):
+        scheme, host, port = key
+        self._count("connections_opened")
+        if scheme == "https":
+            return _ResumingHTTPSConnection(host, port, timeout=self.timeout,
+                                            context=self.ssl_context, host_pool=pool)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None,
+                body: Optional[bytes] = None) -> Response:
+        """
+        Send a request and read the whole response.
+
+        Raises:
+            ValueError: For unsupported URL schemes
+            TimeoutError: If no connection slot frees up within acquire_timeout
+            OSError / http.client.HTTPException: On transport errors
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported scheme: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        send_headers = dict(DEFAULT_HEADERS)
+        if headers:
+            send_headers.update(headers)
+        send_headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+
+        pool = self._pool_for(key)
+        if not pool.slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"no free connection for {key[1]}:{port}")
+        try:
+            self._count("requests")
+            return self._send(pool, key, method, path, send_headers, body)
+        finally:
+            pool.slots.release()
+
+    def _send(self, pool: _HostPool, key, method: str, path: str, headers: dict,
+              body: Optional[bytes]) -> Response:
+        conn = None
+        if self.keep_alive:
+            with pool.lock:
+                conn = pool.idle.pop() if pool.idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._new_connection(key, pool)
+
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # Server dropped the idle connection; retry once on a fresh one
+            self._count("stale_retries")
+            conn = self._new_connection(key, pool)
+            reused = False
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+        try:
+            data = resp.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if reused:
+            self._count("connections_reused")
+        sock = getattr(conn, "sock", None)
+        if not reused and getattr(sock, "session_reused", False):
+            self._count("tls_resumed")
+
+        if self.keep_alive and not resp.will_close:
+            with pool.lock:
+                pool.idle.append(conn)
+        else:
+            conn.close()
+
+        return Response(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+
+    def get(self, url: str, headers: Optional[dict] = None) -> Response:
+        return self.request("GET", url, headers=headers)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            with pool.lock:
+                while pool.idle:
+                    pool.idle.pop().close()
+
+    def __enter__(self) -> "PooledTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_shared_transport: Optional[PooledTransport] = None
+_shared_lock = threading.Lock()
+
+
+def shared_transport() -> PooledTransport:
+    """Process-wide transport for tools that do not manage their own."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = PooledTransport()
+        return _shared_transport
@@ -13,10 +13,23 @@ If using Python <3.12, use TypeScript client instead: npm run dev
 
 Usage:
     python scripts/oracle_client.py [contract_address] [action]
+    python scripts/oracle_client.py <keeper_config.json> keep
+    python scripts/oracle_client.py <addresses> read-many [--workers N]
 
 Actions:
-    read    - Read from contract (default)
-    update  - Update contract (write transaction)
+    read      - Read from contract (default)
+    update    - Update contract (write transaction); with several addresses the
+                transactions are pipelined (--in-flight N) and latency histograms printed
+    keep      - Long-running keeper for many contracts (see scripts/oracle_keeper.py)
+    read-many - Read many contracts concurrently, one JSON line per contract
+                (<addresses> is a comma-separated list or a file with one address per line)
+
+Options:
+    --refresh   - Ignore the contract-type cache and re-detect every contract
+    --in-flight - Transactions kept in flight by a multi-address update (default: 8)
+
+Detected contract types are cached on disk (keyed by chain and address) in
+~/.cache/genlayer-oracle/contract_types.json, or $GENLAYER_ORACLE_CACHE.
 
 Examples:
     # Read from deployed contract
@@ -27,10 +40,25 @@ Examples:
     
     # Update Simple Price Feed
     python scripts/oracle_client.py 0xe328378CAF086ae0a6458395C9919a4137fCb888 update
+    
+    # Keep every feed listed in keeper.json up to date
+    python scripts/oracle_client.py keeper.json keep
+    
+    # Update many feeds, overlapping their consensus waits
+    python scripts/oracle_client.py 0xAAA...,0xBBB... update --in-flight 4
+    
+    # Monitor many feeds at once (JSON lines on stdout)
+    python scripts/oracle_client.py feeds.txt read-many --workers 16
 """
 
+import argparse
+import json
+import os
 import sys
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 
 # ============================================================================
 # GenLayer Python SDK Imports
@@ -186,8 +214,104 @@ def update_oracle_consumer(client, account, address: str) -> None:
         traceback.print_exc()
 
 
-def detect_contract_type(client, address: str) -> Optional[str]:
-    """Detect contract type by trying to read different methods."""
+class ContractTypeCache:
+    """
+    Persistent JSON cache of detected contract types.
+    
+    Entries are keyed by "<chain>:<address>" so the same address on different
+    chains never collides. Only successful detections are stored. Safe to use
+    from the read-many worker threads; call save() once at the end.
+    """
+    
+    def __init__(self, path: str, chain_key: str):
+        self.path = path
+        self.chain_key = chain_key
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = {str(k): str(v) for k, v in data.items()}
+        except (OSError, ValueError):
+            # Missing or corrupt cache: start empty, it is rebuilt on save
+            self._entries = {}
+    
+    @staticmethod
+    def default_path() -> str:
+        return os.environ.get("GENLAYER_ORACLE_CACHE") or os.path.join(
+            os.path.expanduser("~"), ".cache", "genlayer-oracle", "contract_types.json"
+        )
+    
+    def _key(self, address: str) -> str:
+        return f"{self.chain_key}:{address.lower()}"
+    
+    def get(self, address: str) -> Optional[str]:
+        with self._lock:
+            return self._entries.get(self._key(address))
+    
+    def set(self, address: str, contract_type: str) -> None:
+        with self._lock:
+            key = self._key(address)
+            if self._entries.get(key) != contract_type:
+                self._entries[key] = contract_type
+                self._dirty = True
+    
+    def invalidate(self, address: str) -> None:
+        with self._lock:
+            if self._entries.pop(self._key(address), None) is not None:
+                self._dirty = True
+    
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def chain_cache_key(chain) -> str:
+    """Stable cache namespace for a chain config."""
+    for attr in ("id", "name"):
+        value = getattr(chain, attr, None)
+        if value is not None:
+            return str(value)
+    return "unknown"
+
+
+def detect_contract_type(client, address: str, cache: Optional[ContractTypeCache] = None,
+                         refresh: bool = False) -> Optional[str]:
+    """
+    Detect contract type by trying to read different methods.
+    
+    With a cache, a previously detected type is returned without any RPC
+    call; refresh=True drops the cached entry and probes again, so a failed
+    probe leaves nothing stale behind.
+    """
+    if cache is not None:
+        if refresh:
+            cache.invalidate(address)
+        else:
+            cached = cache.get(address)
+            if cached is not None:
+                return cached
+    
+    contract_type = _probe_contract_type(client, address)
+    if cache is not None and contract_type is not None:
+        cache.set(address, contract_type)
+    return contract_type
+
+
+def _probe_contract_type(client, address: str) -> Optional[str]:
+    """Probe get_status, then get_price (up to two RPC round-trips)."""
     # Try Oracle Consumer first (has get_status)
     try:
         client.read_contract(
@@ -215,26 +339,267 @@ def detect_contract_type(client, address: str) -> Optional[str]:
     return None
 
 
+# Read function per contract type (used by quiet / concurrent reads)
+READ_FUNCTIONS = {"oracle": "get_status", "simple": "get_price"}
+
+# Write function and default args per contract type
+UPDATE_CALLS = {
+    "oracle": ("update_all", ["Hanoi", "21.0245", "105.8412", 3]),
+    "simple": ("update_price", []),
+}
+
+
+def parse_address_list(target: str) -> List[str]:
+    """
+    Parse a comma-separated address list, or a file with one address per line.
+    
+    Blank lines and lines starting with '#' are ignored. Duplicates are
+    dropped while keeping the original order.
+    """
+    if os.path.isfile(target):
+        with open(target, "r", encoding="utf-8") as f:
+            candidates = [line.split("#", 1)[0].strip() for line in f]
+    else:
+        candidates = [part.strip() for part in target.split(",")]
+    return list(dict.fromkeys(c for c in candidates if c))
+
+
+def read_contract_state(client, address: str, cache: Optional[ContractTypeCache] = None,
+                        refresh: bool = False) -> dict:
+    """
+    Detect contract type and read its state without printing.
+    
+    If the read fails for a type that came from the cache, the cache entry is
+    dropped so the next run probes the contract again.
+    
+    Returns:
+        JSON-serialisable record with address, type, result/error and elapsed_ms
+    """
+    started = time.perf_counter()
+    record = {"address": address}
+    try:
+        contract_type = detect_contract_type(client, address, cache=cache, refresh=refresh)
+        if contract_type is None:
+            record["ok"] = False
+            record["error"] = "could not detect contract type"
+        else:
+            record["type"] = contract_type
+            try:
+                record["result"] = client.read_contract(
+                    address=address,
+                    function_name=READ_FUNCTIONS[contract_type],
+                    args=[],
+                )
+            except Exception:
+                if cache is not None:
+                    cache.invalidate(address)
+                raise
+            record["ok"] = True
+    except Exception as e:
+        record["ok"] = False
+        record["error"] = str(e)
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def read_many(client, addresses: List[str], workers: int = 8, out=None,
+              cache: Optional[ContractTypeCache] = None, refresh: bool = False) -> int:
+    """
+    Read many contracts concurrently and stream one JSON line per contract.
+    
+    Reads run on a bounded thread pool, so total time is roughly that of the
+    slowest read (per batch of `workers`) rather than the sum of all reads.
+    Lines are written in completion order as soon as each read finishes.
+    
+    Returns:
+        Number of failed reads
+    """
+    out = out or sys.stdout
+    failures = 0
+    if not addresses:
+        return failures
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(addresses)))) as pool:
+        futures = [
+            pool.submit(read_contract_state, client, address, cache, refresh)
+            for address in addresses
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            if not record["ok"]:
+                failures += 1
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+    return failures
+
+
+def update_many(client, account, addresses: List[str], max_in_flight: int = 8,
+                cache: Optional[ContractTypeCache] = None, refresh: bool = False) -> int:
+    """
+    Update many contracts through the submission pipeline.
+    
+    Up to max_in_flight transactions are outstanding at once and their
+    statuses are polled in batches with backoff, so consensus waits overlap
+    instead of being serialised. Prints per-transaction outcomes and
+    submit->accepted / submit->finalized latency histograms.
+    
+    Returns:
+        Number of transactions that did not finalize
+    """
+    from tx_pipeline import TxPipeline
+    
+    print(f"\n--- Updating {len(addresses)} contracts (max {max_in_flight} in flight) ---")
+    
+    pipeline = TxPipeline(client, account, max_in_flight=max_in_flight)
+    skipped = 0
+    for address in addresses:
+        contract_type = detect_contract_type(client, address, cache=cache, refresh=refresh)
+        if contract_type is None:
+            print(f"ERROR: Could not detect contract type for {address}, skipping")
+            skipped += 1
+            continue
+        function_name, call_args = UPDATE_CALLS[contract_type]
+        pipeline.submit(address, function_name, call_args)
+    
+    started = time.monotonic()
+    jobs = pipeline.run()
+    elapsed = time.monotonic() - started
+    
+    print(f"\nCompleted {len(jobs)} transactions in {elapsed:.1f}s")
+    for job in jobs:
+        print(f"  {job.address}: {job.status}" + (f" ({job.error})" if job.error else ""))
+    print()
+    print(pipeline.accepted_latency.render("submit -> accepted"))
+    print(pipeline.finalized_latency.render("submit -> finalized"))
+    
+    return skipped + sum(1 for job in jobs if job.status != "FINALIZED")
+
+
+def run_keeper(client, account, config_path: str, cache: Optional[ContractTypeCache] = None,
+               refresh: bool = False) -> None:
+    """Run the long-running keeper for every feed in a config file."""
+    from oracle_keeper import Feed, Keeper, SubmissionRateLimiter, load_keeper_config
+    
+    print("\n--- Oracle Keeper ---")
+    
+    try:
+        config = load_keeper_config(config_path)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Invalid keeper config: {e}")
+        return
+    
+    feeds = []
+    for entry in config["feeds"]:
+        if not entry.get("kind"):
+            contract_type = detect_contract_type(client, entry["address"], cache=cache, refresh=refresh)
+            if contract_type is None:
+                print(f"ERROR: Could not detect contract type for {entry['address']}, skipping")
+                continue
+            entry = dict(entry, kind=contract_type)
+        feeds.append(Feed.from_config(entry))
+    if cache is not None:
+        cache.save()
+    
+    if not feeds:
+        print("ERROR: No usable feeds in config")
+        return
+    
+    rate = config.get("rate_limit") or {}
+    keeper = Keeper(
+        client,
+        account,
+        feeds,
+        rate_limiter=SubmissionRateLimiter(
+            per_second=float(rate.get("per_second", 1.0)),
+            burst=int(rate.get("burst", 1)),
+        ),
+    )
+    print(f"Keeping {len(feeds)} feed(s) updated (Ctrl+C to stop)")
+    try:
+        keeper.run(tick_seconds=float(config.get("tick_seconds", 1.0)))
+    finally:
+        print("\nKeeper stats:")
+        for address, stats in keeper.stats().items():
+            print(f"  {address}: {stats}")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line arguments (positional usage is unchanged)."""
+    parser = argparse.ArgumentParser(description="GenLayer Oracle Client (Python)")
+    parser.add_argument("contract_address", nargs="?", default=None,
+                        help="Contract address (or address list / keeper config, depending on action)")
+    parser.add_argument("action", nargs="?", default="read",
+                        help="read, update, keep or read-many")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Concurrent reads for read-many (default: 8)")
+    parser.add_argument("--in-flight", type=int, default=8,
+                        help="Transactions kept in flight by a multi-address update (default: 8)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached contract types and re-detect")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main function."""
-    contract_address: Optional[str] = sys.argv[1] if len(sys.argv) > 1 else None
-    action: str = sys.argv[2] if len(sys.argv) > 2 else "read"
+    args = parse_args(sys.argv[1:])
     
     # Create account and client
     account = create_account()
     # Note: genlayer-py requires account in create_client for read_contract
     client = create_client(chain=CHAIN, account=account)
+    cache = ContractTypeCache(ContractTypeCache.default_path(), chain_cache_key(CHAIN))
     
-    print("\n=== GenLayer Oracle Client (Python) ===")
-    print(f"Chain: {CHAIN.name if hasattr(CHAIN, 'name') else 'Unknown'}")
-    print(f"Account: {account.address}")
+    try:
+        run_action(client, account, cache, args)
+    finally:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"WARNING: Could not save contract type cache: {e}", file=sys.stderr)
+
+
+def run_action(client, account, cache: ContractTypeCache, args: argparse.Namespace) -> None:
+    """Dispatch the requested action."""
+    contract_address: Optional[str] = args.contract_address
+    action: str = args.action
+    
+    # read-many streams JSON lines on stdout, so keep the banner off it
+    banner_out = sys.stderr if action == "read-many" else sys.stdout
+    print("\n=== GenLayer Oracle Client (Python) ===", file=banner_out)
+    print(f"Chain: {CHAIN.name if hasattr(CHAIN, 'name') else 'Unknown'}", file=banner_out)
+    print(f"Account: {account.address}", file=banner_out)
     
     if contract_address:
+        if action == "read-many":
+            addresses = parse_address_list(contract_address)
+            if not addresses:
+                print("ERROR: No addresses given", file=sys.stderr)
+                sys.exit(1)
+            failures = read_many(client, addresses, workers=args.workers, cache=cache, refresh=args.refresh)
+            if failures:
+                print(f"WARNING: {failures}/{len(addresses)} reads failed", file=sys.stderr)
+            return
+        
+        if action == "update":
+            addresses = parse_address_list(contract_address)
+            if not addresses:
+                print("ERROR: No addresses given", file=sys.stderr)
+                sys.exit(1)
+            if len(addresses) > 1:
+                update_many(client, account, addresses, max_in_flight=args.in_flight,
+                            cache=cache, refresh=args.refresh)
+                return
+            # A file or list holding one address: update it directly
+            contract_address = addresses[0]
+        
+        if action == "keep":
+            run_keeper(client, account, contract_address, cache=cache, refresh=args.refresh)
+            return
+        
         print(f"\nContract Address: {contract_address}")
         print(f"Action: {action}")
         
         # Detect contract type
-        contract_type = detect_contract_type(client, contract_address)
+        contract_type = detect_contract_type(client, contract_address, cache=cache, refresh=args.refresh)
         
         if contract_type is None:
             print("ERROR: Could not detect contract type.")
@@ -254,7 +619,7 @@ def main():
                 update_simple_price_feed(client, account, contract_address)
         else:
             print(f"ERROR: Unknown action: {action}")
-            print("   Available actions: read, update")
+            print("   Available actions: read, update, keep, read-many")
     else:
         print("\n--- Usage ---")
         print("Provide contract address to interact with contract:")
@@ -262,6 +627,11 @@ def main():
         print("\nActions:")
         print("  read    - Read from contract (default)")
         print("  update  - Update contract (write transaction)")
+        print("  keep    - Keep all feeds in a keeper config updated (pass config path)")
+        print("  read-many - Read many contracts concurrently (comma list or file of addresses)")
+        print("\nOptions:")
+        print("  --refresh   - Re-detect contract types instead of using the on-disk cache")
+        print("  --in-flight - Transactions kept in flight by a multi-address update")
         print("\nExamples:")
         print("  # Read from Oracle Consumer")
         print("  python scripts/oracle_client.py 0xe0E45EC84BB780BB1cccAc1B0CB09E507eF37147")
@@ -269,6 +639,12 @@ def main():
         print("  python scripts/oracle_client.py 0xe328378CAF086ae0a6458395C9919a4137fCb888")
         print("\n  # Update Simple Price Feed")
         print("  python scripts/oracle_client.py 0xe328378CAF086ae0a6458395C9919a4137fCb888 update")
+        print("\n  # Update many feeds with pipelined submission")
+        print("  python scripts/oracle_client.py feeds.txt update --in-flight 4")
+        print("\n  # Run keeper for many feeds")
+        print("  python scripts/oracle_client.py keeper.json keep")
+        print("\n  # Read many feeds concurrently")
+        print("  python scripts/oracle_client.py feeds.txt read-many --workers 16")
 
 
 if __name__ == "__main__":
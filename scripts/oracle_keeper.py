@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+GenLayer Oracle Keeper
+
+Long-running scheduler that keeps many oracle contracts fresh.
+Used by `scripts/oracle_client.py <config.json> keep`.
+
+Each feed is updated when either:
+  - its interval has elapsed since the last submission, or
+  - the reference market price deviates from the on-chain price by more
+    than the feed's deviation threshold.
+
+Transactions are pipelined: the keeper submits and moves on, then polls
+pending hashes on later ticks instead of blocking on finalization. A
+transaction still pending after the feed's `pending_timeout` is counted as
+failed and dropped, so a stuck transaction cannot block its feed forever. A
+global token bucket caps how many transactions are submitted per second
+across all feeds.
+
+The keeper only needs a client object with `write_contract`,
+`read_contract` and `get_transaction`, so it can be driven by a local
+stand-in client (no genlayer-py required).
+
+Config file format:
+    {
+      "tick_seconds": 1.0,
+      "rate_limit": {"per_second": 0.5, "burst": 2},
+      "feeds": [
+        {"address": "0x...", "kind": "simple", "interval": 300,
+         "deviation": 0.005, "symbol": "ETH", "check_every": 30,
+         "pending_timeout": 600},
+        {"address": "0x...", "kind": "oracle", "interval": 900,
+         "args": ["Hanoi", "21.0245", "105.8412", 3]}
+      ]
+    }
+"""
+
+import json
+import time
+from typing import Callable, Dict, List, Optional
+
+from http_pool import shared_transport
+from tx_pipeline import ACCEPTED, FAILED_STATUSES, FINALIZED, fetch_tx_status
+
+
+# Contract kind -> (write function, default args, read function)
+CONTRACT_KINDS = {
+    "simple": ("update_price", [], "get_price"),
+    "oracle": ("update_all", ["Hanoi", "21.0245", "105.8412", 3], "get_status"),
+}
+
+# Status names after which a feed may be scheduled again
+SETTLED_STATUSES = (ACCEPTED, FINALIZED)
+
+
+def onchain_price(state) -> Optional[float]:
+    """Read the stored price out of a `get_price` / `get_status` result."""
+    if not isinstance(state, dict):
+        return None
+    value = state.get("price")
+    if isinstance(value, dict):
+        value = value.get("eth_usd")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def binance_reference_price(symbol: str) -> Optional[float]:
+    """Default reference price provider: Binance spot ticker (pooled keep-alive connection)."""
+    url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol.upper()}USDT"
+    try:
+        resp = shared_transport().get(url, headers={"User-Agent": "GenLayerOracleKeeper/1.0"})
+        if resp.status != 200:
+            return None
+        return float(resp.json()["price"])
+    except Exception:
+        return None
+
+
+class SubmissionRateLimiter:
+    """
+    Global token bucket for transaction submissions.
+
+    Args:
+        per_second: Sustained submissions per second
+        burst: Maximum submissions allowed back to back
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(self, per_second: float = 1.0, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        if per_second <= 0:
+            raise ValueError("per_second must be > 0")
+        self.per_second = float(per_second)
+        self.burst = max(1, int(burst))
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.per_second)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take one token if available."""
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class Feed:
+    """
+    Schedule state for one contract.
+
+    Args:
+        address: Contract address
+        kind: "simple" (SimplePriceFeed) or "oracle" (OracleConsumer)
+        interval: Seconds between scheduled updates
+        deviation: Relative price move that triggers an early update (0 disables)
+        symbol: Symbol used for the reference price
+        args: Override write arguments
+        check_every: Seconds between deviation checks (each check is one RPC read)
+        pending_timeout: Seconds a submitted transaction may stay unsettled
+                         before it is counted as failed and the feed freed
+    """
+
+    def __init__(self, address: str, kind: str, interval: float = 300.0, deviation: float = 0.0,
+                 symbol: str = "ETH", args: Optional[list] = None, check_every: float = 30.0,
+                 pending_timeout: float = 600.0):
+        if kind not in CONTRACT_KINDS:
+            raise ValueError(f"unknown contract kind: {kind}")
+        function_name, default_args, read_function = CONTRACT_KINDS[kind]
+        self.address = address
+        self.kind = kind
+        self.interval = float(interval)
+        self.deviation = float(deviation)
+        self.symbol = symbol
+        self.function_name = function_name
+        self.args = list(args) if args is not None else list(default_args)
+        self.read_function = read_function
+        self.check_every = float(check_every)
+        self.pending_timeout = float(pending_timeout)
+        self.last_check: Optional[float] = None
+        self.last_submit: Optional[float] = None
+        self.pending_hash: Optional[str] = None
+        self.submitted = 0
+        self.failed = 0
+
+    @classmethod
+    def from_config(cls, entry: dict) -> "Feed":
+        return cls(
+            address=entry["address"],
+            kind=entry["kind"],
+            interval=entry.get("interval", 300.0),
+            deviation=entry.get("deviation", 0.0),
+            symbol=entry.get("symbol", "ETH"),
+            args=entry.get("args"),
+            check_every=entry.get("check_every", 30.0),
+            pending_timeout=entry.get("pending_timeout", 600.0),
+        )
+
+
+class Keeper:
+    """
+    Periodic, rate-aware updater for many oracle contracts.
+
+    Args:
+        client: genlayer-py client (or any stand-in with the same methods)
+        account: Account used for write transactions
+        feeds: Feeds to keep updated
+        rate_limiter: Global submission limiter
+        reference_price: Callable symbol -> market price, used for deviation triggers
+        clock: Monotonic time source
+        sleep: Sleep function used between ticks
+        log: Line logger
+    """
+
+    def __init__(self, client, account, feeds: List[Feed], rate_limiter: Optional[SubmissionRateLimiter] = None,
+                 reference_price: Callable[[str], Optional[float]] = binance_reference_price,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 log: Callable[[str], None] = print):
+        self.client = client
+        self.account = account
+        self.feeds = feeds
+        self.rate_limiter = rate_limiter or SubmissionRateLimiter(clock=clock)
+        self.reference_price = reference_price
+        self.clock = clock
+        self.sleep = sleep
+        self.log = log
+
+    def _is_due(self, feed: Feed, now: float) -> bool:
+        if feed.pending_hash is not None:
+            return False
+        if feed.last_submit is None or now - feed.last_submit >= feed.interval:
+            return True
+        if feed.deviation <= 0:
+            return False
+        if feed.last_check is not None and now - feed.last_check < feed.check_every:
+            return False
+        feed.last_check = now
+        reference = self.reference_price(feed.symbol)
+        if reference is None:
+            return False
+        try:
+            state = self.client.read_contract(address=feed.address, function_name=feed.read_function, args=[])
+        except Exception as e:
+            self.log(f"WARN: {feed.address} read failed: {e}")
+            return False
+        current = onchain_price(state)
+        if not current:
+            return True
+        return abs(reference - current) / current >= feed.deviation
+
+    def _submit(self, feed: Feed, now: float) -> None:
+        try:
+            tx_hash = self.client.write_contract(
+                account=self.account,
+                address=feed.address,
+                function_name=feed.function_name,
+                args=feed.args,
+                value=0,
+            )
+        except Exception as e:
+            feed.failed += 1
+            feed.last_submit = now
+            self.log(f"ERROR: {feed.address} {feed.function_name} submit failed: {e}")
+            return
+        feed.pending_hash = tx_hash
+        feed.last_submit = now
+        feed.submitted += 1
+        self.log(f"SUBMIT: {feed.address} {feed.function_name} -> {tx_hash}")
+
+    def _poll(self, feed: Feed, now: float) -> None:
+        try:
+            status = fetch_tx_status(self.client, feed.pending_hash)
+        except Exception as e:
+            status = None
+            self.log(f"WARN: {feed.address} status poll failed: {e}")
+        if status in SETTLED_STATUSES:
+            self.log(f"{status}: {feed.address} {feed.pending_hash}")
+            feed.pending_hash = None
+        elif status in FAILED_STATUSES:
+            feed.failed += 1
+            self.log(f"ERROR: {feed.address} {feed.pending_hash} {status}")
+            feed.pending_hash = None
+        elif now - feed.last_submit >= feed.pending_timeout:
+            feed.failed += 1
+            self.log(f"ERROR: {feed.address} {feed.pending_hash} still {status or 'unknown'} "
+                     f"after {feed.pending_timeout:g}s, giving up")
+            feed.pending_hash = None
+
+    def tick(self) -> int:
+        """
+        Poll pending transactions, then submit updates for due feeds.
+
+        Returns:
+            Number of transactions submitted during this tick
+        """
+        now = self.clock()
+        for feed in self.feeds:
+            if feed.pending_hash is not None:
+                self._poll(feed, now)
+
+        submitted = 0
+        # Most overdue feeds first, so a tight rate limit does not starve the tail
+        for feed in sorted(self.feeds, key=lambda f: f.last_submit if f.last_submit is not None else float("-inf")):
+            if not self._is_due(feed, now):
+                continue
+            if not self.rate_limiter.try_acquire():
+                break
+            self._submit(feed, now)
+            submitted += 1
+        return submitted
+
+    def run(self, tick_seconds: float = 1.0, max_ticks: Optional[int] = None) -> None:
+        """Run ticks until interrupted (or until max_ticks have run)."""
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            self.tick()
+            ticks += 1
+            self.sleep(tick_seconds)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-feed submission counters."""
+        return {
+            feed.address: {
+                "submitted": feed.submitted,
+                "failed": feed.failed,
+                "pending": feed.pending_hash,
+            }
+            for feed in self.feeds
+        }
+
+
+def load_keeper_config(path: str) -> dict:
+    """Load and minimally validate a keeper config file."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict) or not isinstance(config.get("feeds"), list) or not config["feeds"]:
+        raise ValueError(f"{path}: config must contain a non-empty 'feeds' list")
+    for entry in config["feeds"]:
+        if not isinstance(entry, dict) or not entry.get("address"):
+            raise ValueError(f"{path}: every feed needs an 'address'")
+    return config
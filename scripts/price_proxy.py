@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Price Proxy Service (Python / asyncio)
+
+Python counterpart of `scripts/proxy-service-example.js` for the Off-chain
+Proxy Pattern (`contracts/api-key-patterns/off_chain_proxy_oracle.py`).
+The proxy holds the API keys; contracts call it without credentials.
+
+Endpoints:
+    GET /health              - Service status and counters
+    GET /api/price/{SYMBOL}  - {"price", "source", "timestamp", "symbol"}
+    GET /api/prices?symbols=ETH,BTC
+                             - {"prices": {SYMBOL: {"price", "source"}}, "missing": [...],
+                                "unknown": [...], "timestamp"}; fans out to the upstream
+                                batch endpoints. Only registry symbols are fetched (Binance
+                                rejects a whole batch over one bad pair); the rest are
+                                listed under "unknown"
+
+Symbols must be plain tickers ([A-Z0-9]{1,15} after upper-casing); anything
+else is rejected with 400 before it reaches an upstream URL.
+
+Compared to the Node.js example:
+  - Concurrent identical requests are coalesced (single-flight): 100 leader
+    nodes asking for ETH at the same moment cause one upstream call.
+  - Results are cached for a short TTL (PRICE_CACHE_TTL seconds).
+  - Upstream calls reuse pooled keep-alive connections (scripts/http_pool.py).
+  - Per-client rate limiting uses a sliding-window (or token-bucket) limiter
+    with an LRU-bounded client table (packages/genvm-web-fetcher/rate_limit.py),
+    so memory stays flat under many client IPs and there are no 2x bursts
+    at window edges. Throttle counters are reported by /health.
+
+Configuration (environment variables):
+    COINGECKO_API_KEY   - Coingecko Pro key (enables Coingecko)
+    BINANCE_API_KEY     - Binance key (enables Binance fallback)
+    COINGECKO_API_URL   - Override Coingecko base URL (default: https://api.coingecko.com)
+    BINANCE_API_URL     - Override Binance base URL (default: https://api.binance.com)
+    PRICE_CACHE_TTL     - Cache TTL in seconds (default: 2)
+    RATE_LIMIT_MAX      - Requests per client per window (default: 100)
+    RATE_LIMIT_WINDOW   - Window length in seconds (default: 60)
+    RATE_LIMIT_ALGORITHM - sliding_window (default) or token_bucket
+    RATE_LIMIT_MAX_CLIENTS - Tracked clients before LRU eviction (default: 10000)
+    SYMBOLS_FILE        - Symbol snapshot (default: packages/genvm-web-fetcher/symbols.json)
+    HOST / PORT         - Bind address (default: 0.0.0.0:3000)
+
+Usage:
+    COINGECKO_API_KEY=... python scripts/price_proxy.py
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from http_pool import PooledTransport
+
+WEB_FETCHER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "packages", "genvm-web-fetcher")
+sys.path.insert(0, WEB_FETCHER_DIR)
+from rate_limit import KeyedRateLimiter  # noqa: E402
+
+
+def load_symbols(path: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """
+    SYMBOL -> (Binance pair, Coingecko id) from a symbols.json snapshot.
+
+    The same snapshot backs web_fetcher.SYMBOLS and the Node.js proxy, so all
+    three resolve a symbol to the same upstream ids.
+    """
+    with open(path, encoding="utf-8") as f:
+        symbols = json.load(f)["symbols"]
+    return {symbol.upper(): (entry.get("binance"), entry.get("coingecko")) for symbol, entry in symbols.items()}
+
+
+SYMBOLS = load_symbols(os.environ.get("SYMBOLS_FILE") or os.path.join(WEB_FETCHER_DIR, "symbols.json"))
+
+
+def source_ids(symbol: str) -> Tuple[Optional[str], Optional[str]]:
+    """(Binance pair, Coingecko id); unknown symbols get SYMBOL + "USDT" and no Coingecko id."""
+    return SYMBOLS.get(symbol, (f"{symbol}USDT", None))
+
+
+# Symbols end up in upstream query strings next to our API keys, so anything
+# but a plain ticker is rejected before it gets that far
+SYMBOL_PATTERN = re.compile(r"[A-Z0-9]{1,15}")
+
+MAX_REQUEST_HEAD = 16 * 1024
+MAX_BATCH_SYMBOLS = 50
+
+
+class ProxyConfig:
+    """Proxy settings, read from the environment by default."""
+
+    def __init__(self, coingecko_api_key: Optional[str] = None, binance_api_key: Optional[str] = None,
+                 coingecko_url: str = "https://api.coingecko.com", binance_url: str = "https://api.binance.com",
+                 cache_ttl: float = 2.0, upstream_timeout: float = 5.0, upstream_concurrency: int = 16,
+                 rate_limit_max: int = 100, rate_limit_window: float = 60.0,
+                 rate_limit_algorithm: str = "sliding_window", rate_limit_max_clients: int = 10000):
+        self.coingecko_api_key = coingecko_api_key
+        self.binance_api_key = binance_api_key
+        self.coingecko_url = coingecko_url.rstrip("/")
+        self.binance_url = binance_url.rstrip("/")
+        self.cache_ttl = cache_ttl
+        self.upstream_timeout = upstream_timeout
+        self.upstream_concurrency = upstream_concurrency
+        self.rate_limit_max = rate_limit_max
+        self.rate_limit_window = rate_limit_window
+        self.rate_limit_algorithm = rate_limit_algorithm
+        self.rate_limit_max_clients = rate_limit_max_clients
+
+    @classmethod
+    def from_env(cls) -> "ProxyConfig":
+        return cls(
+            coingecko_api_key=os.environ.get("COINGECKO_API_KEY") or None,
+            binance_api_key=os.environ.get("BINANCE_API_KEY") or None,
+            coingecko_url=os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com"),
+            binance_url=os.environ.get("BINANCE_API_URL", "https://api.binance.com"),
+            cache_ttl=float(os.environ.get("PRICE_CACHE_TTL", "2")),
+            rate_limit_max=int(os.environ.get("RATE_LIMIT_MAX", "100")),
+            rate_limit_window=float(os.environ.get("RATE_LIMIT_WINDOW", "60")),
+            rate_limit_algorithm=os.environ.get("RATE_LIMIT_ALGORITHM", "sliding_window"),
+            rate_limit_max_clients=int(os.environ.get("RATE_LIMIT_MAX_CLIENTS", "10000")),
+        )
+
+
+class PriceProxy:
+    """
+    Request handling core of the proxy, independent of the socket server.
+
+    Args:
+        config: Proxy settings
+        transport: Upstream HTTP transport (default: pooled, sized to
+                   upstream_concurrency)
+        clock: Time source for the TTL cache and the rate limiter
+    """
+
+    def __init__(self, config: ProxyConfig, transport: Optional[PooledTransport] = None,
+                 clock=time.monotonic):
+        self.config = config
+        self.transport = transport or PooledTransport(
+            max_per_host=config.upstream_concurrency,
+            timeout=config.upstream_timeout,
+        )
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=config.upstream_concurrency)
+        self._cache: Dict[str, Tuple[float, dict]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.limiter = KeyedRateLimiter(
+            rate=config.rate_limit_max / config.rate_limit_window,
+            burst=config.rate_limit_max,
+            max_keys=config.rate_limit_max_clients,
+            algorithm=config.rate_limit_algorithm,
+            window=config.rate_limit_window,
+            clock=clock,
+        )
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "upstream_calls": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+
+    def _count(self, key: str) -> None:
+        # Upstream calls run on executor threads, so counters need a lock
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Upstream calls (blocking; run on the executor)
+    # ------------------------------------------------------------------
+
+    def _fetch_coingecko(self, symbol: str) -> Optional[dict]:
+        coin_id = source_ids(symbol)[1]
+        if not coin_id:
+            return None
+        self._count("upstream_calls")
+        resp = self.transport.get(
+            f"{self.config.coingecko_url}/api/v3/simple/price?ids={coin_id}&vs_currencies=usd",
+            headers={"X-CG-Pro-API-Key": self.config.coingecko_api_key, "User-Agent": "GenLayerProxy/1.0"},
+        )
+        if resp.status != 200:
+            return None
+        price = (resp.json().get(coin_id) or {}).get("usd")
+        if not price:
+            return None
+        return {"price": str(price), "source": "coingecko-proxy"}
+
+    def _fetch_binance(self, symbol: str) -> Optional[dict]:
+        pair = source_ids(symbol)[0]
+        if not pair:
+            return None
+        self._count("upstream_calls")
+        resp = self.transport.get(
+            f"{self.config.binance_url}/api/v3/ticker/price?symbol={pair}",
+            headers={"X-MBX-APIKEY": self.config.binance_api_key, "User-Agent": "GenLayerProxy/1.0"},
+        )
+        if resp.status != 200:
+            return None
+        price = resp.json().get("price")
+        if price is None or float(price) <= 0:
+            return None
+        return {"price": str(price), "source": "binance-proxy"}
+
+    def _fetch_coingecko_batch(self, symbols: List[str]) -> Dict[str, dict]:
+        """One Coingecko call for many symbols (ids=a,b,c)."""
+        ids = {source_ids(symbol)[1]: symbol for symbol in symbols}
+        ids.pop(None, None)
+        if not ids:
+            return {}
+        self._count("upstream_calls")
+        resp = self.transport.get(
+            f"{self.config.coingecko_url}/api/v3/simple/price?ids={','.join(ids)}&vs_currencies=usd",
+            headers={"X-CG-Pro-API-Key": self.config.coingecko_api_key, "User-Agent": "GenLayerProxy/1.0"},
+        )
+        if resp.status != 200:
+            return {}
+        data = resp.json()
+        results = {}
+        for coin_id, symbol in ids.items():
+            price = (data.get(coin_id) or {}).get("usd")
+            if price:
+                results[symbol] = {"price": str(price), "source": "coingecko-proxy"}
+        return results
+
+    def _fetch_binance_batch(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        One Binance call for many symbols (symbols=["AUSDT","BUSDT"]).
+
+        Binance answers 400 for the whole batch if any pair is unknown, so
+        only registry pairs are sent; guessed SYMBOL + "USDT" pairs are not.
+        """
+        pairs = {SYMBOLS[symbol][0]: symbol for symbol in symbols if symbol in SYMBOLS}
+        pairs.pop(None, None)
+        if not pairs:
+            return {}
+        self._count("upstream_calls")
+        query = quote(json.dumps(list(pairs), separators=(",", ":")))
+        resp = self.transport.get(
+            f"{self.config.binance_url}/api/v3/ticker/price?symbols={query}",
+            headers={"X-MBX-APIKEY": self.config.binance_api_key, "User-Agent": "GenLayerProxy/1.0"},
+        )
+        if resp.status != 200:
+            return {}
+        results = {}
+        for item in resp.json():
+            symbol = pairs.get(item.get("symbol"))
+            price = item.get("price")
+            if symbol and price is not None and float(price) > 0:
+                results[symbol] = {"price": str(price), "source": "binance-proxy"}
+        return results
+
+    def _fetch_prices(self, symbols: List[str]) -> Dict[str, dict]:
+        """
+        Coingecko first (if keyed), then Binance (if keyed) for what is left.
+
+        A single symbol uses the single-symbol endpoints; several symbols use
+        each upstream's batch endpoint, so N symbols cost at most two calls.
+        """
+        results: Dict[str, dict] = {}
+        if self.config.coingecko_api_key:
+            try:
+                if len(symbols) == 1:
+                    result = self._fetch_coingecko(symbols[0])
+                    if result:
+                        results[symbols[0]] = result
+                else:
+                    results.update(self._fetch_coingecko_batch(symbols))
+            except Exception as e:
+                print(f"Coingecko failed, trying Binance... {e}")
+        missing = [symbol for symbol in symbols if symbol not in results]
+        if missing and self.config.binance_api_key:
+            try:
+                if len(missing) == 1:
+                    result = self._fetch_binance(missing[0])
+                    if result:
+                        results[missing[0]] = result
+                else:
+                    results.update(self._fetch_binance_batch(missing))
+            except Exception as e:
+                print(f"Binance failed: {e}")
+        return results
+
+    # ------------------------------------------------------------------
+    # Cache + single-flight
+    # ------------------------------------------------------------------
+
+    async def get_prices(self, symbols: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Prices for many symbols.
+
+        Each symbol is served from the cache, joins an in-flight fetch for
+        the same symbol, or is part of one new upstream batch shared by every
+        concurrent caller. Unavailable symbols map to None.
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        now = self.clock()
+        results: Dict[str, Optional[dict]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        to_fetch: List[str] = []
+        for symbol in symbols:
+            cached = self._cache.get(symbol)
+            if cached is not None and cached[0] > now:
+                self._count("cache_hits")
+                results[symbol] = cached[1]
+            elif symbol in self._inflight:
+                self._count("coalesced")
+                waiting[symbol] = self._inflight[symbol]
+            else:
+                to_fetch.append(symbol)
+
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {symbol: loop.create_future() for symbol in to_fetch}
+            self._inflight.update(futures)
+            try:
+                fetched = await loop.run_in_executor(self._executor, self._fetch_prices, to_fetch)
+                expires = self.clock() + self.config.cache_ttl
+                for symbol, future in futures.items():
+                    result = fetched.get(symbol)
+                    if result is not None:
+                        self._cache[symbol] = (expires, result)
+                    results[symbol] = result
+                    future.set_result(result)
+            except Exception as e:
+                for future in futures.values():
+                    if not future.done():
+                        future.set_exception(e)
+                        future.exception()  # mark retrieved when nobody else was waiting
+                raise
+            finally:
+                for symbol in to_fetch:
+                    del self._inflight[symbol]
+
+        for symbol, future in waiting.items():
+            results[symbol] = await asyncio.shield(future)
+        return {symbol: results.get(symbol) for symbol in symbols}
+
+    async def get_price(self, symbol: str) -> Optional[dict]:
+        """Price for one symbol (see get_prices)."""
+        return (await self.get_prices([symbol]))[symbol.upper()]
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    async def handle(self, method: str, target: str, client: Optional[str] = None) -> Tuple[int, dict]:
+        """
+        Route one request; returns (status, JSON body).
+
+        `client` identifies the caller for rate limiting (the peer IP when
+        served over HTTP); None skips the limiter.
+        """
+        self._count("requests")
+        if client is not None:
+            wait = self.limiter.try_acquire(client)
+            if wait > 0:
+                return 429, {"error": "Rate limit exceeded", "retryAfter": math.ceil(wait)}
+        parts = urlsplit(target)
+        path = parts.path
+        if method != "GET":
+            return 405, {"error": "Method not allowed"}
+
+        if path == "/health":
+            return 200, {
+                "status": "ok",
+                "timestamp": int(time.time() * 1000),
+                "hasCoingeckoKey": bool(self.config.coingecko_api_key),
+                "hasBinanceKey": bool(self.config.binance_api_key),
+                "stats": dict(self.stats),
+                "rateLimit": self.limiter.metrics(),
+            }
+
+        if path.startswith("/api/price/"):
+            symbol = unquote(path[len("/api/price/"):]).strip().upper()
+            if not SYMBOL_PATTERN.fullmatch(symbol):
+                return 400, {"error": "Invalid symbol"}
+            try:
+                result = await self.get_price(symbol)
+            except Exception as e:
+                self._count("errors")
+                return 500, {"error": "Proxy error", "message": str(e)}
+            if result is None:
+                self._count("errors")
+                return 503, {
+                    "error": "All price sources unavailable",
+                    "message": "Coingecko and Binance both failed",
+                }
+            return 200, dict(result, timestamp=int(time.time() * 1000), symbol=symbol)
+
+        if path == "/api/prices":
+            raw = ",".join(parse_qs(parts.query).get("symbols", []))
+            symbols = [s.strip().upper() for s in raw.split(",") if s.strip()]
+            if not symbols:
+                return 400, {"error": "symbols query parameter required"}
+            if len(symbols) > MAX_BATCH_SYMBOLS:
+                return 400, {"error": f"at most {MAX_BATCH_SYMBOLS} symbols per request"}
+            invalid = [symbol for symbol in symbols if not SYMBOL_PATTERN.fullmatch(symbol)]
+            if invalid:
+                return 400, {"error": "Invalid symbol", "symbols": invalid}
+            unknown = [symbol for symbol in dict.fromkeys(symbols) if symbol not in SYMBOLS]
+            symbols = [symbol for symbol in symbols if symbol in SYMBOLS]
+            if not symbols:
+                return 400, {"error": "Unknown symbols", "unknown": unknown}
+            try:
+                results = await self.get_prices(symbols)
+            except Exception as e:
+                self._count("errors")
+                return 500, {"error": "Proxy error", "message": str(e)}
+            prices = {symbol: result for symbol, result in results.items() if result is not None}
+            if not prices:
+                self._count("errors")
+                return 503, {
+                    "error": "All price sources unavailable",
+                    "message": "Coingecko and Binance both failed",
+                    "unknown": unknown,
+                }
+            return 200, {
+                "prices": prices,
+                "missing": [symbol for symbol, result in results.items() if result is None],
+                "unknown": unknown,
+                "timestamp": int(time.time() * 1000),
+            }
+
+        return 404, {"error": "Not found"}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.transport.close()
+
+
+# ----------------------------------------------------------------------
+# Minimal HTTP/1.1 server (keep-alive, GET only)
+# ----------------------------------------------------------------------
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+async def _serve_connection(proxy: PriceProxy, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+    peer = writer.get_extra_info("peername")
+    client = peer[0] if peer else "unknown"
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            if len(head) > MAX_REQUEST_HEAD:
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                return
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            status, body = await proxy.handle(method.upper(), target, client)
+            payload = json.dumps(body).encode("utf-8")
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1") + payload
+            )
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def start_server(proxy: PriceProxy, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+    """Start serving `proxy`; port 0 picks a free port (see server.sockets)."""
+    return await asyncio.start_server(
+        lambda r, w: _serve_connection(proxy, r, w), host, port, limit=MAX_REQUEST_HEAD
+    )
+
+
+async def _main() -> None:
+    config = ProxyConfig.from_env()
+    proxy = PriceProxy(config)
+    host = os.environ.get("HOST", "0.0.0.0")
+    port = int(os.environ.get("PORT", "3000"))
+    server = await start_server(proxy, host, port)
+    print(f"Proxy service running on http://{host}:{port}")
+    print(f"Health check: http://{host}:{port}/health")
+    print(f"Price endpoint: http://{host}:{port}/api/price/ETH")
+    if not config.coingecko_api_key and not config.binance_api_key:
+        print("WARNING: No API keys configured")
+        print("   Set COINGECKO_API_KEY or BINANCE_API_KEY")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        proxy.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        print("\nProxy stopped")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Profile a contract method locally under the GenVM stub.
+
+Loads the contract with the stub `genlayer.gl` from packages/genvm-local,
+answers its web requests from a fixtures file, and runs the method under
+cProfile, a folded-stack profiler and tracemalloc (one fresh deployment per
+pass, so state changes in one pass do not affect the next).
+
+Usage:
+    python scripts/profile_contract.py contracts/oracle_consumer.py update_all
+    python scripts/profile_contract.py contracts/oracle_consumer.py update_all Hanoi 21.0245 105.8412 3
+    python scripts/profile_contract.py packages/genvm-web-fetcher/examples/simple_price_feed.py update_price \\
+        --path packages/genvm-web-fetcher --folded simple.folded
+
+Arguments after the method name are parsed as JSON when possible (so 3 is an
+int and '["ETH","BTC"]' a list) and passed as strings otherwise.
+
+Options:
+    --fixtures PATH   Fake upstream routes (default: packages/genvm-local/fixtures/default.json)
+    --class NAME      Contract class when the file defines several
+    --init-args JSON  Constructor arguments as a JSON list
+    --setup JSON      Calls to make after deploying, e.g. '[["set_proxy_url", "https://p/api"]]'
+    --path DIR        Extra import path (repeatable)
+    --repeat N        Calls per pass (default: 1)
+    --passes LIST     Any of cprofile,folded,memory (default: all three)
+    --top N           Rows per report (default: 15)
+    --sort KEY        pstats sort key (default: cumulative)
+    --folded PATH     Write folded stacks for flamegraph.pl / speedscope
+    --pstats PATH     Write raw cProfile stats
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(ROOT, "packages", "genvm-local"))
+
+import genvm_local  # noqa: E402
+from genvm_local import profiling  # noqa: E402
+
+DEFAULT_FIXTURES = os.path.join(ROOT, "packages", "genvm-local", "fixtures", "default.json")
+
+
+def parse_value(raw: str):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a contract method under the GenVM stub")
+    parser.add_argument("contract", help="Path to the contract file")
+    parser.add_argument("method", help="Public method to call")
+    parser.add_argument("args", nargs="*", help="Method arguments (JSON or plain strings)")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--class", dest="class_name", default=None)
+    parser.add_argument("--init-args", default="[]")
+    parser.add_argument("--setup", default="[]")
+    parser.add_argument("--path", action="append", default=[])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--passes", default="cprofile,folded,memory")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--sort", default="cumulative")
+    parser.add_argument("--folded", default=None)
+    parser.add_argument("--pstats", default=None)
+    return parser.parse_args(argv)
+
+
+def make_call(runtime, cls, args, opts):
+    """Fresh deployment + transport reset; returns the callable to profile."""
+    contract = genvm_local.deploy(cls, *json.loads(opts.init_args))
+    for setup in json.loads(opts.setup):
+        genvm_local.call(contract, setup[0], *setup[1:])
+    genvm_local.reset_storage_writes(contract)
+    runtime.transport.reset()
+    runtime.calls.clear()
+
+    def run():
+        result = None
+        for _ in range(opts.repeat):
+            result = genvm_local.call(contract, opts.method, *args)
+        return result
+
+    return contract, run
+
+
+def print_summary(runtime, contract, outcome) -> None:
+    if outcome.error is not None:
+        print(f"call raised: {type(outcome.error).__name__}: {outcome.error}")
+    else:
+        print(f"result: {outcome.result!r}")
+    print(f"requests: {len(runtime.transport.requests)}")
+    for url in runtime.transport.requests:
+        print(f"  {url}")
+    for i, call in enumerate(runtime.calls):
+        print(f"run_nondet #{i}: {json.dumps(call.to_dict())}")
+    print(f"storage writes: {genvm_local.storage_writes(contract)}")
+
+
+def main(argv=None) -> int:
+    opts = parse_args(argv)
+    passes = [p.strip() for p in opts.passes.split(",") if p.strip()]
+    transport = genvm_local.FakeTransport.from_fixtures(opts.fixtures)
+    runtime = genvm_local.install(genvm_local.Runtime(transport))
+    module = genvm_local.load_contract(opts.contract, opts.path)
+    cls = genvm_local.find_contract_class(module, opts.class_name)
+    args = [parse_value(raw) for raw in opts.args]
+    print(f"{cls.__name__}.{opts.method}({', '.join(map(repr, args))}) x{opts.repeat}\n")
+
+    summary_printed = False
+    if "cprofile" in passes:
+        contract, run = make_call(runtime, cls, args, opts)
+        outcome, stats = profiling.run_cprofile(run)
+        print_summary(runtime, contract, outcome)
+        summary_printed = True
+        print(f"\n=== cProfile (top {opts.top} by {opts.sort}) ===")
+        print(profiling.format_pstats(stats, opts.sort, opts.top))
+        if opts.pstats:
+            stats.dump_stats(opts.pstats)
+            print(f"wrote {opts.pstats}")
+
+    if "folded" in passes:
+        contract, run = make_call(runtime, cls, args, opts)
+        outcome, folded = profiling.run_folded(run)
+        if not summary_printed:
+            print_summary(runtime, contract, outcome)
+            summary_printed = True
+        print(f"\n=== Hottest frames by self time (top {opts.top}) ===")
+        for name, ms in folded.hottest(opts.top):
+            print(f"  {ms:9.3f} ms  {name}")
+        if opts.folded:
+            folded.write(opts.folded)
+            print(f"wrote {opts.folded} ({len(folded.lines())} stacks)")
+
+    if "memory" in passes:
+        contract, run = make_call(runtime, cls, args, opts)
+        outcome, allocations = profiling.run_tracemalloc(run, top=opts.top)
+        if not summary_printed:
+            print_summary(runtime, contract, outcome)
+        print(f"\n=== Allocations (top {opts.top}) ===")
+        print(allocations.render())
+
+    genvm_local.uninstall()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,7 @@
  * 
  * Usage:
  *   Contract calls: GET https://your-proxy.com/api/price/ETH
+ *   Batch:          GET https://your-proxy.com/api/prices?symbols=ETH,BTC
  *   Proxy adds API key and calls: GET https://api.coingecko.com/.../price?...
  */
 
@@ -21,6 +22,19 @@ const express = require('express');
 const axios = require('axios');
 require('dotenv').config();
 
+// Shared symbol snapshot (also used by web_fetcher.SYMBOLS and price_proxy.py)
+const { symbols: SYMBOLS } = require(process.env.SYMBOLS_FILE || '../packages/genvm-web-fetcher/symbols.json');
+
+// Binance pair and Coingecko id for a symbol. Unknown symbols get SYMBOL + 'USDT'
+// and no Coingecko id; a null entry means the source does not list the symbol.
+function sourceIds(symbol) {
+  const entry = SYMBOLS[symbol];
+  if (!entry) {
+    return { binance: `${symbol}USDT`, coingecko: null };
+  }
+  return { binance: entry.binance, coingecko: entry.coingecko };
+}
+
 const app = express();
 app.use(express.json());
 
@@ -77,11 +91,12 @@ app.get('/health', (req, res) => {
 
 // Price endpoint
 app.get('/api/price/:symbol', async (req, res) => {
-  const symbol = symbolMap[req.params.symbol.toUpperCase()] || req.params.symbol.toLowerCase();
+  const ids = sourceIds(req.params.symbol.toUpperCase());
+  const symbol = ids.coingecko;
   
   try {
     // Try Coingecko first (if key available)
-    if (COINGECKO_API_KEY) {
+    if (COINGECKO_API_KEY && symbol) {
       try {
         const response = await axios.get(
           'https://api.coingecko.com/api/v3/simple/price',
@@ -115,9 +130,9 @@ app.get('/api/price/:symbol', async (req, res) => {
     }
     
     // Fallback to Binance (if key available)
-    if (BINANCE_API_KEY) {
+    if (BINANCE_API_KEY && ids.binance) {
       try {
-        const binanceSymbol = `${req.params.symbol.toUpperCase()}USDT`;
+        const binanceSymbol = ids.binance;
         const response = await axios.get(
           `https://api.binance.com/api/v3/ticker/price`,
           {
@@ -160,17 +175,101 @@ app.get('/api/price/:symbol', async (req, res) => {
   }
 });
 
-// Symbol mapping for common cryptocurrencies
-const symbolMap = {
-  'ETH': 'ethereum',
-  'BTC': 'bitcoin',
-  'SOL': 'solana',
-  'MATIC': 'matic-network',
-  'AVAX': 'avalanche-2',
-  'ADA': 'cardano',
-  'DOT': 'polkadot',
-  'LINK': 'chainlink'
-};
+// Batch price endpoint: GET /api/prices?symbols=ETH,BTC
+// One upstream batch call per source instead of one call per symbol
+app.get('/api/prices', async (req, res) => {
+  const symbols = [...new Set(String(req.query.symbols || '')
+    .split(',')
+    .map((s) => s.trim().toUpperCase())
+    .filter(Boolean))];
+  
+  if (symbols.length === 0) {
+    return res.status(400).json({ error: 'symbols query parameter required' });
+  }
+  if (symbols.length > 50) {
+    return res.status(400).json({ error: 'at most 50 symbols per request' });
+  }
+  
+  // Only registry symbols are fetched: Binance rejects the whole batch with
+  // 400 if any pair is invalid, so a guessed SYMBOL + 'USDT' pair would drop
+  // every Binance price in the request. The rest are reported as unknown.
+  const unknown = symbols.filter((s) => !SYMBOLS[s]);
+  const known = symbols.filter((s) => SYMBOLS[s]);
+  if (known.length === 0) {
+    return res.status(400).json({ error: 'Unknown symbols', unknown });
+  }
+  
+  const prices = {};
+  
+  const listed = known.filter((s) => sourceIds(s).coingecko);
+  if (COINGECKO_API_KEY && listed.length > 0) {
+    try {
+      const ids = listed.map((s) => sourceIds(s).coingecko);
+      const response = await axios.get(
+        'https://api.coingecko.com/api/v3/simple/price',
+        {
+          params: { ids: ids.join(','), vs_currencies: 'usd' },
+          headers: {
+            'X-CG-Pro-API-Key': COINGECKO_API_KEY,
+            'User-Agent': 'GenLayerProxy/1.0'
+          },
+          timeout: 5000
+        }
+      );
+      listed.forEach((symbol, i) => {
+        const price = response.data[ids[i]]?.usd;
+        if (price) {
+          prices[symbol] = { price: price.toString(), source: 'coingecko-proxy' };
+        }
+      });
+    } catch (coingeckoError) {
+      console.log('Coingecko batch failed, trying Binance...', coingeckoError.message);
+    }
+  }
+  
+  const pairs = {};
+  known.filter((s) => !prices[s] && sourceIds(s).binance)
+    .forEach((s) => { pairs[sourceIds(s).binance] = s; });
+  if (Object.keys(pairs).length > 0 && BINANCE_API_KEY) {
+    try {
+      const response = await axios.get(
+        'https://api.binance.com/api/v3/ticker/price',
+        {
+          params: { symbols: JSON.stringify(Object.keys(pairs)) },
+          headers: {
+            'X-MBX-APIKEY': BINANCE_API_KEY,
+            'User-Agent': 'GenLayerProxy/1.0'
+          },
+          timeout: 5000
+        }
+      );
+      for (const item of response.data) {
+        const symbol = pairs[item.symbol];
+        const price = parseFloat(item.price);
+        if (symbol && price > 0) {
+          prices[symbol] = { price: price.toString(), source: 'binance-proxy' };
+        }
+      }
+    } catch (binanceError) {
+      console.log('Binance batch failed:', binanceError.message);
+    }
+  }
+  
+  if (Object.keys(prices).length === 0) {
+    return res.status(503).json({
+      error: 'All price sources unavailable',
+      message: 'Coingecko and Binance both failed',
+      unknown
+    });
+  }
+  
+  res.json({
+    prices,
+    missing: known.filter((s) => !prices[s]),
+    unknown,
+    timestamp: Date.now()
+  });
+});
 
 const PORT = process.env.PORT || 3000;
 const HOST = process.env.HOST || '0.0.0.0';
@@ -179,6 +278,7 @@ app.listen(PORT, HOST, () => {
   console.log(`Proxy service running on http://${HOST}:${PORT}`);
   console.log(`Health check: http://${HOST}:${PORT}/health`);
   console.log(`Price endpoint: http://${HOST}:${PORT}/api/price/ETH`);
+  console.log(`Batch endpoint: http://${HOST}:${PORT}/api/prices?symbols=ETH,BTC`);
   
   if (!COINGECKO_API_KEY && !BINANCE_API_KEY) {
     console.warn('⚠️  WARNING: No API keys configured in .env file');
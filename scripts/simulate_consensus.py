@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Simulate consensus for a contract method with N validator nodes.
+
+The leader runs once per call; every validator then runs the contract's
+validator on its own simulated network (latency, jitter, failures) from the
+shared fixtures. Reports the acceptance rate, wall time and per-node work.
+
+Usage:
+    python scripts/simulate_consensus.py contracts/oracle_consumer.py update_all --validators 5 --runs 10
+    python scripts/simulate_consensus.py contracts/oracle_consumer.py update_all \\
+        --validators 20 --latency 0.05 --jitter 0.05 --slow 3:1.0 --rerun-leader --compare
+    python scripts/simulate_consensus.py contracts/oracle_consumer.py update_all --nodes nodes.json
+
+Options:
+    --validators N     Number of validator nodes (default: 5)
+    --latency S        Per-request latency for every node (default: 0)
+    --jitter S         Extra uniform(0, S) latency per request (default: 0)
+    --error-rate P     Per-request failure probability (default: 0)
+    --reject-rate P    Probability a validator votes no anyway (default: 0)
+    --slow I:S         Give validator I (0-based) S seconds latency (repeatable)
+    --leader-latency S Latency of the leader node (default: --latency)
+    --nodes PATH       JSON list of node profiles ({"name", "latency", "jitter",
+                       "error_rate", "fail_match", "reject_rate"}); overrides the above
+    --runs N           Calls to simulate (default: 5)
+    --rerun-leader     Validators re-run the leader fetches before validating
+    --sequential       Run validators one after another instead of in parallel
+    --compare          Run concurrent and sequential back to back
+    --json             Print the report as JSON
+
+Contract options (--fixtures, --class, --init-args, --setup, --path) are the
+same as scripts/profile_contract.py.
+"""
+
+import argparse
+import json
+import sys
+
+from profile_contract import DEFAULT_FIXTURES, parse_value
+
+import genvm_local
+from genvm_local import ConsensusSimulator, NodeProfile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate leader/validator consensus locally")
+    parser.add_argument("contract")
+    parser.add_argument("method")
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--class", dest="class_name", default=None)
+    parser.add_argument("--init-args", default="[]")
+    parser.add_argument("--setup", default="[]")
+    parser.add_argument("--path", action="append", default=[])
+    parser.add_argument("--validators", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--slow", action="append", default=[])
+    parser.add_argument("--leader-latency", type=float, default=None)
+    parser.add_argument("--nodes", default=None)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rerun-leader", action="store_true")
+    parser.add_argument("--sequential", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    return parser.parse_args(argv)
+
+
+def build_profiles(opts):
+    """(leader profile, validator profiles) from the command line."""
+    leader_latency = opts.latency if opts.leader_latency is None else opts.leader_latency
+    leader = NodeProfile("leader", latency=leader_latency, jitter=opts.jitter)
+    if opts.nodes:
+        with open(opts.nodes, "r", encoding="utf-8") as f:
+            return leader, [NodeProfile.from_dict(spec) for spec in json.load(f)]
+    validators = [
+        NodeProfile(f"v{i}", latency=opts.latency, jitter=opts.jitter,
+                    error_rate=opts.error_rate, reject_rate=opts.reject_rate)
+        for i in range(opts.validators)
+    ]
+    for spec in opts.slow:
+        index, seconds = spec.split(":", 1)
+        validators[int(index)].latency = float(seconds)
+    return leader, validators
+
+
+def run_once(opts, concurrent: bool):
+    transport = genvm_local.FakeTransport.from_fixtures(opts.fixtures)
+    runtime = genvm_local.install(genvm_local.Runtime(transport))
+    module = genvm_local.load_contract(opts.contract, opts.path)
+    cls = genvm_local.find_contract_class(module, opts.class_name)
+    contract = genvm_local.deploy(cls, *json.loads(opts.init_args))
+    for setup in json.loads(opts.setup):
+        genvm_local.call(contract, setup[0], *setup[1:])
+
+    leader, validators = build_profiles(opts)
+    simulator = ConsensusSimulator(runtime, validators, leader=leader, concurrent=concurrent, seed=opts.seed,
+                                   rerun_leader=opts.rerun_leader)
+    args = [parse_value(raw) for raw in opts.args]
+    try:
+        return simulator.simulate(lambda: genvm_local.call(contract, opts.method, *args), runs=opts.runs)
+    finally:
+        simulator.close()
+        genvm_local.uninstall()
+
+
+def main(argv=None) -> int:
+    opts = parse_args(argv)
+    modes = [True, False] if opts.compare else [not opts.sequential]
+    reports = [run_once(opts, concurrent) for concurrent in modes]
+    if opts.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2))
+        return 0
+    for report in reports:
+        print(report.render())
+        print()
+    if len(reports) == 2 and reports[0].wall_seconds and reports[1].wall_seconds:
+        concurrent_wall = sum(reports[0].wall_seconds)
+        sequential_wall = sum(reports[1].wall_seconds)
+        if concurrent_wall > 0:
+            print(f"concurrent speedup: {sequential_wall / concurrent_wall:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Tests for the bulk / envelope modes of scripts/encrypt_key.py, run through
+its command line.
+
+    python -m pytest -q scripts/test_encrypt_key.py
+"""
+import base64
+import json
+import sys
+
+import pytest
+
+import encrypt_key
+
+fernet = pytest.importorskip("cryptography.fernet")
+Fernet = fernet.Fernet
+
+KEYS = ["cg-key-1", "cg-key-2", "cg-key-3", "cg-key-4", "cg-key-5"]
+
+
+def run(monkeypatch, capsys, *argv):
+    # Pass Fernet keys as --key=KEY: a key may start with "-"
+    monkeypatch.setattr(sys, "argv", ["encrypt_key.py", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        encrypt_key.main()
+    out, err = capsys.readouterr()
+    return exit_info.value.code, out, err
+
+
+def json_lines(out):
+    return [json.loads(line) for line in out.splitlines()]
+
+
+@pytest.fixture
+def keys_file(tmp_path):
+    path = tmp_path / "keys.txt"
+    path.write_text("# pool\n" + "\n".join(KEYS[:2]) + "\n\n" + "\n".join(KEYS[2:]) + "\n")
+    return str(path)
+
+
+def open_envelope(envelope, keyring):
+    _, version, wrapped, payload = envelope.split(":")
+    data_key = Fernet(keyring[version].encode()).decrypt(wrapped.encode())
+    return Fernet(data_key).decrypt(payload.encode()).decode()
+
+
+def test_bulk_round_trip(keys_file, monkeypatch, capsys):
+    key = Fernet.generate_key()
+    code, out, err = run(monkeypatch, capsys, "--bulk", keys_file, "--key=" + key.decode())
+    assert code == 0
+    lines = json_lines(out)
+    assert [line["line"] for line in lines] == [2, 3, 5, 6, 7]
+    assert [Fernet(key).decrypt(base64.b64decode(line["encrypted_key"])).decode() for line in lines] == KEYS
+    assert all(line["fingerprint"] == encrypt_key.fingerprint(line["encrypted_key"]) for line in lines)
+    assert "Encrypted 5 keys" in err
+
+
+def test_group_round_trip(keys_file, monkeypatch, capsys):
+    key = Fernet.generate_key()
+    code, out, _ = run(monkeypatch, capsys, "--bulk", keys_file, "--key=" + key.decode(), "--group", "2")
+    assert code == 0
+    groups = json_lines(out)
+    assert [len(group["encrypted_keys"]) for group in groups] == [2, 2, 1]
+    cts = [ct for group in groups for ct in group["encrypted_keys"]]
+    assert [Fernet(key).decrypt(base64.b64decode(ct)).decode() for ct in cts] == KEYS
+    assert [fp for group in groups for fp in group["fingerprints"]] == [encrypt_key.fingerprint(ct) for ct in cts]
+
+
+def test_envelope_and_rewrap_round_trip(keys_file, tmp_path, monkeypatch, capsys):
+    keyring = {"v1": Fernet.generate_key().decode(), "v2": Fernet.generate_key().decode()}
+    code, out, _ = run(monkeypatch, capsys, "--bulk", keys_file, "--key=" + keyring["v1"], "--envelope", "v1")
+    assert code == 0
+    envelopes = tmp_path / "envelopes.jsonl"
+    envelopes.write_text(out)
+    keyring_file = tmp_path / "keyring.json"
+    keyring_file.write_text(json.dumps(keyring))
+
+    code, out, err = run(monkeypatch, capsys, "--rewrap", str(envelopes), "--keyring", str(keyring_file),
+                         "--to-version", "v2")
+    assert code == 0
+    originals, rewrapped = json_lines(envelopes.read_text()), json_lines(out)
+    assert [open_envelope(line["encrypted_key"], {"v2": keyring["v2"]}) for line in rewrapped] == KEYS
+    for before, after in zip(originals, rewrapped):
+        assert after["encrypted_key"].startswith("env1:v2:")
+        assert after["encrypted_key"].rsplit(":", 1)[1] == before["encrypted_key"].rsplit(":", 1)[1]
+        assert after["envelope_header"] == after["encrypted_key"].rsplit(":", 1)[0]
+        assert after["old_fingerprint"] == before["fingerprint"]
+    assert "Re-wrapped 5 keys under v2" in err
+
+
+def test_bad_bulk_lines_are_reported_and_nothing_is_written(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "keys.txt"
+    path.write_bytes(b"good-1\nkey-a key-b\ngood-2\n\xff\xfe-binary\ngood-3\n")
+    code, out, err = run(monkeypatch, capsys, "--bulk", str(path), "--key=" + Fernet.generate_key().decode())
+    assert code == 1
+    assert out == ""
+    assert "line 2: whitespace or control characters inside the key" in err
+    assert "line 4: not valid UTF-8" in err
+    assert "2 bad input lines; nothing written" in err
+
+
+def test_bad_rewrap_lines_are_reported_and_nothing_is_written(tmp_path, monkeypatch, capsys):
+    keyring = {"v1": Fernet.generate_key().decode(), "v2": Fernet.generate_key().decode()}
+    other = Fernet.generate_key()
+    good = encrypt_key.make_envelope("cg-key", "v1", keyring["v1"].encode())
+    path = tmp_path / "envelopes.txt"
+    path.write_text("\n".join([
+        good,
+        "env1:v1:only-three",
+        json.dumps({"line": 3}),
+        encrypt_key.make_envelope("cg-key", "v9", other),
+        encrypt_key.make_envelope("cg-key", "v1", other),
+        "{not json",
+        good,
+    ]) + "\n")
+    keyring_file = tmp_path / "keyring.json"
+    keyring_file.write_text(json.dumps(keyring))
+    code, out, err = run(monkeypatch, capsys, "--rewrap", str(path), "--keyring", str(keyring_file),
+                         "--to-version", "v2")
+    assert code == 1
+    assert out == ""
+    for expected in ("line 2: malformed envelope", 'line 3: no "encrypted_key" string',
+                     "line 4: no key for version v9 in keyring",
+                     "line 5: data key does not unwrap with keyring version v1", "line 6: not a JSON object",
+                     "5 bad input lines; nothing written"):
+        assert expected in err
+    assert "line 1" not in err and "line 7" not in err
+
+
+def test_envelope_cannot_be_grouped(keys_file, monkeypatch, capsys):
+    code, out, err = run(monkeypatch, capsys, "--bulk", keys_file, "--key=" + Fernet.generate_key().decode(),
+                         "--envelope", "v1", "--group", "2")
+    assert code == 1
+    assert out == ""
+    assert "--envelope cannot be combined with --group" in err
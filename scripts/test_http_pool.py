@@ -0,0 +1,170 @@
+"""
+Tests for the pooled HTTP transport against a local http.server that can
+drop kept-alive connections, counting the connections it accepts.
+
+    python -m pytest -q scripts/test_http_pool.py
+"""
+import http.client
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_pool import PooledTransport
+
+
+class Upstream:
+    """
+    Keep-alive HTTP/1.1 server on 127.0.0.1.
+
+    `mode` is "keep" (normal), "drop" (answer, then close the connection
+    without a Connection: close header, like an idle timeout) or "garbage"
+    (answer with a bad status line). `gate` holds every response until set.
+    """
+
+    def __init__(self):
+        self.mode = "keep"
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with upstream.lock:
+                    upstream.connections += 1
+
+            def do_GET(self):
+                if upstream.mode == "garbage":
+                    self.wfile.write(b"garbage\r\n")
+                    self.close_connection = True
+                    return
+                with upstream.lock:
+                    upstream.active += 1
+                    upstream.peak = max(upstream.peak, upstream.active)
+                upstream.gate.wait(5)
+                with upstream.lock:
+                    upstream.active -= 1
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+                if upstream.mode == "drop":
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def upstream():
+    server = Upstream()
+    yield server
+    server.stop()
+
+
+def tracked(transport):
+    """Record every connection the transport opens."""
+    opened = []
+    new_connection = transport._new_connection
+
+    def track(key, pool):
+        conn = new_connection(key, pool)
+        opened.append(conn)
+        return conn
+
+    transport._new_connection = track
+    return opened
+
+
+def test_sequential_requests_reuse_one_connection(upstream):
+    with PooledTransport() as transport:
+        for _ in range(5):
+            assert transport.get(upstream.url).body == b"ok"
+        assert (transport.stats["connections_opened"], transport.stats["connections_reused"]) == (1, 4)
+    assert upstream.connections == 1
+
+
+def test_without_keep_alive_every_request_opens_a_connection(upstream):
+    with PooledTransport(keep_alive=False) as transport:
+        for _ in range(3):
+            transport.get(upstream.url)
+        assert (transport.stats["connections_opened"], transport.stats["connections_reused"]) == (3, 0)
+    assert upstream.connections == 3
+
+
+def test_stale_connection_is_retried_once_on_a_fresh_one(upstream):
+    upstream.mode = "drop"
+    with PooledTransport() as transport:
+        transport.get(upstream.url)
+        upstream.mode = "keep"
+        assert transport.get(upstream.url).body == b"ok"  # the pooled socket was closed by the server
+        assert transport.stats["stale_retries"] == 1
+        assert transport.stats["connections_opened"] == 2
+        assert transport.get(upstream.url).body == b"ok"
+        assert transport.stats["connections_reused"] == 1
+    assert upstream.connections == 2
+
+
+def test_failed_retry_closes_the_fresh_connection(upstream):
+    upstream.mode = "drop"
+    transport = PooledTransport()
+    opened = tracked(transport)
+    transport.get(upstream.url)
+    upstream.mode = "garbage"
+    with pytest.raises(http.client.BadStatusLine):
+        transport.get(upstream.url)
+    assert transport.stats["stale_retries"] == 1
+    assert len(opened) == 2
+    assert all(conn.sock is None for conn in opened)  # closed, and not back in the pool
+    with pytest.raises(http.client.BadStatusLine):
+        transport.get(upstream.url)  # a fresh connection: no stale retry
+    assert transport.stats["stale_retries"] == 1
+    assert all(conn.sock is None for conn in opened)
+
+
+def test_connections_per_host_are_bounded(upstream):
+    upstream.gate.clear()
+    transport = PooledTransport(max_per_host=2)
+    threads = [threading.Thread(target=transport.get, args=(upstream.url,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    while upstream.active < 2:
+        time.sleep(0.01)
+    upstream.gate.set()
+    for thread in threads:
+        thread.join(5)
+    transport.close()
+    assert upstream.peak == 2
+    assert upstream.connections == 2
+    assert transport.stats["requests"] == 6
+
+
+def test_no_free_slot_times_out(upstream):
+    upstream.gate.clear()
+    transport = PooledTransport(max_per_host=1, acquire_timeout=0.05)
+    busy = threading.Thread(target=transport.get, args=(upstream.url,))
+    busy.start()
+    while upstream.active < 1:
+        time.sleep(0.01)
+    with pytest.raises(TimeoutError, match="no free connection"):
+        transport.get(upstream.url)
+    upstream.gate.set()
+    busy.join(5)
+    transport.close()
@@ -0,0 +1,189 @@
+"""
+Tests for the oracle client's contract-type cache and concurrent reads,
+driven by stand-in clients. oracle_client imports genlayer-py at module
+level, so these are skipped without it.
+
+    python -m pytest -q scripts/test_oracle_client.py
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("genlayer_py")
+
+from oracle_client import ContractTypeCache, detect_contract_type, read_contract_state, read_many  # noqa: E402
+
+
+class StandInClient:
+    """Answers read_contract from {address: {function_name: value or exception}}; records every call."""
+
+    def __init__(self, contracts):
+        self.contracts = contracts
+        self.calls = []
+
+    def read_contract(self, address, function_name, args):
+        self.calls.append((address, function_name))
+        answer = self.contracts.get(address, {}).get(function_name, RuntimeError(f"no method {function_name}"))
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class ConcurrencyProbe(StandInClient):
+    """StandInClient whose reads take `delay` seconds and count how many overlap."""
+
+    def __init__(self, contracts, delay=0.02):
+        super().__init__(contracts)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def read_contract(self, address, function_name, args):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            return super().read_contract(address, function_name, args)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class Lines:
+    """Output stream that keeps the JSON lines and signals when the first one arrives."""
+
+    def __init__(self):
+        self.records = []
+        self.first = threading.Event()
+
+    def write(self, text):
+        self.records.append(json.loads(text))
+        self.first.set()
+
+    def flush(self):
+        pass
+
+
+def simple_feeds(count):
+    return {f"0x{i}": {"get_price": {"price": f"{3000 + i}.0"}} for i in range(count)}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ContractTypeCache(str(tmp_path / "cache" / "contract_types.json"), "61999")
+
+
+def test_cache_hit_makes_no_rpc(cache):
+    client = StandInClient({"0xA": {"get_price": {"price": "3000.0"}}})
+    assert detect_contract_type(client, "0xA", cache=cache) == "simple"
+    probes = len(client.calls)
+    assert detect_contract_type(client, "0xa", cache=cache) == "simple"  # keys ignore address case
+    assert len(client.calls) == probes
+
+
+def test_failed_detection_is_not_cached(cache):
+    client = StandInClient({})
+    assert detect_contract_type(client, "0xA", cache=cache) is None
+    assert cache.get("0xA") is None
+
+
+def test_read_failure_invalidates_the_cached_type(cache):
+    cache.set("0xA", "oracle")
+    client = StandInClient({"0xA": {"get_status": RuntimeError("execution reverted")}})
+    record = read_contract_state(client, "0xA", cache=cache)
+    assert (record["ok"], record["type"], record["error"]) == (False, "oracle", "execution reverted")
+    assert client.calls == [("0xA", "get_status")]  # served from the cache, then read
+    assert cache.get("0xA") is None
+
+
+def test_refresh_probes_again_and_overwrites_the_entry(cache):
+    cache.set("0xA", "oracle")
+    client = StandInClient({"0xA": {"get_price": {"price": "3000.0"}}})
+    assert detect_contract_type(client, "0xA", cache=cache, refresh=True) == "simple"
+    assert client.calls == [("0xA", "get_status"), ("0xA", "get_price")]
+    assert cache.get("0xA") == "simple"
+
+
+def test_failed_refresh_drops_the_stale_entry(cache):
+    cache.set("0xA", "oracle")
+    client = StandInClient({})
+    assert detect_contract_type(client, "0xA", cache=cache, refresh=True) is None
+    # The next plain call probes instead of serving the old type
+    client.contracts["0xA"] = {"get_price": {"price": "3000.0"}}
+    assert detect_contract_type(client, "0xA", cache=cache) == "simple"
+    assert len(client.calls) == 4
+
+
+def test_save_is_atomic_and_reloads(cache):
+    cache.set("0xA", "oracle")
+    cache.set("0xB", "simple")
+    cache.save()
+    directory = os.path.dirname(cache.path)
+    assert os.listdir(directory) == ["contract_types.json"]  # no temporary file left behind
+    with open(cache.path, encoding="utf-8") as f:
+        assert json.load(f) == {"61999:0xa": "oracle", "61999:0xb": "simple"}
+
+    reloaded = ContractTypeCache(cache.path, "61999")
+    assert (reloaded.get("0xA"), reloaded.get("0xB")) == ("oracle", "simple")
+    assert ContractTypeCache(cache.path, "1").get("0xA") is None  # another chain
+
+    modified = os.stat(cache.path).st_mtime_ns
+    reloaded.set("0xA", "oracle")  # unchanged: nothing to write
+    reloaded.save()
+    assert os.stat(cache.path).st_mtime_ns == modified
+
+
+def test_corrupt_cache_file_starts_empty(cache):
+    os.makedirs(os.path.dirname(cache.path))
+    with open(cache.path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    reloaded = ContractTypeCache(cache.path, "61999")
+    assert reloaded.get("0xA") is None
+    reloaded.set("0xA", "simple")
+    reloaded.save()
+    assert ContractTypeCache(cache.path, "61999").get("0xA") == "simple"
+
+
+def test_read_many_stays_within_the_worker_bound():
+    client = ConcurrencyProbe(simple_feeds(12))
+    out = Lines()
+    assert read_many(client, list(client.contracts), workers=3, out=out) == 0
+    assert 1 < client.peak <= 3
+    assert sorted(record["address"] for record in out.records) == sorted(client.contracts)
+    assert all(record["ok"] and record["type"] == "simple" for record in out.records)
+
+
+def test_read_many_streams_each_line_as_its_read_completes():
+    out = Lines()
+    client = StandInClient(simple_feeds(2))
+    read = client.read_contract
+
+    def read_contract(address, function_name, args):
+        # 0x0 finishes only after 0x1's line is already on the stream
+        if address == "0x0" and not out.first.wait(5):
+            raise TimeoutError("0x1 was not streamed before 0x0 finished")
+        return read(address, function_name, args)
+
+    client.read_contract = read_contract
+    assert read_many(client, ["0x0", "0x1"], workers=2, out=out) == 0
+    assert [record["address"] for record in out.records] == ["0x1", "0x0"]
+
+
+def test_read_many_counts_failures_without_stopping_the_batch(cache):
+    contracts = simple_feeds(4)
+    contracts["0x1"] = {}  # nothing answers: type not detected
+    contracts["0x2"] = {"get_status": RuntimeError("execution reverted")}
+    cache.set("0x2", "oracle")
+    out = Lines()
+    assert read_many(StandInClient(contracts), list(contracts), workers=2, out=out, cache=cache) == 2
+    records = {record["address"]: record for record in out.records}
+    assert len(out.records) == 4
+    assert records["0x1"]["error"] == "could not detect contract type"
+    assert records["0x2"]["error"] == "execution reverted"
+    assert records["0x0"]["ok"] and records["0x3"]["ok"]
+    assert all("elapsed_ms" in record for record in out.records)
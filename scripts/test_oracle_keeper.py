@@ -0,0 +1,179 @@
+"""
+Tests for the oracle keeper, driven by a stand-in client and a fake clock.
+
+    python -m pytest -q scripts/test_oracle_keeper.py
+"""
+import pytest
+
+from oracle_keeper import Feed, Keeper, SubmissionRateLimiter, load_keeper_config
+
+
+class FakeClient:
+    """Stand-in for the genlayer-py client: records writes, answers statuses from a dict."""
+
+    def __init__(self, price="3000.0"):
+        self.price = price
+        self.writes = []
+        self.reads = 0
+        self.statuses = {}
+        self.poll_error = None
+
+    def write_contract(self, account, address, function_name, args, value):
+        tx_hash = f"0xtx{len(self.writes)}"
+        self.writes.append((address, function_name, list(args)))
+        self.statuses[tx_hash] = "PENDING"
+        return tx_hash
+
+    def read_contract(self, address, function_name, args):
+        self.reads += 1
+        return {"price": self.price}
+
+    def get_transaction(self, hash):
+        if self.poll_error is not None:
+            raise self.poll_error
+        return {"status": self.statuses[hash]}
+
+
+def keeper(client, clock, feeds, reference=3000.0, per_second=100.0, burst=100):
+    references = []
+
+    def reference_price(symbol):
+        references.append(symbol)
+        return reference
+
+    k = Keeper(client, "account", feeds, rate_limiter=SubmissionRateLimiter(per_second, burst, clock=clock),
+               reference_price=reference_price, clock=clock, sleep=clock.sleep, log=lambda line: None)
+    k.references = references
+    return k
+
+
+def settle(client, status="FINALIZED"):
+    for tx_hash in client.statuses:
+        client.statuses[tx_hash] = status
+
+
+def test_feeds_are_submitted_when_due(clock):
+    client = FakeClient()
+    feeds = [Feed("0xa", "simple", interval=60), Feed("0xb", "oracle", interval=120)]
+    k = keeper(client, clock, feeds)
+    assert k.tick() == 2
+    assert client.writes == [("0xa", "update_price", []), ("0xb", "update_all", ["Hanoi", "21.0245", "105.8412", 3])]
+    settle(client)
+    clock.now += 59
+    assert k.tick() == 0
+    clock.now += 1
+    assert k.tick() == 1
+    assert client.writes[-1][0] == "0xa"
+    assert k.stats()["0xa"] == {"submitted": 2, "failed": 0, "pending": "0xtx2"}
+
+
+@pytest.mark.parametrize("reference, submits", [(3020.0, 0), (3040.0, 1), (2950.0, 1)])
+def test_deviation_triggers_an_early_update(clock, reference, submits):
+    client = FakeClient(price="3000.0")
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=3600, deviation=0.01, check_every=30)],
+               reference=reference)
+    k.tick()
+    settle(client)
+    clock.now += 30
+    assert k.tick() == submits
+    assert client.reads == 1
+
+
+def test_deviation_checks_are_spaced_by_check_every(clock):
+    client = FakeClient()
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=3600, deviation=0.01, check_every=30)])
+    k.tick()
+    settle(client)
+    for _ in range(10):
+        clock.now += 5
+        k.tick()
+    assert client.reads == 2  # at +5s and +35s, not on every tick
+    assert k.references == ["ETH", "ETH"]
+
+
+def test_rate_limit_caps_submissions_and_serves_the_most_overdue_first(clock):
+    client = FakeClient()
+    feeds = [Feed(f"0x{i}", "simple", interval=10) for i in range(3)]
+    k = keeper(client, clock, feeds, per_second=0.5, burst=1)
+    assert k.tick() == 1
+    assert k.tick() == 0
+    clock.now += 2
+    assert k.tick() == 1
+    clock.now += 2
+    assert k.tick() == 1
+    assert [address for address, _, _ in client.writes] == ["0x0", "0x1", "0x2"]
+    settle(client)
+    clock.now += 10
+    assert k.tick() == 1
+    assert client.writes[-1][0] == "0x0"
+
+
+def test_submission_rate_limiter_refills(clock):
+    limiter = SubmissionRateLimiter(per_second=1.0, burst=2, clock=clock)
+    assert [limiter.try_acquire() for _ in range(3)] == [True, True, False]
+    clock.now += 1.5
+    assert [limiter.try_acquire() for _ in range(2)] == [True, False]
+    with pytest.raises(ValueError):
+        SubmissionRateLimiter(per_second=0)
+
+
+def test_pending_transaction_blocks_its_feed_until_settled(clock):
+    client = FakeClient()
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=10)])
+    k.tick()
+    clock.now += 20
+    assert k.tick() == 0
+    settle(client, "ACCEPTED")
+    assert k.tick() == 1
+
+
+def test_failed_transaction_is_counted_and_frees_the_feed(clock):
+    client = FakeClient()
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=10)])
+    k.tick()
+    settle(client, "LEADER_TIMEOUT")
+    clock.now += 10
+    assert k.tick() == 1
+    assert k.stats()["0xa"]["failed"] == 1
+
+
+@pytest.mark.parametrize("poll_error", [None, ConnectionError("rpc down")])
+def test_stuck_transaction_times_out(clock, poll_error):
+    client = FakeClient()
+    client.poll_error = poll_error
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=60, pending_timeout=300)])
+    k.tick()
+    clock.now += 299
+    assert k.tick() == 0
+    assert k.stats()["0xa"]["pending"] == "0xtx0"
+    clock.now += 1
+    assert k.tick() == 1
+    assert k.stats()["0xa"] == {"submitted": 2, "failed": 1, "pending": "0xtx1"}
+
+
+def test_submit_errors_are_counted_and_retried_after_the_interval(clock):
+    client = FakeClient()
+
+    def fail(**kwargs):
+        raise ConnectionError("refused")
+
+    client.write_contract = fail
+    k = keeper(client, clock, [Feed("0xa", "simple", interval=60)])
+    assert k.tick() == 1
+    assert k.stats()["0xa"] == {"submitted": 0, "failed": 1, "pending": None}
+    assert k.tick() == 0
+    clock.now += 60
+    assert k.tick() == 1
+    assert k.stats()["0xa"]["failed"] == 2
+
+
+def test_load_keeper_config(tmp_path):
+    path = tmp_path / "keeper.json"
+    path.write_text('{"feeds": [{"address": "0xa", "kind": "simple", "pending_timeout": 120}]}')
+    feed = Feed.from_config(load_keeper_config(str(path))["feeds"][0])
+    assert (feed.kind, feed.pending_timeout) == ("simple", 120.0)
+    path.write_text('{"feeds": []}')
+    with pytest.raises(ValueError, match="non-empty"):
+        load_keeper_config(str(path))
+    with pytest.raises(ValueError, match="unknown contract kind"):
+        Feed("0xa", "weather")
@@ -0,0 +1,163 @@
+"""
+Tests for the Python price proxy against fake upstreams on a local server,
+counting how many requests actually reach them.
+
+    python -m pytest -q scripts/test_price_proxy.py
+"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from local_test_server import LocalTestServer
+from price_proxy import PriceProxy, ProxyConfig
+
+PRICES = {"ETHUSDT": "3000.00", "BTCUSDT": "60000.00"}
+COINGECKO = {"ethereum": 3001.5, "bitcoin": 60001.5}
+
+
+def ok(body):
+    return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+
+class Upstreams:
+    """Binance / Coingecko stand-ins; `gate` holds every ticker response until set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.queries = []
+        self.server = LocalTestServer({
+            "/api/v3/ticker/price": self.ticker,
+            "/api/v3/simple/price": self.simple_price,
+        })
+
+    def ticker(self, query):
+        self.gate.wait(5)
+        self.queries.append(query)
+        if "symbols" in query:
+            pairs = json.loads(query["symbols"][0])
+            if any(pair not in PRICES for pair in pairs):
+                return 400, {"Content-Type": "application/json"}, b'{"code": -1121, "msg": "Invalid symbol."}'
+            return ok([{"symbol": pair, "price": PRICES[pair]} for pair in pairs])
+        pair = query["symbol"][0]
+        if pair not in PRICES:
+            return 400, {"Content-Type": "application/json"}, b'{"code": -1121, "msg": "Invalid symbol."}'
+        return ok({"symbol": pair, "price": PRICES[pair]})
+
+    def simple_price(self, query):
+        self.queries.append(query)
+        ids = query["ids"][0].split(",")
+        return ok({coin_id: {"usd": COINGECKO[coin_id]} for coin_id in ids if coin_id in COINGECKO})
+
+    def hits(self, path="/api/v3/ticker/price"):
+        return self.server.hits[path]
+
+
+@pytest.fixture
+def upstreams():
+    fake = Upstreams()
+    with fake.server:
+        yield fake
+
+
+def make_proxy(upstreams, clock, coingecko=False, **kwargs):
+    config = ProxyConfig(
+        coingecko_api_key="cg-key" if coingecko else None, binance_api_key="bn-key",
+        coingecko_url=upstreams.server.url(), binance_url=upstreams.server.url(), **kwargs,
+    )
+    return PriceProxy(config, clock=clock)
+
+
+def run(proxy, *targets, client=None):
+    async def main():
+        return await asyncio.gather(*(proxy.handle("GET", target, client) for target in targets))
+
+    try:
+        return asyncio.run(main())
+    finally:
+        proxy.close()
+
+
+def test_concurrent_requests_for_one_symbol_make_one_upstream_call(upstreams, clock):
+    proxy = make_proxy(upstreams, clock)
+    upstreams.gate.clear()
+
+    async def main():
+        requests = [asyncio.ensure_future(proxy.handle("GET", "/api/price/eth")) for _ in range(20)]
+        await asyncio.sleep(0.05)  # every request is now waiting on the one in-flight fetch
+        upstreams.gate.set()
+        return await asyncio.gather(*requests)
+
+    try:
+        responses = asyncio.run(main())
+    finally:
+        proxy.close()
+    assert [status for status, _ in responses] == [200] * 20
+    assert {body["price"] for _, body in responses} == {"3000.00"}
+    assert upstreams.hits() == 1
+    assert (proxy.stats["upstream_calls"], proxy.stats["coalesced"]) == (1, 19)
+
+
+def test_cached_prices_expire_after_the_ttl(upstreams, clock):
+    proxy = make_proxy(upstreams, clock, cache_ttl=2.0)
+
+    async def main():
+        await proxy.handle("GET", "/api/price/ETH")
+        clock.now += 1.9
+        await proxy.handle("GET", "/api/price/ETH")
+        hits_within_ttl = upstreams.hits()
+        clock.now += 0.2
+        await proxy.handle("GET", "/api/price/ETH")
+        return hits_within_ttl
+
+    try:
+        assert asyncio.run(main()) == 1
+    finally:
+        proxy.close()
+    assert upstreams.hits() == 2
+    assert proxy.stats["cache_hits"] == 1
+
+
+def test_clients_over_the_rate_limit_get_429(upstreams, clock):
+    proxy = make_proxy(upstreams, clock, rate_limit_max=3, rate_limit_window=60.0)
+    responses = run(proxy, *["/api/price/ETH"] * 5, client="10.0.0.1")
+    assert [status for status, _ in responses] == [200, 200, 200, 429, 429]
+    assert responses[-1][1]["error"] == "Rate limit exceeded"
+    assert responses[-1][1]["retryAfter"] > 0
+    assert upstreams.hits() == 1
+
+
+@pytest.mark.parametrize("target", [
+    "/api/price/ETH%26apiKey%3Dx",
+    "/api/price/ETH%3Fx=1",
+    "/api/price/ETH%2FBTC",
+    "/api/price/" + "A" * 16,
+    "/api/prices?symbols=ETH,BTC%26limit%3D1",
+])
+def test_symbols_that_are_not_plain_tickers_are_rejected(upstreams, clock, target):
+    proxy = make_proxy(upstreams, clock)
+    [(status, body)] = run(proxy, target)
+    assert (status, body["error"]) == (400, "Invalid symbol")
+    assert upstreams.hits() == 0
+
+
+def test_unknown_symbols_do_not_sink_the_binance_batch(upstreams, clock):
+    # The fake Binance, like the real one, rejects a batch with any bad pair
+    proxy = make_proxy(upstreams, clock)
+    [(status, body)] = run(proxy, "/api/prices?symbols=ETH,NOTACOIN,BTC,MATIC")
+    assert status == 200
+    assert {symbol: entry["price"] for symbol, entry in body["prices"].items()} == \
+        {"ETH": "3000.00", "BTC": "60000.00"}
+    assert body["unknown"] == ["NOTACOIN"]
+    assert body["missing"] == ["MATIC"]  # listed, but not on Binance
+    assert upstreams.hits() == 1
+    assert json.loads(upstreams.queries[0]["symbols"][0]) == ["ETHUSDT", "BTCUSDT"]
+
+
+def test_a_batch_of_only_unknown_symbols_is_rejected(upstreams, clock):
+    proxy = make_proxy(upstreams, clock, coingecko=True)
+    [(status, body)] = run(proxy, "/api/prices?symbols=NOTACOIN,FAKE")
+    assert (status, body) == (400, {"error": "Unknown symbols", "unknown": ["NOTACOIN", "FAKE"]})
+    assert upstreams.hits() == upstreams.hits("/api/v3/simple/price") == 0
@@ -0,0 +1,126 @@
+"""
+Tests for the transaction submission pipeline, driven by stand-in clients
+and a fake clock (the pipeline's sleep advances it).
+
+    python -m pytest -q scripts/test_tx_pipeline.py
+"""
+import pytest
+
+from tx_pipeline import FINALIZED, LatencyHistogram, TxPipeline, tx_status_name
+
+
+class ScriptedClient:
+    """Each transaction walks through `statuses`, one step per poll, then stays on the last."""
+
+    def __init__(self, statuses=("PENDING", "ACCEPTED", "FINALIZED")):
+        self.statuses = list(statuses)
+        self.polls = {}
+        self.writes = []
+
+    def write_contract(self, account, address, function_name, args, value):
+        self.writes.append(address)
+        return f"0xtx{len(self.writes)}"
+
+    def get_transaction(self, hash):
+        step = self.polls.get(hash, 0)
+        self.polls[hash] = step + 1
+        status = self.statuses[min(step, len(self.statuses) - 1)]
+        if isinstance(status, Exception):
+            raise status
+        return {"status": status}
+
+
+def pipeline(client, clock, **kwargs):
+    kwargs.setdefault("poll_workers", 1)
+    return TxPipeline(client, "account", clock=clock, sleep=clock.sleep, log=lambda line: None, **kwargs)
+
+
+def test_jobs_finalize_with_bounded_concurrency(clock):
+    client = ScriptedClient()
+    p = pipeline(client, clock, max_in_flight=2)
+    for i in range(5):
+        p.submit(f"0x{i}", "update_price")
+    jobs = p.run()
+    assert [job.status for job in jobs] == [FINALIZED] * 5
+    assert client.writes == [f"0x{i}" for i in range(5)]
+    assert p.report()["outcomes"] == {FINALIZED: 5}
+    assert p.finalized_latency.summary()["count"] == 5
+
+
+def test_never_finalizing_transaction_times_out(clock):
+    client = ScriptedClient(statuses=("PENDING",))
+    p = pipeline(client, clock, timeout=60, max_poll_interval=5)
+    job = p.submit("0xa", "update_price")
+    p.run()
+    assert job.status == "TIMEOUT"
+    assert "not finalized after 60s (last status PENDING)" in job.error
+    assert 60 < clock.now - 1000 <= 70
+
+
+def test_default_timeout_is_finite(clock):
+    client = ScriptedClient(statuses=("ACCEPTED",))
+    p = pipeline(client, clock)
+    job = p.submit("0xa", "update_price")
+    p.run()
+    assert job.status == "TIMEOUT"
+    assert clock.now - 1000 <= p.timeout + p.max_poll_interval
+
+
+@pytest.mark.parametrize("failure", [ConnectionError("rpc down"), "GARBAGE"])
+def test_consecutive_poll_failures_give_up(clock, failure):
+    # A raising RPC and a status we cannot read are both poll failures
+    client = ScriptedClient(statuses=(failure,))
+    if failure == "GARBAGE":
+        client.get_transaction = lambda hash: {"no_status": True}
+    p = pipeline(client, clock, max_poll_errors=3, timeout=None)
+    job = p.submit("0xa", "update_price")
+    p.run()
+    assert job.status == "POLL_FAILED"
+    assert job.error.startswith("3 status polls failed in a row")
+    assert p.polls == 3
+
+
+def test_a_successful_poll_resets_the_error_count(clock):
+    error = ConnectionError("blip")
+    client = ScriptedClient(statuses=(error, error, "PENDING", error, error, "FINALIZED"))
+    p = pipeline(client, clock, max_poll_errors=3)
+    job = p.submit("0xa", "update_price")
+    p.run()
+    assert job.status == FINALIZED
+    assert job.error is None
+
+
+def test_failed_status_and_submit_errors_complete_the_job(clock):
+    client = ScriptedClient(statuses=("PENDING", "LEADER_TIMEOUT"))
+    p = pipeline(client, clock)
+    failed = p.submit("0xa", "update_price")
+
+    def refuse(**kwargs):
+        raise ConnectionError("refused")
+
+    p.run()
+    client.write_contract = refuse
+    rejected = p.submit("0xb", "update_price")
+    p.run()
+    assert (failed.status, failed.error) == ("LEADER_TIMEOUT", "LEADER_TIMEOUT")
+    assert (rejected.status, rejected.error) == ("SUBMIT_FAILED", "refused")
+
+
+def test_tx_status_name_accepts_dicts_objects_and_enums():
+    class Status:
+        name = "finalized"
+
+    class Tx:
+        status = Status()
+
+    assert tx_status_name({"statusName": "accepted"}) == "ACCEPTED"
+    assert tx_status_name(Tx()) == "FINALIZED"
+    assert tx_status_name(None) == tx_status_name({}) == "UNKNOWN"
+
+
+def test_latency_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram(buckets=(1, 10))
+    for seconds in (0.5, 2, 3, 20):
+        histogram.record(seconds)
+    assert histogram.summary() == {"count": 4, "p50": 3, "p90": 20, "max": 20,
+                                   "buckets": {"<=1s": 1, "<=10s": 2, ">10s": 1}}
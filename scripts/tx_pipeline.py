@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Transaction Submission Pipeline
+
+Keeps up to N write transactions in flight instead of submitting one and
+blocking on `wait_for_transaction_receipt(..., FINALIZED)` before the next.
+Used by `scripts/oracle_client.py <addresses> update`; the status helpers
+are shared with the keeper.
+
+Each loop iteration:
+  1. tops up the in-flight set from the queue (write_contract),
+  2. polls the status of every in-flight transaction as one batch
+     (concurrently, on a small thread pool),
+  3. sleeps with exponential backoff while nothing changes, and resets
+     the delay as soon as any transaction moves.
+
+Latency from submission to ACCEPTED and FINALIZED is recorded per job and
+summarised as histograms. Every job ends: it is marked TIMEOUT once its
+deadline passes and POLL_FAILED after `max_poll_errors` consecutive failed
+or unreadable status polls, so a stuck transaction or an RPC outage cannot
+keep `run()` looping forever.
+
+Only `write_contract` and `get_transaction` are used, so any stand-in
+client with those methods works (no genlayer-py required).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+
+ACCEPTED = "ACCEPTED"
+FINALIZED = "FINALIZED"
+FAILED_STATUSES = ("UNDETERMINED", "CANCELED", "LEADER_TIMEOUT", "VALIDATORS_TIMEOUT")
+
+# Default per-job deadline after submission, in seconds
+DEFAULT_TIMEOUT = 600.0
+# Default consecutive failed / unreadable status polls before a job is given up
+DEFAULT_MAX_POLL_ERRORS = 5
+
+# Default histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+
+
+def tx_status_name(tx) -> str:
+    """
+    Extract the status name from a transaction returned by `get_transaction`.
+
+    Accepts dict-like and attribute-style transactions, and status values
+    given either as names or as enums.
+    """
+    if tx is None:
+        return "UNKNOWN"
+    for field in ("status_name", "statusName", "status"):
+        value = tx.get(field) if isinstance(tx, dict) else getattr(tx, field, None)
+        if value is None:
+            continue
+        if hasattr(value, "name"):
+            return str(value.name).upper()
+        if isinstance(value, str):
+            return value.upper()
+    return "UNKNOWN"
+
+
+def fetch_tx_status(client, tx_hash: str) -> str:
+    """Fetch a transaction and return its status name."""
+    return tx_status_name(client.get_transaction(hash=tx_hash))
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Args:
+        buckets: Increasing bucket upper bounds in seconds; one overflow
+                 bucket is added automatically.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(float(b) for b in buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.samples: List[float] = []
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        """Compact dict with count, percentiles and bucket counts."""
+        labels = [f"<={b:g}s" for b in self.buckets] + [f">{self.buckets[-1]:g}s"]
+        return {
+            "count": len(self.samples),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "max": max(self.samples) if self.samples else None,
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+    def render(self, title: str, width: int = 30) -> str:
+        """Text histogram for terminal output."""
+        lines = [f"{title} (n={len(self.samples)})"]
+        if not self.samples:
+            return lines[0] + ": no samples"
+        peak = max(self.counts) or 1
+        labels = [f"<={b:g}s" for b in self.buckets] + [f">{self.buckets[-1]:g}s"]
+        for label, n in zip(labels, self.counts):
+            if n:
+                lines.append(f"  {label:>8} | {'#' * max(1, n * width // peak)} {n}")
+        lines.append(f"  p50={self.percentile(50):.2f}s p90={self.percentile(90):.2f}s max={max(self.samples):.2f}s")
+        return "\n".join(lines)
+
+
+class TxJob:
+    """One write transaction moving through the pipeline."""
+
+    def __init__(self, address: str, function_name: str, args: Optional[list] = None):
+        self.address = address
+        self.function_name = function_name
+        self.args = list(args or [])
+        self.tx_hash: Optional[str] = None
+        self.status = "QUEUED"
+        self.error: Optional[str] = None
+        self.poll_errors = 0
+        self.submitted_at: Optional[float] = None
+        self.accepted_at: Optional[float] = None
+        self.finalized_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        def _since_submit(ts: Optional[float]) -> Optional[float]:
+            if ts is None or self.submitted_at is None:
+                return None
+            return round(ts - self.submitted_at, 3)
+
+        return {
+            "address": self.address,
+            "function": self.function_name,
+            "tx_hash": self.tx_hash,
+            "status": self.status,
+            "error": self.error,
+            "accepted_s": _since_submit(self.accepted_at),
+            "finalized_s": _since_submit(self.finalized_at),
+        }
+
+
+class TxPipeline:
+    """
+    Submit many write transactions with bounded concurrency.
+
+    Args:
+        client: genlayer-py client (or stand-in)
+        account: Account used for write_contract
+        max_in_flight: Maximum submitted-but-unfinished transactions
+        wait_for: Status at which a job is complete: "ACCEPTED" or "FINALIZED"
+        poll_interval: Initial delay between status polls (seconds)
+        max_poll_interval: Upper bound for the backoff delay
+        backoff: Delay multiplier applied while no transaction changes status
+        timeout: Per-job deadline after submission (None for no deadline)
+        max_poll_errors: Consecutive failed or unreadable (UNKNOWN) status
+                         polls after which a job is marked POLL_FAILED
+        poll_workers: Threads used to poll one batch of statuses
+        clock: Monotonic time source
+        sleep: Sleep function
+        log: Line logger
+    """
+
+    def __init__(self, client, account, max_in_flight: int = 8, wait_for: str = FINALIZED,
+                 poll_interval: float = 1.0, max_poll_interval: float = 15.0, backoff: float = 2.0,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT, max_poll_errors: int = DEFAULT_MAX_POLL_ERRORS,
+                 poll_workers: int = 8,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep,
+                 log: Callable[[str], None] = print):
+        if wait_for not in (ACCEPTED, FINALIZED):
+            raise ValueError(f"wait_for must be {ACCEPTED} or {FINALIZED}")
+        self.client = client
+        self.account = account
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.wait_for = wait_for
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_poll_errors = max(1, int(max_poll_errors))
+        self.poll_workers = max(1, int(poll_workers))
+        self.clock = clock
+        self.sleep = sleep
+        self.log = log
+        self.queue: List[TxJob] = []
+        self.in_flight: List[TxJob] = []
+        self.completed: List[TxJob] = []
+        self.polls = 0
+        self.accepted_latency = LatencyHistogram()
+        self.finalized_latency = LatencyHistogram()
+
+    def submit(self, address: str, function_name: str, args: Optional[list] = None) -> TxJob:
+        """Queue a write transaction; it is sent by pump()/run()."""
+        job = TxJob(address, function_name, args)
+        self.queue.append(job)
+        return job
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and not self.in_flight
+
+    def _finish(self, job: TxJob) -> None:
+        self.in_flight.remove(job)
+        self.completed.append(job)
+
+    def _fill(self) -> bool:
+        progressed = False
+        while self.queue and len(self.in_flight) < self.max_in_flight:
+            job = self.queue.pop(0)
+            try:
+                job.tx_hash = self.client.write_contract(
+                    account=self.account,
+                    address=job.address,
+                    function_name=job.function_name,
+                    args=job.args,
+                    value=0,
+                )
+            except Exception as e:
+                job.status = "SUBMIT_FAILED"
+                job.error = str(e)
+                self.completed.append(job)
+                self.log(f"ERROR: {job.address} {job.function_name} submit failed: {e}")
+                progressed = True
+                continue
+            job.submitted_at = self.clock()
+            job.status = "SUBMITTED"
+            self.in_flight.append(job)
+            self.log(f"SUBMIT: {job.address} {job.function_name} -> {job.tx_hash}")
+            progressed = True
+        return progressed
+
+    def _poll_one(self, job: TxJob) -> str:
+        """Status of one job; the previous status (and a counted error) if the poll fails."""
+        try:
+            status = fetch_tx_status(self.client, job.tx_hash)
+        except Exception as e:
+            job.poll_errors += 1
+            job.error = str(e)
+            return job.status
+        if status == "UNKNOWN":
+            job.poll_errors += 1
+            job.error = "unreadable transaction status"
+            return job.status
+        job.poll_errors = 0
+        job.error = None
+        return status
+
+    def _poll(self) -> bool:
+        if not self.in_flight:
+            return False
+        batch = list(self.in_flight)
+        self.polls += 1
+        if len(batch) == 1 or self.poll_workers == 1:
+            statuses = [self._poll_one(job) for job in batch]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.poll_workers, len(batch))) as pool:
+                statuses = list(pool.map(self._poll_one, batch))
+
+        now = self.clock()
+        progressed = False
+        for job, status in zip(batch, statuses):
+            if status != job.status:
+                progressed = True
+            job.status = status
+            if status in (ACCEPTED, FINALIZED) and job.accepted_at is None:
+                job.accepted_at = now
+                self.accepted_latency.record(now - job.submitted_at)
+            if status == FINALIZED and job.finalized_at is None:
+                job.finalized_at = now
+                self.finalized_latency.record(now - job.submitted_at)
+
+            if status == FINALIZED or (status == ACCEPTED and self.wait_for == ACCEPTED):
+                self.log(f"{status}: {job.address} {job.tx_hash} ({now - job.submitted_at:.1f}s)")
+                self._finish(job)
+            elif status in FAILED_STATUSES:
+                job.error = job.error or status
+                self.log(f"ERROR: {job.address} {job.tx_hash} {status}")
+                self._finish(job)
+            elif job.poll_errors >= self.max_poll_errors:
+                job.status = "POLL_FAILED"
+                job.error = f"{job.poll_errors} status polls failed in a row (last: {job.error})"
+                self.log(f"ERROR: {job.address} {job.tx_hash} status polls failing, giving up")
+                self._finish(job)
+            elif self.timeout is not None and now - job.submitted_at > self.timeout:
+                job.status = "TIMEOUT"
+                job.error = f"not {self.wait_for.lower()} after {self.timeout:g}s (last status {status})"
+                self.log(f"ERROR: {job.address} {job.tx_hash} timed out")
+                self._finish(job)
+        return progressed
+
+    def pump(self) -> bool:
+        """
+        Run one submit + poll step without sleeping.
+
+        Returns:
+            True if any job was submitted or changed status
+        """
+        polled = self._poll()
+        filled = self._fill()
+        return polled or filled
+
+    def run(self) -> List[TxJob]:
+        """Process the queue until every job is complete."""
+        delay = self.poll_interval
+        self._fill()
+        while not self.idle:
+            self.sleep(delay)
+            if self.pump():
+                delay = self.poll_interval
+            else:
+                delay = min(self.max_poll_interval, delay * self.backoff)
+        return self.completed
+
+    def report(self) -> dict:
+        """Outcome counts and latency histograms."""
+        outcomes: Dict[str, int] = {}
+        for job in self.completed:
+            outcomes[job.status] = outcomes.get(job.status, 0) + 1
+        return {
+            "jobs": len(self.completed),
+            "outcomes": outcomes,
+            "status_polls": self.polls,
+            "submit_to_accepted": self.accepted_latency.summary(),
+            "submit_to_finalized": self.finalized_latency.summary(),
+        }